@@ -89,12 +89,8 @@ class ComplianceObjective(ObjectiveBase):
         -------
         ce : 单元柔顺度向量
         """
-        ke0 = self.solver.get_base_local_stiffness_matrix()
-        cell2dof = self.solver.tensor_space.cell_to_dof()
-        ue = u[cell2dof]
-        
         # 更新缓存
-        self._element_compliance = bm.einsum('ci, cik, ck -> c', ue, ke0, ue)
+        self._element_compliance = self.solver.compute_element_compliance(u)
 
         return self._element_compliance
     
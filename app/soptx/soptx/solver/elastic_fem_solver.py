@@ -5,7 +5,7 @@ from enum import Enum, auto
 from fealpy.backend import backend_manager as bm
 from fealpy.typing import TensorLike, Union
 from fealpy.functionspace import TensorFunctionSpace
-from fealpy.fem import LinearElasticIntegrator, BilinearForm, DirichletBC
+from fealpy.fem import LinearElasticIntegrator, ScaledBilinearForm, DirichletBC
 from fealpy.sparse import CSRTensor
 from fealpy.solver import cg, spsolve
 
@@ -75,9 +75,11 @@ class ElasticFEMSolver:
         # 状态管理
         self._current_density = None
         self._current_material = None
+        self._current_modulus = None
             
         # 缓存
         self._base_local_stiffness_matrix = None
+        self._scaled_form = None
         self._global_stiffness_matrix = None
         self._global_force_vector = None
 
@@ -105,6 +107,7 @@ class ElasticFEMSolver:
         self._current_density = density
         # 根据新密度计算材料属性
         E = self.material_properties.calculate_elastic_modulus(density)
+        self._current_modulus = E
         self._current_material = ElasticMaterialInstance(E, self.material_properties.config)
         
         # 清除依赖于密度的缓存
@@ -139,6 +142,21 @@ class ElasticFEMSolver:
             self._base_local_stiffness_matrix = integrator.assembly(space=self.tensor_space)
         return self._base_local_stiffness_matrix
     
+    def get_scaled_form(self) -> ScaledBilinearForm:
+        """获取基于基础材料单元刚度矩阵的缩放双线性型（会被缓存）
+        
+        K(rho) = sum_e E(rho_e) K_e, 其中 K_e 只在第一次组装时计算
+        """
+        if self._scaled_form is None:
+            integrator = self._create_integrator(self.material_properties.get_base_material())
+            self._scaled_form = ScaledBilinearForm(self.tensor_space)
+            self._scaled_form.add_integrator(integrator)
+        return self._scaled_form
+
+    def compute_element_compliance(self, u: TensorLike) -> TensorLike:
+        """计算基础材料下的单元柔顺度 u_e^T K_e u_e"""
+        return self.get_scaled_form().element_compliance(u)
+
     def compute_local_stiffness_matrix(self) -> TensorLike:
         """计算当前材料的局部刚度矩阵（每次重新计算）"""
         if self._current_material is None:
@@ -169,10 +187,14 @@ class ElasticFEMSolver:
     #---------------------------------------------------------------------------
     # 内部方法：组装和边界条件
     #---------------------------------------------------------------------------
-    def _create_integrator(self) -> LinearElasticIntegrator:
+    def _create_integrator(self, material=None) -> LinearElasticIntegrator:
         """创建适当的积分器实例
         
         根据配置创建对应的积分器，并设置正确的积分方法
+
+        Parameters
+        ----------
+        material : 积分器使用的材料, 默认为当前材料
         """
         # 确定积分方法
         method_map = {
@@ -189,7 +211,7 @@ class ElasticFEMSolver:
         q = self.tensor_space.p + self.assembly_config.quadrature_degree_increase
         
         integrator = LinearElasticIntegrator(
-            material=self._current_material,
+            material=self._current_material if material is None else material,
             q=q,
             method=method
         )
@@ -198,26 +220,15 @@ class ElasticFEMSolver:
     
     
     def _assemble_global_stiffness_matrix(self) -> CSRTensor:
-        """组装全局刚度矩阵"""
+        """组装全局刚度矩阵
+        
+        基础单元刚度矩阵和稀疏结构只在第一次组装时计算, 
+        之后每次只需按单元杨氏模量加权散射到固定的 CSR 结构中
+        """
         if self._current_material is None:
             raise ValueError("Material not initialized. Call update_density first.")
-        
-        # 创建计时器
-        # t = timer("Assemble Timing")
-        # next(t)  # 启动计时器
-            
-        # 创建适当的积分器
-        integrator = self._create_integrator()
-
-        bform = BilinearForm(self.tensor_space)
-        bform.add_integrator(integrator)
-        # t.send('Local Assembly')
-        K = bform.assembly(format='csr')
-        Kdense = K.to_dense()
-        # t.send('Global Assembly')
 
-        # 结束计时
-        # t.send(None)
+        K = self.get_scaled_form().assembly(self._current_modulus, format='csr')
         self._global_stiffness_matrix = K
 
         return K
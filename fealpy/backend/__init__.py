@@ -7,5 +7,6 @@ This module provides a backend manager for FEALPy.
 """
 from .manager import BackendManager
 from .base import TensorLike, Size, Number
+from .index_policy import set_index_policy, get_index_policy, index_dtype, promote_index_dtype
 
 backend_manager = BackendManager(default_backend='numpy')
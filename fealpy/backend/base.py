@@ -212,7 +212,7 @@ FUNCTION_MAPPING = _make_default_mapping(
     'std', 'sum',
     'var',
     # non-standard
-    'cumsum', 'cumprod',
+    'cumsum', 'cumprod', 'bincount',
 
     ### Utility Functions ###
     # python array API standard v2023.12
@@ -0,0 +1,60 @@
+
+from typing import Any
+
+_POLICIES = ('auto', 'int32', 'int64')
+_INT32_MAX = 2**31 - 1
+_INDEX_POLICY = 'auto'
+
+
+def set_index_policy(policy: str, /) -> None:
+    """Select the integer type of the index tensors of meshes, dof maps and
+    sparse matrices.
+
+    Parameters:
+        policy (str): 'auto' (default) stores the indices in int32 when the\
+        indexed entities are fewer than 2^31, and in int64 otherwise. On the\
+        pytorch backend, 'auto' always gives int64, since the scatter, gather\
+        and sparse COO kernels of torch only take int64 indices. 'int32'\
+        and 'int64' fix the type, and 'int32' raises OverflowError for 2^31\
+        or more entities.
+    """
+    if policy not in _POLICIES:
+        raise ValueError(f"Unknown index policy '{policy}', "
+                         f"available: {', '.join(_POLICIES)}.")
+    global _INDEX_POLICY
+    _INDEX_POLICY = policy
+
+
+def get_index_policy() -> str:
+    """Get the name of the index policy."""
+    return _INDEX_POLICY
+
+
+def index_dtype(size: int, /) -> Any:
+    """Integer type to store the indices of `size` entities by the index policy.
+
+    Parameters:
+        size (int): Upper bound of the number of the indexed entities.
+
+    Returns:
+        dtype: int32 or int64 of the current backend.
+    """
+    from . import backend_manager as bm
+    if size > _INT32_MAX and _INDEX_POLICY == 'int32':
+        raise OverflowError(f"{size} entities can not be indexed by int32 "
+                            "with the 'int32' index policy.")
+    if _INDEX_POLICY == 'int64' or size > _INT32_MAX:
+        return bm.int64
+    if _INDEX_POLICY == 'auto' and bm.backend_name == 'pytorch':
+        return bm.int64
+    return bm.int32
+
+
+def promote_index_dtype(dtype: Any, size: int, /) -> Any:
+    """Integer type at least as wide as `dtype` that can hold the indices of
+    `size` entities, e.g. the row pointers of a CSR matrix with `size` non-zeros.
+    Unlike `index_dtype`, this never narrows `dtype`."""
+    from . import backend_manager as bm
+    if dtype == bm.int32 and size > _INT32_MAX:
+        return bm.int64
+    return dtype
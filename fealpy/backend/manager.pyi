@@ -305,6 +305,7 @@ class BackendManager():
     # non-standard
     def cumsum(self, x: _DT, /, *, axis: Optional[int]=None) -> _DT: ...
     def cumprod(self, x: _DT, /, *, axis: Optional[int]=None) -> _DT: ...
+    def bincount(self, x: _DT, /, weights: Optional[_DT]=None, minlength: int=0) -> _DT: ...
 
     ### Utility Functions ###
     # python array API standard v2023.12
@@ -456,12 +456,12 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
 
     @staticmethod
     def scatter(x: Tensor, index, src, /, *, axis: int=0):
-        x.scatter_(dim=axis, index=index, src=src)
+        x.scatter_(dim=axis, index=index.long(), src=src)
         return x
 
     @staticmethod
     def scatter_add(x: Tensor, index, src, /, *, axis: int=0):
-        x.scatter_add_(dim=axis, index=index, src=src)
+        x.scatter_add_(dim=axis, index=index.long(), src=src)
         return x
 
     ### Functional programming ###
@@ -492,7 +492,7 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
     @staticmethod
     def coo_spmm(indices, values, shape, other):
         if values.ndim == 1:
-            mat = torch.sparse_coo_tensor(indices, values, size=shape)
+            mat = torch.sparse_coo_tensor(indices.long(), values, size=shape)
             return PyTorchBackend._spmm(mat, other)
         else:
             raise NotImplementedError("Batch sparse matrix multiplication has "
@@ -516,7 +516,7 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
 
     @staticmethod
     def coo_tocsr(indices, values, shape):
-        mat = torch.sparse_coo_tensor(indices, values, size=shape)
+        mat = torch.sparse_coo_tensor(indices.long(), values, size=shape)
         mat = mat.to_sparse_csr()
         return mat.crow_indices(), mat.col_indices(), mat.values()
 
@@ -137,7 +137,7 @@ class EITDataGenerator():
                 or (Batch, Boundary nodes).
         """
         # uh = cg(self.A_n, self.b_, batch_first=True, atol=1e-12, rtol=0.)
-        uh = spsolve(self.A_n, self.b_.T, solver='scipy').T
+        uh = spsolve(self.A_n, self.b_.T, solver='scipy', reuse=True).T
 
         if return_full:
             return uh[:-1]
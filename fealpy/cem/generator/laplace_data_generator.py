@@ -3,9 +3,11 @@ from typing import Callable, Tuple, Iterable, Generator, Any, Dict, Optional, Un
 import numpy as np
 from numpy import float32
 from numpy.typing import NDArray
-from scipy.sparse.linalg import splu
 from scipy.sparse import spdiags, hstack, vstack, csr_matrix
 
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor
+from fealpy.solver import DirectSolver
 from fealpy.functionspace import LagrangeFESpace
 from fealpy.mesh import TriangleMesh, UniformMesh2d
 from fealpy.fem import BilinearForm
@@ -68,7 +70,7 @@ class LaplaceFEMSolver():
         D1 = spdiags(bdIdx, 0, A_.shape[0], A_.shape[0])
         A_ = D0@A_@D0 + D1
 
-        self.AD_lu = splu(A_.tocsc())
+        self.AD_lu = DirectSolver(CSRTensor.from_scipy(A_.tocsr()), solver='scipy')
 
     def solve_from_gd(self, gd: ArrayOrFunc) -> NDArray:
         """
@@ -85,7 +87,7 @@ class LaplaceFEMSolver():
         b_[:] = b_ - self.A_@uh.reshape(-1)
         b_[isDDof] = uh[isDDof]
 
-        uh[:] = self.AD_lu.solve(b_)
+        uh[:] = bm.to_numpy(self.AD_lu.solve(b_))
         return uh
 
     def solve_from_gds(self, gd_iterable: Iterable[ArrayOrFunc]) -> Generator[NDArray, Any, None]:
@@ -103,7 +105,7 @@ class LaplaceFEMSolver():
         A_C = hstack([A_, C_.reshape(-1, 1)])
         A_C = vstack([A_C, hstack([C_.reshape(1, -1), csr_matrix((1, 1), dtype=space.ftype)])])
 
-        self.AC_lu = splu(A_C.tocsc())
+        self.AC_lu = DirectSolver(CSRTensor.from_scipy(A_C.tocsr()), solver='scipy')
 
     def solve_from_gn(self, gn: ArrayOrFunc) -> NDArray:
         """
@@ -119,7 +121,7 @@ class LaplaceFEMSolver():
         intergrator.assembly_face_vector(space, out=F_[:-1])
 
         uh = np.zeros((self.ndof, ), dtype=space.ftype)
-        uh[:] = self.AC_lu.solve(F_)[:-1]
+        uh[:] = bm.to_numpy(self.AC_lu.solve(F_))[:-1]
         return uh
 
     def solve_from_gns(self, gn_iterable: Iterable[ArrayOrFunc]) -> Generator[NDArray, Any, None]:
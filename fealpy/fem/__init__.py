@@ -3,6 +3,8 @@
 ### Forms and bases
 from .integrator import *
 from .bilinear_form import BilinearForm
+from .scaled_bilinear_form import ScaledBilinearForm
+from .matrix_free_operator import MatrixFreeOperator
 from .linear_form import LinearForm
 from .nonlinear_form import NonlinearForm
 from .block_form import BlockForm
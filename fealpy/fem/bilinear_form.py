@@ -4,13 +4,17 @@ from typing import Optional, Literal, overload
 from .. import logger
 from ..typing import TensorLike
 from ..backend import backend_manager as bm
-from ..sparse import COOTensor, CSRTensor
+from ..sparse import COOTensor, CSRTensor, CSRPattern, COOBuilder, CSRBuilder
 from .form import Form
 from .integrator import LinearInt
 
 
 class BilinearForm(Form[LinearInt]):
     _M = None
+    _keep_pattern = False
+    _pattern: Optional[CSRPattern] = None
+    _streaming = False
+    _mmap_dir: Optional[str] = None
 
     def _get_sparse_shape(self):
         spaces = self._spaces
@@ -43,36 +47,211 @@ class BilinearForm(Form[LinearInt]):
                 raise ValueError("Spaces should have the same dtype, "
                                 f"but got {s0.ftype} and {s1.ftype}.")
 
+    def keep_pattern(self, status_on=True, /):
+        """Set whether to reuse the sparsity pattern between assemblies.
+
+        When enabled, the CSR structure and the scatter map from local matrix
+        entries to CSR slots are built in the first `assembly` call. Later calls
+        only recompute the local matrices and scatter them into the existing
+        structure, skipping the sorting and coalescing.
+        The mesh and spaces must stay unchanged while the pattern is kept.
+        """
+        self._keep_pattern = status_on
+        if not status_on:
+            self.clear_pattern()
+        return self
+
+    def clear_pattern(self) -> None:
+        """Clear the kept sparsity pattern."""
+        self._pattern = None
+
+    def streaming(self, status_on=True, /, *, mmap_dir: Optional[str]=None):
+        """Set whether to assemble in two streaming passes straight into CSR.
+
+        When enabled, the first pass builds the CSR structure from the
+        entity-to-dof maps alone, and the second pass evaluates the local
+        matrices chunk by chunk (see the `chunk_size` of `add_integrator`),
+        summing each chunk into the final CSR values. The triplets of all
+        entities are never held in memory at once.
+
+        Parameters:
+            status_on (bool, optional): Defaults to True.
+            mmap_dir (str | None, optional): Directory to keep the column indices
+                and values of the matrix as memory-mapped .npy files
+                (numpy backend only). Defaults to None.
+        """
+        self._streaming = status_on
+        self._mmap_dir = mmap_dir if status_on else None
+        return self
+
+    def _add_integrator_impl(self, I, group=None, chunk_size=0):
+        self.clear_pattern()
+        return super()._add_integrator_impl(I, group, chunk_size)
+
+    def _local_nnz(self) -> int:
+        """Total number of entries in the local matrices of all groups."""
+        nnz = 0
+        for integrator in self.integrators.values():
+            etg = integrator.to_global_dof(self.space)
+            if not isinstance(etg, (tuple, list)):
+                etg = (etg, )
+            ue2dof = etg[0]
+            ve2dof = etg[1] if (len(etg) > 1) else ue2dof
+            nnz += ve2dof.shape[0] * ve2dof.shape[1] * ue2dof.shape[1]
+        return nnz
+
+    def _local_builder(self, sparse_shape, *, transposed=False) -> COOBuilder:
+        """Fill local matrices of all groups into a COO builder."""
+        space = self._spaces
+        dense_shape = () if (self.batch_size == 0) else (self.batch_size,)
+        builder = COOBuilder(
+            sparse_shape, self._local_nnz(),
+            dense_shape = dense_shape,
+            itype = space[0].itype,
+            ftype = space[0].ftype,
+            device = bm.get_device(space[0])
+        )
+
+        for group in self.integrators.keys():
+            if self.is_parallel(group):
+                self._parallel_fill(builder, group, transposed=transposed)
+                continue
+
+            for group_tensor, e2dofs_tuple in self.assembly_local_group(group):
+                ue2dof = e2dofs_tuple[0]
+                ve2dof = e2dofs_tuple[1] if (len(e2dofs_tuple) > 1) else ue2dof
+                if transposed:
+                    builder.add_local(bm.swapaxes(group_tensor, -1, -2), ue2dof, ve2dof)
+                else:
+                    builder.add_local(group_tensor, ve2dof, ue2dof)
+
+        return builder
+
+    def _parallel_fill(self, builder: COOBuilder, group: str, /, *, transposed=False) -> None:
+        """Evaluate the chunks of a group on a thread pool, each writing its
+        triplets into its own slice of the builder. The triplets are in the same
+        order as the serial assembly, so the results are reproducible."""
+        etg = self.integrators[group].to_global_dof(self.space)
+        if not isinstance(etg, (tuple, list)):
+            etg = (etg, )
+        uldof = etg[0].shape[1]
+        vldof = etg[1].shape[1] if (len(etg) > 1) else uldof
+        size = self._group_size(group)
+        local_nnz = uldof * vldof
+        offset = builder.allocate(size * local_nnz).start
+        logger.debug(f"(ASSEMBLY LOCAL PARALLEL) {group}, {self.workers} workers")
+
+        def fill(indices: slice, group_tensor: TensorLike, e2dofs_tuple):
+            ue2dof = e2dofs_tuple[0]
+            ve2dof = e2dofs_tuple[1] if (len(e2dofs_tuple) > 1) else ue2dof
+            start = offset + indices.start * local_nnz
+            at = slice(start, start + ue2dof.shape[0] * local_nnz)
+            if transposed:
+                builder.add_local(bm.swapaxes(group_tensor, -1, -2), ue2dof, ve2dof, at=at)
+            else:
+                builder.add_local(group_tensor, ve2dof, ue2dof, at=at)
+
+        self._group_chunks(group).map(self.space, fill, workers=self.workers)
+
     def _scalar_assembly(self):
         self.check_space()
         space = self._spaces
-        batch_size = self.batch_size
         ugdof = space[0].number_of_global_dofs()
         vgdof = space[1].number_of_global_dofs() if (len(space) > 1) else ugdof
-        init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (vgdof, ugdof)
 
-        M = COOTensor(
-            indices = bm.empty((2, 0), dtype=space[0].itype, device=bm.get_device(space[0])),
-            values = bm.empty(init_value_shape, dtype=space[0].ftype, device=bm.get_device(space[0])),
-            spshape = sparse_shape
+        return self._local_builder(sparse_shape).tocoo()
+
+    def _pattern_assembly(self) -> CSRTensor:
+        self.check_space()
+        space = self._spaces
+        ugdof = space[0].number_of_global_dofs()
+        vgdof = space[1].number_of_global_dofs() if (len(space) > 1) else ugdof
+        sparse_shape = (vgdof, ugdof)
+        transposed = getattr(self, '_transposed', False)
+        if transposed:
+            sparse_shape = (ugdof, vgdof)
+
+        if self._pattern is None:
+            M = self._local_builder(sparse_shape, transposed=transposed).tocoo()
+            self._pattern = CSRPattern(M.indices(), sparse_shape)
+            logger.info(f"Sparsity pattern built with {self._pattern.nnz} non-zeros.")
+            return self._pattern.scatter(M.values())
+
+        pattern = self._pattern
+        dense_shape = () if (self.batch_size == 0) else (self.batch_size,)
+        ctx = dict(dtype=space[0].ftype, device=bm.get_device(space[0]))
+        values = pattern.zeros(dense_shape, **ctx)
+        start = 0
+
+        for group_tensor, _ in self.assembly_local_iterative():
+            if transposed:
+                group_tensor = bm.swapaxes(group_tensor, -1, -2)
+            local_shape = group_tensor.shape[-3:]
+            size = local_shape[0] * local_shape[1] * local_shape[2]
+            if start + size > pattern.ntriplets:
+                raise RuntimeError("Local matrices do not match the kept sparsity pattern. "
+                                   "Call clear_pattern() if the mesh or spaces have changed.")
+            local_values = bm.reshape(group_tensor, group_tensor.shape[:-3] + (size,))
+            values = pattern.scatter_add(values, local_values, start)
+            start += size
+
+        if start != pattern.ntriplets:
+            raise RuntimeError("Local matrices do not match the kept sparsity pattern. "
+                               "Call clear_pattern() if the mesh or spaces have changed.")
+
+        return CSRTensor(pattern.crow(), pattern.col(), values, sparse_shape)
+
+    def _stream_assembly(self) -> CSRTensor:
+        self.check_space()
+        space = self._spaces
+        ugdof = space[0].number_of_global_dofs()
+        vgdof = space[1].number_of_global_dofs() if (len(space) > 1) else ugdof
+        sparse_shape = (vgdof, ugdof)
+        transposed = getattr(self, '_transposed', False)
+        if transposed:
+            sparse_shape = (ugdof, vgdof)
+
+        builder = CSRBuilder(
+            sparse_shape,
+            dense_shape = () if (self.batch_size == 0) else (self.batch_size,),
+            itype = space[0].itype,
+            ftype = space[0].ftype,
+            device = bm.get_device(space[0]),
+            mmap_dir = self._mmap_dir
         )
-        # for group in self.integrators.keys():
-            # group_tensor, e2dofs = self._assembly_group(group, retain_ints)
+
+        # Pass 1: the CSR structure from the entity-to-dof maps.
+        for group, integrator in self.integrators.items():
+            etg = integrator.to_global_dof(self.space)
+            if not isinstance(etg, (tuple, list)):
+                etg = (etg, )
+            ue2dof = etg[0]
+            ve2dof = etg[1] if (len(etg) > 1) else ue2dof
+            NE = ue2dof.shape[0]
+            chunk_size = self.chunk_sizes[group]
+            chunk_size = NE if (chunk_size <= 0) else chunk_size
+
+            for start in range(0, NE, chunk_size):
+                ue, ve = ue2dof[start:start+chunk_size], ve2dof[start:start+chunk_size]
+                if transposed:
+                    builder.add_local_pattern(ue, ve)
+                else:
+                    builder.add_local_pattern(ve, ue)
+
+        builder.finalize()
+        logger.info(f"Streaming CSR structure built with {builder.nnz} non-zeros.")
+
+        # Pass 2: sum the local matrices chunk by chunk.
         for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
             ue2dof = e2dofs_tuple[0]
             ve2dof = e2dofs_tuple[1] if (len(e2dofs_tuple) > 1) else ue2dof
-            local_shape = group_tensor.shape[-3:] # (NC, vldof, uldof)
-
-            if (batch_size > 0) and (group_tensor.ndim == 3): # Case: no batch dimension
-                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
-            I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
-            J = bm.broadcast_to(ue2dof[:, None, :], local_shape)
-            indices = bm.stack([I.ravel(), J.ravel()], axis=0)
-            group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-            M = M.add(COOTensor(indices, group_tensor, sparse_shape))
+            if transposed:
+                builder.add_local(bm.swapaxes(group_tensor, -1, -2), ue2dof, ve2dof)
+            else:
+                builder.add_local(group_tensor, ve2dof, ue2dof)
 
-        return M
+        return builder.tocsr()
 
     @overload
     def assembly(self) -> CSRTensor: ...
@@ -87,9 +266,25 @@ class BilinearForm(Form[LinearInt]):
             format (str, optional): Layout of the output ('csr' | 'coo'). Defaults to 'csr'.\n
             retain_ints (bool, optional): Whether to retain the integrator cache.csr
 
+        Note:
+            Use `keep_pattern()` to reuse the CSR structure in repeated assemblies,
+            and `streaming()` to assemble large matrices with less memory.
+
         Returns:
             global_matrix (CSRTensor | COOTensor): Global sparse matrix shaped ([batch, ]gdof, gdof).
         """
+        if self._streaming or self._keep_pattern:
+            M = self._stream_assembly() if self._streaming else self._pattern_assembly()
+            if format == 'csr':
+                self._M = M
+            elif format == 'coo':
+                self._M = M.tocoo()
+                self._M.is_coalesced = True
+            else:
+                raise ValueError(f"Unsupported format {format}.")
+            logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
+            return self._M
+
         M = self._scalar_assembly()
         if getattr(self, '_transposed', False):
             M = M.T
@@ -121,6 +316,8 @@ class BilinearForm(Form[LinearInt]):
         transposed = self.copy()
         transposed._transposed = True
         transposed._M = self._M
+        # The memory-mapped files are not shared with the transposed form.
+        transposed._streaming = self._streaming
         return transposed
 
     def __matmul__(self, u: TensorLike):
@@ -149,6 +346,20 @@ class BilinearForm(Form[LinearInt]):
         gu_subs = 'bcj' if (u.ndim >= 2) else 'cj'
 
         for group in self.integrators.keys():
+            compact = self._congruent_group(group)
+            if compact is not None:
+                # Apply the reference local matrix without expanding it to cells.
+                reference, scale, e2dofs = compact
+                ue2dof = e2dofs[0]
+                ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
+                gu = u[..., ue2dof] # (..., NC, uldof)
+                gv = bm.einsum('ij, ...cj -> ...ci', reference, gu)
+                if scale is not None:
+                    gv = gv * scale[..., None]
+                gv = bm.broadcast_to(gv, shape[:-1] + gv.shape[-2:])
+                v = bm.index_add(v, ve2dof.reshape(-1), gv.reshape(gv_reshape))
+                continue
+
             group_tensor, e2dofs = self._assembly_group(group, True)
             ue2dof = e2dofs[0]
             ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
@@ -3,9 +3,8 @@ from typing import List
 from .. import logger
 from ..typing import Size, TensorLike
 from ..backend import backend_manager as bm
-from ..sparse import COOTensor, CSRTensor
+from ..sparse import COOTensor, CSRTensor, COOBuilder
 from .form import Form
-from ..sparse import COOTensor, CSRTensor
 
 class BlockForm(Form):
     _M = None
@@ -36,25 +35,28 @@ class BlockForm(Form):
         row_offset = bm.concatenate((bm.array([0]),row_offset))
         col_offset = bm.concatenate((bm.array([0]),col_offset))
          
-        for j in range(self.ncols):
-            block = self.blocks[0][j]
-            if block is not None:
-                indices = bm.empty((2, 0), dtype=block.space.mesh.itype)
-                values = bm.empty((0,), dtype=block.space.mesh.ftype)
-                break
         sparse_shape = self.shape
-        
+        block_matrices = []
+        nnz = 0
+
         for i in range(self.nrows):
             for j in range(self.ncols):
                 block = self.blocks[i][j]
                 if block is None:
                     continue
                 block_matrix = block.assembly(format='coo')
-                block_indices = block_matrix.indices() + bm.array([[row_offset[i]], [col_offset[j]]])
-                block_values = block_matrix.values() 
-                indices = bm.concatenate((indices, block_indices), axis=1)
-                values = bm.concatenate((values, block_values))
-        M = COOTensor(indices, values, sparse_shape) 
+                block_matrices.append((i, j, block_matrix))
+                nnz += block_matrix.nnz
+
+        fmatrix = block_matrices[0][2]
+        builder = COOBuilder(sparse_shape, nnz,
+                             itype=fmatrix.itype, ftype=fmatrix.ftype,
+                             device=bm.get_device(fmatrix.indices()))
+
+        for i, j, block_matrix in block_matrices:
+            offset = bm.array([[row_offset[i]], [col_offset[j]]], dtype=fmatrix.itype)
+            builder.add(block_matrix.indices() + offset, block_matrix.values())
+        M = builder.tocoo()
         if format == 'csr':
             self._M = M.coalesce().tocsr()
         elif format == 'coo':
@@ -63,6 +65,18 @@ class BlockForm(Form):
             raise ValueError(f"Unknown format {format}.")
         logger.info(f"Block form matrix constructed, with shape {list(self._M.shape)}.")
         return self._M
+
+    def assembly_blocks(self, format='csr') -> List[List]:
+        """Assemble every block on its own, without the monolithic matrix.
+
+        Parameters:
+            format (str, optional): 'csr' or 'coo'. Defaults to 'csr'.
+
+        Returns:
+            List[List[SparseTensor | None]]: The block matrices, None for empty blocks.
+        """
+        return [[None if block is None else block.assembly(format=format)
+                 for block in row] for row in self.blocks]
     
     
     def __matmul__(self, u: TensorLike):
@@ -83,7 +97,7 @@ class BlockForm(Form):
                 if block is None:
                     continue
                 v = bm.index_add(v, bm.arange(row_offset[i],row_offset[i+1]), 
-                                 block @ u[row_offset[j]:row_offset[j+1]] )
+                                 block @ u[col_offset[j]:col_offset[j+1]] )
                 #v[row_offset[i]:row_offset[i+1]] += block @ u[row_offset[j]:row_offset[j+1]] 
         return v
 
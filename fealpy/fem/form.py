@@ -1,5 +1,6 @@
 
-from typing import Sequence, overload, Iterable, Dict, Tuple, Optional, Union, TypeVar, Generic
+from typing import Sequence, overload, Iterable, Dict, Tuple, List, Optional, Union, TypeVar, Generic, Callable
+from concurrent.futures import ThreadPoolExecutor
 
 from ..typing import TensorLike, Size, Index
 from ..backend import backend_manager as bm
@@ -18,15 +19,23 @@ class Form(Generic[_I], ABC):
     integrators: Dict[str, _I]
     chunk_sizes: Dict[str, int]
     batch_size: int
+    workers: int
     sparse_shape: Tuple[int, ...]
 
     @overload
-    def __init__(self, space: _FS, /, *, batch_size: int=0): ...
+    def __init__(self, space: _FS, /, *, batch_size: int=0, workers: int=0): ...
     @overload
-    def __init__(self, space: Tuple[_FS, ...], /, *, batch_size: int=0): ...
+    def __init__(self, space: Tuple[_FS, ...], /, *, batch_size: int=0, workers: int=0): ...
     @overload
-    def __init__(self, *space: _FS, batch_size: int=0): ...
-    def __init__(self, *space, batch_size: int=0):
+    def __init__(self, *space: _FS, batch_size: int=0, workers: int=0): ...
+    def __init__(self, *space, batch_size: int=0, workers: int=0):
+        """
+        Parameters:
+            *space (FunctionSpace): The function space(s) of the form.
+            batch_size (int, optional): Size of the batch dimension. Defaults to 0.
+            workers (int, optional): Number of threads evaluating the chunks of
+                integrators added with `chunk_size`. Defaults to 0, evaluating serially.
+        """
         if len(space) == 0:
             raise ValueError("No space is given.")
         if isinstance(space[0], Sequence):
@@ -36,12 +45,13 @@ class Form(Generic[_I], ABC):
         self.chunk_sizes = {}
         self._cursor = 0
         self.batch_size = batch_size
+        self.workers = workers
 
         self._values_ravel_shape = (-1,) if self.batch_size == 0 else (self.batch_size, -1)
         self.sparse_shape = self._get_sparse_shape()
 
     def copy(self):
-        new_obj = self.__class__(self._spaces, batch_size=self.batch_size)
+        new_obj = self.__class__(self._spaces, batch_size=self.batch_size, workers=self.workers)
         new_obj.integrators.update(self.integrators)
         new_obj.chunk_sizes.update(self.chunk_sizes)
         new_obj._values_ravel_shape = self._values_ravel_shape
@@ -133,17 +143,74 @@ class Form(Generic[_I], ABC):
             etg = (etg, )
         return integrator(self.space), etg
 
+    def _congruent_group(self, group: str, /):
+        """Return the reference local tensor, the scale of entities and the
+        to_global_dof tuple if the entities of the group are congruent,
+        otherwise None. See `Integrator.reference_assembly`."""
+        integrator = self.integrators[group]
+        if not integrator.is_congruent(self.space):
+            return None
+        reference, scale = integrator.reference_assembly(self.space)
+        etg = integrator.to_global_dof(self.space)
+        if not isinstance(etg, (tuple, list)):
+            etg = (etg, )
+        return reference, scale, etg
+
+    def _group_size(self, group: str, /) -> int:
+        """Number of entities integrated by the group."""
+        integrator = self.integrators[group]
+        region = integrator._region
+        if bm.is_tensor(region):
+            return region.shape[0]
+        etg = integrator.to_global_dof(self.space)
+        if isinstance(etg, (tuple, list)):
+            etg = etg[0]
+        return etg.shape[0]
+
+    def _group_chunks(self, group: str, /) -> 'IntegralIter':
+        chunk_size = self.chunk_sizes[group]
+        return IntegralIter.split(self.integrators[group], chunk_size, self._group_size(group))
+
+    def is_parallel(self, group: str, /) -> bool:
+        """Whether the chunks of the group are evaluated on a thread pool.
+
+        This requires `workers > 1`, a positive chunk size, and the numpy backend.
+        Other backends run the chunks serially: pytorch parallelizes its kernels
+        internally and its functional transforms are not thread-safe, while jax
+        can not write the results in place."""
+        return (self.workers > 1) and (self.chunk_sizes[group] > 0) \
+            and (bm.backend_name == 'numpy') \
+            and (not self.integrators[group].is_congruent(self.space))
+
+    def assembly_local_group(self, group: str, /):
+        """Assembly local matrix of one group considering chunk size.
+        Yields local matrix and to_global_dof tuple."""
+        chunk_size = self.chunk_sizes[group]
+        compact = self._congruent_group(group)
+        if compact is not None:
+            logger.debug(f"(ASSEMBLY LOCAL CONGRUENT) {group}")
+            reference, scale, etg = compact
+            NC = etg[0].shape[0]
+            step = NC if (chunk_size <= 0) else chunk_size
+            for start in range(0, NC, step):
+                stop = min(start + step, NC)
+                chunk_etg = tuple(e[start:stop] for e in etg)
+                if scale is None:
+                    yield bm.broadcast_to(reference, (stop - start,) + reference.shape), chunk_etg
+                else:
+                    yield scale[..., start:stop, None, None] * reference, chunk_etg
+        elif chunk_size == 0:
+            logger.debug(f"(ASSEMBLY LOCAL FULL) {group}")
+            yield self._assembly_group(group)
+        else:
+            logger.debug(f"(ASSEMBLY LOCAL ITER) {group}, {chunk_size} chunks")
+            yield from self._group_chunks(group)(self.space)
+
     def assembly_local_iterative(self):
         """Assembly local matrix considering chunk size.
         Yields local matrix and to_global_dof tuple."""
-        for key, int_ in self.integrators.items():
-            chunk_size = self.chunk_sizes[key]
-            if chunk_size == 0:
-                logger.debug(f"(ASSEMBLY LOCAL FULL) {key}")
-                yield self._assembly_group(key)
-            else:
-                logger.debug(f"(ASSEMBLY LOCAL ITER) {key}, {chunk_size} chunks")
-                yield from IntegralIter.split(int_, chunk_size)(self.space)
+        for key in self.integrators.keys():
+            yield from self.assembly_local_group(key)
 
 
 # An iteration util for the `_assembly_group` method.
@@ -152,11 +219,22 @@ class IntegralIter():
         self.integrator = integrator
         self.indices_or_segments = indices_or_segments
 
-    def kernel(self, space: Union[_FS, Tuple[_FS, ...]], /, indices: Index):
-        etg = self.integrator.to_global_dof(space, indices=indices)
+    def kernel(self, space: Union[_FS, Tuple[_FS, ...]], /, indices: Index,
+               etg: Optional[Tuple[TensorLike, ...]] = None):
+        if etg is None:
+            etg = self.integrator.to_global_dof(space, indices=indices)
+            if not isinstance(etg, (tuple, list)):
+                etg = (etg, )
+        else: # Slice the to_global_dof of all entities
+            etg = tuple(e[indices] for e in etg)
+        return self.integrator(space, indices=indices), etg
+
+    def global_dof(self, space: Union[_FS, Tuple[_FS, ...]], /) -> Tuple[TensorLike, ...]:
+        """to_global_dof of all entities, fetched once and sliced for the chunks."""
+        etg = self.integrator.to_global_dof(space)
         if not isinstance(etg, (tuple, list)):
             etg = (etg, )
-        return self.integrator(space, indices=indices), etg
+        return etg
 
     def __call__(self, spaces: Tuple[_FS, ...]):
         if isinstance(self.indices_or_segments, TensorLike):
@@ -171,20 +249,55 @@ class IntegralIter():
             yield self.kernel(spaces, index)
 
     def _call_impl_segments(self, spaces: Tuple[_FS, ...], /, segments: TensorLike):
-        assert segments.ndim == 1
-        start = 0
-        stop = 0
-        length = segments.shape[0] + 1
+        slices = self.slices()
+        length = len(slices)
+        etg = self.global_dof(spaces)
 
-        for i in range(length):
+        for i, slicing in enumerate(slices):
             logger.debug(f"(ITERATION) {i}/{length}")
-            stop = segments[i] if (i + 1 < length) else None
-            slicing = slice(start, stop, 1)
-            yield self.kernel(spaces, slicing)
-            start = stop
+            yield self.kernel(spaces, slicing, etg)
+
+    def slices(self) -> List[slice]:
+        """Slices of entities in each chunk split by the segments."""
+        segments = self.indices_or_segments
+        assert segments.ndim == 1
+        bounds = [0] + [int(s) for s in segments] + [None]
+        return [slice(bounds[i], bounds[i+1], 1) for i in range(len(bounds) - 1)]
+
+    def map(self, spaces: Tuple[_FS, ...], func: Callable[[Index, TensorLike, Tuple], None], /,
+            workers: int=1) -> None:
+        """Evaluate the chunks on a thread pool and pass the results to `func`.
+
+        The `func` is called in the worker threads as `func(indices, local_tensor, etg)`
+        for every chunk, so that each chunk can be written into its own place
+        without keeping all local tensors. Exceptions are raised in the caller.
+
+        Parameters:
+            spaces (FunctionSpace | Tuple[FunctionSpace, ...]): Spaces of the form.
+            func (Callable): Consumer of the results of each chunk.
+            workers (int, optional): Number of threads. Defaults to 1.
+        """
+        if isinstance(self.indices_or_segments, TensorLike):
+            chunks = self.slices()
+            etg = self.global_dof(spaces)
+        else:
+            chunks = list(self.indices_or_segments)
+            etg = None
+
+        def task(indices):
+            func(indices, *self.kernel(spaces, indices, etg))
+
+        # The backend setting is thread-local.
+        with ThreadPoolExecutor(max_workers=workers, initializer=bm.set_backend,
+                                initargs=(bm.backend_name,)) as pool:
+            for _ in pool.map(task, chunks):
+                pass
 
     @classmethod
-    def split(cls, integrator: Integrator, /, chunk_size=0):
-        size = integrator.get_region().shape[0]
+    def split(cls, integrator: Integrator, /, chunk_size=0, size: Optional[int]=None):
+        """Split the entities into chunks of `chunk_size`.
+        The number of entities is taken from the region if `size` is None."""
+        if size is None:
+            size = integrator.get_region().shape[0]
         segments = bm.arange(chunk_size, size, chunk_size)
         return cls(integrator, segments)
@@ -1,5 +1,5 @@
 
-from typing import Union, Optional, Any, TypeVar, Tuple, List, Dict
+from typing import Union, Optional, Any, TypeVar, Tuple, List, Dict, Callable
 from typing import Generic
 import logging
 
@@ -190,6 +190,31 @@ class Integrator(metaclass=IntegratorMeta):
                 return self._region
     ### END: Region of Integration ###
 
+    ### START: Congruent Entities ###
+    def is_congruent(self, space: _SpaceGroup, /) -> bool:
+        """Whether the local tensors of all entities are scaled copies of one
+        reference tensor, see `reference_assembly`. Defaults to False."""
+        return False
+
+    def reference_assembly(self, space: _SpaceGroup, /) -> Tuple[TensorLike, Optional[TensorLike]]:
+        """Return the compact form of the local tensors for congruent entities.
+
+        Returns:
+            Tuple[Tensor, Tensor | None]: The reference local tensor shaped (ldof, ldof),
+                and the scale of each entity shaped ([batch, ]NC) or None for all ones.
+                The local tensor of entity c is `scale[..., c] * reference`.
+        """
+        raise NotImplementedError
+    ### END: Congruent Entities ###
+
+    ### START: Matrix-free Application ###
+    def local_operator(self, space: _SpaceGroup, /) -> Optional[Callable[[TensorLike], TensorLike]]:
+        """Return a function applying the local tensors to local vectors
+        shaped (NC, ldof, K) without forming the tensors, e.g. by sum factorization.
+        Returns None if not supported, which is the default."""
+        return None
+    ### END: Matrix-free Application ###
+
     def const(self, space: _SpaceGroup, /):
         value = self.assembly(space)
         to_gdof = self.to_global_dof(space)
@@ -272,6 +297,52 @@ class EdgeInt(Integrator):
 ### Integral Utils
 ##################################################
 
+def is_congruent_mesh(mesh: Any) -> bool:
+    """Whether all cells of the mesh are congruent, e.g. uniform structured meshes."""
+    from ..mesh import UniformMesh2d, UniformMesh3d
+    return isinstance(mesh, (UniformMesh2d, UniformMesh3d))
+
+
+def is_cellwise_coef(coef: Optional[CoefLike], batched: bool=False) -> bool:
+    """Whether the coefficient is constant in each cell, i.e. None, a number,
+    or a tensor shaped ([batch, ]NC)."""
+    if coef is None:
+        return not batched
+    if isinstance(coef, (int, float)):
+        return not batched
+    if isinstance(coef, TensorLike):
+        return coef.ndim == 1 + int(batched) or ((not batched) and coef.ndim == 0)
+    return False
+
+
+def cellwise_scale(reference: TensorLike, coef: Optional[CoefLike]):
+    """Split a cell-wise coefficient into the reference tensor and the scale of cells."""
+    if coef is None:
+        return reference, None
+    if isinstance(coef, (int, float)) or coef.ndim == 0:
+        return reference * coef, None
+    return reference, coef
+
+
+def select_entities(index: Index, indices: Index, number: int, device=None) -> TensorLike:
+    """Global indices of the entities at positions `indices` among those
+    selected by `index`, e.g. for evaluating a chunk of entities."""
+    return bm.arange(number, device=device)[index][indices]
+
+
+def first_entity(index: Index, number: int, device=None) -> TensorLike:
+    """Index of the first entity selected by `index`, shaped (1,)."""
+    return select_entities(index, slice(0, 1), number, device)
+
+
+def select_cellwise(coef: Optional[CoefLike], indices: Index, batched: bool=False):
+    """Select the entities at positions `indices` from a coefficient tensor
+    shaped ([batch, ]NC, ...). Numbers, functions and None are returned as they are."""
+    if isinstance(coef, TensorLike) and coef.ndim > int(batched):
+        return coef[(slice(None),) * int(batched) + (indices,)]
+    return coef
+
+
 _GT = TypeVar('_GT')
 
 class ConstIntegrator(Integrator, Generic[_GT]):
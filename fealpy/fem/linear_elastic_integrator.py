@@ -9,7 +9,8 @@ from ..functionspace.tensor_space import TensorFunctionSpace as _TS
 from .integrator import (
     LinearInt, OpInt, CellInt,
     enable_cache,
-    assemblymethod
+    assemblymethod,
+    is_congruent_mesh, first_entity
 )
 from fealpy.fem.utils import SymbolicIntegration
 
@@ -109,6 +110,31 @@ class LinearElasticIntegrator(LinearInt, OpInt, CellInt):
 
         return cm, mesh, glambda_x, bm.asarray(M, dtype=bm.float64)
 
+    @enable_cache
+    def fetch_reference(self, space: _FS):
+        mesh = getattr(space, 'mesh', None)
+        q = space.p+3 if self.q is None else self.q
+        qf = mesh.quadrature_formula(q)
+        bcs, ws = qf.get_quadrature_points_and_weights()
+        index = first_entity(self.index, mesh.number_of_cells(), device=mesh.device)
+        cm = mesh.entity_measure('cell')[index]
+        gphi = space.grad_basis(bcs, index=index, variable='x')
+        return cm, ws, gphi
+
+    def is_congruent(self, space: _TS, /) -> bool:
+        mesh = getattr(space, 'mesh', None)
+        if (self._method not in ('assembly', 'voigt')) or (not is_congruent_mesh(mesh)):
+            return False
+        D = self.material.elastic_matrix()
+        return D.shape[0] == 1 and D.shape[1] == 1
+
+    def reference_assembly(self, space: _TS, /):
+        cm, ws, gphi = self.fetch_reference(space.scalar_space)
+        D = self.material.elastic_matrix()[0, 0]
+        B = self.material.strain_matrix(dof_priority=space.dof_priority, gphi=gphi)
+        KE = bm.einsum('q, c, cqki, kl, cqlj -> ij', ws, cm, B, D, B)
+        return KE, None
+
     def assembly(self, space: _TS) -> TensorLike:
         scalar_space = space.scalar_space
         mesh = getattr(scalar_space, 'mesh', None)
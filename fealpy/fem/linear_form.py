@@ -4,7 +4,7 @@ from typing import overload, Literal, Optional
 from .. import logger
 from ..typing import TensorLike
 from ..backend import backend_manager as bm 
-from ..sparse import COOTensor
+from ..sparse import COOTensor, COOBuilder
 from .form import Form
 from .integrator import LinearInt
 
@@ -33,29 +33,35 @@ class LinearForm(Form[LinearInt]):
         if len(self._spaces) != 1:
             raise ValueError("LinearForm should have only one space.")
 
+    def _local_nnz(self) -> int:
+        """Total number of entries in the local vectors of all groups."""
+        nnz = 0
+        for integrator in self.integrators.values():
+            etg = integrator.to_global_dof(self.space)
+            if isinstance(etg, (tuple, list)):
+                etg = etg[0]
+            nnz += etg.shape[0] * etg.shape[1]
+        return nnz
+
     def _scalar_assembly(self):
         self.check_space()
         space = self._spaces[0]
         batch_size = self.batch_size
         gdof = space.number_of_global_dofs()
-        init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (gdof, )
 
-        M = COOTensor(
-            indices = bm.empty((1, 0), dtype=space.itype, device=bm.get_device(space)),
-            values = bm.empty(init_value_shape, dtype=space.ftype, device=bm.get_device(space)),
-            spshape = sparse_shape
+        builder = COOBuilder(
+            sparse_shape, self._local_nnz(),
+            dense_shape = () if (batch_size == 0) else (batch_size,),
+            itype = space.itype,
+            ftype = space.ftype,
+            device = bm.get_device(space)
         )
 
         for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
-            if (batch_size > 0) and (group_tensor.ndim == 2):
-                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
-
-            indices = e2dofs_tuple[0].reshape(1, -1)
-            group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-            M = M.add(COOTensor(indices, group_tensor, sparse_shape))
+            builder.add_local(group_tensor, e2dofs_tuple[0])
 
-        return M
+        return builder.tocoo()
 
     @overload
     def assembly(self) -> TensorLike: ...
@@ -0,0 +1,237 @@
+from typing import Optional, List, Tuple, Callable, Union
+
+from .. import logger
+from ..typing import TensorLike, Size
+from ..backend import backend_manager as bm
+from .bilinear_form import BilinearForm
+
+# (local tensor, reference tensor or local operator, scale of entities or None, ve2dof, ue2dof)
+_Kernel = Tuple[Union[TensorLike, Callable], Optional[TensorLike], TensorLike, TensorLike]
+
+
+class MatrixFreeOperator():
+    """Linear operator of a bilinear form applied without the global matrix.
+
+    The local tensors of all integrator groups are computed once when the
+    operator is built, and kept resident. For groups of congruent entities
+    (see `Integrator.reference_assembly`), only the reference tensor and the
+    scale of each entity are kept. Integrators providing a `local_operator`
+    (e.g. the 'sumfact' method on quadrangle and hexahedron meshes) keep only
+    the geometric factors on the quadrature points, and apply the local
+    tensors without forming them. Every product then gathers the local DoF
+    values, applies the local tensors by a batched einsum and scatters the
+    results into a preallocated output, so the global CSR is never formed.
+
+    The operator can be passed to `fealpy.solver.cg` in place of the matrix.
+
+    Example:
+    ```
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(q=p+2))
+        A = MatrixFreeOperator(bform)
+        F = bc.apply_vector(F, A, check=False)
+        A.set_dirichlet(bc.is_boundary_dof)
+        uh = cg(A, F)
+    ```
+    """
+    def __init__(self, form: BilinearForm, /):
+        """Build the operator and compute the local tensors.
+
+        Parameters:
+            form (BilinearForm): The bilinear form without batch.
+        """
+        if not isinstance(form, BilinearForm):
+            raise TypeError("MatrixFreeOperator requires a BilinearForm, "
+                            f"but got {type(form).__name__}.")
+        if form.batch_size != 0:
+            raise ValueError("MatrixFreeOperator does not support batched forms.")
+        form.check_space()
+        self.form = form
+        self._transposed = getattr(form, '_transposed', False)
+        self._kernels: List[_Kernel] = []
+        self._is_bd_dof: Optional[TensorLike] = None
+        self._out: Optional[TensorLike] = None
+        self.update()
+
+    @property
+    def shape(self) -> Size:
+        return self.form.sparse_shape
+
+    @property
+    def dtype(self):
+        return self.form._spaces[0].ftype
+
+    def update(self) -> None:
+        """Recompute the local tensors, e.g. after the coefficients are changed."""
+        form = self.form
+        kernels = []
+
+        for group, integrator in form.integrators.items():
+            # Local operators are assumed symmetric, so they are not used
+            # for transposed forms.
+            operator = None if self._transposed else integrator.local_operator(form.space)
+            if operator is not None:
+                etg = integrator.to_global_dof(form.space)
+                if not isinstance(etg, (tuple, list)):
+                    etg = (etg, )
+                ue2dof = etg[0]
+                ve2dof = etg[1] if (len(etg) > 1) else ue2dof
+                kernels.append((operator, None, ve2dof, ue2dof))
+                continue
+
+            compact = form._congruent_group(group)
+            if compact is None:
+                locals_, etgs = [], []
+                for group_tensor, etg in form.assembly_local_group(group):
+                    locals_.append(group_tensor)
+                    etgs.append(etg)
+                local = bm.concat(locals_, axis=0) if len(locals_) > 1 else locals_[0]
+                etg = tuple(bm.concat(es, axis=0) for es in zip(*etgs)) \
+                      if len(etgs) > 1 else etgs[0]
+                scale = None
+            else:
+                local, scale, etg = compact
+
+            ue2dof = etg[0]
+            ve2dof = etg[1] if (len(etg) > 1) else ue2dof
+            if self._transposed:
+                local = bm.swapaxes(local, -1, -2)
+                ue2dof, ve2dof = ve2dof, ue2dof
+            kernels.append((local, scale, ve2dof, ue2dof))
+
+        self._kernels = kernels
+        logger.info(f"MatrixFreeOperator built with {len(kernels)} groups.")
+
+    def set_dirichlet(self, is_bd_dof: Optional[TensorLike]=None, /):
+        """Make the operator act as the identity on the Dirichlet DoFs.
+
+        This is the matrix-free counterpart of `DirichletBC.apply_matrix`:
+        the rows and columns of the fixed DoFs are removed and a unit diagonal
+        is put on them. Apply `DirichletBC.apply_vector` to the right-hand side
+        before setting the boundary, as it needs the original operator.
+
+        Parameters:
+            is_bd_dof (Tensor | None, optional): Boolean flags of the fixed DoFs
+                shaped (gdof,). Defaults to None, removing the boundary condition.
+        """
+        if is_bd_dof is not None:
+            if self.shape[0] != self.shape[1]:
+                raise ValueError("Dirichlet boundary condition requires a square operator.")
+            if is_bd_dof.shape != (self.shape[0],):
+                raise ValueError(f"is_bd_dof should be shaped ({self.shape[0]},), "
+                                 f"but got {tuple(is_bd_dof.shape)}.")
+        self._is_bd_dof = is_bd_dof
+        return self
+
+    def _buffer(self, shape: Size, like: TensorLike) -> TensorLike:
+        """Zeroed output reused between products of the same shape."""
+        out = self._out
+        if (out is None) or (out.shape != shape) or (out.dtype != like.dtype):
+            out = bm.zeros(shape, **bm.context(like))
+            self._out = out
+        else:
+            out = bm.set_at(out, (...,), 0)
+        return out
+
+    def mult(self, x: TensorLike, out: Optional[TensorLike]=None) -> TensorLike:
+        """Matrix-vector multiplication.
+
+        Parameters:
+            x (Tensor): Vector shaped (ncol,), or multiple vectors shaped (ncol, k).
+            out (Tensor | None, optional): Output to be overwritten, shaped (nrow,)
+                or (nrow, k). Defaults to None, writing into a buffer kept by the
+                operator, which is overwritten by the next call of `mult`.
+
+        Returns:
+            Tensor: The product A @ x.
+        """
+        nrow, ncol = self.shape
+        if x.ndim not in (1, 2) or x.shape[0] != ncol:
+            raise ValueError(f"x should be shaped ({ncol},) or ({ncol}, k), "
+                             f"but got {tuple(x.shape)}.")
+        out_shape = (nrow,) + tuple(x.shape[1:])
+        if out is None:
+            out = self._buffer(out_shape, x)
+        else:
+            if tuple(out.shape) != out_shape:
+                raise ValueError(f"out should be shaped {out_shape}, "
+                                 f"but got {tuple(out.shape)}.")
+            out = bm.set_at(out, (...,), 0)
+
+        is_bd_dof = self._is_bd_dof
+        if is_bd_dof is not None:
+            x_bd = x[is_bd_dof]
+            x = bm.set_at(bm.copy(x), is_bd_dof, 0)
+
+        suffix = '' if (x.ndim == 1) else 'k'
+        for local, scale, ve2dof, ue2dof in self._kernels:
+            gu = x[ue2dof] # (NC, uldof[, k])
+            if callable(local):
+                gv = local(gu if (x.ndim == 2) else gu[..., None])
+                if x.ndim == 1:
+                    gv = gv[..., 0]
+            elif local.ndim == 2:
+                gv = bm.einsum(f'ij, cj{suffix} -> ci{suffix}', local, gu)
+                if scale is not None:
+                    gv = gv * bm.reshape(scale, scale.shape + (1,) * (gv.ndim - 1))
+            else:
+                gv = bm.einsum(f'cij, cj{suffix} -> ci{suffix}', local, gu)
+            gv = bm.reshape(gv, (-1,) + tuple(x.shape[1:]))
+            out = bm.index_add(out, bm.reshape(ve2dof, (-1,)), gv)
+
+        if is_bd_dof is not None:
+            out = bm.set_at(out, is_bd_dof, x_bd)
+
+        return out
+
+    def matmul(self, x: TensorLike, /) -> TensorLike:
+        """Return A @ x as a new tensor."""
+        nrow = self.shape[0]
+        out = bm.zeros((nrow,) + tuple(x.shape[1:]), **bm.context(x))
+        return self.mult(x, out)
+
+    __matmul__ = matmul
+
+    @staticmethod
+    def _probe_diagonal(operator: Callable, e2dof: TensorLike, dtype, block: int=8) -> TensorLike:
+        """Diagonal of the local matrices of a local operator, shaped (NC, ldof),
+        found by applying it to blocks of unit vectors."""
+        NC, ldof = e2dof.shape
+        eye = bm.eye(ldof, dtype=dtype, device=bm.get_device(e2dof))
+        diag = []
+        for start in range(0, ldof, block):
+            cols = eye[:, start:start+block]
+            val = operator(bm.broadcast_to(cols[None, ...], (NC,) + tuple(cols.shape)))
+            diag.append(bm.einsum('cii -> ci', val[:, start:start+block, :]))
+        return bm.concat(diag, axis=-1)
+
+    def diagonal(self) -> TensorLike:
+        """Diagonal of the operator, e.g. for the Jacobi preconditioner.
+
+        Returns:
+            Tensor: The diagonal shaped (gdof,).
+        """
+        if self.shape[0] != self.shape[1]:
+            raise ValueError("Diagonal requires a square operator.")
+        space = self.form._spaces[0]
+        diag = bm.zeros((self.shape[0],), dtype=space.ftype, device=bm.get_device(space))
+
+        for local, scale, ve2dof, ue2dof in self._kernels:
+            # Local entries on the global diagonal, where the row DoF and
+            # the column DoF are the same.
+            if callable(local): # the row and column DoFs are the same
+                ldiag = self._probe_diagonal(local, ue2dof, space.ftype)
+                diag = bm.index_add(diag, bm.reshape(ve2dof, (-1,)), bm.reshape(ldiag, (-1,)))
+                continue
+            on_diag = (ve2dof[:, :, None] == ue2dof[:, None, :])
+            if local.ndim == 2:
+                local = local[None, ...]
+            ldiag = bm.sum(bm.where(on_diag, local, 0), axis=-1)
+            if scale is not None:
+                ldiag = ldiag * scale[:, None]
+            diag = bm.index_add(diag, bm.reshape(ve2dof, (-1,)), bm.reshape(ldiag, (-1,)))
+
+        if self._is_bd_dof is not None:
+            diag = bm.set_at(diag, self._is_bd_dof, 1)
+
+        return diag
@@ -3,7 +3,7 @@ from typing import Optional
 from .. import logger
 from ..typing import TensorLike
 from ..backend import backend_manager as bm
-from ..sparse import COOTensor
+from ..sparse import COOTensor, COOBuilder
 from .form import Form
 from .integrator import NonlinearInt, OpInt, SrcInt
 from .nonlinear_wrapper import NonlinearWrapperInt
@@ -79,13 +79,21 @@ class NonlinearForm(Form[NonlinearInt]):
         space = self._spaces
         ugdof = space[0].number_of_global_dofs()
         vgdof = space[1].number_of_global_dofs() if (len(space) > 1) else ugdof
-        init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (vgdof, ugdof)
 
-        M = COOTensor(
-            indices = bm.empty((2, 0), dtype=space[0].itype),
-            values = bm.empty(init_value_shape, dtype=space[0].ftype),
-            spshape = sparse_shape
+        nnz = 0
+        for group in self.integrators.keys():
+            if isinstance(self.integrators[group][0], OpInt):
+                e2dofs = [self.integrators[group][0].to_global_dof(s) for s in space]
+                ue2dof = e2dofs[0]
+                ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
+                nnz += ve2dof.shape[0] * ve2dof.shape[1] * ue2dof.shape[1]
+
+        builder = COOBuilder(
+            sparse_shape, nnz,
+            dense_shape = () if (batch_size == 0) else (batch_size,),
+            itype = space[0].itype,
+            ftype = space[0].ftype
         )
 
         for group in self.integrators.keys():
@@ -93,28 +101,26 @@ class NonlinearForm(Form[NonlinearInt]):
                 group_tensor, e2dofs = self._assembly_group(group, retain_ints)[0]
                 ue2dof = e2dofs[0]
                 ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
-                local_shape = group_tensor.shape[-3:] # (NC, vldof, uldof)
+                builder.add_local(group_tensor, ve2dof, ue2dof)
 
-                if (batch_size > 0) and (group_tensor.ndim == 3): # Case: no batch dimension
-                    group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
-                J = bm.broadcast_to(ue2dof[:, None, :], local_shape)
-                I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
-                indices = bm.stack([I.ravel(), J.ravel()], axis=0)
-                group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-                M = M.add(COOTensor(indices, group_tensor, sparse_shape))
-        return M
+        return builder.tocoo()
 
     def _scalar_assembly_F(self, retain_ints: bool, batch_size: int):
 
         space = self._spaces[0]
         gdof = space.number_of_global_dofs()
-        init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (gdof, )
 
-        M = COOTensor(
-            indices = bm.empty((1, 0), dtype=space.itype),
-            values = bm.empty(init_value_shape, dtype=space.ftype),
-            spshape = sparse_shape
+        nnz = 0
+        for group in self.integrators.keys():
+            e2dof = self.integrators[group][0].to_global_dof(space)
+            nnz += e2dof.shape[0] * e2dof.shape[1]
+
+        builder = COOBuilder(
+            sparse_shape, nnz,
+            dense_shape = () if (batch_size == 0) else (batch_size,),
+            itype = space.itype,
+            ftype = space.ftype
         )
 
         for group in self.integrators.keys():
@@ -123,14 +129,9 @@ class NonlinearForm(Form[NonlinearInt]):
             else:
                 group_tensor, e2dofs = self._assembly_group(group, retain_ints)[1]
 
-            if (batch_size > 0) and (group_tensor.ndim == 2):
-                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
-
-            indices = e2dofs[0].reshape(1, -1)
-            group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-            M = M.add(COOTensor(indices, group_tensor, sparse_shape))
+            builder.add_local(group_tensor, e2dofs[0])
 
-        return M
+        return builder.tocoo()
 
     def assembly(self, *, return_dense=True, coalesce=True, format='csr',retain_ints: bool=False) -> COOTensor:
 
@@ -33,7 +33,8 @@ class PressWorkIntegrator(LinearInt, OpInt, CellInt):
 
     @enable_cache
     def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+        return (space[0].cell_to_dof()[self.index],
+                space[1].cell_to_dof()[self.index])
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -49,7 +50,7 @@ class PressWorkIntegrator(LinearInt, OpInt, CellInt):
                                "not a subclass of HomoMesh.")
 
         cm = mesh.entity_measure('cell', index=index)
-        q = space.p+3 if self.q is None else self.q
+        q = space1.p+3 if self.q is None else self.q
         qf = mesh.quadrature_formula(q, 'cell')
         bcs, ws = qf.get_quadrature_points_and_weights()
 
@@ -83,7 +84,8 @@ class PressWorkIntegratorX(LinearInt, OpInt, CellInt):
 
     @enable_cache
     def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+        return (space[0].cell_to_dof()[self.index],
+                space[1].cell_to_dof()[self.index])
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -98,7 +100,7 @@ class PressWorkIntegratorX(LinearInt, OpInt, CellInt):
                                "not a subclass of HomoMesh.")
 
         cm = mesh.entity_measure('cell', index=index)
-        q = space.p+3 if self.q is None else self.q
+        q = space1.p+3 if self.q is None else self.q
         qf = mesh.quadrature_formula(q, 'cell')
         bcs, ws = qf.get_quadrature_points_and_weights()
         phi = space0.basis(bcs, index=index)
@@ -127,7 +129,8 @@ class PressWorkIntegratorY(LinearInt, OpInt, CellInt):
 
     @enable_cache
     def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+        return (space[0].cell_to_dof()[self.index],
+                space[1].cell_to_dof()[self.index])
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -142,7 +145,7 @@ class PressWorkIntegratorY(LinearInt, OpInt, CellInt):
                                "not a subclass of HomoMesh.")
 
         cm = mesh.entity_measure('cell', index=index)
-        q = space.p+3 if self.q is None else self.q
+        q = space1.p+3 if self.q is None else self.q
         qf = mesh.quadrature_formula(q, 'cell')
         bcs, ws = qf.get_quadrature_points_and_weights()
 
@@ -11,7 +11,13 @@ from .integrator import (
     LinearInt, OpInt, CellInt,
     enable_cache,
     assemblymethod,
-    CoefLike
+    CoefLike,
+    is_congruent_mesh, is_cellwise_coef, cellwise_scale, first_entity,
+    select_entities, select_cellwise
+)
+from .sum_factorization import (
+    is_tensor_product_space, tensor_basis_1d, tensor_geometry,
+    diffusion_factor, sumfact_stiffness_matrix, sumfact_stiffness_apply
 )
 
 
@@ -20,7 +26,7 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
     def __init__(self, coef: Optional[CoefLike] = None, q: Optional[int] = None, *,
                  index: Index = _S,
                  batched: bool = False,
-                 method: Literal['fast', 'nonlinear', 'isopara', None] = None) -> None:
+                 method: Literal['fast', 'nonlinear', 'isopara', 'sumfact', None] = None) -> None:
         super().__init__(method=method if method else 'assembly')
         self.coef = coef
         self.q = q
@@ -28,8 +34,9 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
         self.batched = batched
 
     @enable_cache
-    def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+    def to_global_dof(self, space: _FS, /, indices=None) -> TensorLike:
+        cell2dof = space.cell_to_dof()[self.index]
+        return cell2dof if (indices is None) else cell2dof[indices]
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -57,15 +64,83 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
         bcs = self.fetch(space)[0]
         return space.grad_basis(bcs, index=self.index, variable='u')
 
-    def assembly(self, space: _FS) -> TensorLike:
+    @enable_cache
+    def fetch_reference(self, space: _FS):
+        mesh = getattr(space, 'mesh', None)
+        bcs, ws, _ = self.fetch(space)
+        index = first_entity(self.index, mesh.number_of_cells(), device=mesh.device)
+        cm = mesh.entity_measure('cell')[index]
+        gphi = space.grad_basis(bcs, index=index, variable='x')
+        return bilinear_integral(gphi, gphi, ws, cm)[0]
+
+    def is_congruent(self, space: _FS, /) -> bool:
+        mesh = getattr(space, 'mesh', None)
+        return (self._method == 'assembly') and is_congruent_mesh(mesh) \
+            and is_cellwise_coef(self.coef, self.batched)
+
+    def reference_assembly(self, space: _FS, /):
+        return cellwise_scale(self.fetch_reference(space), self.coef)
+
+    def assembly(self, space: _FS, /, indices=None) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
         bcs, ws, cm = self.fetch(space)
-        coef = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=self.index)
-        gphi = self.fetch_gphix(space)
-        
+
+        if indices is None:
+            index = self.index
+            gphi = self.fetch_gphix(space)
+        else: # a chunk of the cells
+            index = select_entities(self.index, indices, mesh.number_of_cells(), mesh.device)
+            cm = cm[indices]
+            coef = select_cellwise(coef, indices, self.batched)
+            gphi = space.grad_basis(bcs, index=index, variable='x')
+
+        coef = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
+
         return bilinear_integral(gphi, gphi, ws, cm, coef, batched=self.batched)
 
+    @enable_cache
+    def fetch_sumfact(self, space: _FS):
+        if not is_tensor_product_space(space):
+            raise RuntimeError("The 'sumfact' method of ScalarDiffusionIntegrator only "
+                               "supports Lagrange spaces on quadrangle and hexahedron meshes.")
+        mesh = getattr(space, 'mesh', None)
+        bcs, ws, _ = self.fetch(space)
+        phi, dphi = tensor_basis_1d(space.p, bcs[0])
+        detws, Ginv, J = tensor_geometry(mesh, bcs, ws, index=self.index)
+        return bcs, phi, dphi, detws, Ginv, J
+
+    def sumfact_factor(self, space: _FS, /, indices=None):
+        """Geometric and coefficient factor on the quadrature points shaped
+        (NC, NQ, TD, TD), and the 1-D basis values and derivatives."""
+        if self.batched:
+            raise ValueError("The 'sumfact' method does not support batched coef.")
+        coef = self.coef
+        mesh = getattr(space, 'mesh', None)
+        bcs, phi, dphi, detws, Ginv, J = self.fetch_sumfact(space)
+        index = self.index
+
+        if indices is not None: # a chunk of the cells
+            index = select_entities(index, indices, mesh.number_of_cells(), mesh.device)
+            detws, Ginv, J = detws[indices], Ginv[indices], J[indices]
+            coef = select_cellwise(coef, indices, self.batched)
+
+        coef = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
+        return diffusion_factor(detws, Ginv, J, coef), phi, dphi
+
+    @assemblymethod('sumfact')
+    def sumfact_assembly(self, space: _FS, /, indices=None) -> TensorLike:
+        """Sum-factorized assembly on quadrangle and hexahedron meshes,
+        costing O(p^{2d+1}) per cell instead of O(p^{3d})."""
+        factor, phi, dphi = self.sumfact_factor(space, indices)
+        return sumfact_stiffness_matrix(factor, phi, dphi)
+
+    def local_operator(self, space: _FS, /):
+        if self._method != 'sumfact':
+            return None
+        factor, phi, dphi = self.sumfact_factor(space)
+        return lambda u: sumfact_stiffness_apply(factor, phi, dphi, u)
+
     @assemblymethod('fast')
     def fast_assembly(self, space: _FS) -> TensorLike:
         """
@@ -11,7 +11,13 @@ from .integrator import (
     LinearInt, OpInt, CellInt,
     enable_cache,
     assemblymethod,
-    CoefLike
+    CoefLike,
+    is_congruent_mesh, is_cellwise_coef, cellwise_scale, first_entity,
+    select_entities, select_cellwise
+)
+from .sum_factorization import (
+    is_tensor_product_space, tensor_basis_1d, tensor_geometry,
+    mass_factor, sumfact_mass_matrix, sumfact_mass_apply
 )
 
 
@@ -28,8 +34,9 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
         self.batched = batched
 
     @enable_cache
-    def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+    def to_global_dof(self, space: _FS, /, indices=None) -> TensorLike:
+        cell2dof = space.cell_to_dof()[self.index]
+        return cell2dof if (indices is None) else cell2dof[indices]
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -49,14 +56,83 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
         phi = space.basis(bcs, index=index)
         return bcs, ws, phi, cm, index
 
-    def assembly(self, space: _FS) -> TensorLike:
+    @enable_cache
+    def fetch_reference(self, space: _FS):
+        mesh = getattr(space, 'mesh', None)
+        bcs, ws = self.fetch(space)[:2]
+        index = first_entity(self.index, mesh.number_of_cells(), device=mesh.device)
+        cm = mesh.entity_measure('cell')[index]
+        phi = space.basis(bcs, index=index)
+        return bilinear_integral(phi, phi, ws, cm)[0]
+
+    def is_congruent(self, space: _FS, /) -> bool:
+        mesh = getattr(space, 'mesh', None)
+        return (self._method == 'assembly') and is_congruent_mesh(mesh) \
+            and is_cellwise_coef(self.coef, self.batched)
+
+    def reference_assembly(self, space: _FS, /):
+        return cellwise_scale(self.fetch_reference(space), self.coef)
+
+    def assembly(self, space: _FS, /, indices=None) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
         bcs, ws, phi, cm, index = self.fetch(space)
+
+        if indices is not None: # a chunk of the cells
+            index = select_entities(index, indices, mesh.number_of_cells(), mesh.device)
+            cm = cm[indices]
+            coef = select_cellwise(coef, indices, self.batched)
+            phi = space.basis(bcs, index=index)
+
         val = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
 
         return bilinear_integral(phi, phi, ws, cm, val, batched=self.batched)
 
+    @enable_cache
+    def fetch_sumfact(self, space: _FS):
+        if not is_tensor_product_space(space):
+            raise RuntimeError("The 'sumfact' method of ScalarMassIntegrator only "
+                               "supports Lagrange spaces on quadrangle and hexahedron meshes.")
+        mesh = getattr(space, 'mesh', None)
+        q = space.p+3 if self.q is None else self.q
+        qf = mesh.quadrature_formula(q, 'cell')
+        bcs, ws = qf.get_quadrature_points_and_weights()
+        phi, _ = tensor_basis_1d(space.p, bcs[0])
+        detws, _, _ = tensor_geometry(mesh, bcs, ws, index=self.index)
+        return bcs, phi, detws
+
+    def sumfact_factor(self, space: _FS, /, indices=None):
+        """Geometric and coefficient factor on the quadrature points shaped
+        (NC, NQ), and the 1-D basis values."""
+        if self.batched:
+            raise ValueError("The 'sumfact' method does not support batched coef.")
+        coef = self.coef
+        mesh = getattr(space, 'mesh', None)
+        bcs, phi, detws = self.fetch_sumfact(space)
+        index = self.index
+
+        if indices is not None: # a chunk of the cells
+            index = select_entities(index, indices, mesh.number_of_cells(), mesh.device)
+            detws = detws[indices]
+            coef = select_cellwise(coef, indices, self.batched)
+
+        coef = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
+        return mass_factor(detws, coef), phi
+
+    @assemblymethod('sumfact')
+    def sumfact_assembly(self, space: _FS, /, indices=None) -> TensorLike:
+        """Sum-factorized assembly on quadrangle and hexahedron meshes,
+        costing O(p^{2d+1}) per cell instead of O(p^{3d})."""
+        factor, phi = self.sumfact_factor(space, indices)
+        return sumfact_mass_matrix(factor, phi, space.mesh.TD)
+
+    def local_operator(self, space: _FS, /):
+        if self._method != 'sumfact':
+            return None
+        factor, phi = self.sumfact_factor(space)
+        TD = space.mesh.TD
+        return lambda u: sumfact_mass_apply(factor, phi, u, TD)
+
     @assemblymethod('semilinear')
     def semilinear_assembly(self, space: _FS) -> TensorLike:
         uh = self.uh
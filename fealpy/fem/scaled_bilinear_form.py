@@ -0,0 +1,149 @@
+from typing import Optional, List, Tuple
+
+from .. import logger
+from ..typing import TensorLike
+from ..backend import backend_manager as bm
+from ..sparse import CSRTensor, CSRPattern
+from .bilinear_form import BilinearForm
+
+_BaseLocal = Tuple[TensorLike, Optional[TensorLike], TensorLike, TensorLike]
+
+
+class ScaledBilinearForm(BilinearForm):
+    """Bilinear form assembled as K(s) = sum_c s_c K_c with a scale s_c for each cell.
+
+    The base local matrices K_c of the integrators are computed in the first
+    assembly and kept, together with the CSR sparsity pattern. Later assemblies
+    with new scales only do one weighted scatter into the fixed pattern,
+    without calling the integrators again. This fits the density-based
+    topology optimization, where s_c = E(rho_c) changes in every iteration.
+
+    Congruent cells (see `Integrator.reference_assembly`) keep only one
+    reference matrix.
+
+    Example:
+    ```
+        bform = ScaledBilinearForm(space)
+        bform.add_integrator(LinearElasticIntegrator(base_material))
+        K = bform.assembly(E)
+        ce = bform.element_compliance(uh)
+    ```
+    """
+    _base: Optional[List[_BaseLocal]] = None
+
+    def clear_pattern(self) -> None:
+        """Clear the kept sparsity pattern and the base local matrices."""
+        super().clear_pattern()
+        self._base = None
+
+    def _base_local(self) -> List[_BaseLocal]:
+        """Base local matrices, base scales and cell-to-dof of every group."""
+        if self._base is not None:
+            return self._base
+
+        base = []
+        for group in self.integrators.keys():
+            compact = self._congruent_group(group)
+            if compact is None:
+                local, etg = self._assembly_group(group)
+                base_scale = None
+            else:
+                local, base_scale, etg = compact
+            ue2dof = etg[0]
+            ve2dof = etg[1] if (len(etg) > 1) else ue2dof
+            base.append((local, base_scale, ve2dof, ue2dof))
+
+        self._base = base
+        return base
+
+    def _build_pattern(self) -> CSRPattern:
+        indices = []
+        for _, _, ve2dof, ue2dof in self._base_local():
+            local_shape = (ve2dof.shape[0], ve2dof.shape[1], ue2dof.shape[1])
+            row = bm.broadcast_to(ve2dof[:, :, None], local_shape)
+            col = bm.broadcast_to(ue2dof[:, None, :], local_shape)
+            indices.append(bm.stack([bm.reshape(row, (-1,)), bm.reshape(col, (-1,))], axis=0))
+        pattern = CSRPattern(bm.concat(indices, axis=1), self.sparse_shape)
+        logger.info(f"Sparsity pattern built with {pattern.nnz} non-zeros.")
+        return pattern
+
+    def assembly(self, scale: Optional[TensorLike]=None, *, format='csr'):
+        """Assembly the matrix with the cell-wise scales.
+
+        Parameters:
+            scale (Tensor | None, optional): Scale of each cell shaped (NC,).
+                Defaults to None, meaning all ones.
+            format (str, optional): Layout of the output ('csr' | 'coo'). Defaults to 'csr'.
+
+        Returns:
+            global_matrix (CSRTensor | COOTensor): Global sparse matrix shaped (gdof, gdof).
+        """
+        self.check_space()
+        if self.batch_size != 0:
+            raise ValueError("ScaledBilinearForm does not support batch.")
+        if self._pattern is None:
+            self._pattern = self._build_pattern()
+
+        pattern = self._pattern
+        space = self._spaces[0]
+        values = pattern.zeros(dtype=space.ftype, device=bm.get_device(space))
+        start = 0
+
+        for local, base_scale, ve2dof, _ in self._base_local():
+            NC = ve2dof.shape[0]
+            if (scale is not None) and (scale.shape != (NC,)):
+                raise ValueError(f"scale should be shaped ({NC},), "
+                                 f"but got {tuple(scale.shape)}.")
+            cell_scale = base_scale if (scale is None) else (
+                scale if (base_scale is None) else scale * base_scale
+            )
+            if local.ndim == 2: # reference matrix of congruent cells
+                if cell_scale is None:
+                    cell_scale = bm.ones((NC,), dtype=local.dtype, device=bm.get_device(local))
+                local_values = cell_scale[:, None] * bm.reshape(local, (1, -1))
+            elif cell_scale is None:
+                local_values = local
+            else:
+                local_values = cell_scale[:, None, None] * local
+            local_values = bm.reshape(local_values, (-1,))
+            values = pattern.scatter_add(values, local_values, start)
+            start += local_values.shape[0]
+
+        M = CSRTensor(pattern.crow(), pattern.col(), values, self.sparse_shape)
+
+        if format == 'csr':
+            self._M = M
+        elif format == 'coo':
+            self._M = M.tocoo()
+            self._M.is_coalesced = True
+        else:
+            raise ValueError(f"Unsupported format {format}.")
+
+        return self._M
+
+    def element_compliance(self, u: TensorLike, /) -> TensorLike:
+        """Compute u_c^T K_c u_c of every cell with the unscaled base matrices.
+
+        This is the sensitivity kernel of the compliance, as
+        d(u^T K(s) u)/d(s_c) = u_c^T K_c u_c.
+
+        Parameters:
+            u (Tensor): Global vector shaped (gdof,).
+
+        Returns:
+            Tensor: Compliance of each cell shaped (NC,).
+        """
+        out = None
+
+        for local, base_scale, ve2dof, ue2dof in self._base_local():
+            uc = u[ue2dof]
+            vc = u[ve2dof]
+            if local.ndim == 2:
+                val = bm.einsum('ci, ij, cj -> c', vc, local, uc)
+            else:
+                val = bm.einsum('ci, cij, cj -> c', vc, local, uc)
+            if base_scale is not None:
+                val = val * base_scale
+            out = val if (out is None) else out + val
+
+        return out
@@ -0,0 +1,191 @@
+"""Sum-factorization kernels for tensor-product elements.
+
+On quadrangle and hexahedron meshes, the Lagrange basis is the tensor product
+of 1-D bases evaluated on the tuple of 1-D quadrature points. Instead of
+forming the full (NC, NQ, ldof, TD) basis arrays, the kernels here apply the
+1-D matrices along each axis in turn:
+
+- evaluating a local function on the quadrature points costs O(p^{d+1}) per cell,
+  instead of O(p^{2d});
+- forming the local matrices costs O(p^{2d+1}) per cell, instead of O(p^{3d}).
+
+Axes of a local tensor are ordered as the tensor-product basis, i.e. the DoF
+(i_0, ..., i_{d-1}) is at position i_0*n^{d-1} + ... + i_{d-1}.
+"""
+
+from typing import Sequence, Tuple, Optional
+from math import prod
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike, CoefLike
+from ..utils import is_scalar, fill_axis
+
+_QS = 'pqr' # axes of quadrature points
+_IS = 'ijk' # axes of the left DoFs
+_JS = 'lmn' # axes of the right DoFs
+
+
+def is_tensor_product_space(space) -> bool:
+    """Whether the space is a scalar Lagrange space on a tensor-product mesh
+    (QuadrangleMesh, HexahedronMesh and uniform meshes)."""
+    from ..mesh import TensorMesh
+    from ..functionspace import LagrangeFESpace
+    mesh = getattr(space, 'mesh', None)
+    return isinstance(space, LagrangeFESpace) and isinstance(mesh, TensorMesh) \
+        and mesh.TD in (2, 3)
+
+
+def tensor_basis_1d(p: int, bc: TensorLike) -> Tuple[TensorLike, TensorLike]:
+    """Values and derivatives of the 1-D Lagrange basis on the 1-D quadrature points.
+
+    Parameters:
+        p (int): Degree of the basis.
+        bc (Tensor): 1-D barycentric quadrature points shaped (NQ, 2).
+
+    Returns:
+        Tuple[Tensor, Tensor]: Values and derivatives both shaped (NQ, p+1).
+    """
+    mi = bm.multi_index_matrix(p, 1)
+    phi = bm.simplex_shape_function(bc, p, mi)
+    R = bm.simplex_grad_shape_function(bc, p=p)
+    Dlambda = bm.array([-1, 1], dtype=phi.dtype, device=bm.get_device(bc))
+    dphi = bm.einsum('...ij, j -> ...i', R, Dlambda)
+    return phi, dphi
+
+
+def tensor_geometry(mesh, bcs: Tuple[TensorLike, ...], ws: TensorLike, index=None):
+    """Geometric factors on the quadrature points of tensor-product cells.
+
+    Returns:
+        Tuple[Tensor, Tensor, Tensor]: The weights multiplied by the area element
+            shaped (NC, NQ), the inverse of the metric tensor J^T J shaped
+            (NC, NQ, TD, TD), and the Jacobi matrix shaped (NC, NQ, GD, TD).
+    """
+    kwargs = {} if index is None else {'index': index}
+    J = mesh.jacobi_matrix(bcs, **kwargs)
+    G = bm.einsum('cqki, cqkj -> cqij', J, J)
+    detws = bm.sqrt(bm.abs(bm.linalg.det(G))) * ws[None, :]
+    return detws, bm.linalg.inv(G), J
+
+
+def mass_factor(detws: TensorLike, coef: Optional[CoefLike]=None) -> TensorLike:
+    """Factor on quadrature points for the mass matrix, shaped (NC, NQ)."""
+    if coef is None:
+        return detws
+    if is_scalar(coef):
+        return detws * coef
+    return detws * fill_axis(coef, 2)
+
+
+def diffusion_factor(detws: TensorLike, Ginv: TensorLike, J: TensorLike,
+                     coef: Optional[CoefLike]=None) -> TensorLike:
+    """Factor on quadrature points for the stiffness matrix, shaped (NC, NQ, TD, TD).
+
+    The gradient in x is `G^{-1} J^T` applied to the reference gradient, so the
+    factor is `G^{-1} J^T A J G^{-1}` for a matrix coefficient A, and
+    `a G^{-1}` for a scalar coefficient a, both multiplied by `detws`."""
+    if coef is None:
+        return detws[..., None, None] * Ginv
+    if is_scalar(coef):
+        return (detws * coef)[..., None, None] * Ginv
+    if coef.ndim == 4: # (NC, NQ, GD, GD)
+        P = bm.einsum('cqij, cqkj -> cqik', Ginv, J) # (NC, NQ, TD, GD)
+        K = bm.einsum('cqik, cqkl, cqjl -> cqij', P, coef, P)
+        return detws[..., None, None] * K
+    return (detws * fill_axis(coef, 2))[..., None, None] * Ginv
+
+
+def _grid_shape(factor: TensorLike, nq: int, d: int):
+    return (factor.shape[0],) + (nq,) * d + tuple(factor.shape[2:])
+
+
+def sumfact_matrix(factor: TensorLike, left: Sequence[TensorLike],
+                   right: Sequence[TensorLike]) -> TensorLike:
+    """Local matrices sum_q factor[c, q] prod_i left[i][q_i, a_i] right[i][q_i, b_i],
+    contracting one quadrature axis at a time.
+
+    Parameters:
+        factor (Tensor): Factor on the quadrature points shaped (NC, NQ), NQ = nq^d.
+        left (Sequence[Tensor]): d 1-D matrices shaped (nq, n) for the rows.
+        right (Sequence[Tensor]): d 1-D matrices shaped (nq, n) for the columns.
+
+    Returns:
+        Tensor: Local matrices shaped (NC, n^d, n^d).
+    """
+    d = len(left)
+    nq = left[0].shape[0]
+    T = bm.reshape(factor, _grid_shape(factor, nq, d))
+    subs = 'c' + _QS[:d]
+    acc = ''
+
+    for i in reversed(range(d)):
+        acc = _IS[i] + _JS[i] + acc
+        new_subs = 'c' + _QS[:i] + acc
+        T = bm.einsum(f'{subs}, {_QS[i]}{_IS[i]}, {_QS[i]}{_JS[i]} -> {new_subs}',
+                      T, left[i], right[i])
+        subs = new_subs
+
+    T = bm.einsum(f'{subs} -> c{_IS[:d]}{_JS[:d]}', T)
+    nrow = prod(m.shape[1] for m in left)
+    ncol = prod(m.shape[1] for m in right)
+    return bm.reshape(T, (T.shape[0], nrow, ncol))
+
+
+def sumfact_mass_matrix(factor: TensorLike, phi: TensorLike, d: int) -> TensorLike:
+    """Local mass matrices shaped (NC, ldof, ldof), see `mass_factor`."""
+    return sumfact_matrix(factor, [phi] * d, [phi] * d)
+
+
+def sumfact_stiffness_matrix(factor: TensorLike, phi: TensorLike, dphi: TensorLike) -> TensorLike:
+    """Local stiffness matrices shaped (NC, ldof, ldof), see `diffusion_factor`."""
+    d = factor.shape[-1]
+    out = None
+    for k in range(d):
+        left = [dphi if i == k else phi for i in range(d)]
+        for l in range(d):
+            right = [dphi if i == l else phi for i in range(d)]
+            val = sumfact_matrix(factor[..., k, l], left, right)
+            out = val if (out is None) else out + val
+    return out
+
+
+def sumfact_interpolate(u: TensorLike, mats: Sequence[TensorLike]) -> TensorLike:
+    """Apply 1-D matrices along each tensor axis of local vectors.
+
+    Parameters:
+        u (Tensor): Local vectors shaped (NC, n^d, K).
+        mats (Sequence[Tensor]): d matrices shaped (m, n).
+
+    Returns:
+        Tensor: Shaped (NC, m^d, K).
+    """
+    d = len(mats)
+    n = mats[0].shape[1]
+    T = bm.reshape(u, (u.shape[0],) + (n,) * d + (u.shape[-1],))
+    subs = 'c' + _QS[:d] + 'z'
+    for i, M in enumerate(mats):
+        T = bm.einsum(f'{subs}, y{_QS[i]} -> {subs.replace(_QS[i], "y")}', T, M)
+    return bm.reshape(T, (u.shape[0], -1, u.shape[-1]))
+
+
+def sumfact_mass_apply(factor: TensorLike, phi: TensorLike, u: TensorLike, d: int) -> TensorLike:
+    """Apply the local mass matrices to local vectors u shaped (NC, ldof, K)
+    in O(p^{d+1}) operations per cell."""
+    uq = sumfact_interpolate(u, [phi] * d) # (NC, NQ, K)
+    return sumfact_interpolate(factor[..., None] * uq, [phi.T] * d)
+
+
+def sumfact_stiffness_apply(factor: TensorLike, phi: TensorLike, dphi: TensorLike,
+                            u: TensorLike) -> TensorLike:
+    """Apply the local stiffness matrices to local vectors u shaped (NC, ldof, K)
+    in O(p^{d+1}) operations per cell."""
+    d = factor.shape[-1]
+    grads = [sumfact_interpolate(u, [dphi if i == k else phi for i in range(d)])
+             for k in range(d)]
+    grads = bm.stack(grads, axis=-1) # (NC, NQ, K, d)
+    flux = bm.einsum('cqkl, cqzl -> cqzk', factor, grads)
+    out = None
+    for k in range(d):
+        val = sumfact_interpolate(flux[..., k], [dphi.T if i == k else phi.T for i in range(d)])
+        out = val if (out is None) else out + val
+    return out
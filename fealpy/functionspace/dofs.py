@@ -5,6 +5,7 @@ from typing import Union, Generic, TypeVar
 
 from ..backend import TensorLike
 from ..backend import backend_manager as bm
+from ..backend import promote_index_dtype
 from ..mesh.mesh_base import Mesh
 
 
@@ -19,6 +20,14 @@ class LinearMeshCFEDof(Generic[_MT]):
         self.mesh = mesh
         self.p = p
         self.multiIndex = mesh.multi_index_matrix(p, TD)
+        # The dofs are numbered by the interpolation points in the index type
+        # of the mesh, which can not be widened here.
+        self.itype = mesh.itype
+        gdof = self.number_of_global_dofs()
+        if promote_index_dtype(self.itype, gdof) != self.itype:
+            raise OverflowError(f"{gdof} dofs can not be indexed by {self.itype} of "
+                                "the mesh, please create the mesh with the 'int64' "
+                                "index policy.")
    
     def is_boundary_dof(self, threshold=None, method=None):
         TD = self.mesh.top_dimension()
@@ -93,6 +102,7 @@ class LinearMeshDFEDof(Generic[_MT]):
         else:
             TD = mesh.top_dimension()
             self.multiIndex = bm.array((TD+1)*(0,), dtype=mesh.itype)
+        self.itype = promote_index_dtype(mesh.itype, self.number_of_global_dofs())
         self.cell2dof = self.cell_to_dof()
 
     def entity_to_dof(self, etype: int, index: Index=_S):
@@ -106,7 +116,7 @@ class LinearMeshDFEDof(Generic[_MT]):
         mesh = self.mesh
         NC = mesh.number_of_cells()
         ldof = self.number_of_local_dofs()
-        cell2dof = bm.arange(NC*ldof).reshape(NC, ldof)
+        cell2dof = bm.arange(NC*ldof, dtype=self.itype).reshape(NC, ldof)
 
         return cell2dof[index]
 
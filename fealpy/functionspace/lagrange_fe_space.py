@@ -30,7 +30,7 @@ class LagrangeFESpace(FunctionSpace, Generic[_MT]):
             raise ValueError(f"Unknown type: {ctype}")
 
         self.ftype = mesh.ftype
-        self.itype = mesh.itype
+        self.itype = self.dof.itype
         # self.multi_index_matrix = mesh.multi_index_matrix(p,2)
 
         #TODO:JAX
@@ -111,6 +111,7 @@ from ctypes import POINTER as P, byref
 import os, sys, operator as op
 from warnings import warn
 from collections import namedtuple
+from functools import reduce
 import numpy as np
 try:
     import networkx
@@ -668,23 +669,12 @@ def array_to_metis(adj, adjLocation, nodew=None, nodesz=None):
     n = len(adjLocation) - 1
     m2 = adjLocation[-1] 
 
-    if adj.dtype == 'int32':
-        if idx_t == ctypes.POINTER(ctypes.c_int64):
-            adj = adj.astype(np.int64)
-            adjLocation = adjLocation.astype(np.int64)
-
-            adjncy = adj.ctypes.data_as(ctypes.POINTER(ctypes.c_int64))
-            xadj = adjLocation.ctypes.data_as(ctypes.POINTER(ctypes.c_int64)) 
-        else:
-            adjncy = adj.ctypes.data_as(ctypes.POINTER(ctypes.c_int32))
-            xadj = adjLocation.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)) 
-    elif adj.dtype == 'int64':
-        if idx_t == ctypes.POINTER(ctypes.c_int32):
-            raise TypeError
-        adjncy = adj.ctypes.data_as(ctypes.POINTER(ctypes.c_int32))
-        xadj = adjLocation.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)) 
-    else:
-        raise TypeError
+    # The arrays must have the width of idx_t, and be kept alive by the caller.
+    itype = np.int64 if idx_t is ctypes.c_int64 else np.int32
+    if adj.dtype != itype or adjLocation.dtype != itype:
+        raise TypeError("adj and adjLocation should be %s arrays" % np.dtype(itype))
+    adjncy = adj.ctypes.data_as(ctypes.POINTER(idx_t))
+    xadj = adjLocation.ctypes.data_as(ctypes.POINTER(idx_t))
 
 
     adjwgt = None 
@@ -737,31 +727,63 @@ def _METIS_PartGraphRecursive(nvtxs, ncon, xadj, adjncy, vwgt, vsize,
 
 ### End METIS wrappers. ###
 
+def mesh_adjacency(mesh, entity='cell'):
+    """ Adjacency of the cells (through faces) or of the nodes (through edges)
+    of a mesh in CSR arrays.
+
+    Return `(adj, adjLocation)`, where the neighbours of the i-th entity are
+    `adj[adjLocation[i]:adjLocation[i+1]]`.
+
+    :param mesh: a mesh
+    :param entity: 'cell' or 'node'
+    """
+    if entity == 'cell':
+        cell2cell = mesh.cell_to_cell()
+        cell2cell = np.asarray(cell2cell.cpu() if hasattr(cell2cell, 'cpu') else cell2cell)
+        NC, NFC = cell2cell.shape
+        row = np.repeat(np.arange(NC), NFC)
+        col = cell2cell.reshape(-1)
+        flag = row != col # boundary faces point to the cell itself
+        row, col, n = row[flag], col[flag], NC
+    elif entity == 'node':
+        edge = mesh.entity('edge')
+        edge = np.asarray(edge.cpu() if hasattr(edge, 'cpu') else edge)
+        row = np.concatenate([edge[:, 0], edge[:, 1]])
+        col = np.concatenate([edge[:, 1], edge[:, 0]])
+        n = mesh.number_of_nodes()
+    else:
+        raise ValueError("entity should be 'cell' or 'node', but got %r" % entity)
+
+    itype = np.int64 if idx_t is ctypes.c_int64 else np.int32
+    order = np.argsort(row, kind='stable')
+    adj = np.ascontiguousarray(col[order], dtype=itype)
+    adjLocation = np.zeros(n + 1, dtype=itype)
+    np.cumsum(np.bincount(row, minlength=n), out=adjLocation[1:])
+    return adj, adjLocation
+
+
 def part_mesh(mesh, entity='cell', nparts=2, 
         tpwgts=None, ubvec=None, recursive=False, **opts):
     """ Perform graph partitioning using k-way or recursive methods
 
-    Return ....
+    Returns a 2-tuple `(objval, parts)`, where `parts` is the partition index
+    of each cell (or node), and `objval` is the value of the objective function.
 
     :param mesh: a mesh 
-    
+    :param entity: partition the 'cell' (adjacent through faces) or the 'node'
+      (adjacent through edges) graph
     """
-    if entity == 'cell':
-        adj, adjLocation = mesh.ds.cell_to_cell(return_array=True)
-    elif entity == 'node':
-        adj, adjLocation = mesh.ds.node_to_node(return_array=True)
-
+    # Keep the arrays referenced here: the graph only holds raw pointers.
+    adj, adjLocation = mesh_adjacency(mesh, entity)
     graph = array_to_metis(adj, adjLocation)
 
     options = METIS_Options(**opts)
-    print(options)
-    print(options.keys());
     if tpwgts and not isinstance(tpwgts, ctypes.Array):
         if isinstance(tpwgts[0], (tuple, list)):
             tpwgts = reduce(op.add, tpwgts)
         tpwgts = (real_t*len(tpwgts))(*tpwgts)
     if ubvec and not isinstance(ubvec, ctypes.Array):
-        ubvec = (real_t*len(ubvect))(*ubvec)
+        ubvec = (real_t*len(ubvec))(*ubvec)
 
     if tpwgts: assert len(tpwgts) == nparts * graph.ncon
     if ubvec: assert len(ubvec) == graph.ncon
@@ -37,7 +37,7 @@ class HexahedronMesh(TensorMesh, Plotable):
             [2, 4], [4, 3], [3, 5], [5, 2],
             [1, 4], [1, 3], [1, 5], [2, 1]], **kwargs)
 
-        self.construct()
+        self.construct(lazy=True)
         self.nodedata = {}
         self.edgedata = {}
         self.facedata = {}
@@ -373,7 +373,7 @@ class HexahedronMesh(TensorMesh, Plotable):
 
             self.node = node
             self.cell = cell
-            self.construct()
+            self.construct(lazy=True)
 
         if returnim is True:
             return IM
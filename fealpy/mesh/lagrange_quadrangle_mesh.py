@@ -33,6 +33,10 @@ class LagrangeQuadrangleMesh(TensorMesh):
         self.celldata = {}
         self.meshdata = {}
 
+    def _binary_args(self):
+        # NOTE: the surface is not saved.
+        return {'node': self.node, 'cell': self.cell}, {'p': self.p}
+
     def reference_cell_measure(self):
         return 1
     
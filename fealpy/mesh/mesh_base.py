@@ -1,5 +1,5 @@
 
-from typing import Union, Optional, Sequence, Tuple, Any
+from typing import Union, Optional, Sequence, Tuple, Dict, Any
 
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, _S
@@ -16,6 +16,12 @@ from .utils import (
 ##################################################
 
 class Mesh(MeshDS):
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ('node', 'cell'):
+            # The cached point locator is built on the old nodes and cells.
+            self.__dict__.pop('_point_locator', None)
+        super().__setattr__(name, value)
+
     def geo_dimension(self) -> int:
         node = self.entity(0)
         if node is None:
@@ -128,6 +134,53 @@ class Mesh(MeshDS):
                        "Use `quadrature_formula` instead.")
         return self.quadrature_formula(q, etype, qtype)
 
+    # binary format
+    def save(self, filename: str) -> None:
+        """Save the mesh in the binary format of FEALPy, with the entities and
+        topology relations built already and the tensors in the data dictionaries.
+        See `fealpy.mesh.mesh_io`.
+
+        Parameters:
+            filename (str): Path of the file.
+        """
+        from .mesh_io import save_mesh
+        save_mesh(self, filename)
+
+    @classmethod
+    def load(cls, filename: str, *, mmap: bool=True):
+        """Load a mesh saved by `save`. The arrays are memory-mapped by default,
+        so a mesh of any size is opened in constant time and paged in on access.
+
+        Parameters:
+            filename (str): Path of the file.
+            mmap (bool, optional): Whether to memory-map the arrays. Defaults to True.
+
+        Returns:
+            Mesh: The mesh, of the saved class, which must be `cls` or its subclass.
+        """
+        from .mesh_io import load_mesh
+        return load_mesh(filename, mmap=mmap, cls=cls)
+
+    def _binary_args(self) -> Tuple[Dict[str, TensorLike], Dict[str, Any]]:
+        """Tensors and JSON serializable keyword arguments to create the mesh in `load`."""
+        return {'node': self.node, 'cell': self.cell}, {}
+
+    @classmethod
+    def _from_binary_args(cls, args: Dict[str, TensorLike], kwargs: Dict[str, Any], itype):
+        return cls._with_itype(itype, args['node'], args['cell'], **kwargs)
+
+    @classmethod
+    def _with_itype(cls, itype, /, *args, **kwargs):
+        """Create a mesh whose index type is `itype` instead of the one given by
+        the index policy, e.g. to keep the index type of a mesh file."""
+        mesh = cls.__new__(cls)
+        mesh._fixed_itype = itype
+        try:
+            mesh.__init__(*args, **kwargs)
+        finally:
+            mesh.__dict__.pop('_fixed_itype', None)
+        return mesh
+
     # ipoints
     def edge_to_ipoint(self, p: int, index: Index=_S) -> TensorLike:
         """Get the relationship between edges and integration points."""
@@ -363,6 +416,30 @@ class HomogeneousMesh(Mesh):
 
         return bm.bc_to_points(bcs, node, entity)
 
+    def point_locator(self):
+        """The `PointLocator` of the mesh. It is built on the first call and
+        kept until the node or cell of the mesh is set again. Changing the
+        nodes in place is not detected, so set `mesh.node` after moving them.
+        """
+        locator = self.__dict__.get('_point_locator', None)
+        if locator is None:
+            from .point_locator import PointLocator
+            locator = PointLocator(self)
+            self._point_locator = locator
+        return locator
+
+    def location(self, points: TensorLike) -> TensorLike:
+        """Find the cells containing the points, -1 for the points outside.
+        See `point_locator`.
+        """
+        return self.point_locator().locate(points)
+
+    def point_to_bc(self, points: TensorLike):
+        """Find the cells containing the points, and the barycentric coordinates
+        of the points in the cells. See `PointLocator.point_to_bc`.
+        """
+        return self.point_locator().point_to_bc(points)
+
     # ipoints
     def interpolation_points(self, p: int, index: Index=_S) -> TensorLike:
         raise NotImplementedError
@@ -2,6 +2,7 @@
 from typing import Union, Optional, Dict, overload, Callable, Any
 
 from ..backend import backend_manager as bm
+from ..backend import index_dtype
 from ..typing import TensorLike, Index, EntityName, _S, _int_func
 from .. import logger
 from .utils import estr2dim, edim2entity, MeshMeta, flocc
@@ -14,6 +15,7 @@ from .utils import estr2dim, edim2entity, MeshMeta, flocc
 
 class MeshDS(metaclass=MeshMeta):
     _STORAGE_ATTR = ['cell', 'face', 'edge', 'node']
+    _TOPOLOGY_ATTR = ['face2cell', 'cell2face', 'edge2cell', 'cell2edge']
     cell: TensorLike
     face: TensorLike
     edge: TensorLike
@@ -31,6 +33,7 @@ class MeshDS(metaclass=MeshMeta):
             k: getattr(self, self._entity_dim_method_name_map[k])
             for k in self._entity_dim_method_name_map
         }
+        self._topology_factory: Dict[str, Callable] = {}
         self.TD = TD
         self.itype = itype
         self.ftype = ftype
@@ -41,6 +44,9 @@ class MeshDS(metaclass=MeshMeta):
         if name in self._STORAGE_ATTR:
             etype_dim = estr2dim(self, name)
             return edim2entity(self._entity_storage, self._entity_factory, etype_dim)
+        elif name in self.__dict__.get('_topology_factory', ()):
+            self._topology_factory[name]()
+            return object.__getattribute__(self, name)
         else:
             return object.__getattribute__(self, name)
 
@@ -49,10 +55,30 @@ class MeshDS(metaclass=MeshMeta):
             if not hasattr(self, '_entity_storage'):
                 raise RuntimeError('please call super().__init__() before setting attributes.')
             etype_dim = estr2dim(self, name)
+            if etype_dim > 0 and self._is_index(value):
+                if etype_dim == self.TD:
+                    self.itype = self._index_dtype(value)
+                if value.dtype != self.itype:
+                    value = bm.astype(value, self.itype)
             self._entity_storage[etype_dim] = value
         else:
             super().__setattr__(name, value)
 
+    @staticmethod
+    def _is_index(value: Any) -> bool:
+        return bm.is_tensor(value) and value.ndim == 2 and value.dtype in (bm.int32, bm.int64)
+
+    def _index_dtype(self, cell: TensorLike):
+        """Index type of the mesh with the given cells, by the index policy,
+        unless it is fixed by `Mesh._with_itype`."""
+        itype = self.__dict__.get('_fixed_itype', None)
+        if itype is not None:
+            return itype
+        node = self._entity_storage.get(0, None)
+        NN = node.shape[0] if bm.is_tensor(node) else 0
+        # The faces and edges are fewer than twice the vertices of the cells.
+        return index_dtype(max(NN, 2 * cell.shape[0] * cell.shape[1]))
+
     def __delattr__(self, name: str) -> None:
         if name in self._STORAGE_ATTR:
             del self._entity_storage[estr2dim(self, name)]
@@ -256,15 +282,50 @@ class MeshDS(metaclass=MeshMeta):
         total_edge = cell[..., local_edge].reshape(-1, NVE)
         return total_edge
 
-    def construct(self):
+    def construct(self, *, lazy: bool=False):
+        """Construct the faces, edges and the relations between them and the cells.
+
+        Parameters:
+            lazy (bool, optional): If True, only register the construction, so that\
+            the faces with face2cell and cell2face, and the edges with cell2edge\
+            in 3-d meshes, are built on their first access. Defaults to False.
+        """
         if not self.is_homogeneous():
             raise RuntimeError('Can not construct for a non-homogeneous mesh.')
 
+        self.invalidate()
+        if not lazy:
+            self._construct_face()
+            if self.TD == 3:
+                self._construct_edge()
+
+    def invalidate(self):
+        """Remove the faces, edges and topology relations built from the cells,
+        to build them again on their first access. Call this after changing the
+        cells of a homogeneous mesh."""
+        TD = self.TD
+        for name in self._TOPOLOGY_ATTR:
+            self.__dict__.pop(name, None)
+        names = ['face2cell', 'cell2face']
+        if TD > 1: # Do not add faces for interval mesh
+            self._entity_storage.pop(TD - 1, None)
+            self._entity_factory[TD - 1] = self._construct_face
+        if TD == 2:
+            names += ['edge2cell', 'cell2edge']
+        self._topology_factory = {name: self._construct_face for name in names}
+        if TD == 3:
+            self._entity_storage.pop(1, None)
+            self._entity_factory[1] = self._construct_edge
+            self._topology_factory['cell2edge'] = self._construct_edge
+
+    def _construct_face(self):
         totalFace = self.total_face()
         i0, i1, j = flocc(bm.sort(totalFace, axis=1))
 
+        face = None
         if self.TD > 1: # Do not add faces for interval mesh
-            self.face = totalFace[i0, :] # this also adds the edge in 2-d meshes
+            face = totalFace[i0, :] # this also adds the edge in 2-d meshes
+            self.face = face
 
         NC = self.number_of_cells()
         NFC = self.number_of_faces_of_cells()
@@ -275,20 +336,22 @@ class MeshDS(metaclass=MeshMeta):
         )
         # NOTE: dtype must be specified here, as these tensors are the results of unique.
 
-        if self.TD == 3:
-            NEC = self.number_of_edges_of_cells()
-
-            totalEdge = self.total_edge()
-            i2, _, j = flocc(bm.sort(totalEdge, axis=1))
-            self.edge = totalEdge[i2, :]
-            self.cell2edge = bm.astype(j.reshape(NC, NEC), self.itype)
-
-        elif self.TD == 2:
+        if self.TD == 2:
             self.edge2cell = self.face2cell
             self.cell2edge = self.cell2face
 
-        NN = self.number_of_nodes()
-        NF = i0.shape[0]
-        logger.info(f"Mesh toplogy relation constructed, with {NC} cells, {NF} "
-                    f"faces, {NN} nodes "
-                    f"on device ?")
+        logger.info(f"Mesh faces constructed, with {NC} cells and {i0.shape[0]} faces.")
+        return face
+
+    def _construct_edge(self):
+        NC = self.number_of_cells()
+        NEC = self.number_of_edges_of_cells()
+
+        totalEdge = self.total_edge()
+        i2, _, j = flocc(bm.sort(totalEdge, axis=1))
+        edge = totalEdge[i2, :]
+        self.edge = edge
+        self.cell2edge = bm.astype(j.reshape(NC, NEC), self.itype)
+
+        logger.info(f"Mesh edges constructed, with {NC} cells and {i2.shape[0]} edges.")
+        return edge
@@ -0,0 +1,232 @@
+"""
+Binary mesh format of FEALPy
+============================
+
+A mesh file consists of
+
+    MAGIC (8 bytes) | header size (uint64, little endian) | header | arrays
+
+The header is a UTF-8 JSON object, recording the mesh class, the index and
+float types, the keyword arguments of the constructor, and the dtype, shape
+and byte offset of every array. The arrays are raw C-ordered buffers aligned
+to 64 bytes, so they are memory-mapped on loading without any parsing.
+
+The arrays are grouped by the prefix of their names:
+
+- `args/`: the tensors passed to the constructor, e.g. the node and the cell;
+- `entity/`: the other entities built already, e.g. the face and the edge;
+- `topology/`: the relations built already, e.g. face2cell and cell2edge;
+- `nodedata/`, `edgedata/`, `facedata/`, `celldata/`, `meshdata/`: the tensors
+  in the data dictionaries of the mesh.
+"""
+import json
+import importlib
+from typing import Dict, Any, Optional, Type
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .. import logger
+
+MAGIC = b'FEALPYMB'
+VERSION = 1
+_ALIGN = 64
+_DATA_ATTR = ['nodedata', 'edgedata', 'facedata', 'celldata', 'meshdata']
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def dtype_name(dtype) -> str:
+    """Name of a dtype of the current backend in numpy, e.g. 'int32'."""
+    return bm.to_numpy(bm.zeros((0,), dtype=dtype)).dtype.name
+
+
+def save_mesh(mesh, filename: str, /) -> None:
+    """Save a mesh in the binary format.
+
+    Entities and topology relations are saved only if they have been built,
+    so call `mesh.construct()` first to store them in the file. Entries of the
+    data dictionaries that are not tensors are saved in the header if they are
+    JSON serializable, and skipped otherwise.
+
+    Parameters:
+        mesh (Mesh): The mesh to save.
+        filename (str): Path of the file.
+    """
+    from .mesh_base import StructuredMesh
+    arrays: Dict[str, TensorLike] = {}
+    alias: Dict[str, str] = {}
+
+    def add(name: str, value: TensorLike):
+        for key, saved in arrays.items():
+            if saved is value:
+                alias[name] = key
+                return
+        arrays[name] = value
+
+    args, kwargs = mesh._binary_args()
+    for name, value in args.items():
+        add('args/' + name, value)
+
+    # Structured meshes generate their entities and relations on demand.
+    if not isinstance(mesh, StructuredMesh):
+        storage = mesh.storage()
+        for dim, value in storage.items():
+            if bm.is_tensor(value) and dim not in (0, mesh.TD):
+                add(f'entity/{dim}', value)
+        for name in mesh._TOPOLOGY_ATTR:
+            if name in mesh.__dict__:
+                add('topology/' + name, mesh.__dict__[name])
+
+    values: Dict[str, Any] = {}
+    saved_data = []
+    for attr in _DATA_ATTR:
+        data = getattr(mesh, attr, None)
+        # Data dictionaries shared by two names, e.g. edgedata and facedata
+        # of 2-d meshes, are shared again by the constructor.
+        if not isinstance(data, dict) or any(data is d for d in saved_data):
+            continue
+        saved_data.append(data)
+        for key, value in data.items():
+            if bm.is_tensor(value):
+                add(f'{attr}/{key}', value)
+            else:
+                try:
+                    json.dumps(value)
+                except TypeError:
+                    logger.warning(f"save_mesh: {attr}['{key}'] of type "
+                                   f"{type(value).__name__} is not saved.")
+                    continue
+                values[f'{attr}/{key}'] = value
+
+    buffers = {name: np.ascontiguousarray(bm.to_numpy(value)) for name, value in arrays.items()}
+    header = {
+        'version': VERSION,
+        'class': f'{type(mesh).__module__}:{type(mesh).__qualname__}',
+        'TD': mesh.TD,
+        'itype': dtype_name(mesh.itype),
+        'ftype': dtype_name(mesh.ftype),
+        'kwargs': kwargs,
+        'values': values,
+        'alias': alias,
+        'arrays': {},
+    }
+    offset = 0
+    for name, buf in buffers.items():
+        header['arrays'][name] = {'dtype': buf.dtype.str, 'shape': list(buf.shape), 'offset': offset}
+        offset = _aligned(offset + buf.nbytes)
+    relative = {name: item['offset'] for name, item in header['arrays'].items()}
+    # The offsets depend on the size of the header, which grows with them.
+    start = 0
+    while True:
+        for name, item in header['arrays'].items():
+            item['offset'] = start + relative[name]
+        text = json.dumps(header).encode('utf-8')
+        if len(MAGIC) + 8 + len(text) <= start:
+            break
+        start = _aligned(len(MAGIC) + 8 + len(text))
+    text += b' ' * (start - len(MAGIC) - 8 - len(text))
+
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.array(len(text), dtype='<u8').tobytes())
+        f.write(text)
+        for name, buf in buffers.items():
+            f.seek(header['arrays'][name]['offset'])
+            buf.tofile(f)
+
+
+def read_header(filename: str, /) -> Dict[str, Any]:
+    """Read the header of a mesh file without loading the arrays."""
+    with open(filename, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} is not a mesh file of FEALPy.")
+        size = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+        header = json.loads(f.read(size).decode('utf-8'))
+    if header['version'] > VERSION:
+        raise ValueError(f"The version {header['version']} of {filename} is not "
+                         f"supported, the latest is {VERSION}.")
+    return header
+
+
+def _mesh_class(name: str, /) -> Type:
+    """The mesh class named 'module:qualname' in a header. Only the mesh classes
+    of the modules of this package are accepted, so a file can not import or
+    create any other object."""
+    from .mesh_base import Mesh
+    package = __name__.rpartition('.')[0]
+    module, _, qualname = name.partition(':')
+    prefix, _, submodule = module.rpartition('.')
+    if prefix != package or not submodule.isidentifier() or not qualname.isidentifier():
+        raise ValueError(f"'{name}' is not a mesh class of {package}.")
+    try:
+        mesh_class = getattr(importlib.import_module(module), qualname, None)
+    except ImportError:
+        mesh_class = None
+    if not (isinstance(mesh_class, type) and issubclass(mesh_class, Mesh)):
+        raise ValueError(f"'{name}' is not a mesh class of {package}.")
+    return mesh_class
+
+
+def load_mesh(filename: str, /, *, mmap: bool=True, cls: Optional[Type]=None):
+    """Load a mesh saved by `save_mesh`.
+
+    Parameters:
+        filename (str): Path of the file.
+        mmap (bool, optional): Whether to memory-map the arrays in copy-on-write\
+        mode, so that the file is opened in constant time, the data is paged in\
+        on access and the file is never modified. Defaults to True. The arrays\
+        are copied to the device for the backends other than numpy and pytorch\
+        on CPU.
+        cls (type, optional): Expected mesh class. Raises TypeError if the saved\
+        mesh is not an instance of it. Defaults to None, i.e. `Mesh`. Raises\
+        ValueError if the header names a class other than the mesh classes of\
+        `fealpy.mesh`.
+
+    Returns:
+        Mesh: The mesh, of the saved class.
+    """
+    from .mesh_base import Mesh
+    header = read_header(filename)
+    mesh_class = _mesh_class(header['class'])
+    cls = Mesh if cls is None else cls
+    if not issubclass(mesh_class, cls):
+        raise TypeError(f"{filename} contains a {mesh_class.__name__}, "
+                        f"which is not a {cls.__name__}.")
+
+    def read(item):
+        dtype, shape = np.dtype(item['dtype']), tuple(item['shape'])
+        if not mmap or 0 in shape:
+            count = int(np.prod(shape))
+            array = np.fromfile(filename, dtype=dtype, count=count, offset=item['offset'])
+            return bm.from_numpy(array.reshape(shape))
+        return bm.from_numpy(np.memmap(filename, dtype=dtype, mode='c',
+                                       offset=item['offset'], shape=shape))
+
+    arrays = {name: read(item) for name, item in header['arrays'].items()}
+    for name, target in header['alias'].items():
+        arrays[name] = arrays[target]
+
+    def group(prefix: str):
+        n = len(prefix) + 1
+        return {k[n:]: v for k, v in arrays.items() if k.startswith(prefix + '/')}
+
+    # Keep the saved index type, so that the arrays are not copied.
+    itype = bm.int32 if header['itype'] == 'int32' else bm.int64
+    mesh = mesh_class._from_binary_args(group('args'), header['kwargs'], itype)
+    for dim, value in group('entity').items():
+        mesh.storage()[int(dim)] = value
+    for name, value in group('topology').items():
+        setattr(mesh, name, value)
+
+    for attr in _DATA_ATTR:
+        data = getattr(mesh, attr, None)
+        if isinstance(data, dict):
+            data.update(group(attr))
+    for key, value in header['values'].items():
+        attr, name = key.split('/', 1)
+        getattr(mesh, attr)[name] = value
+    return mesh
@@ -0,0 +1,241 @@
+
+from typing import Union, Tuple, Sequence
+from math import prod, ceil
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .mesh_base import SimplexMesh, TensorMesh
+
+
+# Reference coordinates of the vertices of the linear tensor cells, in the
+# order of the cell nodes of `QuadrangleMesh` and `HexahedronMesh`.
+_TENSOR_VERTICES = {
+    2: [(0, 0), (1, 0), (1, 1), (0, 1)],
+    3: [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+        (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+}
+
+
+class PointLocator():
+    """Spatial index to find the cells containing given points.
+
+    The bounding boxes of the cells are registered in a uniform grid of
+    buckets over the bounding box of the mesh, with about `cells_per_bucket`
+    cells in every bucket. A query looks up the bucket of each point, and
+    tests the candidate cells of the bucket by their reference coordinates:
+    the barycentric coordinates for simplices, and the coordinates of the
+    (bi/tri)linear map, found by Newton iterations, for quadrangles and
+    hexahedra. All the steps are vectorized with `backend_manager`, and
+    the points are processed in chunks of `chunk_size` to bound the memory.
+
+    Example:
+    ```
+        locator = PointLocator(mesh)
+        cell, bc = locator.point_to_bc(points)
+        inside = cell >= 0
+    ```
+    """
+    def __init__(self, mesh: Union[SimplexMesh, TensorMesh], /, *,
+                 cells_per_bucket: float=2.0,
+                 tol: float=1e-10,
+                 chunk_size: int=2**20):
+        """
+        Parameters:
+            mesh (SimplexMesh | TensorMesh): A triangle, tetrahedron, quadrangle or\
+            hexahedron mesh, whose geometric and topological dimensions are equal.
+            cells_per_bucket (float, optional): Average number of cells per bucket.\
+            Defaults to 2.0.
+            tol (float, optional): Tolerance of the reference coordinates, so that\
+            the points on the boundary of a cell are found. Defaults to 1e-10.
+            chunk_size (int, optional): Number of points processed at once. Defaults to 2**20.
+        """
+        GD, TD = mesh.geo_dimension(), mesh.top_dimension()
+        if GD != TD:
+            raise ValueError("Point location requires a mesh with equal geometric "
+                             f"and topological dimensions, but got GD={GD}, TD={TD}.")
+        node = mesh.entity('node')
+        cell = mesh.entity('cell')
+        if isinstance(mesh, SimplexMesh) and cell.shape[1] == TD + 1:
+            self.simplex = True
+            self.ref_dim = TD + 1
+        elif isinstance(mesh, TensorMesh) and TD in _TENSOR_VERTICES and cell.shape[1] == 2**TD:
+            self.simplex = False
+            self.ref_dim = TD
+        else:
+            raise TypeError(f"Point location is not supported by {type(mesh).__name__}.")
+
+        self.GD = GD
+        self.tol = tol
+        self.chunk_size = chunk_size
+        self.node = node
+        self.cell = cell
+        kwargs = bm.context(node)
+        ikw = {'dtype': bm.int64, 'device': bm.get_device(node)}
+
+        if self.simplex:
+            # Inverse Jacobian of the affine maps, (NC, TD, GD).
+            v0 = node[cell[:, 0]]
+            J = bm.stack([node[cell[:, i]] - v0 for i in range(1, TD + 1)], axis=-1)
+            self.inv_jacobi = bm.linalg.inv(J)
+        else:
+            V = bm.tensor(_TENSOR_VERTICES[TD], **kwargs)
+            self._a = 1.0 - V      # phi_v(t) = prod_d (a_vd + b_vd t_d)
+            self._b = 2.0 * V - 1.0
+
+        # Buckets of the cell bounding boxes.
+        cnode = node[cell]
+        lo, hi = bm.min(cnode, axis=1), bm.max(cnode, axis=1)
+        self.origin = bm.min(lo, axis=0)
+        extent = bm.to_numpy(bm.max(hi, axis=0) - self.origin)
+        NC = cell.shape[0]
+        nbuckets = max(NC / cells_per_bucket, 1.0)
+        h = (prod(max(float(e), 1e-300) for e in extent) / nbuckets) ** (1.0 / GD)
+        self.shape = tuple(max(1, min(ceil(float(e) / h), 1 << 20)) for e in extent)
+        self.h = bm.tensor([max(float(e), 1e-300) / s for e, s in zip(extent, self.shape)], **kwargs)
+
+        i0 = self._bucket_index(lo)
+        count = self._bucket_index(hi) - i0 + 1 # (NC, GD)
+        total = bm.prod(count, axis=1)
+        pair_cell = bm.repeat(bm.arange(NC, **ikw), total)
+        offset = bm.cumsum(total, axis=0) - total
+        local = bm.arange(pair_cell.shape[0], **ikw) - bm.repeat(offset, total)
+        index = []
+        for d in range(GD - 1, -1, -1):
+            cd = count[pair_cell, d]
+            index.append(i0[pair_cell, d] + local % cd)
+            local = local // cd
+        bucket = self._ravel(index[::-1])
+        order = bm.argsort(bucket, stable=True)
+        self.bucket_cell = pair_cell[order]
+        nb = prod(self.shape)
+        self.bucket_ptr = bm.concat([
+            bm.zeros((1,), **ikw),
+            bm.cumsum(bm.bincount(bucket, minlength=nb), axis=0)
+        ], axis=0)
+
+    @property
+    def number_of_buckets(self) -> int:
+        return prod(self.shape)
+
+    def _bucket_index(self, points: TensorLike) -> TensorLike:
+        index = bm.astype(bm.floor((points - self.origin) / self.h), bm.int64)
+        upper = bm.tensor(self.shape, dtype=bm.int64, device=bm.get_device(index)) - 1
+        return bm.clip(index, 0 * upper, upper)
+
+    def _ravel(self, index: Sequence[TensorLike]) -> TensorLike:
+        out = index[0]
+        for d in range(1, len(index)):
+            out = out * self.shape[d] + index[d]
+        return out
+
+    def locate(self, points: TensorLike) -> TensorLike:
+        """Find the cells containing the points.
+
+        Parameters:
+            points (Tensor): The points, shaped (..., GD).
+
+        Returns:
+            Tensor: Index of the cell containing each point, shaped (...),\
+            and -1 for the points outside the mesh.
+        """
+        return self.point_to_bc(points)[0]
+
+    def point_to_bc(self, points: TensorLike) -> Tuple[TensorLike, Union[TensorLike, Tuple[TensorLike, ...]]]:
+        """Find the cells containing the points, and the reference coordinates
+        of the points in the cells.
+
+        Parameters:
+            points (Tensor): The points, shaped (..., GD).
+
+        Returns:
+            Tensor: Index of the cell containing each point, shaped (...),\
+            and -1 for the points outside the mesh.
+            Tensor | Tuple[Tensor, ...]: The barycentric coordinates shaped (..., TD+1)\
+            for simplices, or a tuple of the 1D barycentric coordinates (1 - t, t)\
+            shaped (..., 2) of every direction for tensor cells. They are zeros\
+            for the points outside.
+        """
+        batch = points.shape[:-1]
+        points = bm.reshape(points, (-1, self.GD))
+        cells, bcs = [], []
+        for start in range(0, max(points.shape[0], 1), self.chunk_size):
+            c, bc = self._query(points[start:start + self.chunk_size])
+            cells.append(c)
+            bcs.append(bc)
+        cell = bm.reshape(bm.concat(cells, axis=0), batch)
+        bc = bm.concat(bcs, axis=0)
+        if self.simplex:
+            return cell, bm.reshape(bc, batch + (bc.shape[-1],))
+        TD = bc.shape[-1]
+        return cell, tuple(bm.reshape(bm.stack([1 - bc[:, d], bc[:, d]], axis=-1), batch + (2,))
+                           for d in range(TD))
+
+    def _query(self, points: TensorLike):
+        NP = points.shape[0]
+        ikw = {'dtype': bm.int64, 'device': bm.get_device(points)}
+        upper = self.origin + self.h * bm.tensor(self.shape, **bm.context(points))
+        margin = self.tol * self.h
+        in_box = bm.all((points >= self.origin - margin) & (points <= upper + margin), axis=-1)
+        bucket = self._ravel([self._bucket_index(points)[:, d] for d in range(self.GD)])
+        start = self.bucket_ptr[bucket]
+        count = bm.where(in_box, self.bucket_ptr[bucket + 1] - start, 0)
+
+        pair_point = bm.repeat(bm.arange(NP, **ikw), count)
+        offset = bm.cumsum(count, axis=0) - count
+        local = bm.arange(pair_point.shape[0], **ikw) - bm.repeat(offset, count)
+        pair_cell = self.bucket_cell[start[pair_point] + local]
+        if pair_cell.shape[0] == 0:
+            return bm.full((NP,), -1, **ikw), bm.zeros((NP, self.ref_dim), **bm.context(points))
+        inside, ref = self._reference(points[pair_point], pair_cell)
+
+        # Any accepted candidate of a point (e.g. on a shared face) is valid,
+        # but its cell and coordinates are taken from the same pair.
+        pick = bm.full((NP,), -1, **ikw)
+        accepted = bm.nonzero(inside)[0]
+        pick = bm.set_at(pick, pair_point[accepted], accepted)
+        found = pick >= 0
+        pick = bm.where(found, pick, 0)
+        cell = bm.where(found, pair_cell[pick], -1)
+        ref = bm.where(found[:, None], ref[pick], 0.0)
+        return cell, ref
+
+    def _reference(self, points: TensorLike, cell: TensorLike):
+        """Reference coordinates of the points in the cells, pairwise, and
+        whether they are inside the reference cell."""
+        tol = self.tol
+        node = self.node
+        if self.simplex:
+            v0 = node[self.cell[cell, 0]]
+            lam = bm.einsum('pij, pj -> pi', self.inv_jacobi[cell], points - v0)
+            bc = bm.concat([1 - bm.sum(lam, axis=-1, keepdims=True), lam], axis=-1)
+            return bm.all(bc >= -tol, axis=-1), bc
+
+        X = node[self.cell[cell]] # (P, NV, GD)
+        a, b = self._a, self._b
+        TD = a.shape[-1]
+        t = bm.full(points.shape, 0.5, **bm.context(points))
+        converged = bm.zeros((t.shape[0],), dtype=bm.bool, device=bm.get_device(t))
+        # Newton iterations on the pairs not converged yet. The candidates far
+        # from their points may not converge, and are never accepted.
+        active = bm.arange(t.shape[0], dtype=bm.int64, device=bm.get_device(t))
+        for _ in range(20):
+            ta, Xa = t[active], X[active]
+            F = a[None] + b[None] * ta[:, None, :] # (P, NV, TD)
+            phi = bm.prod(F, axis=-1)
+            dphi = []
+            for d in range(TD):
+                others = [F[..., e] for e in range(TD) if e != d]
+                dphi.append(b[None, :, d] * prod(others))
+            dphi = bm.stack(dphi, axis=-1) # (P, NV, TD)
+            r = bm.einsum('pv, pvg -> pg', phi, Xa) - points[active]
+            J = bm.einsum('pvd, pvg -> pgd', dphi, Xa)
+            # Keep the iterates near the reference cell.
+            tn = bm.clip(ta - bm.linalg.solve(J, r[..., None])[..., 0], -1.0, 2.0)
+            t = bm.set_at(t, active, tn)
+            done = bm.max(bm.abs(tn - ta), axis=-1) < 1e-12
+            converged = bm.set_at(converged, active[done], True)
+            active = active[~done]
+            if active.shape[0] == 0:
+                break
+        inside = converged & bm.all((t >= -tol) & (t <= 1 + tol), axis=-1)
+        return inside, t
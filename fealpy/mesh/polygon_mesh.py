@@ -36,6 +36,14 @@ class PolygonMesh(Mesh, Plotable):
         self.celldata = {}
         self.meshdata = {}
 
+    def _binary_args(self):
+        cell, cellLocation = self.cell
+        return {'node': self.node, 'cell': cell, 'cellLocation': cellLocation}, {}
+
+    @classmethod
+    def _from_binary_args(cls, args, kwargs, itype):
+        return cls._with_itype(itype, args['node'], (args['cell'], args['cellLocation']))
+
     def total_edge(self) -> TensorLike:
         cell, cellLocation = self.cell
         kwargs = bm.context(cell)
@@ -26,7 +26,7 @@ class QuadrangleMesh(TensorMesh, Plotable):
 
         self.localCell = None
 
-        self.construct()
+        self.construct(lazy=True)
 
         self.nodedata = {}
         self.edgedata = {}
@@ -427,7 +427,7 @@ class QuadrangleMesh(TensorMesh, Plotable):
             self.node = bm.concatenate([self.node, edgeCenter, cellCenter], axis=0)
             self.cell = cell
 
-            self.construct()
+            self.construct(lazy=True)
         if returnim is True:
             return IM
 
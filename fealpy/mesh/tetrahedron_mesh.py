@@ -29,7 +29,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             (3, 0, 2, 1), (3, 2, 1, 0), (3, 1, 0, 2)], **kwargs)
 
         self.ccw = bm.tensor([0, 1, 2], **kwargs)
-        self.construct()
+        self.construct(lazy=True)
         self.OFace = bm.tensor([
             (1, 2, 3),  (0, 3, 2), (0, 1, 3), (0, 2, 1)], **kwargs)
         self.SFace = bm.tensor([
@@ -201,14 +201,14 @@ class TetrahedronMesh(SimplexMesh, Plotable):
     def grad_lambda(self, index=_S):
         localFace = self.localFace
         node = self.node
-        cell = self.cell
-        NC = self.number_of_cells() if index == _S else len(index)
+        cell = self.cell[index]
+        NC = cell.shape[0]
         Dlambda = bm.zeros((NC, 4, 3), device=self.device, dtype=self.ftype)
         volume = self.entity_measure('cell', index=index)
         for i in range(4):
             j,k,m = localFace[i]
-            vjk = node[cell[index, k],:] - node[cell[index, j],:]
-            vjm = node[cell[index, m],:] - node[cell[index, j],:]
+            vjk = node[cell[:, k],:] - node[cell[:, j],:]
+            vjm = node[cell[:, m],:] - node[cell[:, j],:]
             Dlambda[:, i, :] = bm.cross(vjm, vjk)/(6*volume.reshape(-1, 1))
         return Dlambda
     
@@ -533,7 +533,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             newCell = bm.set_at(newCell , (slice(7*NC , 8*NC),2) , p[bm.arange(NC), T[:, 4]])
             newCell = bm.set_at(newCell , (slice(7*NC , 8*NC),3) , p[bm.arange(NC), T[:, 5]])
             self.cell = newCell
-            self.construct()
+            self.construct(lazy=True)
 
             #self.ds.reinit(NN+NE, newCell)
     def circumcenter(self, index=_S, returnradius=False):
@@ -604,7 +604,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             cell = bm.set_at(cell, cellidx[flag], cell[cellidx[flag]][:, [3, 2, 1, 0]])
 
         if rflag == True:
-            self.construct()
+            self.construct(lazy=True)
 
     def uniform_bisect(self, n=1):
         for i in range(n):
@@ -793,7 +793,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
 
         self.node = node[:NN]
         self.cell = cell[:NC]
-        self.construct()
+        self.construct(lazy=True)
         
 
         for key in self.celldata:
@@ -33,7 +33,7 @@ class TriangleMesh(SimplexMesh, Plotable):
             (1, 2, 0),
             (2, 0, 1)], **kwargs)
 
-        self.construct()
+        self.construct(lazy=True)
 
         self.nodedata = {}
         self.edgedata = {}
@@ -323,30 +323,70 @@ class TriangleMesh(SimplexMesh, Plotable):
             self.cell = bm.concatenate(
                     (p[:,[0,5,4]], p[:,[5,1,3]], p[:,[4,3,2]], p[:,[3,4,5]]),
                     axis=0)
-            self.construct()
+            self.construct(lazy=True)
 
         if returnim is True:
             return IM
 
-    def is_crossed_cell(self, point, segment):
-        """
-        @berif 给定一组线段，找到这些线段的一个邻域单元集合, 且这些单元要满足一定的连通
-        性
-        """
-        pass
-    
-    def location(self, points):
-        """
-        @breif  给定一组点 p , 找到这些点所在的单元
+    def is_crossed_cell(self, point: TensorLike, segment: TensorLike) -> TensorLike:
+        """Find a connected set of cells around the given segments.
 
-        这里假设：
+        A cell is crossed if it intersects one of the segments: the vertices of
+        the cell are not all on one side of the line of the segment, and the two
+        ends of the segment are not both outside the same edge of the cell. The
+        cells around the nodes on the segments, and around the nodes where the
+        crossed cells only touch each other, are also marked, so that the marked
+        cells are connected through their edges.
 
-        1. 所有点在网格内部，
-        2. 网格中没有洞
-        3. 区域还要是凸的
+        Parameters:
+            point (Tensor): The points shaped (NP, 2).
+            segment (Tensor): The segments given by the indices of their two points, shaped (NS, 2).
+
+        Returns:
+            Tensor: Whether every cell is crossed, shaped (NC,).
         """
-        pass
+        NN = self.number_of_nodes()
+        NC = self.number_of_cells()
+        node = self.entity('node')
+        cell = self.entity('cell')
+        v = node[cell] # (NC, 3, 2)
+        length = bm.max(node, axis=0) - bm.min(node, axis=0)
+        eps = 1e-12 * float(bm.sum(length**2))
+
+        def cross(a, b):
+            return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+        isCrossedCell = bm.zeros((NC, ), dtype=bm.bool, device=self.device)
+        isCrossedNode = bm.zeros((NN, ), dtype=bm.bool, device=self.device)
+        p0 = point[segment[:, 0]]
+        p1 = point[segment[:, 1]]
+
+        for i in range(segment.shape[0]):
+            d = p1[i] - p0[i]
+            a = cross(d, v - p0[i]) # side of the vertices to the line
+            flag = ~(bm.all(a > eps, axis=-1) | bm.all(a < -eps, axis=-1))
+            for j in range(3): # the cells are counterclockwise
+                e = v[:, (j+2)%3] - v[:, (j+1)%3]
+                out0 = cross(e, p0[i] - v[:, (j+1)%3]) < -eps
+                out1 = cross(e, p1[i] - v[:, (j+1)%3]) < -eps
+                flag = flag & ~(out0 & out1)
+            isCrossedCell = isCrossedCell | flag
+
+            w = node - p0[i]
+            t = bm.sum(w * d, axis=-1)
+            onLine = bm.abs(cross(d, w)) <= eps
+            isCrossedNode = isCrossedNode | (onLine & (t >= 0) & (t <= bm.sum(d * d)))
+
+        # The nodes shared by more than two edges between crossed and other cells.
+        edge = self.entity('edge')
+        edge2cell = self.edge2cell
+        flag = isCrossedCell[edge2cell[:, 0]] ^ isCrossedCell[edge2cell[:, 1]]
+        if bm.any(flag):
+            valence = bm.bincount(bm.reshape(edge[flag], (-1, )), minlength=NN)
+            isCrossedNode = isCrossedNode | (valence > 2)
 
+        return isCrossedCell | bm.any(isCrossedNode[cell], axis=-1)
+    
     def circumcenter(self, index: Index=_S, returnradius=False):
         """
         @brief 计算三角形外接圆的圆心和半径
@@ -592,7 +632,7 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         self.NN = self.node.shape[0]
         self.cell = cell
-        self.construct()
+        self.construct(lazy=True)
 
     def coarsen(self, isMarkedCell=None, options={}):
         """
@@ -707,7 +747,7 @@ class TriangleMesh(SimplexMesh, Plotable):
         cell = idxMap[cell]
 
         self.cell = cell
-        self.construct()
+        self.construct(lazy=True)
 
     def label(self, node=None, cell=None, cellidx=None):
         """
@@ -758,7 +798,7 @@ class TriangleMesh(SimplexMesh, Plotable):
             cell = bm.set_at(cell , cellidx[flag] , cell[cellidx[flag]][:, [2, 0, 1]])
 
         if rflag == True:
-            self.construct()
+            self.construct(lazy=True)
 
     def delete_degree_4(self):
         pass
@@ -1030,7 +1070,7 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         self.node = node[:NN]
         self.cell = cell[:NC]
-        self.construct()
+        self.construct(lazy=True)
 
     def jacobian_matrix(self, index: Index=_S):
         """
@@ -1049,12 +1089,6 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         return J
 
-    def point_to_bc(self, point):
-        """
-        @brief 找到定点 point 所在的单元，并计算其重心坐标 
-        """
-        pass
-
     def mark_interface_cell(self, phi):
         """
         @brief 标记穿过界面的单元
@@ -167,6 +167,19 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
         (0, 1, 8, 10), (2, 3, 9, 11),
         (0, 2, 4, 6), (1, 3, 5, 7)], dtype=self.itype)
 
+    def _binary_args(self):
+        from .mesh_io import dtype_name
+        kwargs = {'extent': self.extent, 'h': self.h, 'origin': self.origin,
+                  'ipoints_ordering': self.ipoints_ordering,
+                  'flip_direction': self.flip_direction,
+                  'itype': dtype_name(self.itype), 'ftype': dtype_name(self.ftype)}
+        return {}, kwargs
+
+    @classmethod
+    def _from_binary_args(cls, args, kwargs, itype):
+        kwargs = dict(kwargs, itype=itype, ftype=getattr(bm, kwargs['ftype']))
+        return cls(**kwargs)
+
 
     # 实体生成方法
     @entitymethod(0)
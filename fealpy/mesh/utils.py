@@ -78,9 +78,42 @@ def inverse_relation(entity: TensorLike, size: int, index=None, *, sorted=True):
     return row, col, (size, entity.shape[0])
 
 
-def flocc(array: TensorLike, /):
+def _packed_keys(array: TensorLike, /):
+    """Pack the columns of a non-negative integer 2D array into as few int64
+    keys as possible, preserving the lexicographic order of the rows.
+
+    Returns:
+        out (Tuple[TensorLike, ...] | None): The keys, most significant first,\
+        or None if the array has negative entries.
+    """
+    if array.shape[0] == 0 or int(bm.min(array)) < 0:
+        return None
+    base = int(bm.max(array)) + 1
+    keys = []
+    start, NV = 0, array.shape[1]
+    while start < NV:
+        stop = start + 1
+        while stop < NV and base ** (stop - start + 1) <= 2**63:
+            stop += 1
+        key = bm.astype(array[:, start], bm.int64)
+        for k in range(start + 1, stop):
+            key = key * base + bm.astype(array[:, k], bm.int64)
+        keys.append(key)
+        start = stop
+    return tuple(keys)
+
+
+def flocc(array: TensorLike, /, *, packed: bool=True):
     """Find the first and last occurrence of each unique row in a 2D array.
 
+    Parameters:
+        array (TensorLike): The 2D integer array.
+        packed (bool, optional): Whether to pack each row into integer keys\
+        first, so that rows of up to 63 bits (e.g. faces of meshes with up to\
+        2^21 nodes, or edges with up to 2^31 nodes) are ordered by a single-key\
+        stable sort, and wider rows by a lexsort over fewer keys. The output is\
+        the same as without packing. Defaults to True.
+
     Returns:
         out (TensorLike, TensorLike, TensorLike):
         - The first occurrence index of each unique row.
@@ -90,8 +123,17 @@ def flocc(array: TensorLike, /):
     if array.ndim != 2:
         raise ValueError("total_face must be a 2D array.")
 
-    indices = bm.lexsort(tuple(reversed(array.T)), axis=0)
-    sorted_array = array[indices]
+    keys = _packed_keys(array) if packed else None
+
+    if keys is None:
+        indices = bm.lexsort(tuple(reversed(array.T)), axis=0)
+        sorted_array = array[indices]
+    elif len(keys) == 1:
+        indices = bm.argsort(keys[0], stable=True)
+        sorted_array = keys[0][indices][:, None]
+    else:
+        indices = bm.lexsort(tuple(reversed(keys)), axis=0)
+        sorted_array = bm.stack([k[indices] for k in keys], axis=1)
     diff_flag = bm.any(
         sorted_array[1:] != sorted_array[:-1],
         axis=1,
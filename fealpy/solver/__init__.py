@@ -1,4 +1,20 @@
 
 from .conjugate_gradient import cg
-from .direct_solver import spsolve
+from .direct_solver import spsolve, DirectSolver, clear_factor_cache
+from .mixed_precision import iterative_refinement
 from .gmres_solver import gmres
+from .bicgstab_solver import bicgstab
+from .minres_solver import minres
+from .lobpcg_solver import lobpcg
+from .amg_solver import AMGSolver, rigid_body_modes
+from .gmg_solver import GeometricMultigrid, nodal_prolongation
+from .preconditioner import (
+    JacobiPreconditioner, BlockJacobiPreconditioner, SSORPreconditioner,
+    IC0Preconditioner, ILU0Preconditioner, CallablePreconditioner, get_preconditioner
+)
+from .block_preconditioner import (
+    BlockOperator, BlockDiagonalPreconditioner, BlockTriangularPreconditioner,
+    MassSchurPreconditioner
+)
+from .schwarz_preconditioner import AdditiveSchwarzPreconditioner, partition_cells
+from .solver_info import SolverInfo
@@ -0,0 +1,328 @@
+from typing import Optional, List, Union, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ..sparse.ops import ptap
+from .smoother import matrix_diagonal, spectral_radius
+from .multigrid import Multigrid
+
+_KNUTH = 2654435761 # a prime, so that i*_KNUTH % N permutes range(N)
+
+
+def rigid_body_modes(points: TensorLike) -> TensorLike:
+    """Rigid body modes of linear elasticity as the near-nullspace of AMG.
+
+    The DoFs are assumed interleaved by nodes, i.e. (u_0, v_0, u_1, v_1, ...),
+    matching `block_size=GD` of `AMGSolver`.
+
+    Parameters:
+        points (Tensor): Coordinates of the nodes shaped (NN, GD), GD = 2 or 3.
+
+    Returns:
+        Tensor: The modes shaped (NN*GD, 3) in 2D, or (NN*GD, 6) in 3D.
+    """
+    NN, GD = points.shape
+    kwargs = bm.context(points)
+    one = bm.ones((NN,), **kwargs)
+    zero = bm.zeros((NN,), **kwargs)
+    x = points[:, 0]
+    y = points[:, 1]
+
+    if GD == 2:
+        modes = [(one, zero), (zero, one), (-y, x)]
+    elif GD == 3:
+        z = points[:, 2]
+        modes = [(one, zero, zero), (zero, one, zero), (zero, zero, one),
+                 (-y, x, zero), (zero, -z, y), (z, zero, -x)]
+    else:
+        raise ValueError(f"Rigid body modes are defined in 2D and 3D, but GD = {GD}.")
+
+    B = [bm.reshape(bm.stack(m, axis=1), (-1,)) for m in modes]
+    return bm.stack(B, axis=1)
+
+
+def _row_max(crow: TensorLike, col: TensorLike, w: TensorLike) -> TensorLike:
+    """Maximum of the non-negative integers w[col] in each row of a CSR
+    structure without empty rows, by one sort of keys row*W + w[col]."""
+    n = crow.shape[0] - 1
+    W = int(bm.max(w)) + 1
+    row = bm.repeat(bm.arange(n, **bm.context(crow)), crow[1:] - crow[:-1])
+    key = bm.sort(bm.astype(row, bm.int64) * W + w[col])
+    return key[crow[1:] - 1] - bm.astype(bm.arange(n, **bm.context(crow)), bm.int64) * W
+
+
+def strength_graph(A: CSRTensor, theta: float=0.0, block_size: int=1) -> Tuple[TensorLike, TensorLike]:
+    """Symmetric strength-of-connection graph of the matrix.
+
+    Nodes i != j are strongly connected if |a_ij| >= theta sqrt(|a_ii a_jj|),
+    where a_ij is the Frobenius norm of the (i, j) block if `block_size` > 1.
+
+    Returns:
+        Tuple[Tensor, Tensor]: Row pointers and column indices of the graph
+            with self-loops, and sorted columns in each row.
+    """
+    n = A.shape[0]
+    nn = n // block_size
+    row, col, val = A.row(), A.col(), A.values()
+
+    if block_size > 1:
+        coo = COOTensor(bm.stack([row // block_size, col // block_size], axis=0),
+                        val**2, (nn, nn)).coalesce()
+        i, j = coo.indices()[0], coo.indices()[1]
+        mag = bm.sqrt(coo.values())
+    else:
+        i, j, mag = row, col, bm.abs(val)
+
+    is_diag = (i == j)
+    dmag = bm.zeros((nn,), **bm.context(mag))
+    dmag = bm.index_add(dmag, i[is_diag], mag[is_diag])
+    strong = (~is_diag) & (mag > 0)
+    if theta > 0:
+        strong = strong & (mag >= theta * bm.sqrt(dmag[i] * dmag[j]))
+    i, j = i[strong], j[strong]
+
+    loop = bm.arange(nn, **bm.context(i))
+    indices = bm.stack([bm.concat([i, j, loop], axis=0),
+                        bm.concat([j, i, loop], axis=0)], axis=0)
+    G = COOTensor(indices, None, (nn, nn)).coalesce(accumulate=False).tocsr()
+    return G.crow(), G.col()
+
+
+def aggregate(crow: TensorLike, col: TensorLike) -> Tuple[TensorLike, int]:
+    """Aggregate the nodes of a graph around a maximal independent set of G^2.
+
+    The roots are selected by the parallel (Luby) algorithm with fixed
+    pseudo-random priorities: an undecided node becomes a root if it has the
+    largest priority among undecided nodes within distance 2, and nodes within
+    distance 2 of new roots are excluded. Then every node joins the aggregate
+    of a neighbouring root, and the rest join the aggregate of a neighbour.
+    Isolated nodes (e.g. rows of Dirichlet DoFs) are not aggregated.
+
+    Parameters:
+        crow (Tensor): Row pointers of the graph with self-loops.
+        col (Tensor): Column indices of the graph.
+
+    Returns:
+        Tuple[Tensor, int]: Aggregate of each node shaped (n,) with -1 for
+            isolated nodes, and the number of aggregates.
+    """
+    n = crow.shape[0] - 1
+    degree = crow[1:] - crow[:-1]
+    isolated = degree <= 1
+    if n == 0 or bm.all(isolated):
+        return bm.full((n,), -1, dtype=bm.int64, device=bm.get_device(crow)), 0
+
+    ones = bm.ones(col.shape, dtype=bm.float64, device=bm.get_device(col))
+    G = CSRTensor(crow, col, ones, (n, n))
+    prio = (bm.arange(n, dtype=bm.int64, device=bm.get_device(crow)) * _KNUTH) % n + 1
+    zero = bm.zeros((n,), dtype=bm.int64, device=bm.get_device(crow))
+
+    undecided = ~isolated
+    root = bm.zeros((n,), dtype=bm.bool, device=bm.get_device(crow))
+    while bm.any(undecided):
+        w = bm.where(undecided, prio, zero)
+        m = _row_max(crow, col, _row_max(crow, col, w))
+        new_root = undecided & (w == m)
+        root = root | new_root
+        near = G @ (G @ bm.astype(new_root, bm.float64))
+        undecided = undecided & (near == 0)
+
+    aggid = bm.cumsum(bm.astype(root, bm.int64), axis=0)
+    nagg = int(aggid[-1])
+    w = bm.where(root, aggid, zero)
+    m = _row_max(crow, col, w)
+    agg = bm.where(isolated, -1, m - 1)
+
+    # Nodes at distance 2 from the roots join the aggregate of a neighbour.
+    while True:
+        left = (agg < 0) & (~isolated)
+        if not bm.any(left):
+            break
+        m = _row_max(crow, col, agg + 1)
+        if not bm.any(left & (m > 0)):
+            break
+        agg = bm.where(left & (m > 0), m - 1, agg)
+
+    return agg, nagg
+
+
+def _segment_sum(values: TensorLike, segment: TensorLike, num_segments: int) -> TensorLike:
+    out = bm.zeros((num_segments,), **bm.context(values))
+    return bm.index_add(out, segment, values)
+
+
+def tentative_prolongator(agg: TensorLike, nagg: int, B: TensorLike,
+                          block_size: int=1) -> Tuple[CSRTensor, TensorLike]:
+    """Tentative prolongator by orthonormalizing the near-nullspace in each aggregate.
+
+    The Gram-Schmidt process runs for all aggregates at once, with segmented
+    sums over the aggregates. Columns that vanish on an aggregate are dropped.
+
+    Parameters:
+        agg (Tensor): Aggregate of each node shaped (n/block_size,), -1 if not aggregated.
+        nagg (int): Number of aggregates.
+        B (Tensor): Near-nullspace vectors shaped (n, nB).
+        block_size (int, optional): Number of DoFs of each node. Defaults to 1.
+
+    Returns:
+        Tuple[CSRTensor, Tensor]: The prolongator shaped (n, nc), and the
+            near-nullspace on the coarse level shaped (nc, nB).
+    """
+    n, nB = B.shape
+    kwargs = bm.context(B)
+    dof_agg = bm.repeat(agg, block_size) if block_size > 1 else agg
+    dofs = bm.nonzero(dof_agg >= 0)[0]
+    a = dof_agg[dofs]
+    Bs = B[dofs]
+
+    Q: List[TensorLike] = []
+    R = [[None] * nB for _ in range(nB)]
+    zero = bm.zeros((nagg,), **kwargs)
+    for j in range(nB):
+        v = Bs[:, j]
+        bnorm = bm.sqrt(_segment_sum(v * v, a, nagg))
+        for l in range(j):
+            c = _segment_sum(Q[l] * v, a, nagg)
+            R[l][j] = c
+            v = v - c[a] * Q[l]
+        for l in range(j+1, nB):
+            R[l][j] = zero
+        nrm = bm.sqrt(_segment_sum(v * v, a, nagg))
+        ok = nrm > 1e-10 * bnorm
+        nrm = bm.where(ok, nrm, zero)
+        R[j][j] = nrm
+        inv = bm.where(ok, 1.0 / bm.where(ok, nrm, 1.0), zero)
+        Q.append(v * inv[a])
+
+    R = bm.stack([bm.stack(r, axis=-1) for r in R], axis=1) # (nagg, nB, nB)
+    keep = bm.reshape(bm.einsum('aii -> ai', R) > 0, (-1,)) # (nagg*nB,)
+    cidx = bm.cumsum(bm.astype(keep, bm.int64), axis=0) - 1
+    nc = int(cidx[-1]) + 1 if keep.shape[0] > 0 else 0
+
+    Q = bm.stack(Q, axis=1) # (m, nB)
+    local = bm.arange(nB, dtype=bm.int64, device=bm.get_device(a))
+    cols = bm.reshape(bm.astype(a, bm.int64)[:, None] * nB + local[None, :], (-1,))
+    rows = bm.reshape(bm.broadcast_to(bm.astype(dofs, bm.int64)[:, None], Q.shape), (-1,))
+    vals = bm.reshape(Q, (-1,))
+    flag = keep[cols]
+    indices = bm.stack([rows[flag], cidx[cols[flag]]], axis=0)
+    T = COOTensor(indices, vals[flag], (n, nc)).tocsr()
+    Bc = bm.reshape(R, (-1, nB))[keep]
+    return T, Bc
+
+
+class AMGSolver(Multigrid):
+    """Smoothed aggregation algebraic multigrid for symmetric positive definite matrices.
+
+    The setup builds a hierarchy of levels from the CSR matrix only, with
+    vectorized kernels of `backend_manager` (no Python loops over rows):
+
+    1. the strength-of-connection graph of the matrix;
+    2. aggregation around a maximal independent set of the squared graph;
+    3. the tentative prolongator from the near-nullspace on each aggregate;
+    4. the smoothed prolongator P = (I - omega D^{-1}A) T;
+    5. the Galerkin coarse operator P^T A P.
+
+    The coarsest level is solved by a dense inverse. The solver can run V- or
+    W-cycles with damped Jacobi or Chebyshev smoothers, standalone by `solve`,
+    or as a preconditioner of `cg` through `M @ r`.
+
+    Example:
+    ```
+        A = bform.assembly()
+        A, F = DirichletBC(space, gd).apply(A, F)
+        amg = AMGSolver(A)
+        uh = cg(A, F, M=amg, rtol=1e-10)
+    ```
+    For linear elasticity, pass `block_size=GD` and the rigid body modes
+    `B=rigid_body_modes(points)` with the DoFs interleaved by nodes.
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor], *,
+                 B: Optional[TensorLike]=None,
+                 block_size: int=1,
+                 theta: float=0.0,
+                 max_levels: int=10,
+                 coarse_size: int=500,
+                 smoother: str='jacobi',
+                 presmooth: int=1,
+                 postsmooth: int=1,
+                 cycle: str='V'):
+        """Initialize and set up the solver.
+
+        Parameters:
+            A (CSRTensor | COOTensor): The symmetric positive definite matrix.
+            B (Tensor | None, optional): Near-nullspace vectors shaped (n, nB).
+                Defaults to None, meaning constant vectors of each component.
+            block_size (int, optional): Number of DoFs of each node, interleaved.
+                Defaults to 1.
+            theta (float, optional): Threshold of the strength of connection.
+                Defaults to 0.0, meaning all connections are strong.
+            max_levels (int, optional): Maximum number of levels. Defaults to 10.
+            coarse_size (int, optional): Size under which a level is solved directly.
+                Defaults to 500.
+            smoother (str, optional): 'jacobi' or 'chebyshev'. Defaults to 'jacobi'.
+            presmooth (int, optional): Number of pre-smoothing sweeps. Defaults to 1.
+            postsmooth (int, optional): Number of post-smoothing sweeps. Defaults to 1.
+            cycle (str, optional): 'V' or 'W'. Defaults to 'V'.
+        """
+        super().__init__(smoother=smoother, presmooth=presmooth,
+                         postsmooth=postsmooth, cycle=cycle)
+        if A.shape[0] % block_size != 0:
+            raise ValueError(f"Size of the matrix {A.shape[0]} is not a multiple "
+                             f"of the block size {block_size}.")
+        self.block_size = block_size
+        self.theta = theta
+        self.max_levels = max_levels
+        self.coarse_size = coarse_size
+        self.setup(A, B)
+
+    def setup(self, A: Union[CSRTensor, COOTensor], B: Optional[TensorLike]=None) -> None:
+        """Build the multigrid hierarchy of the matrix.
+
+        Parameters:
+            A (CSRTensor | COOTensor): The matrix.
+            B (Tensor | None, optional): Near-nullspace vectors shaped (n, nB).
+        """
+        A = A.tocsr()
+        n = A.shape[0]
+        k = self.block_size
+        kwargs = bm.context(A.values())
+        if B is None:
+            B = bm.reshape(bm.broadcast_to(bm.eye(k, **kwargs)[None, ...], (n // k, k, k)), (n, k))
+        if B.ndim == 1:
+            B = B[:, None]
+
+        self.A = [A]
+        self.P = []
+        self.R = []
+        self.S = []
+
+        while (len(self.A) < self.max_levels) and (self.A[-1].shape[0] > self.coarse_size):
+            A = self.A[-1]
+            dinv = 1.0 / matrix_diagonal(A)
+            rho = spectral_radius(A, dinv)
+
+            # Coarse DoFs are grouped by aggregates, unless some columns are dropped.
+            bs = k if len(self.A) == 1 else B.shape[1]
+            if A.shape[0] % bs != 0:
+                bs = 1
+            crow, col = strength_graph(A, self.theta, bs)
+            agg, nagg = aggregate(crow, col)
+            if nagg == 0:
+                break
+            T, Bc = tentative_prolongator(agg, nagg, B, bs)
+            if (T.shape[1] == 0) or (T.shape[1] >= A.shape[0]):
+                break
+
+            AT = A.matmul(T)
+            DAT = CSRTensor(AT.crow(), AT.col(), AT.values() * dinv[AT.row()], AT.sparse_shape)
+            P = T.add(DAT, alpha=-4.0 / (3.0 * rho))
+
+            self.S.append(self.make_smoother(A, dinv, rho))
+            self.P.append(P)
+            self.R.append(P.T)
+            self.A.append(ptap(P, A))
+            B = Bc
+
+        self.setup_coarse()
@@ -0,0 +1,161 @@
+
+import time
+from typing import Optional, Union, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .smoother import SupportsMatmul
+from .preconditioner import Preconditioner, get_preconditioner
+from .solver_info import SolverInfo
+
+from .. import logger
+
+
+def bicgstab(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+             M: Optional[Preconditioner]=None,
+             batch_first: bool=False,
+             atol: float=1e-12, rtol: float=1e-8,
+             maxiter: Optional[int]=10000,
+             return_info: bool=False) -> Union[TensorLike, Tuple[TensorLike, SolverInfo]]:
+    """Solve a linear system Ax = b using the BiConjugate Gradient Stabilized (BiCGStab) method.
+
+    Parameters:
+        A (SupportsMatmul): The coefficient matrix of the linear system, a sparse\
+        tensor or a matrix-free operator supporting `A @ x`.
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\
+        Must have the same shape as b when reshaped appropriately.
+        M (str | SupportsMatmul | Callable, optional): The right preconditioner applied as `M @ r`,\
+        approximating the inverse of A. See `get_preconditioner`. Default is None.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        return_info (bool, optional): Whether to return a `SolverInfo` with the number of\
+        iterations, the residual history and the wall time. Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        SolverInfo: Diagnostics of the solve, only if `return_info` is True.
+
+    Note:
+        BiCGStab works for general non-symmetric matrices. As in `cg`, every
+        column of a 2D `b` converges on its own and is then removed from the iteration.
+    """
+    assert isinstance(b, TensorLike), "b must be a Tensor"
+    single_vector = b.ndim == 1
+
+    if b.ndim not in {1, 2}:
+        raise ValueError("b must be a 1D or 2D dense tensor")
+
+    if x0 is None:
+        x0 = bm.zeros_like(b)
+    elif x0.shape != b.shape:
+        raise ValueError("x0 and b must have the same shape")
+
+    if (not single_vector) and batch_first:
+        b = bm.swapaxes(b, 0, 1)
+        x0 = bm.swapaxes(x0, 0, 1)
+
+    start = time.perf_counter()
+    M = get_preconditioner(M, A)
+    sol, info = _bicgstab_impl(A, b, x0, M, atol, rtol, maxiter)
+    info.wall_time = time.perf_counter() - start
+
+    if (not single_vector) and batch_first:
+        sol = bm.swapaxes(sol, 0, 1)
+
+    if return_info:
+        return sol, info
+    return sol
+
+
+def _bicgstab_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
+    single_vector = b.ndim == 1
+    if single_vector:
+        b, x0 = b[:, None], x0[:, None]
+
+    def apply(op, v):
+        if op is None:
+            return v
+        return (op @ v[:, 0])[:, None] if single_vector else op @ v
+
+    def dot(u, v):
+        return bm.sum(u*v, axis=0)
+
+    def safe(d):
+        return bm.where(d == 0, 1.0, d)
+
+    x = bm.copy(x0)
+    r = b - apply(A, x)
+    b_norm = bm.sqrt(dot(b, b))
+    tol = bm.where(rtol * b_norm > atol, rtol * b_norm, atol)
+    r_norm = bm.sqrt(dot(r, r))
+    history = [r_norm]
+    iterations = bm.zeros(r_norm.shape, dtype=bm.int64, device=bm.get_device(b))
+    converged = r_norm < tol
+    n_iter = 0
+
+    active = bm.nonzero(~converged)[0]
+    xa, r = x[:, active], r[:, active]
+    r_hat = bm.copy(r)
+    p = bm.copy(r)
+    rho = dot(r_hat, r)
+
+    while active.shape[0] > 0:
+        if (maxiter is not None) and (n_iter >= maxiter):
+            break
+
+        p_hat = apply(M, p)
+        v = apply(A, p_hat)
+        alpha = rho / safe(dot(r_hat, v))
+        s = r - alpha[None, :] * v
+        # Columns converged in the half step take only the update along p.
+        half = bm.sqrt(dot(s, s)) < tol[active]
+        s_hat = apply(M, s)
+        t = apply(A, s_hat)
+        omega = bm.where(half, 0.0, dot(t, s) / safe(dot(t, t)))
+        xa = xa + alpha[None, :] * p_hat + omega[None, :] * s_hat
+        r = s - omega[None, :] * t
+        n_iter += 1
+
+        r_norm = bm.set_at(bm.copy(r_norm), active, bm.sqrt(dot(r, r)))
+        history.append(r_norm)
+        iterations = bm.set_at(iterations, active, n_iter)
+        done = r_norm[active] < tol[active]
+
+        rho_new = dot(r_hat, r)
+        # Breakdown of the recurrence: restart these columns from their residual.
+        restart = (~done) & ((rho_new == 0) | (omega == 0))
+        if bm.any(restart):
+            r_hat = bm.where(restart[None, :], r, r_hat)
+            rho_new = bm.where(restart, dot(r, r), rho_new)
+        beta = (rho_new / safe(rho)) * (alpha / safe(omega))
+        p = r + beta[None, :] * (p - omega[None, :] * v)
+        p = bm.where(restart[None, :], r, p)
+        rho = rho_new
+
+        if bm.any(done):
+            x = bm.set_at(x, (slice(None), active[done]), xa[:, done])
+            converged = bm.set_at(converged, active[done], True)
+            keep = ~done
+            active, xa, r, p, r_hat = active[keep], xa[:, keep], r[:, keep], p[:, keep], r_hat[:, keep]
+            rho = rho[keep]
+
+    if active.shape[0] > 0:
+        x = bm.set_at(x, (slice(None), active), xa)
+        logger.info(f"BiCGStab: failed, stopped by maxiter ({maxiter}), "
+                    f"{active.shape[0]} of {b.shape[1]} columns not converged.")
+        reason = 'maxiter'
+    else:
+        logger.info(f"BiCGStab: converged in {n_iter} iterations.")
+        reason = 'tolerance'
+
+    history = bm.stack(history, axis=0)
+    if single_vector:
+        x, history = x[:, 0], history[:, 0]
+        iterations, converged = iterations[0], converged[0]
+    info = SolverInfo('BiCGStab', n_iter, iterations, converged, history, 0.0, reason)
+
+    return x, info
@@ -0,0 +1,252 @@
+from typing import Optional, Sequence, List
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike, Size
+from ..sparse import COOTensor, CSRTensor
+from .smoother import SupportsMatmul
+from .preconditioner import Preconditioner, get_preconditioner
+
+
+def _offsets(sizes: Sequence[int]) -> List[int]:
+    offsets = [0]
+    for s in sizes:
+        offsets.append(offsets[-1] + int(s))
+    return offsets
+
+
+def _block_size(blocks, axis: int, name: str, k: int) -> int:
+    for block in blocks:
+        if block is not None:
+            return int(block.shape[axis])
+    raise ValueError(f"Size of the block {name} {k} is unknown, since all its blocks are None.")
+
+
+class BlockOperator():
+    """Block matrix keeping the blocks separate.
+
+    The product `A @ u` is computed block by block, so the monolithic matrix
+    is never assembled. Together with the block preconditioners below, it can
+    be passed to `minres`, `gmres(..., 'fealpy')` or `bicgstab`.
+
+    Example:
+    ```
+        bform = BlockForm([[U_bform, P_bform], [P_bform.T, None]])
+        A = BlockOperator.from_form(bform)
+        A = A.dirichlet([is_u_bd_dof, None])
+        M = BlockDiagonalPreconditioner(A, [AMGSolver(A.block(0, 0)),
+                                            MassSchurPreconditioner(Mp, scale=mu)])
+        x = minres(A, F, M=M)
+    ```
+    """
+    def __init__(self, blocks: List[List[Optional[SupportsMatmul]]], /,
+                 row_sizes: Optional[Sequence[int]]=None,
+                 col_sizes: Optional[Sequence[int]]=None):
+        """
+        Parameters:
+            blocks (List[List[SupportsMatmul | None]]): The blocks, None for zero blocks.
+                Every block needs a `shape` if the sizes are not given.
+            row_sizes (Sequence[int] | None, optional): Number of rows of each block row.
+            col_sizes (Sequence[int] | None, optional): Number of columns of each block column.
+        """
+        nrows, ncols = len(blocks), len(blocks[0])
+        if any(len(row) != ncols for row in blocks):
+            raise ValueError("All block rows should have the same number of blocks.")
+        self.blocks = blocks
+        if row_sizes is None:
+            row_sizes = [_block_size([blocks[i][j] for j in range(ncols)], -2, 'row', i)
+                         for i in range(nrows)]
+        if col_sizes is None:
+            col_sizes = [_block_size([blocks[i][j] for i in range(nrows)], -1, 'column', j)
+                         for j in range(ncols)]
+        if len(row_sizes) != nrows or len(col_sizes) != ncols:
+            raise ValueError("The number of block sizes does not match the blocks.")
+        self.row_sizes = [int(s) for s in row_sizes]
+        self.col_sizes = [int(s) for s in col_sizes]
+        self.row_offsets = _offsets(self.row_sizes)
+        self.col_offsets = _offsets(self.col_sizes)
+
+    @classmethod
+    def from_form(cls, form, /) -> 'BlockOperator':
+        """Assemble the blocks of a `BlockForm` separately."""
+        return cls(form.assembly_blocks(format='csr'))
+
+    @classmethod
+    def from_matrix(cls, A: CSRTensor, /, sizes: Sequence[int]) -> 'BlockOperator':
+        """Split a matrix into square diagonal blocks of the given sizes."""
+        A = A.tocoo()
+        offsets = _offsets(sizes)
+        bounds = bm.tensor(offsets[1:-1], **bm.context(A.indices()))
+        row, col = A.indices()[0], A.indices()[1]
+        bi = bm.searchsorted(bounds, row, side='right')
+        bj = bm.searchsorted(bounds, col, side='right')
+        blocks = []
+        for i in range(len(sizes)):
+            blocks.append([])
+            for j in range(len(sizes)):
+                flag = (bi == i) & (bj == j)
+                if not bm.any(flag):
+                    blocks[i].append(None)
+                    continue
+                indices = bm.stack([row[flag] - offsets[i], col[flag] - offsets[j]], axis=0)
+                block = COOTensor(indices, A.values()[..., flag], (sizes[i], sizes[j]))
+                blocks[i].append(block.tocsr())
+        return cls(blocks, sizes, sizes)
+
+    @property
+    def shape(self) -> Size:
+        return (self.row_offsets[-1], self.col_offsets[-1])
+
+    @property
+    def nblocks(self) -> int:
+        """Number of block rows."""
+        return len(self.row_sizes)
+
+    def block(self, i: int, j: int) -> Optional[SupportsMatmul]:
+        return self.blocks[i][j]
+
+    def split(self, u: TensorLike, /, rows: bool=True) -> List[TensorLike]:
+        """Split a vector (or a block of column vectors) along the block rows,
+        or along the block columns if `rows` is False."""
+        offsets = self.row_offsets if rows else self.col_offsets
+        return [u[offsets[k]:offsets[k+1]] for k in range(len(offsets) - 1)]
+
+    def __matmul__(self, u: TensorLike) -> TensorLike:
+        parts = self.split(u, rows=False)
+        out = []
+        for i, row in enumerate(self.blocks):
+            v = bm.zeros((self.row_sizes[i],) + tuple(u.shape[1:]), **bm.context(u))
+            for j, block in enumerate(row):
+                if block is not None:
+                    v = v + block @ parts[j]
+            out.append(v)
+        return bm.concat(out, axis=0)
+
+    def dirichlet(self, is_bd_dof: Sequence[Optional[TensorLike]], /) -> 'BlockOperator':
+        """Eliminate the Dirichlet DoFs of each block row/column, as `DirichletBC`
+        does on a monolithic matrix: their rows and columns are removed, and
+        ones are put on the diagonal of the diagonal blocks.
+
+        Parameters:
+            is_bd_dof (Sequence[Tensor | None]): Boolean flags of the Dirichlet
+                DoFs of each block, None for blocks without Dirichlet DoFs.
+
+        Returns:
+            BlockOperator: The new operator. All the blocks should be sparse tensors.
+        """
+        n = self.nblocks
+        if len(is_bd_dof) != n:
+            raise ValueError(f"Expected {n} flags, but got {len(is_bd_dof)}.")
+        blocks = []
+        for i in range(n):
+            blocks.append([])
+            for j in range(n):
+                block = self.blocks[i][j]
+                if block is None or (is_bd_dof[i] is None and is_bd_dof[j] is None):
+                    blocks[i].append(block)
+                    continue
+                A = block.tocoo()
+                row, col = A.indices()[0], A.indices()[1]
+                remove = bm.zeros(row.shape, dtype=bm.bool, device=bm.get_device(row))
+                if is_bd_dof[i] is not None:
+                    remove = remove | is_bd_dof[i][row]
+                if is_bd_dof[j] is not None:
+                    remove = remove | is_bd_dof[j][col]
+                keep = ~remove
+                indices, values = A.indices()[:, keep], A.values()[..., keep]
+                if i == j:
+                    index = bm.nonzero(is_bd_dof[i])[0]
+                    indices = bm.concat([indices, bm.stack([index, index], axis=0)], axis=1)
+                    values = bm.concat([values, bm.ones(index.shape, **bm.context(values))], axis=-1)
+                blocks[i].append(COOTensor(indices, values, A.sparse_shape).coalesce().tocsr())
+        return BlockOperator(blocks, self.row_sizes, self.col_sizes)
+
+
+def _block_inverses(A: BlockOperator, inverses):
+    if len(inverses) != A.nblocks:
+        raise ValueError(f"Expected {A.nblocks} diagonal inverses, but got {len(inverses)}.")
+    return [get_preconditioner(P, A.block(i, i)) for i, P in enumerate(inverses)]
+
+
+class BlockDiagonalPreconditioner():
+    """Block diagonal preconditioner diag(P_0, P_1, ...), where P_i approximates
+    the inverse of the i-th diagonal block or, for a saddle-point system, of
+    the Schur complement. With symmetric positive definite P_i it can be used
+    in `minres`."""
+    def __init__(self, A: BlockOperator, /, inverses: Sequence[Preconditioner]):
+        """
+        Parameters:
+            A (BlockOperator): The block system.
+            inverses (Sequence[str | SupportsMatmul | Callable]): Approximate inverse
+                of each diagonal block, e.g. an `AMGSolver`, a `MassSchurPreconditioner`,
+                or a string built from the diagonal block by `get_preconditioner`.
+        """
+        self.A = A
+        self.inverses = _block_inverses(A, inverses)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        parts = self.A.split(r)
+        return bm.concat([P @ rp for P, rp in zip(self.inverses, parts)], axis=0)
+
+
+class BlockTriangularPreconditioner():
+    """Block triangular preconditioner, the inverse of the upper (or lower)
+    block triangular part of A with the diagonal blocks replaced by the
+    approximations P_i^{-1}. It is applied by block back (or forward)
+    substitution. For a Stokes system [[A, B^T], [B, 0]] with P_1 approximating
+    the inverse of the Schur complement -B A^{-1} B^T, GMRES converges in a few
+    iterations independent of the mesh size. Not symmetric, so use it with
+    `gmres` or `bicgstab`."""
+    def __init__(self, A: BlockOperator, /, inverses: Sequence[Preconditioner],
+                 lower: bool=False):
+        """
+        Parameters:
+            A (BlockOperator): The block system.
+            inverses (Sequence[str | SupportsMatmul | Callable]): Approximate inverse
+                of each diagonal block, as in `BlockDiagonalPreconditioner`.
+            lower (bool, optional): Whether to use the lower block triangular part.
+                Defaults to False.
+        """
+        self.A = A
+        self.inverses = _block_inverses(A, inverses)
+        self.lower = lower
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        A = self.A
+        n = A.nblocks
+        parts = A.split(r)
+        z = [None] * n
+        order = range(n) if self.lower else range(n - 1, -1, -1)
+        for i in order:
+            rhs = parts[i]
+            others = range(i) if self.lower else range(i + 1, n)
+            for j in others:
+                block = A.block(i, j)
+                if block is not None:
+                    rhs = rhs - block @ z[j]
+            z[i] = self.inverses[i] @ rhs
+        return bm.concat(z, axis=0)
+
+
+class MassSchurPreconditioner():
+    """Approximate inverse of the pressure Schur complement by the scaled
+    inverse of the pressure mass matrix, scale * Mp^{-1}.
+
+    For the Stokes equations -mu Laplace u + grad p = f, the Schur complement
+    -B A^{-1} B^T is spectrally equivalent to -Mp / mu. Use `scale=mu` in a
+    `BlockDiagonalPreconditioner` (it must be positive for MINRES), and
+    `scale=-mu` in a `BlockTriangularPreconditioner`.
+    """
+    def __init__(self, Mp: CSRTensor, /, scale: float=1.0, inner: Preconditioner='jacobi'):
+        """
+        Parameters:
+            Mp (CSRTensor): The pressure mass matrix.
+            scale (float, optional): Scaling factor. Defaults to 1.0.
+            inner (str | SupportsMatmul | Callable, optional): Approximate inverse of
+                Mp, built by `get_preconditioner`. Defaults to 'jacobi', which is
+                spectrally equivalent to the inverse of Mp for Lagrange elements.
+        """
+        self.scale = scale
+        self.inner = get_preconditioner(inner, Mp)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.scale * (self.inner @ r)
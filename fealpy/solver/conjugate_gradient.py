@@ -1,20 +1,24 @@
 
-from typing import Optional, Protocol
+import time
+from typing import Optional, Union, Tuple
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
+from .smoother import SupportsMatmul
+from .preconditioner import Preconditioner, get_preconditioner
+from .solver_info import SolverInfo
+from .mixed_precision import to_low_precision, iterative_refinement
 
 from .. import logger
 
 
-class SupportsMatmul(Protocol):
-    def __matmul__(self, other: TensorLike) -> TensorLike: ...
-
-
 def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+       M: Optional[Preconditioner]=None,
        batch_first: bool=False,
        atol: float=1e-12, rtol: float=1e-8,
-       maxiter: Optional[int]=10000) -> TensorLike:
+       maxiter: Optional[int]=10000,
+       mixed_precision: bool=False,
+       return_info: bool=False) -> Union[TensorLike, Tuple[TensorLike, SolverInfo]]:
     """Solve a linear system Ax = b using the Conjugate Gradient (CG) method.
 
     Parameters:
@@ -22,15 +26,25 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
         b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
         x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\
         Must have the same shape as b when reshaped appropriately.
+        M (str | SupportsMatmul | Callable, optional): The preconditioner applied as `M @ r`,\
+        approximating the inverse of A, e.g. an `AMGSolver`. It can also be 'jacobi', 'ssor',\
+        'ic0' or 'ilu0' to build one from A, or a function of r. See `get_preconditioner`. Default is None.
         batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\
         is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
         atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
         rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
         maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.\
-        If not provided, the method will continue until convergence based on the given tolerances.
+        If not provided, the method will continue until convergence based on the given tolerances.\
+        In the mixed precision mode, it is the limit of every inner solve.
+        mixed_precision (bool, optional): Whether to run CG in float32 as the inner solver of\
+        the iterative refinement in float64, see `iterative_refinement`. A must be a sparse\
+        tensor, and a string M is built from its float32 copy. Default is False.
+        return_info (bool, optional): Whether to return a `SolverInfo` with the number of\
+        iterations, the residual history and the wall time. Default is False.
 
     Returns:
         Tensor: The approximate solution to the system Ax = b.
+        SolverInfo: Diagnostics of the solve, only if `return_info` is True.
 
     Raises:
         ValueError: If inputs do not meet the specified conditions (e.g., A is not sparse, dimensions mismatch).
@@ -38,6 +52,9 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
     Note:
         This implementation assumes that A is a symmetric positive-definite matrix,
         which is a common requirement for the Conjugate Gradient method to work correctly.
+        Every column of a 2D `b` converges on its own, when its residual norm is
+        below `atol` or `rtol` times its norm. Converged columns are removed from
+        the iteration, so they no longer cost matrix-vector products.
     """
     assert isinstance(b, TensorLike), "b must be a Tensor"
     if x0 is not None:
@@ -57,55 +74,116 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
         b = bm.swapaxes(b, 0, 1)
         x0 = bm.swapaxes(x0, 0, 1)
 
-    sol = _cg_impl(A, b, x0, atol, rtol, maxiter)
+    start = time.perf_counter()
+    if mixed_precision:
+        sol, info = _mixed_cg(A, b, x0, M, atol, rtol, maxiter)
+    else:
+        M = get_preconditioner(M, A)
+        sol, info = _cg_impl(A, b, x0, M, atol, rtol, maxiter)
+    info.wall_time = time.perf_counter() - start
 
     if (not single_vector) and batch_first:
         sol = bm.swapaxes(sol, 0, 1)
 
+    if return_info:
+        return sol, info
     return sol
 
 
-def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, atol, rtol, maxiter):
-    # initialize
-    x = x0              # (dof, batch)
-    r = b - A @ x       # (dof, batch)
-    p = r               # (dof, batch)
-    n_iter = 0
-    b_norm = bm.linalg.norm(b)
-    sum_func = bm.sum
-    sqrt_func = bm.sqrt
+# Relative tolerance of the float32 inner solves, well above the float32
+# round-off, so that every refinement step gains about four digits.
+_INNER_RTOL = 1e-4
 
-    # iterate
-    while True:
-        Ap = A @ p      # (dof, batch)
-        rTr = sum_func(r**2, axis=0)
-        alpha = rTr / sum_func(p*Ap, axis=0)  # r @ r / (p @ Ap) # (batch,)
-        x = x + alpha[None, ...] * p  # (dof, batch)
-        r_new = r - alpha[None, ...] * Ap
-        rTr_new = sum_func(r_new**2, axis=0)  # (batch,)
-        r_norm_new = sqrt_func(sum_func(rTr_new))
 
-        n_iter += 1
+def _mixed_cg(A, b, x0, M, atol, rtol, maxiter):
+    A32 = to_low_precision(A)
+    M32 = get_preconditioner(M, A32)
 
-        if r_norm_new < atol:
-            logger.info(f"CG: converged in {n_iter} iterations, "
-                        "stopped by absolute tolerance.")
-            break
+    def inner(r):
+        d, info = _cg_impl(A32, r, bm.zeros_like(r), M32, 0.0, _INNER_RTOL, maxiter)
+        return d, info.niter
 
-        if r_norm_new < rtol * b_norm:
-            logger.info(f"CG: converged in {n_iter} iterations, "
-                        "stopped by relative tolerance.")
-            break
+    return iterative_refinement(A, b, inner, x0, atol=atol, rtol=rtol,
+                                name='CG-IR', return_info=True)
+
+
+def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
+    # Columns are kept as a 2D block (dof, batch), and an 1D problem is
+    # passed to the operators as 1D.
+    single_vector = b.ndim == 1
+    if single_vector:
+        b, x0 = b[:, None], x0[:, None]
+
+    def apply(op, v):
+        return (op @ v[:, 0])[:, None] if single_vector else op @ v
+
+    sum_func = bm.sum
+    sqrt_func = bm.sqrt
+    x = bm.copy(x0)     # (dof, batch)
+    r = b - apply(A, x) # (dof, batch)
+    b_norm = sqrt_func(sum_func(b**2, axis=0))
+    tol = bm.where(rtol * b_norm > atol, rtol * b_norm, atol) # (batch,)
+    r_norm = sqrt_func(sum_func(r**2, axis=0))
+    history = [r_norm]
+    iterations = bm.zeros(r_norm.shape, dtype=bm.int64, device=bm.get_device(b))
+    converged = r_norm < tol
+    n_iter = 0
 
+    # Only the active (not converged) columns are iterated.
+    active = bm.nonzero(~converged)[0]
+    xa, r = x[:, active], r[:, active]
+    z = r if M is None else apply(M, r)
+    p = z
+    rTz = sum_func(r*z, axis=0) # (active,)
+
+    # iterate
+    while active.shape[0] > 0:
         if (maxiter is not None) and (n_iter >= maxiter):
-            logger.info(f"CG: failed, stopped by maxiter ({maxiter}).")
             break
 
-        beta = rTr_new / rTr # (batch,)
-        p = r_new + beta[None, ...] * p
-        r = r_new
+        Ap = apply(A, p)    # (dof, active)
+        alpha = rTz / sum_func(p*Ap, axis=0)  # r @ z / (p @ Ap) # (active,)
+        xa = xa + alpha[None, ...] * p
+        r = r - alpha[None, ...] * Ap
+        rTr = sum_func(r**2, axis=0) # (active,)
+        n_iter += 1
+
+        r_norm = bm.set_at(bm.copy(r_norm), active, sqrt_func(rTr))
+        history.append(r_norm)
+        iterations = bm.set_at(iterations, active, n_iter)
+        done = r_norm[active] < tol[active]
+
+        if bm.any(done):
+            x = bm.set_at(x, (slice(None), active[done]), xa[:, done])
+            converged = bm.set_at(converged, active[done], True)
+            keep = ~done
+            active, xa, r, p = active[keep], xa[:, keep], r[:, keep], p[:, keep]
+            rTz, rTr = rTz[keep], rTr[keep]
+            if active.shape[0] == 0:
+                break
+
+        z = r if M is None else apply(M, r)
+        rTz_new = rTr if M is None else sum_func(r*z, axis=0)
+        beta = rTz_new / rTz # (active,)
+        p = z + beta[None, ...] * p
+        rTz = rTz_new
+
+    if active.shape[0] > 0:
+        x = bm.set_at(x, (slice(None), active), xa)
+        logger.info(f"CG: failed, stopped by maxiter ({maxiter}), "
+                    f"{active.shape[0]} of {b.shape[1]} columns not converged.")
+        reason = 'maxiter'
+    else:
+        logger.info(f"CG: converged in {n_iter} iterations.")
+        reason = 'tolerance'
+
+    history = bm.stack(history, axis=0)
+    if single_vector:
+        x, history = x[:, 0], history[:, 0]
+        iterations, converged = iterations[0], converged[0]
+    info = SolverInfo('CG', n_iter, iterations, converged, history, 0.0, reason)
 
-    return x
+    return x, info
 
     # @staticmethod
     # def setup_context(ctx, inputs, output):
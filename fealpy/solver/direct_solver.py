@@ -1,8 +1,14 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Union, Tuple
 
 from ..backend import backend_manager as bm
+from ..backend import TensorLike
 from ..sparse import COOTensor, CSRTensor
 import numpy as np
 
+from .mixed_precision import iterative_refinement
+
 def _mumps_solve(A, b):
     """Solve a linear system using MUMPS.
 
@@ -104,17 +110,301 @@ def _cupy_solve(A, b):
         x = cp.asnumpy(x)
     return x
 
-def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps"):
+def _fingerprint(*arrays) -> str:
+    """Hash of the contents of the tensors."""
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        a = np.ascontiguousarray(bm.to_numpy(a))
+        h.update(str((a.dtype, a.shape)).encode())
+        h.update(a.tobytes())
+    return h.hexdigest()
+
+
+def structure_key(A: Union[COOTensor, CSRTensor]) -> str:
+    """Fingerprint of the shape and the sparsity pattern of a matrix."""
+    A = A.tocsr()
+    return _fingerprint(A.crow(), A.col()) + str(tuple(A.sparse_shape))
+
+
+def value_key(A: Union[COOTensor, CSRTensor]) -> str:
+    """Fingerprint of the non-zero values of a matrix."""
+    return _fingerprint(A.tocsr().values())
+
+
+class DirectSolver():
+    """Sparse direct solver keeping the factorization of a matrix.
+
+    The matrix is factorized once, and every solve then costs only the
+    triangular sweeps. Matrices with the same sparsity pattern (e.g. in time
+    stepping, or with new coefficients) are refactorized by `refactor`, which
+    keeps the symbolic analysis: the fill-reducing column ordering for SciPy
+    (SuperLU), and the analysis phase for MUMPS.
+
+    Example:
+    ```
+        solver = DirectSolver(A)
+        x = solver.solve(F) # F shaped (n,) or (n, k)
+        solver.refactor(A_new) # same pattern as A
+        x = solver @ F
+    ```
+    With `mixed_precision=True`, the matrix is factorized in float32, which
+    halves the memory of the factors, and every solve refines the solution
+    in float64 against the original matrix by `iterative_refinement`.
+    """
+    def __init__(self, A: Union[COOTensor, CSRTensor, None]=None, *, solver: str='scipy',
+                 mixed_precision: bool=False):
+        """
+        Parameters:
+            A (COOTensor | CSRTensor | None, optional): The matrix to factorize.
+                Defaults to None, meaning to call `factorize` later.
+            solver (str, optional): 'scipy' (SuperLU) or 'mumps'. Defaults to 'scipy'.
+            mixed_precision (bool, optional): Whether to factorize in float32 and
+                refine in float64. Only for 'scipy'. Defaults to False.
+        """
+        if solver not in ('scipy', 'mumps'):
+            raise ValueError(f"Unknown solver '{solver}' for factorization, "
+                             "available: scipy, mumps.")
+        if mixed_precision and solver != 'scipy':
+            raise ValueError(f"The mixed precision factorization is not supported by '{solver}'.")
+        self.solver = solver
+        self.mixed_precision = mixed_precision
+        self._A = None
+        self.structure_key: Optional[str] = None
+        self.value_key: Optional[str] = None
+        self._shape = None
+        self._lu = None
+        self._perm_c = None
+        self._permuted = False
+        self._ctx = None
+        if A is not None:
+            self.factorize(A)
+
+    @property
+    def shape(self):
+        return self._shape
+
+    def factorize(self, A: Union[COOTensor, CSRTensor], /) -> 'DirectSolver':
+        """Symbolic and numeric factorization of a new matrix.
+
+        Parameters:
+            A (COOTensor | CSRTensor): The matrix.
+
+        Returns:
+            DirectSolver: self.
+        """
+        A = A.tocsr()
+        if A.sparse_shape[0] != A.sparse_shape[1]:
+            raise ValueError(f"Direct solve requires a square matrix, but got shape {A.sparse_shape}.")
+        self.release()
+        self._shape = tuple(A.sparse_shape)
+        self.structure_key = structure_key(A)
+
+        if self.solver == 'scipy':
+            from scipy.sparse.linalg import splu
+            self._lu = splu(self._host_matrix(A))
+            # Column j of A is the column perm_c[j] of the factorized matrix.
+            perm = self._lu.perm_c
+            self._perm_c = np.empty_like(perm)
+            self._perm_c[perm] = np.arange(perm.shape[0], dtype=perm.dtype)
+            self._permuted = False
+        else:
+            from mumps import DMumpsContext
+            self._ctx = DMumpsContext()
+            self._ctx.set_silent()
+            self._ctx.set_centralized_sparse(A.to_scipy().tocoo())
+            self._ctx.run(job=4) # analysis + factorization
+
+        self.value_key = value_key(A)
+        return self
+
+    def refactor(self, A: Union[COOTensor, CSRTensor], /) -> 'DirectSolver':
+        """Numeric factorization of a matrix with the sparsity pattern of the
+        factorized one, reusing the symbolic analysis. Nothing is done if the
+        values are not changed either.
+
+        Parameters:
+            A (COOTensor | CSRTensor): The matrix.
+
+        Returns:
+            DirectSolver: self.
+        """
+        if self.structure_key is None:
+            return self.factorize(A)
+        A = A.tocsr()
+        if structure_key(A) != self.structure_key:
+            raise ValueError("The sparsity pattern is changed, call `factorize` instead.")
+        key = value_key(A)
+        if key == self.value_key:
+            return self
+
+        if self.solver == 'scipy':
+            self._refactor_scipy(A)
+        else:
+            M = A.to_scipy().tocoo()
+            self._ctx.set_centralized_assembled_values(M.data)
+            self._ctx.run(job=2) # factorization only
+
+        self.value_key = key
+        return self
+
+    def _refactor_scipy(self, A: CSRTensor):
+        from scipy.sparse.linalg import splu
+        # Reuse the column ordering, so SuperLU skips the COLAMD analysis.
+        Ac = self._host_matrix(A)[:, self._perm_c]
+        self._lu = splu(Ac, permc_spec='NATURAL')
+        self._permuted = True
+
+    def _factorize_like(self, other: 'DirectSolver', A: Union[COOTensor, CSRTensor], /,
+                        vkey: Optional[str]=None) -> 'DirectSolver':
+        """Factorize a matrix with the sparsity pattern of the one factorized
+        by `other`, sharing its symbolic analysis but not its factors. Only the
+        column ordering of SciPy can be shared, and MUMPS factorizes anew."""
+        if self.solver != 'scipy' or other.solver != 'scipy':
+            return self.factorize(A)
+        A = A.tocsr()
+        self.release()
+        self._shape = other._shape
+        self.structure_key = other.structure_key
+        self._perm_c = other._perm_c
+        self._refactor_scipy(A)
+        self.value_key = value_key(A) if vkey is None else vkey
+        return self
+
+    def _host_matrix(self, A: CSRTensor):
+        """The CSC matrix to factorize, in float32 for the mixed precision."""
+        M = A.to_scipy().tocsc()
+        if self.mixed_precision:
+            self._A = A
+            M = M.astype(np.float32)
+        return M
+
+    def solve(self, b: TensorLike, /, *, rtol: float=1e-12, maxiter: int=20,
+              return_info: bool=False):
+        """Solve with the factorized matrix.
+
+        Parameters:
+            b (Tensor): Right-hand side shaped (n,) or (n, k).
+            rtol (float, optional): Relative tolerance of the refinement. Only for
+                the mixed precision. Defaults to 1e-12.
+            maxiter (int, optional): Maximum number of refinement steps. Only for
+                the mixed precision. Defaults to 20.
+            return_info (bool, optional): Whether to return the `SolverInfo` of the
+                refinement. Only for the mixed precision. Defaults to False.
+
+        Returns:
+            Tensor: The solution in the shape of b.
+            SolverInfo: Diagnostics of the refinement, only if `return_info` is True.
+        """
+        if self.structure_key is None:
+            raise RuntimeError("No matrix is factorized.")
+        if self.mixed_precision:
+            b = bm.astype(b, bm.float64)
+            inner = lambda r: bm.tensor(self._solve_host(bm.to_numpy(r)), **bm.context(r))
+            return iterative_refinement(self._A, b, inner, atol=0.0, rtol=rtol, maxiter=maxiter,
+                                        name='SuperLU-IR', return_info=return_info)
+        if return_info:
+            raise ValueError("return_info is only supported in the mixed precision mode.")
+        return bm.tensor(self._solve_host(np.asarray(bm.to_numpy(b), dtype=np.float64)))
+
+    def _solve_host(self, rhs: np.ndarray) -> np.ndarray:
+        if self.solver == 'scipy':
+            y = self._lu.solve(rhs)
+            if self._permuted:
+                # Solved for the column-permuted matrix in `refactor`.
+                x = np.empty_like(y)
+                x[self._perm_c] = y
+                y = x
+        else:
+            y = np.array(rhs, order='F', copy=True)
+            columns = y[:, None] if y.ndim == 1 else y
+            for k in range(columns.shape[1]):
+                x = np.ascontiguousarray(columns[:, k])
+                self._ctx.set_rhs(x)
+                self._ctx.run(job=3)
+                columns[:, k] = x
+
+        return y
+
+    def __matmul__(self, b: TensorLike) -> TensorLike:
+        """Apply the inverse of the matrix to b."""
+        return self.solve(b)
+
+    def release(self) -> None:
+        """Free the factorization."""
+        if self._ctx is not None:
+            self._ctx.destroy()
+        self._lu = None
+        self._perm_c = None
+        self._ctx = None
+        self._A = None
+        self.structure_key = None
+        self.value_key = None
+
+    def __del__(self):
+        if getattr(self, '_ctx', None) is not None:
+            self._ctx.destroy()
+
+
+_FACTOR_CACHE: "OrderedDict[Tuple[str, bool, str, str], DirectSolver]" = OrderedDict()
+_FACTOR_CACHE_SIZE = 4
+
+
+def clear_factor_cache() -> None:
+    """Release all the factorizations cached by `spsolve(..., reuse=True)`."""
+    for solver in _FACTOR_CACHE.values():
+        solver.release()
+    _FACTOR_CACHE.clear()
+
+
+def _cached_solver(A, solver: str, mixed_precision: bool=False) -> DirectSolver:
+    """The cached factorization of A, keyed by the fingerprints of its pattern
+    and its values. A new matrix with the pattern of a cached one (e.g. K and
+    M on one space) gets its own entry, sharing the symbolic analysis."""
+    A = A.tocsr()
+    key = (solver, mixed_precision, structure_key(A), value_key(A))
+    if key in _FACTOR_CACHE:
+        _FACTOR_CACHE.move_to_end(key)
+        return _FACTOR_CACHE[key]
+
+    direct = DirectSolver(solver=solver, mixed_precision=mixed_precision)
+    same_pattern = [v for k, v in _FACTOR_CACHE.items() if k[:3] == key[:3]]
+    if same_pattern:
+        direct._factorize_like(same_pattern[-1], A, vkey=key[3])
+    else:
+        direct.factorize(A)
+    _FACTOR_CACHE[key] = direct
+    while len(_FACTOR_CACHE) > _FACTOR_CACHE_SIZE:
+        _, old = _FACTOR_CACHE.popitem(last=False)
+        old.release()
+    return direct
+
+
+def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps", reuse:bool=False,
+            mixed_precision:bool=False):
     """Solve a linear system using a direct solver.
 
     Parameters:
         A(COOTensor | CSRTensor): The matrix of the linear system.
-        b(Tensor): The right-hand side.
+        b(Tensor): The right-hand side, shaped (n,) or (n, k).
         solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        reuse(bool): Whether to keep the factorization for later calls. The
+            factorizations of the last few matrices are cached by the
+            fingerprints of their patterns and values, and a new matrix with
+            a cached pattern reuses its symbolic analysis. Only for "mumps"
+            and "scipy".
+        mixed_precision(bool): Whether to factorize in float32 and refine the
+            solution in float64, see `DirectSolver`. Only for "scipy".
 
     Returns:
         Tensor: The solution of the linear system.
     """
+    if reuse:
+        if solver not in ("mumps", "scipy"):
+            raise ValueError(f"Factorization reuse is not supported by the solver '{solver}'.")
+        return _cached_solver(A, solver, mixed_precision).solve(b)
+    if mixed_precision:
+        return DirectSolver(A, solver=solver, mixed_precision=True).solve(b)
+
     if solver == "mumps":
         return bm.tensor(_mumps_solve(A, b))
     elif solver == "scipy":
@@ -124,6 +414,3 @@ def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps"):
         return bm.tensor(_cupy_solve(A, b))
     else:
         raise ValueError(f"Unknown solver: {solver}")
-
-
-
@@ -0,0 +1,208 @@
+from typing import Optional, List, Union, Sequence, Callable
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ..sparse.ops import ptap
+from .multigrid import Multigrid
+from .smoother import matrix_diagonal
+
+
+def _new_node_entities(mesh) -> Sequence[str]:
+    """Entities whose barycenters are the nodes added by `uniform_refine`, in order."""
+    from ..mesh import TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh
+    if isinstance(mesh, (TriangleMesh, TetrahedronMesh)):
+        return ('edge',)
+    if isinstance(mesh, QuadrangleMesh):
+        return ('edge', 'cell')
+    if isinstance(mesh, HexahedronMesh):
+        return ('edge', 'face', 'cell')
+    raise TypeError("Geometric multigrid supports TriangleMesh, TetrahedronMesh, "
+                    f"QuadrangleMesh and HexahedronMesh, but got {type(mesh).__name__}.")
+
+
+def nodal_prolongation(mesh) -> CSRTensor:
+    """Prolongation of linear (bilinear, trilinear) Lagrange functions from the
+    mesh to its uniform refinement.
+
+    Nodes of the refined mesh are the old nodes followed by the barycenters
+    of the refined entities, so each row averages the vertices of one entity.
+    Call this before `mesh.uniform_refine()`.
+
+    Parameters:
+        mesh (Mesh): The coarse mesh.
+
+    Returns:
+        CSRTensor: The prolongation shaped (NN_fine, NN_coarse).
+    """
+    NN = mesh.number_of_nodes()
+    device = mesh.device
+    rows = [bm.arange(NN, dtype=bm.int64, device=device)]
+    cols = [bm.arange(NN, dtype=bm.int64, device=device)]
+    vals = [bm.ones((NN,), dtype=mesh.ftype, device=device)]
+    start = NN
+
+    for etype in _new_node_entities(mesh):
+        entity = bm.astype(mesh.entity(etype), bm.int64)
+        NE, nv = entity.shape
+        row = bm.arange(start, start + NE, dtype=bm.int64, device=device)
+        rows.append(bm.reshape(bm.broadcast_to(row[:, None], (NE, nv)), (-1,)))
+        cols.append(bm.reshape(entity, (-1,)))
+        vals.append(bm.full((NE * nv,), 1.0 / nv, dtype=mesh.ftype, device=device))
+        start += NE
+
+    indices = bm.stack([bm.concat(rows, axis=0), bm.concat(cols, axis=0)], axis=0)
+    return COOTensor(indices, bm.concat(vals, axis=0), (start, NN)).tocsr()
+
+
+def fixed_dofs(A: CSRTensor) -> TensorLike:
+    """Flags of the rows without non-zero off-diagonal entries, e.g. the
+    Dirichlet DoFs after `DirichletBC.apply_matrix`."""
+    row, col, val = A.row(), A.col(), A.values()
+    off = (row != col) & (val != 0)
+    count = bm.bincount(row[off], minlength=A.shape[0])
+    return count == 0
+
+
+def _restrict_prolongation(P: CSRTensor, fine_fixed: TensorLike,
+                           coarse_fixed: TensorLike) -> CSRTensor:
+    """Remove the entries of P in rows of fixed fine DoFs and columns of fixed
+    coarse DoFs, so that coarse corrections never touch the fixed values."""
+    row, col = P.row(), P.col()
+    keep = ~(fine_fixed[row] | coarse_fixed[col])
+    indices = bm.stack([row[keep], col[keep]], axis=0)
+    return COOTensor(indices, P.values()[keep], P.sparse_shape).tocsr()
+
+
+class GeometricMultigrid(Multigrid):
+    """Geometric multigrid on a hierarchy of uniformly refined meshes.
+
+    The prolongations between levels are the nodal interpolations of linear
+    Lagrange functions from one mesh to its uniform refinement. Matrices of the
+    coarse levels are either rediscretized on the coarse meshes, or formed by
+    the Galerkin products P^T A P. Rows without off-diagonal entries (the
+    Dirichlet DoFs) are kept out of the coarse corrections. Every level is
+    smoothed by vectorized damped Jacobi or Chebyshev sweeps, and the coarsest
+    level is solved by a dense inverse.
+
+    Example:
+    ```
+        def assemble(mesh):
+            space = LagrangeFESpace(mesh, p=1)
+            bform = BilinearForm(space)
+            bform.add_integrator(ScalarDiffusionIntegrator())
+            return DirichletBC(space, gd).apply_matrix(bform.assembly())
+
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        mg = GeometricMultigrid.from_mesh(mesh, 5, assemble) # mesh is refined
+        uh = cg(mg.A[0], F, M=mg)
+    ```
+    """
+    def __init__(self, A: Union[CSRTensor, Sequence[CSRTensor]],
+                 P: Sequence[CSRTensor], *,
+                 smoother: str='jacobi',
+                 presmooth: int=1,
+                 postsmooth: int=1,
+                 cycle: str='V'):
+        """Initialize the solver with the operators of all levels.
+
+        Parameters:
+            A (CSRTensor | Sequence[CSRTensor]): Matrix of the finest level, or
+                matrices of all levels from the finest to the coarsest. Only
+                the finest is needed for Galerkin coarse operators.
+            P (Sequence[CSRTensor]): Prolongations P[l] from level l+1 to level l,
+                shaped (n_l, n_{l+1}), from the finest.
+            smoother (str, optional): 'jacobi' or 'chebyshev'. Defaults to 'jacobi'.
+            presmooth (int, optional): Number of pre-smoothing sweeps. Defaults to 1.
+            postsmooth (int, optional): Number of post-smoothing sweeps. Defaults to 1.
+            cycle (str, optional): 'V' or 'W'. Defaults to 'V'.
+        """
+        super().__init__(smoother=smoother, presmooth=presmooth,
+                         postsmooth=postsmooth, cycle=cycle)
+        galerkin = isinstance(A, (CSRTensor, COOTensor))
+        As = [A.tocsr()] if galerkin else [M.tocsr() for M in A]
+        if (not galerkin) and (len(As) != len(P) + 1):
+            raise ValueError(f"{len(P) + 1} matrices are required for {len(P)} "
+                             f"prolongations, but got {len(As)}.")
+
+        fixed = fixed_dofs(As[0])
+        self.A = [As[0]]
+        for level, Pl in enumerate(P):
+            if Pl.shape[0] != self.A[-1].shape[0]:
+                raise ValueError(f"Prolongation {level} has {Pl.shape[0]} rows, "
+                                 f"but level {level} has {self.A[-1].shape[0]} DoFs.")
+            if galerkin:
+                # Coarse nodes keep their numbers on the fine level.
+                coarse_fixed = fixed[:Pl.shape[1]]
+            else:
+                coarse_fixed = fixed_dofs(As[level + 1])
+            Pl = _restrict_prolongation(Pl.tocsr(), fixed, coarse_fixed)
+
+            if galerkin:
+                Ac = ptap(Pl, self.A[-1])
+                Ac = self._fix_coarse(Ac, coarse_fixed)
+            else:
+                Ac = As[level + 1]
+
+            self.S.append(self.make_smoother(self.A[-1]))
+            self.P.append(Pl)
+            self.R.append(Pl.T)
+            self.A.append(Ac)
+            fixed = coarse_fixed
+
+        self.setup_coarse()
+
+    @staticmethod
+    def _fix_coarse(Ac: CSRTensor, coarse_fixed: TensorLike) -> CSRTensor:
+        """Put a unit diagonal on the rows of fixed coarse DoFs, which are
+        left empty by the restricted prolongation."""
+        idx = bm.nonzero(coarse_fixed & (matrix_diagonal(Ac) == 0))[0]
+        if idx.shape[0] == 0:
+            return Ac
+        ones = bm.ones((idx.shape[0],), **bm.context(Ac.values()))
+        eye = COOTensor(bm.stack([idx, idx], axis=0), ones, Ac.sparse_shape).tocsr()
+        return Ac.add(eye)
+
+    @classmethod
+    def from_mesh(cls, mesh, nrefine: int,
+                  assemble: Callable[..., Union[CSRTensor, COOTensor]], *,
+                  galerkin: bool=False, **kwargs) -> 'GeometricMultigrid':
+        """Refine the mesh uniformly and build the multigrid on the hierarchy.
+
+        The mesh is refined in place, so it is the finest mesh after the call,
+        and the DoFs of the finest level are its nodes.
+
+        Parameters:
+            mesh (Mesh): The coarsest mesh, TriangleMesh, TetrahedronMesh,
+                QuadrangleMesh or HexahedronMesh.
+            nrefine (int): Number of uniform refinements, i.e. levels - 1.
+            assemble (Callable): Function mapping a mesh to the matrix of the
+                linear Lagrange space on it, with the boundary conditions applied.
+            galerkin (bool, optional): Whether to form the coarse matrices by
+                Galerkin products instead of calling `assemble` on coarse meshes.
+                Defaults to False.
+            **kwargs: Other arguments of the constructor.
+
+        Returns:
+            GeometricMultigrid: The solver, with the meshes of all levels from the
+                finest in `meshes` (empty if `galerkin` is True).
+        """
+        _new_node_entities(mesh)
+        meshes, prolongations = [], []
+
+        for _ in range(nrefine):
+            if not galerkin:
+                meshes.append(mesh.__class__(bm.copy(mesh.entity('node')),
+                                             bm.copy(mesh.entity('cell'))))
+            prolongations.append(nodal_prolongation(mesh))
+            mesh.uniform_refine()
+
+        prolongations.reverse()
+        if galerkin:
+            mg = cls(assemble(mesh), prolongations, **kwargs)
+        else:
+            meshes.append(mesh)
+            meshes.reverse()
+            mg = cls([assemble(m) for m in meshes], prolongations, **kwargs)
+        mg.meshes = meshes
+        return mg
@@ -1,6 +1,13 @@
+import time
+
 from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
 import numpy as np
+from .preconditioner import get_preconditioner
+from .solver_info import SolverInfo
+
+from .. import logger
+
 def _to_cupy_data(A, b, x0):
     """Convert the input tensors to cupy tensors.
 
@@ -59,30 +66,200 @@ def _cupy_solve(A, b, tol, x0, maxiter ,atol):
         x = cp.asnumpy(x)
     return x
 
-def _scipy_solve(A, b, tol, x0, maxiter, atol):
+def _scipy_preconditioner(M, n):
+    """Wrap a preconditioner applied as `M @ r` as a scipy LinearOperator."""
+    from scipy.sparse.linalg import LinearOperator
+
+    def matvec(r):
+        return bm.to_numpy(M @ bm.tensor(np.ravel(r)))
+
+    return LinearOperator((n, n), matvec=matvec, dtype=np.float64)
+
+
+def _scipy_solve(A, b, tol, x0, maxiter, atol, M=None):
     from scipy.sparse.linalg import gmres 
     from scipy.sparse import csr_matrix
 
     A = A.to_scipy()
     b = bm.to_numpy(b)
-    return gmres(A, b, x0=x0, maxiter=maxiter, atol=atol, rtol=tol)[0]
+    if x0 is not None:
+        x0 = bm.to_numpy(x0)
+    if M is not None:
+        M = _scipy_preconditioner(M, A.shape[0])
+    return gmres(A, b, x0=x0, maxiter=maxiter, atol=atol, rtol=tol, M=M)[0]
+
+
+def _gmres_impl(A, b, x0, M, atol, rtol, restart, maxiter):
+    # Columns are kept as a 2D block (dof, batch) as in `cg`, and all the
+    # active columns run the Arnoldi process of a cycle in lockstep.
+    single_vector = b.ndim == 1
+    if single_vector:
+        b, x0 = b[:, None], x0[:, None]
+
+    def apply(op, v):
+        if op is None:
+            return v
+        return (op @ v[:, 0])[:, None] if single_vector else op @ v
+
+    def dot(u, v):
+        return bm.sum(u*v, axis=0)
+
+    def safe(d):
+        return bm.where(d == 0, 1.0, d)
+
+    if maxiter is None:
+        maxiter = 10 * b.shape[0]
+    x = bm.copy(x0)
+    r = b - apply(A, x)
+    b_norm = bm.sqrt(dot(b, b))
+    tol = bm.where(rtol * b_norm > atol, rtol * b_norm, atol)
+    r_norm = bm.sqrt(dot(r, r))
+    history = [r_norm]
+    iterations = bm.zeros(r_norm.shape, dtype=bm.int64, device=bm.get_device(b))
+    converged = r_norm < tol
+    active = bm.nonzero(~converged)[0]
+    n_iter = 0
+    n_cycle = 0
+
+    while active.shape[0] > 0 and n_cycle < maxiter:
+        xa = x[:, active]
+        ra = b[:, active] - apply(A, xa)
+        beta = bm.sqrt(dot(ra, ra))
+        tol_a = tol[active]
+        V = [ra / safe(beta)[None, :]]
+        R = [] # columns of the triangular factor of the Hessenberg matrix
+        cs, sn = [], []
+        g = [beta]
+        steps = bm.zeros(beta.shape, dtype=bm.int64, device=bm.get_device(b))
+        done = beta < tol_a
+
+        for j in range(restart):
+            w = apply(A, apply(M, V[j]))
+            h = []
+            for i in range(j + 1): # modified Gram-Schmidt
+                h.append(dot(V[i], w))
+                w = w - h[i][None, :] * V[i]
+            h_next = bm.sqrt(dot(w, w))
+            V.append(w / safe(h_next)[None, :])
+
+            for i in range(j):
+                hi = cs[i] * h[i] + sn[i] * h[i+1]
+                h[i+1] = -sn[i] * h[i] + cs[i] * h[i+1]
+                h[i] = hi
+            denom = bm.sqrt(h[j]**2 + h_next**2)
+            cs.append(bm.where(denom == 0, 1.0, h[j] / safe(denom)))
+            sn.append(h_next / safe(denom))
+            h[j] = denom
+            R.append(h)
+            g.append(-sn[j] * g[j])
+            g[j] = cs[j] * g[j]
+            n_iter += 1
+
+            res = bm.abs(g[j+1])
+            new = ~done
+            steps = bm.where(new, j + 1, steps)
+            r_norm = bm.set_at(bm.copy(r_norm), active[new], res[new])
+            history.append(r_norm)
+            iterations = bm.set_at(iterations, active[new], iterations[active[new]] + 1)
+            done = done | (res < tol_a) | (h_next == 0)
+            if bm.all(done):
+                break
+
+        # Back substitution of each column with its own number of steps.
+        nstep = len(R)
+        y = [None] * nstep
+        for i in range(nstep - 1, -1, -1):
+            rhs = g[i]
+            for l in range(i + 1, nstep):
+                rhs = rhs - R[l][i] * y[l]
+            y[i] = bm.where(i < steps, rhs / safe(R[i][i]), 0.0)
+        dx = bm.zeros_like(xa)
+        for i in range(nstep):
+            dx = dx + y[i][None, :] * V[i]
+        x = bm.set_at(x, (slice(None), active), xa + apply(M, dx))
+        n_cycle += 1
+
+        finished = bm.abs(bm.stack(g, axis=0)[steps, bm.arange(steps.shape[0])]) < tol_a
+        converged = bm.set_at(converged, active[finished], True)
+        active = active[~finished]
+
+    if active.shape[0] > 0:
+        logger.info(f"GMRES: failed, stopped by maxiter ({maxiter} cycles), "
+                    f"{active.shape[0]} of {b.shape[1]} columns not converged.")
+        reason = 'maxiter'
+    else:
+        logger.info(f"GMRES: converged in {n_iter} iterations.")
+        reason = 'tolerance'
+
+    history = bm.stack(history, axis=0)
+    if single_vector:
+        x, history = x[:, 0], history[:, 0]
+        iterations, converged = iterations[0], converged[0]
+    info = SolverInfo('GMRES', n_iter, iterations, converged, history, 0.0, reason)
+
+    return x, info
 
 
 def gmres(A:[COOTensor, CSRTensor], b, solver:str="scipy", 
-          tol=1e-5, x0=None, maxiter=None, atol=0.0):
+          tol=1e-5, x0=None, maxiter=None, atol=0.0, M=None, *,
+          restart: int=20, batch_first: bool=False, return_info: bool=False):
     """Solve a linear system using a gmres solver.
 
     Parameters:
-        A(COOTensor | CSRTensor): The matrix of the linear system.
-        b(Tensor): The right-hand side.
-        solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        A(COOTensor | CSRTensor | SupportsMatmul): The matrix of the linear system.
+            Matrix-free operators supporting `A @ x` are only for the "fealpy" solver.
+        b(Tensor): The right-hand side, shaped (n,), or (n, k) for the "fealpy" solver.
+        solver(str): The solver to use. It can be "fealpy", "scipy", or "cupy".
+            "fealpy" is the restarted GMRES(m) implemented on the backend, so the
+            data stay on their device.
+        tol(float): The relative tolerance.
+        x0(Tensor, optional): Initial guess.
+        maxiter(int, optional): Maximum number of restart cycles.
+        atol(float): The absolute tolerance.
+        M(str | SupportsMatmul | Callable, optional): The preconditioner, e.g. 'ilu0',
+            see `get_preconditioner`. Applied on the right by the "fealpy" solver.
+            Not supported by the "cupy" solver.
+        restart(int): Number of iterations between restarts. Only for the "fealpy" solver.
+        batch_first(bool): Whether the batch dimension of b and x0 is the first
+            dimension. Only for the "fealpy" solver.
+        return_info(bool): Whether to return a `SolverInfo` as well. Only for the
+            "fealpy" solver.
 
     Returns:
         Tensor: The solution of the linear system.
+        SolverInfo: Diagnostics of the solve, only if `return_info` is True.
     """
+    if solver == "fealpy":
+        if b.ndim not in {1, 2}:
+            raise ValueError("b must be a 1D or 2D dense tensor")
+        if x0 is None:
+            x0 = bm.zeros_like(b)
+        elif x0.shape != b.shape:
+            raise ValueError("x0 and b must have the same shape")
+        single_vector = b.ndim == 1
+        if (not single_vector) and batch_first:
+            b = bm.swapaxes(b, 0, 1)
+            x0 = bm.swapaxes(x0, 0, 1)
+
+        start = time.perf_counter()
+        M = get_preconditioner(M, A)
+        sol, info = _gmres_impl(A, b, x0, M, atol, tol, restart, maxiter)
+        info.wall_time = time.perf_counter() - start
+
+        if (not single_vector) and batch_first:
+            sol = bm.swapaxes(sol, 0, 1)
+        if return_info:
+            return sol, info
+        return sol
+
+    if return_info:
+        raise ValueError(f"return_info is not supported by the solver '{solver}'.")
     if solver == "scipy":
-        return bm.tensor(_scipy_solve(A, b, tol=tol, x0=x0, maxiter=maxiter, atol=atol))
+        M = get_preconditioner(M, A)
+        return bm.tensor(_scipy_solve(A, b, tol=tol, x0=x0, maxiter=maxiter, atol=atol, M=M))
     elif solver == "cupy":
+        if M is not None:
+            raise ValueError("Preconditioners are not supported by the solver 'cupy'.")
         A = A.tocoo()
         return bm.tensor(_cupy_solve(A, b, tol=tol, x0=x0, maxiter=maxiter, atol=atol))
     else:
@@ -0,0 +1,197 @@
+
+import time
+from typing import Optional, Union, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .smoother import SupportsMatmul
+from .preconditioner import Preconditioner, get_preconditioner
+from .solver_info import SolverInfo
+
+from .. import logger
+
+
+def lobpcg(A: SupportsMatmul, X: TensorLike, B: Optional[SupportsMatmul]=None, *,
+           M: Optional[Preconditioner]=None,
+           largest: bool=False,
+           atol: Optional[float]=None, rtol: float=1e-6,
+           maxiter: Optional[int]=500,
+           return_info: bool=False) -> Union[Tuple[TensorLike, TensorLike],
+                                             Tuple[TensorLike, TensorLike, SolverInfo]]:
+    """Compute the extreme eigenpairs of the generalized symmetric eigenvalue problem
+    A x = lambda B x by the Locally Optimal Block Preconditioned Conjugate Gradient
+    (LOBPCG) method.
+
+    Parameters:
+        A (SupportsMatmul): The symmetric matrix, e.g. a stiffness matrix, as a sparse\
+        tensor or a matrix-free operator.
+        X (TensorLike): Initial guess of the eigenvectors, shaped (n, k). The number\
+        of eigenpairs k is taken from it, and 3k should be less than n.
+        B (SupportsMatmul, optional): The symmetric positive definite matrix, e.g. a mass\
+        matrix. Default is None, meaning the identity.
+        M (str | SupportsMatmul | Callable, optional): The symmetric positive definite\
+        preconditioner approximating the inverse of A, e.g. an `AMGSolver` or a\
+        `GeometricMultigrid`. See `get_preconditioner`. Default is None.
+        largest (bool, optional): Whether to compute the largest eigenvalues instead\
+        of the smallest. Default is False.
+        atol (float, optional): Absolute tolerance of the residual norms. Default is None,\
+        meaning sqrt(eps) * ||A|| * ||B x||, where ||A|| is estimated by the largest\
+        Ritz value in magnitude, so that the eigenpairs with lambda = 0 (e.g. constants\
+        of a Neumann problem, or rigid body modes of a free body) converge as well.\
+        With atol=0.0, such pairs never meet the relative tolerance.
+        rtol (float, optional): Relative tolerance of the residual norms, relative to\
+        |lambda| * ||B x||. Default is 1e-6.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 500.
+        return_info (bool, optional): Whether to return a `SolverInfo` with the number of\
+        iterations, the residual history and the wall time. Default is False.
+
+    Returns:
+        Tensor: The eigenvalues, shaped (k,), in ascending order (descending if `largest`).
+        Tensor: The B-orthonormal eigenvectors, shaped (n, k).
+        SolverInfo: Diagnostics of the solve, only if `return_info` is True.
+
+    Note:
+        Every eigenpair is soft locked once its residual norm is below
+        max(atol, rtol * |lambda| * ||B x||): it stays in the Rayleigh-Ritz
+        projection, but no more search directions are computed for it.
+        With the Dirichlet DoFs eliminated by `DirichletBC` (ones on the diagonal
+        of A, and zero rows of B), start from X vanishing on those DoFs to keep
+        the iterates away from them.
+    """
+    assert isinstance(X, TensorLike), "X must be a Tensor"
+    if X.ndim != 2:
+        raise ValueError("X must be a 2D dense tensor shaped (n, k)")
+    n, k = X.shape
+    if 3 * k >= n:
+        raise ValueError(f"Too many eigenpairs ({k}) for a matrix of size {n}, "
+                         "use a dense eigen-solver instead.")
+
+    start = time.perf_counter()
+    M = get_preconditioner(M, A)
+    theta, X, info = _lobpcg_impl(A, X, B, M, largest, atol, rtol, maxiter)
+    info.wall_time = time.perf_counter() - start
+
+    if return_info:
+        return theta, X, info
+    return theta, X
+
+
+# Cholesky of a projected matrix which is not numerically positive definite.
+_BREAKDOWN = (ValueError, RuntimeError)
+
+
+def _apply(op, V):
+    return V if op is None else op @ V
+
+
+def _symmetric(G):
+    return (G + G.T) / 2
+
+
+def _orthonormalize(V, BV, *others):
+    """B-orthonormalize the columns of V by the Cholesky factor of V^T B V,
+    and transform BV and the other images of V in the same way."""
+    L = bm.linalg.cholesky(_symmetric(V.T @ BV))
+    T = bm.linalg.inv(L).T
+    return (V @ T, BV @ T) + tuple(W @ T for W in others)
+
+
+def _rayleigh_ritz(gA, gB, k, largest):
+    """The k extreme eigenpairs of the projected problem gA c = theta gB c, and
+    the largest Ritz value in magnitude."""
+    T = bm.linalg.inv(bm.linalg.cholesky(gB))
+    theta, C = bm.linalg.eigh(_symmetric(T @ gA @ T.T))
+    index = bm.arange(k, device=bm.get_device(theta))
+    if largest:
+        index = theta.shape[0] - 1 - index
+    return theta[index], T.T @ C[:, index], bm.max(bm.abs(theta))
+
+
+def _project(blocks, k, largest):
+    S, AS, BS = (bm.concat([b[i] for b in blocks], axis=1) for i in range(3))
+    try:
+        return S, AS, BS, _rayleigh_ritz(S.T @ AS, S.T @ BS, k, largest)
+    except _BREAKDOWN:
+        return S, AS, BS, None
+
+
+def _lobpcg_impl(A, X, B, M, largest, atol, rtol, maxiter):
+    k = X.shape[1]
+    X, BX = _orthonormalize(X, _apply(B, X))
+    AX = A @ X
+    theta, C, norm_A = _rayleigh_ritz(X.T @ AX, bm.eye(k, **bm.context(X)), k, largest)
+    X, AX, BX = X @ C, AX @ C, BX @ C
+    floor = bm.sqrt(bm.tensor(bm.finfo(X.dtype).eps, **bm.context(X)))
+
+    iterations = bm.zeros((k,), dtype=bm.int64, device=bm.get_device(X))
+    converged = bm.zeros((k,), dtype=bm.bool, device=bm.get_device(X))
+    history = []
+    P = AP = BP = None
+    n_iter = 0
+    reason = 'maxiter'
+
+    while True:
+        R = AX - BX * theta[None, :]
+        r_norm = bm.linalg.norm(R, axis=0)
+        history.append(r_norm)
+        BX_norm = bm.linalg.norm(BX, axis=0)
+        tol = rtol * bm.abs(theta) * BX_norm
+        # Ritz values of larger subspaces improve the estimate of ||A||.
+        abs_tol = floor * norm_A * BX_norm if atol is None else atol
+        tol = bm.where(tol > abs_tol, tol, abs_tol)
+        converged = converged | (r_norm <= tol)
+        iterations = bm.where(converged, iterations, n_iter)
+        active = bm.nonzero(~converged)[0]
+
+        if active.shape[0] == 0:
+            reason = 'tolerance'
+            break
+        if (maxiter is not None) and (n_iter >= maxiter):
+            break
+
+        # Preconditioned residuals of the active pairs, B-orthogonal to X.
+        W = _apply(M, R[:, active])
+        BW = _apply(B, W)
+        D = BX.T @ W
+        W, BW = W - X @ D, BW - BX @ D
+        try:
+            W, BW = _orthonormalize(W, BW)
+        except _BREAKDOWN:
+            reason = 'breakdown'
+            break
+        AW = A @ W
+
+        blocks = [(X, AX, BX), (W, AW, BW)]
+        if P is not None:
+            try:
+                P, BP, AP = _orthonormalize(P[:, active], BP[:, active], AP[:, active])
+                blocks.append((P, AP, BP))
+            except _BREAKDOWN:
+                pass
+
+        S, AS, BS, ritz = _project(blocks, k, largest)
+        if ritz is None and len(blocks) == 3:
+            # Restart without the conjugate directions.
+            S, AS, BS, ritz = _project(blocks[:2], k, largest)
+        if ritz is None:
+            reason = 'breakdown'
+            break
+        theta, C, ritz_max = ritz
+        norm_A = bm.maximum(norm_A, ritz_max)
+
+        # New conjugate directions from W (and P), then the new Ritz vectors.
+        Cx, Cr = C[:k], C[k:]
+        P, AP, BP = S[:, k:] @ Cr, AS[:, k:] @ Cr, BS[:, k:] @ Cr
+        X, AX, BX = X @ Cx + P, AX @ Cx + AP, BX @ Cx + BP
+        n_iter += 1
+
+    if reason == 'tolerance':
+        logger.info(f"LOBPCG: converged in {n_iter} iterations.")
+    else:
+        logger.info(f"LOBPCG: failed, stopped by {reason} after {n_iter} iterations, "
+                    f"{active.shape[0]} of {k} eigenpairs not converged.")
+
+    history = bm.stack(history, axis=0)
+    info = SolverInfo('LOBPCG', n_iter, iterations, converged, history, 0.0, reason)
+
+    return theta, X, info
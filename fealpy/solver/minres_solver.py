@@ -0,0 +1,182 @@
+
+import time
+from typing import Optional, Union, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .smoother import SupportsMatmul
+from .preconditioner import Preconditioner, get_preconditioner
+from .solver_info import SolverInfo
+
+from .. import logger
+
+
+def minres(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+           M: Optional[Preconditioner]=None,
+           batch_first: bool=False,
+           atol: float=1e-12, rtol: float=1e-8,
+           maxiter: Optional[int]=10000,
+           return_info: bool=False) -> Union[TensorLike, Tuple[TensorLike, SolverInfo]]:
+    """Solve a symmetric linear system Ax = b using the Minimal Residual (MINRES) method.
+
+    Parameters:
+        A (SupportsMatmul): The symmetric coefficient matrix, possibly indefinite\
+        (e.g. a saddle-point system), as a sparse tensor or a matrix-free operator.
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\
+        Must have the same shape as b when reshaped appropriately.
+        M (str | SupportsMatmul | Callable, optional): The symmetric positive definite\
+        preconditioner applied as `M @ r`. See `get_preconditioner`. Default is None.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        return_info (bool, optional): Whether to return a `SolverInfo` with the number of\
+        iterations, the residual history and the wall time. Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        SolverInfo: Diagnostics of the solve, only if `return_info` is True.
+
+    Note:
+        The residual norms are the estimates of the Lanczos recurrence, measured
+        in the norm induced by M when a preconditioner is given, so `rtol` is
+        relative to that norm of the initial residual. As in `cg`, every column
+        of a 2D `b` converges on its own and is then removed from the iteration.
+    """
+    assert isinstance(b, TensorLike), "b must be a Tensor"
+    single_vector = b.ndim == 1
+
+    if b.ndim not in {1, 2}:
+        raise ValueError("b must be a 1D or 2D dense tensor")
+
+    if x0 is None:
+        x0 = bm.zeros_like(b)
+    elif x0.shape != b.shape:
+        raise ValueError("x0 and b must have the same shape")
+
+    if (not single_vector) and batch_first:
+        b = bm.swapaxes(b, 0, 1)
+        x0 = bm.swapaxes(x0, 0, 1)
+
+    start = time.perf_counter()
+    M = get_preconditioner(M, A)
+    sol, info = _minres_impl(A, b, x0, M, atol, rtol, maxiter)
+    info.wall_time = time.perf_counter() - start
+
+    if (not single_vector) and batch_first:
+        sol = bm.swapaxes(sol, 0, 1)
+
+    if return_info:
+        return sol, info
+    return sol
+
+
+def _minres_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
+    single_vector = b.ndim == 1
+    if single_vector:
+        b, x0 = b[:, None], x0[:, None]
+
+    def apply(op, v):
+        if op is None:
+            return v
+        return (op @ v[:, 0])[:, None] if single_vector else op @ v
+
+    def dot(u, v):
+        return bm.sum(u*v, axis=0)
+
+    x = bm.copy(x0)
+    r1 = b - apply(A, x)
+    y = apply(M, r1)
+    beta1 = dot(r1, y)
+    if bm.any(beta1 < 0):
+        raise ValueError("MINRES requires a positive definite preconditioner.")
+    beta1 = bm.sqrt(beta1)
+    b_norm = bm.sqrt(dot(b, apply(M, b)))
+    tol = bm.where(rtol * b_norm > atol, rtol * b_norm, atol)
+    r_norm = beta1
+    history = [r_norm]
+    iterations = bm.zeros(r_norm.shape, dtype=bm.int64, device=bm.get_device(b))
+    converged = r_norm < tol
+    n_iter = 0
+
+    # State of the Lanczos process and the QR factorization of its tridiagonal
+    # matrix, one value (or vector) per active column.
+    active = bm.nonzero(~converged)[0]
+    xa, r1, y = x[:, active], r1[:, active], y[:, active]
+    r2 = r1
+    beta = beta1[active]
+    oldb = bm.zeros_like(beta)
+    dbar = bm.zeros_like(beta)
+    epsln = bm.zeros_like(beta)
+    phibar = beta
+    cs = -bm.ones_like(beta)
+    sn = bm.zeros_like(beta)
+    w = bm.zeros_like(xa)
+    w2 = bm.zeros_like(xa)
+
+    while active.shape[0] > 0:
+        if (maxiter is not None) and (n_iter >= maxiter):
+            break
+
+        v = y / beta[None, :]
+        y = apply(A, v)
+        if n_iter > 0:
+            y = y - (beta / oldb)[None, :] * r1
+        alfa = dot(v, y)
+        y = y - (alfa / beta)[None, :] * r2
+        r1, r2 = r2, y
+        y = apply(M, r2)
+        oldb = beta
+        beta = bm.sqrt(bm.abs(dot(r2, y)))
+
+        oldeps = epsln
+        delta = cs * dbar + sn * alfa
+        gbar = sn * dbar - cs * alfa
+        epsln = sn * beta
+        dbar = -cs * beta
+        gamma = bm.sqrt(gbar**2 + beta**2)
+        gamma = bm.where(gamma == 0, bm.finfo(gamma.dtype).eps, gamma)
+        cs = gbar / gamma
+        sn = beta / gamma
+        phi = cs * phibar
+        phibar = sn * phibar
+
+        w1, w2 = w2, w
+        w = (v - oldeps[None, :] * w1 - delta[None, :] * w2) / gamma[None, :]
+        xa = xa + phi[None, :] * w
+        n_iter += 1
+
+        r_norm = bm.set_at(bm.copy(r_norm), active, phibar)
+        history.append(r_norm)
+        iterations = bm.set_at(iterations, active, n_iter)
+        # beta = 0: the Krylov space is invariant, and the solution is exact.
+        done = (phibar < tol[active]) | (beta == 0)
+
+        if bm.any(done):
+            x = bm.set_at(x, (slice(None), active[done]), xa[:, done])
+            converged = bm.set_at(converged, active[done], True)
+            keep = ~done
+            active = active[keep]
+            xa, r1, r2, y, w, w2 = (t[:, keep] for t in (xa, r1, r2, y, w, w2))
+            beta, oldb, dbar, epsln, phibar, cs, sn = (
+                t[keep] for t in (beta, oldb, dbar, epsln, phibar, cs, sn)
+            )
+
+    if active.shape[0] > 0:
+        x = bm.set_at(x, (slice(None), active), xa)
+        logger.info(f"MINRES: failed, stopped by maxiter ({maxiter}), "
+                    f"{active.shape[0]} of {b.shape[1]} columns not converged.")
+        reason = 'maxiter'
+    else:
+        logger.info(f"MINRES: converged in {n_iter} iterations.")
+        reason = 'tolerance'
+
+    history = bm.stack(history, axis=0)
+    if single_vector:
+        x, history = x[:, 0], history[:, 0]
+        iterations, converged = iterations[0], converged[0]
+    info = SolverInfo('MINRES', n_iter, iterations, converged, history, 0.0, reason)
+
+    return x, info
@@ -0,0 +1,144 @@
+
+import time
+from typing import Optional, Union, Tuple, Callable, Any
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .smoother import SupportsMatmul
+from .solver_info import SolverInfo
+
+from .. import logger
+
+# Inner solve: maps the residual columns in low precision to the corrections,
+# optionally with the number of inner iterations, `d` or `(d, niter)`.
+InnerSolve = Callable[[TensorLike], Any]
+
+
+def to_low_precision(A, /, dtype=None):
+    """Copy of a sparse matrix with the values cast to the low precision
+    (float32 by default) for the inner solves of `iterative_refinement`."""
+    if not hasattr(A, 'astype'):
+        raise TypeError("The mixed precision mode requires a sparse tensor, "
+                        f"but got {type(A).__name__}.")
+    return A.astype(bm.float32 if dtype is None else dtype)
+
+
+def iterative_refinement(A: SupportsMatmul, b: TensorLike, inner: InnerSolve,
+                         x0: Optional[TensorLike]=None, *,
+                         dtype=None,
+                         atol: float=1e-12, rtol: float=1e-10,
+                         maxiter: int=50,
+                         name: str='IR',
+                         return_info: bool=False) -> Union[TensorLike, Tuple[TensorLike, SolverInfo]]:
+    """Solve a linear system Ax = b by mixed precision iterative refinement.
+
+    The solution and the residual r = b - Ax are kept in the precision of `b`
+    (float64), while the corrections A d = r are solved by `inner` in the low
+    precision, e.g. a float32 factorization or a float32 preconditioned CG.
+    Each step reduces the error by the relative accuracy of the inner solve,
+    so the float64 tolerance is reached in a few steps, while the inner
+    solver moves half of the bytes.
+
+    Parameters:
+        A (SupportsMatmul): The coefficient matrix in the working precision.
+        b (TensorLike): The right-hand side, a 1D or 2D tensor.
+        inner (Callable): The inner solve, taking the residual columns cast to\
+        `dtype` and scaled to unit norm, with the shape of b, and returning the\
+        corrections, or a tuple of the corrections and the number of inner iterations.
+        x0 (TensorLike, optional): Initial guess for the solution. Default is None.
+        dtype (dtype, optional): The low precision. Default is None, meaning float32.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-10.
+        maxiter (int, optional): Maximum number of refinement steps. Default is 50.
+        name (str, optional): Name of the method in the `SolverInfo`. Default is 'IR'.
+        return_info (bool, optional): Whether to return a `SolverInfo`. Default is False.
+
+    Returns:
+        Tensor: The solution of the linear system.
+        SolverInfo: Diagnostics of the solve, only if `return_info` is True. The\
+        `inner_niter` attribute lists the inner iterations of each step.
+
+    Note:
+        The refinement stops early if no column reduces its residual norm
+        by at least a half in a step, e.g. when the matrix is too ill-conditioned
+        for the low precision.
+    """
+    assert isinstance(b, TensorLike), "b must be a Tensor"
+    if b.ndim not in {1, 2}:
+        raise ValueError("b must be a 1D or 2D dense tensor")
+    if x0 is None:
+        x0 = bm.zeros_like(b)
+    elif x0.shape != b.shape:
+        raise ValueError("x0 and b must have the same shape")
+
+    start = time.perf_counter()
+    low = bm.float32 if dtype is None else dtype
+    single_vector = b.ndim == 1
+    if single_vector:
+        b, x0 = b[:, None], x0[:, None]
+
+    def apply_A(v):
+        return (A @ v[:, 0])[:, None] if single_vector else A @ v
+
+    def solve_inner(r):
+        out = inner(r[:, 0] if single_vector else r)
+        d, niter = out if isinstance(out, tuple) else (out, None)
+        d = bm.astype(d, b.dtype)
+        return (d[:, None] if single_vector else d), niter
+
+    x = bm.copy(x0)
+    r = b - apply_A(x)
+    b_norm = bm.linalg.norm(b, axis=0)
+    tol = bm.where(rtol * b_norm > atol, rtol * b_norm, atol)
+    r_norm = bm.linalg.norm(r, axis=0)
+    history = [r_norm]
+    iterations = bm.zeros(r_norm.shape, dtype=bm.int64, device=bm.get_device(b))
+    converged = r_norm < tol
+    inner_niter = []
+    n_iter = 0
+    reason = 'maxiter'
+
+    while True:
+        active = bm.nonzero(~converged)[0]
+        if active.shape[0] == 0:
+            reason = 'tolerance'
+            break
+        if n_iter >= maxiter:
+            break
+
+        # Scale the residuals to unit norm, so that they are not flushed to
+        # zero or denormalized in the low precision.
+        scale = r_norm[active]
+        ra = bm.astype(r[:, active] / scale[None, :], low)
+        d, niter = solve_inner(ra)
+        inner_niter.append(niter)
+        x = bm.set_at(x, (slice(None), active), x[:, active] + d * scale[None, :])
+        r = b - apply_A(x)
+        new_norm = bm.linalg.norm(r, axis=0)
+        n_iter += 1
+
+        stagnated = not bm.any(new_norm[active] < 0.5 * r_norm[active])
+        r_norm = new_norm
+        history.append(r_norm)
+        iterations = bm.set_at(iterations, active, n_iter)
+        converged = converged | (r_norm < tol)
+        if stagnated and not bm.all(converged):
+            reason = 'stagnation'
+            break
+
+    if reason == 'tolerance':
+        logger.info(f"{name}: converged in {n_iter} refinement steps.")
+    else:
+        logger.info(f"{name}: failed, stopped by {reason} after {n_iter} refinement steps, "
+                    f"{int(bm.sum(~converged))} of {b.shape[1]} columns not converged.")
+
+    history = bm.stack(history, axis=0)
+    if single_vector:
+        x, history = x[:, 0], history[:, 0]
+        iterations, converged = iterations[0], converged[0]
+    info = SolverInfo(name, n_iter, iterations, converged, history,
+                      time.perf_counter() - start, reason, inner_niter=inner_niter)
+
+    if return_info:
+        return x, info
+    return x
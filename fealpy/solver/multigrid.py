@@ -0,0 +1,142 @@
+from typing import Optional, List
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor
+from .smoother import JacobiSmoother, ChebyshevSmoother, matrix_diagonal, spectral_radius
+
+from .. import logger
+
+
+class Multigrid():
+    """Base of the multigrid solvers running cycles over a hierarchy of levels.
+
+    Level 0 is the finest. Subclasses fill the matrices `A`, the prolongations
+    `P` from level l+1 to level l, the restrictions `R` and the smoothers `S`
+    of all levels but the coarsest, and call `setup_coarse` at the end.
+    """
+    def __init__(self, *, smoother: str='jacobi',
+                 presmooth: int=1, postsmooth: int=1, cycle: str='V'):
+        if smoother not in ('jacobi', 'chebyshev'):
+            raise ValueError(f"Unknown smoother '{smoother}', available: jacobi, chebyshev.")
+        if cycle not in ('V', 'W'):
+            raise ValueError(f"Unknown cycle '{cycle}', available: V, W.")
+        self.smoother = smoother
+        self.presmooth = presmooth
+        self.postsmooth = postsmooth
+        self.cycle_type = cycle
+        self.A: List[CSRTensor] = []
+        self.P: List[CSRTensor] = []
+        self.R: List[CSRTensor] = []
+        self.S = [] # smoothers
+
+    def make_smoother(self, A: CSRTensor, dinv: Optional[TensorLike]=None,
+                      rho: Optional[float]=None):
+        """Smoother of the selected kind for a level."""
+        if dinv is None:
+            dinv = 1.0 / matrix_diagonal(A)
+        if rho is None:
+            rho = spectral_radius(A, dinv)
+        if self.smoother == 'jacobi':
+            return JacobiSmoother(A, dinv=dinv, rho=rho)
+        return ChebyshevSmoother(A, dinv=dinv, rho=rho)
+
+    def setup_coarse(self) -> None:
+        """Factorize the coarsest level by a dense (pseudo-)inverse."""
+        self._coarse_inv = bm.linalg.pinv(self.A[-1].to_dense())
+        logger.info(f"{self.__class__.__name__}: {self.nlevels} levels, operator "
+                    f"complexity {self.operator_complexity():.3f}, grid complexity "
+                    f"{self.grid_complexity():.3f}.")
+
+    @property
+    def nlevels(self) -> int:
+        return len(self.A)
+
+    @property
+    def shape(self):
+        return self.A[0].shape
+
+    def operator_complexity(self) -> float:
+        """Total number of non-zeros of all levels over that of the finest level."""
+        return sum(A.nnz for A in self.A) / self.A[0].nnz
+
+    def grid_complexity(self) -> float:
+        """Total number of unknowns of all levels over that of the finest level."""
+        return sum(A.shape[0] for A in self.A) / self.A[0].shape[0]
+
+    def __repr__(self) -> str:
+        sizes = ', '.join(str(A.shape[0]) for A in self.A)
+        return (f"{self.__class__.__name__}(levels=[{sizes}], "
+                f"cycle={self.cycle_type}, smoother={self.smoother})")
+
+    def _cycle(self, level: int, b: TensorLike, x: Optional[TensorLike]) -> TensorLike:
+        if level == self.nlevels - 1:
+            return self._coarse_inv @ b
+
+        A = self.A[level]
+        smoother = self.S[level]
+        x = smoother(b, x, self.presmooth)
+        rc = self.R[level] @ (b - A @ x)
+        ec = self._cycle(level + 1, rc, None)
+        if (self.cycle_type == 'W') and (level + 2 < self.nlevels):
+            ec = self._cycle(level + 1, rc, ec)
+        x = x + self.P[level] @ ec
+        return smoother(b, x, self.postsmooth)
+
+    def cycle(self, b: TensorLike, x: Optional[TensorLike]=None) -> TensorLike:
+        """Run one multigrid cycle on Ax = b.
+
+        Parameters:
+            b (Tensor): Right-hand side shaped (n,) or (n, k).
+            x (Tensor | None, optional): Initial guess. Defaults to None, meaning zero.
+
+        Returns:
+            Tensor: The new approximation.
+        """
+        return self._cycle(0, b, x)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        """Apply one cycle from zero to r, as a preconditioner."""
+        return self._cycle(0, r, None)
+
+    def solve(self, b: TensorLike, x0: Optional[TensorLike]=None, *,
+              atol: float=1e-12, rtol: float=1e-8,
+              maxiter: int=200) -> TensorLike:
+        """Solve Ax = b by multigrid cycles.
+
+        Parameters:
+            b (Tensor): Right-hand side shaped (n,) or (n, k).
+            x0 (Tensor | None, optional): Initial guess. Defaults to None, meaning zero.
+            atol (float, optional): Absolute tolerance of the residual norm. Defaults to 1e-12.
+            rtol (float, optional): Relative tolerance of the residual norm. Defaults to 1e-8.
+            maxiter (int, optional): Maximum number of cycles. Defaults to 200.
+
+        Returns:
+            Tensor: The approximate solution.
+        """
+        A = self.A[0]
+        name = self.__class__.__name__
+        x = x0
+        b_norm = bm.linalg.norm(b)
+        n_iter = 0
+
+        while True:
+            x = self._cycle(0, b, x)
+            n_iter += 1
+            r_norm = bm.linalg.norm(b - A @ x)
+
+            if r_norm < atol:
+                logger.info(f"{name}: converged in {n_iter} iterations, "
+                            "stopped by absolute tolerance.")
+                break
+
+            if r_norm < rtol * b_norm:
+                logger.info(f"{name}: converged in {n_iter} iterations, "
+                            "stopped by relative tolerance.")
+                break
+
+            if n_iter >= maxiter:
+                logger.info(f"{name}: failed, stopped by maxiter ({maxiter}).")
+                break
+
+        return x
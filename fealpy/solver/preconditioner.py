@@ -0,0 +1,172 @@
+from typing import Optional, Union, Callable
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor
+from ..sparse.triangular import TriangularSolver
+from ..sparse.incomplete import ic0, ilu0
+from .smoother import SupportsMatmul, matrix_diagonal, _scale_rows
+
+
+class JacobiPreconditioner():
+    """Jacobi (diagonal) preconditioner M^{-1} = D^{-1}."""
+    def __init__(self, A: SupportsMatmul, /):
+        """
+        Parameters:
+            A (SupportsMatmul): Sparse matrix, or an operator with a `diagonal` method.
+        """
+        diag = matrix_diagonal(A)
+        if bm.any(diag == 0):
+            raise ValueError("Jacobi preconditioner requires a non-zero diagonal.")
+        self.dinv = 1.0 / diag
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return _scale_rows(self.dinv, r)
+
+
+class BlockJacobiPreconditioner():
+    """Block Jacobi preconditioner inverting the diagonal blocks of A.
+
+    The blocks are the groups of `block_size` consecutive rows, e.g. the
+    components of a node when the DoFs of vector spaces are ordered by nodes.
+    All the blocks are inverted at once as a batch of dense matrices.
+    """
+    def __init__(self, A: CSRTensor, /, block_size: int):
+        """
+        Parameters:
+            A (CSRTensor): The matrix shaped (n, n), n divisible by `block_size`.
+            block_size (int): Size of the diagonal blocks.
+        """
+        A = A.tocsr()
+        n = A.shape[0]
+        if n % block_size != 0:
+            raise ValueError(f"Size of the matrix ({n}) is not divisible by "
+                             f"the block size ({block_size}).")
+        nb = n // block_size
+        row, col, val = A.row(), A.col(), A.values()
+        inside = (row // block_size) == (col // block_size)
+        row, col = row[inside], col[inside]
+        flat = row * block_size + col % block_size
+        blocks = bm.zeros((nb * block_size * block_size,), **bm.context(val))
+        blocks = bm.index_add(blocks, flat, val[inside])
+        blocks = bm.reshape(blocks, (nb, block_size, block_size))
+        self.block_size = block_size
+        self.inv = bm.linalg.inv(blocks)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        nb, bs = self.inv.shape[0], self.block_size
+        rb = bm.reshape(r, (nb, bs, -1))
+        z = bm.einsum('bij, bjk -> bik', self.inv, rb)
+        return bm.reshape(z, r.shape)
+
+
+class SSORPreconditioner():
+    """Symmetric successive over-relaxation preconditioner
+
+        M = omega/(2-omega) (D/omega + L) D^{-1} (D/omega + U),
+
+    where L and U are the strictly lower and upper triangular parts of A.
+    Both triangular solves are level-scheduled (see `TriangularSolver`).
+    """
+    def __init__(self, A: CSRTensor, /, omega: float=1.0):
+        """
+        Parameters:
+            A (CSRTensor): Symmetric matrix with a positive diagonal.
+            omega (float, optional): Relaxation factor in (0, 2). Defaults to 1.0.
+        """
+        if not (0.0 < omega < 2.0):
+            raise ValueError(f"omega should be in (0, 2), but got {omega}.")
+        A = A.tocsr()
+        row, col, val = A.row(), A.col(), A.values()
+        scaled = bm.where(row == col, val / omega, val)
+        A = CSRTensor(A.crow(), col, scaled, A.sparse_shape)
+        self.omega = omega
+        self.diag = matrix_diagonal(A) * omega
+        self.lower = TriangularSolver(A, lower=True)
+        self.upper = TriangularSolver(A, lower=False)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        y = self.lower.solve(r)
+        y = _scale_rows(self.diag, y)
+        return (2.0 - self.omega) / self.omega * self.upper.solve(y)
+
+
+class IC0Preconditioner():
+    """Zero fill-in incomplete Cholesky preconditioner M = L L^T (see `ic0`)."""
+    def __init__(self, A: CSRTensor, /):
+        """
+        Parameters:
+            A (CSRTensor): Symmetric positive definite matrix.
+        """
+        L = ic0(A)
+        self.L = L
+        self.lower = TriangularSolver(L, lower=True)
+        self.upper = TriangularSolver(L.T, lower=False)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.upper.solve(self.lower.solve(r))
+
+
+class ILU0Preconditioner():
+    """Zero fill-in incomplete LU preconditioner M = L U (see `ilu0`),
+    for non-symmetric matrices such as the convection-diffusion ones."""
+    def __init__(self, A: CSRTensor, /):
+        """
+        Parameters:
+            A (CSRTensor): Square matrix with the full diagonal in its pattern.
+        """
+        LU = ilu0(A)
+        self.LU = LU
+        self.lower = TriangularSolver(LU, lower=True, unit_diagonal=True)
+        self.upper = TriangularSolver(LU, lower=False)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.upper.solve(self.lower.solve(r))
+
+
+class CallablePreconditioner():
+    """Wrap a function r -> M^{-1} r as a preconditioner."""
+    def __init__(self, func: Callable[[TensorLike], TensorLike], /):
+        self.func = func
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.func(r)
+
+
+_PRECONDITIONERS = {
+    'jacobi': JacobiPreconditioner,
+    'ssor': SSORPreconditioner,
+    'ic0': IC0Preconditioner,
+    'ilu0': ILU0Preconditioner,
+}
+
+Preconditioner = Union[str, SupportsMatmul, Callable[[TensorLike], TensorLike]]
+
+
+def get_preconditioner(M: Optional[Preconditioner], A: SupportsMatmul) -> Optional[SupportsMatmul]:
+    """Turn the preconditioner argument of the iterative solvers to an object
+    applied as `M @ r`.
+
+    Parameters:
+        M (str | SupportsMatmul | Callable | None): None for no preconditioning,
+            'jacobi', 'ssor', 'ic0' or 'ilu0' to build one from A, an object supporting
+            `M @ r` (e.g. an `AMGSolver`), or a function of r.
+        A (SupportsMatmul): The matrix of the system.
+
+    Returns:
+        SupportsMatmul | None: The preconditioner.
+    """
+    if M is None:
+        return None
+    if isinstance(M, str):
+        key = M.lower()
+        if key not in _PRECONDITIONERS:
+            raise ValueError(f"Unknown preconditioner '{M}', available: "
+                             f"{', '.join(_PRECONDITIONERS)}.")
+        return _PRECONDITIONERS[key](A)
+    if hasattr(M, '__matmul__'):
+        return M
+    if callable(M):
+        return CallablePreconditioner(M)
+    raise TypeError(f"The preconditioner should be a string, an object supporting "
+                    f"`M @ r` or a callable, but got {type(M).__name__}.")
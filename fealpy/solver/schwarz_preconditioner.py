@@ -0,0 +1,320 @@
+from typing import Optional, List, Sequence
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor
+from .. import logger
+
+
+def partition_cells(mesh, nparts: int, method: str='metis') -> np.ndarray:
+    """Partition the cells of a mesh into `nparts` subdomains.
+
+    Parameters:
+        mesh (Mesh): The mesh.
+        nparts (int): Number of subdomains.
+        method (str, optional): 'metis' to partition the cell graph by METIS
+            (`fealpy.graph.metis.part_mesh`), or 'rcb' for the recursive
+            coordinate bisection of the cell barycenters, which needs no
+            extra library. 'metis' falls back to 'rcb' with a warning if the
+            METIS library can not be loaded. Defaults to 'metis'.
+
+    Returns:
+        ndarray: Subdomain index of each cell, shaped (NC,).
+    """
+    if nparts < 1:
+        raise ValueError(f"nparts should be positive, but got {nparts}.")
+    NC = mesh.number_of_cells()
+    if nparts == 1:
+        return np.zeros(NC, dtype=np.int64)
+    if method == 'metis':
+        try:
+            from ..graph.metis import part_mesh
+        except (ImportError, RuntimeError) as e:
+            # The wrapper raises RuntimeError if the METIS dll is not found.
+            logger.warning(f"partition_cells: METIS is not available ({e}), "
+                           "falling back to the recursive coordinate bisection.")
+            method = 'rcb'
+        else:
+            _, parts = part_mesh(mesh, entity='cell', nparts=nparts)
+            return np.asarray(parts, dtype=np.int64)
+    if method == 'rcb':
+        points = bm.to_numpy(mesh.entity_barycenter('cell'))
+        return _coordinate_bisection(points, nparts)
+    raise ValueError(f"Unknown partition method '{method}', available: metis, rcb.")
+
+
+def _coordinate_bisection(points: np.ndarray, nparts: int) -> np.ndarray:
+    """Split the points recursively along their longest extent."""
+    parts = np.zeros(points.shape[0], dtype=np.int64)
+    stack = [(np.arange(points.shape[0]), nparts, 0)]
+    while stack:
+        index, n, first = stack.pop()
+        if n == 1:
+            parts[index] = first
+            continue
+        p = points[index]
+        axis = np.argmax(np.ptp(p, axis=0))
+        order = index[np.argsort(p[:, axis], kind='stable')]
+        n0 = n // 2
+        k = (order.shape[0] * n0) // n
+        stack.append((order[:k], n0, first))
+        stack.append((order[k:], n - n0, first + n0))
+    return parts
+
+
+def _factorize(M, dofs: Sequence[np.ndarray]):
+    from scipy.sparse.linalg import splu
+    return [splu(M[d][:, d].tocsc()) for d in dofs]
+
+
+def _local_solve(factors, dofs, r: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """out = sum_i R_i^T A_i^{-1} R_i r."""
+    for lu, d in zip(factors, dofs):
+        out[d] += lu.solve(r[d])
+    return out
+
+
+def _attach(name: str, shape, dtype) -> tuple:
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _schwarz_worker(conn, csr, n: int, dofs: List[np.ndarray]):
+    """Factorize the subdomains of this worker from the shared CSR arrays,
+    then serve the local solves until closed."""
+    from scipy.sparse import csr_matrix
+
+    handles = [_attach(*spec) for spec in csr]
+    M = csr_matrix(tuple(a for _, a in reversed(handles)), shape=(n, n))
+    factors = _factorize(M, dofs)
+    del M
+    for shm, _ in handles:
+        shm.close()
+    conn.send('ready')
+
+    buffers = {}
+    while True:
+        msg = conn.recv()
+        if msg[0] == 'close':
+            break
+        _, rspec, zspec, widx = msg
+        for spec in (rspec, zspec):
+            if spec[0] not in buffers:
+                buffers[spec[0]] = _attach(*spec)
+        r = buffers[rspec[0]][1]
+        z = buffers[zspec[0]][1][widx]
+        z[:] = 0.0
+        _local_solve(factors, dofs, r, z)
+        conn.send('done')
+
+    for shm, _ in buffers.values():
+        shm.close()
+    conn.close()
+
+
+class _SharedArray():
+    """A numpy array in a shared memory block, owned by this process."""
+    def __init__(self, array: np.ndarray):
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf)
+        self.array[...] = array
+
+    @property
+    def spec(self):
+        return (self.shm.name, self.array.shape, self.array.dtype.str)
+
+    def release(self):
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class _SchwarzPool():
+    """Worker processes holding the factorized subdomain matrices."""
+    def __init__(self, M, dofs: List[np.ndarray], workers: int):
+        n = M.shape[0]
+        workers = min(workers, len(dofs))
+        # Greedy balance of the subdomains by their sizes.
+        load = np.zeros(workers)
+        groups = [[] for _ in range(workers)]
+        for i in np.argsort([-d.shape[0] for d in dofs], kind='stable'):
+            w = int(np.argmin(load))
+            groups[w].append(dofs[i])
+            load[w] += dofs[i].shape[0]
+
+        # The workers read the matrix from shared memory instead of a pickle.
+        csr = [_SharedArray(a) for a in (M.indptr, M.indices, M.data)]
+        ctx = mp.get_context('spawn')
+        self.conns, self.procs = [], []
+        for group in groups:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_schwarz_worker,
+                               args=(child, [a.spec for a in csr], n, group), daemon=True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+        for conn in self.conns:
+            if conn.recv() != 'ready':
+                raise RuntimeError("Failed to factorize the subdomain matrices.")
+        for a in csr:
+            a.release()
+
+        self.n = n
+        self._r = self._z = None
+
+    def solve(self, r: np.ndarray) -> np.ndarray:
+        shape = r.shape
+        if self._r is None or self._r.array.shape != shape:
+            self._release_buffers()
+            self._r = _SharedArray(np.zeros(shape))
+            self._z = _SharedArray(np.zeros((len(self.procs),) + shape))
+        self._r.array[...] = r
+        for w, conn in enumerate(self.conns):
+            conn.send(('solve', self._r.spec, self._z.spec, w))
+        for conn in self.conns:
+            conn.recv()
+        return self._z.array.sum(axis=0)
+
+    def _release_buffers(self):
+        for buf in (self._r, self._z):
+            if buf is not None:
+                buf.release()
+        self._r = self._z = None
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(('close',))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self.procs:
+            proc.join(timeout=5)
+        for conn in self.conns:
+            conn.close()
+        self.conns, self.procs = [], []
+        self._release_buffers()
+
+
+class AdditiveSchwarzPreconditioner():
+    """Overlapping additive Schwarz preconditioner
+
+        M^{-1} = sum_i R_i^T A_i^{-1} R_i  (+ R_0^T A_0^{-1} R_0),
+
+    where R_i restricts to the DoFs of the i-th subdomain and A_i = R_i A R_i^T.
+    The cells are partitioned into subdomains (by METIS by default), each
+    subdomain is extended by `overlap` layers of neighbouring cells through
+    `cell_to_cell`, and the subdomain matrices are factorized by SuperLU.
+
+    With `workers > 0`, the subdomains are distributed to worker processes.
+    They read the CSR arrays of A from shared memory, keep their
+    factorizations, and run their local solves in parallel on every
+    application, exchanging the vectors through shared memory.
+
+    The optional coarse space has one vector per subdomain, the indicator of
+    the DoFs owned by it (Nicolaides), and removes the growth of the iteration
+    numbers with the number of subdomains for elliptic problems.
+
+    The local solves run on the host with SciPy, and the results are moved
+    back to the device of A. The preconditioner is symmetric if A is, so it
+    can be used in `cg`.
+
+    Example:
+    ```
+        M = AdditiveSchwarzPreconditioner(A, space, nparts=8, overlap=1,
+                                          coarse=True, workers=4)
+        uh = cg(A, F, M=M)
+        M.close()
+    ```
+    """
+    def __init__(self, A: CSRTensor, space, /, nparts: Optional[int]=None, *,
+                 parts: Optional[TensorLike]=None,
+                 method: str='metis',
+                 overlap: int=1,
+                 coarse: bool=False,
+                 workers: int=0):
+        """
+        Parameters:
+            A (CSRTensor): The matrix, with the DoFs of `space`.
+            space (FunctionSpace): The space providing `mesh` and `cell_to_dof`.
+            nparts (int | None, optional): Number of subdomains. Required if
+                `parts` is not given.
+            parts (Tensor | None, optional): Subdomain index of each cell. Defaults
+                to None, meaning to partition the cells by `partition_cells`.
+            method (str, optional): Partition method, 'metis' or 'rcb'. Defaults to 'metis'.
+            overlap (int, optional): Number of layers of cells added to each
+                subdomain. Defaults to 1.
+            coarse (bool, optional): Whether to add the coarse space. Defaults to False.
+            workers (int, optional): Number of worker processes. Defaults to 0,
+                meaning to solve the subdomains serially in this process.
+        """
+        mesh = space.mesh
+        if parts is None:
+            if nparts is None:
+                raise ValueError("Either nparts or parts should be given.")
+            parts = partition_cells(mesh, nparts, method)
+        parts = np.asarray(bm.to_numpy(parts), dtype=np.int64)
+        nparts = int(parts.max()) + 1
+
+        A = A.tocsr()
+        self._context = bm.context(A.values())
+        M = A.to_scipy().tocsr()
+        n = M.shape[0]
+        cell2dof = bm.to_numpy(space.cell_to_dof())
+        cell2cell = bm.to_numpy(mesh.cell_to_cell())
+
+        self.dofs = []
+        for p in range(nparts):
+            flag = parts == p
+            for _ in range(overlap):
+                flag[cell2cell[flag].reshape(-1)] = True
+            self.dofs.append(np.unique(cell2dof[flag]))
+
+        self.coarse = None
+        if coarse:
+            owner = np.zeros(n, dtype=np.int64)
+            owner[cell2dof.reshape(-1)] = np.repeat(parts, cell2dof.shape[1])
+            from scipy.sparse import csr_matrix
+            from scipy.linalg import lu_factor
+            R0 = csr_matrix((np.ones(n), (owner, np.arange(n))), shape=(nparts, n))
+            self.coarse = (R0, lu_factor((R0 @ M @ R0.T).toarray()))
+
+        self._pool = None
+        if workers > 0:
+            self._pool = _SchwarzPool(M, self.dofs, workers)
+            self._factors = None
+        else:
+            self._factors = _factorize(M, self.dofs)
+        logger.info(f"Additive Schwarz: {nparts} subdomains with "
+                    f"{sum(d.shape[0] for d in self.dofs)} DoFs in total "
+                    f"({n} DoFs in A), workers={workers}.")
+
+    @property
+    def nparts(self) -> int:
+        return len(self.dofs)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        rn = np.asarray(bm.to_numpy(r), dtype=np.float64)
+        if self._pool is not None:
+            z = self._pool.solve(rn)
+        else:
+            z = _local_solve(self._factors, self.dofs, rn, np.zeros_like(rn))
+        if self.coarse is not None:
+            from scipy.linalg import lu_solve
+            R0, lu = self.coarse
+            z += R0.T @ lu_solve(lu, R0 @ rn)
+        return bm.tensor(z, **self._context)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __del__(self):
+        if getattr(self, '_pool', None) is not None:
+            self._pool.close()
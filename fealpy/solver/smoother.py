@@ -0,0 +1,152 @@
+from typing import Optional, Protocol
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+class SupportsMatmul(Protocol):
+    def __matmul__(self, other: TensorLike) -> TensorLike: ...
+
+
+def matrix_diagonal(A) -> TensorLike:
+    """Diagonal of a sparse matrix (COOTensor or CSRTensor) shaped (n,).
+
+    Operators providing a `diagonal` method (e.g. MatrixFreeOperator) are
+    also accepted."""
+    if hasattr(A, 'diagonal'):
+        return A.diagonal()
+    A = A.tocsr()
+    row, col, val = A.row(), A.col(), A.values()
+    is_diag = (row == col)
+    diag = bm.zeros((A.shape[0],), **bm.context(val))
+    return bm.index_add(diag, row[is_diag], val[is_diag])
+
+
+def _scale_rows(d: TensorLike, x: TensorLike) -> TensorLike:
+    return d[:, None] * x if (x.ndim == 2) else d * x
+
+
+def spectral_radius(A: SupportsMatmul, dinv: TensorLike, maxit: int=20) -> float:
+    """Estimate the spectral radius of D^{-1}A for a symmetric positive definite A.
+
+    The largest Ritz value of the Lanczos process on D^{-1/2} A D^{-1/2} is
+    returned, which converges much faster than the power iteration. The
+    starting vector is fixed, so that the estimation is reproducible.
+
+    Parameters:
+        A (SupportsMatmul): The matrix shaped (n, n).
+        dinv (Tensor): Inverse of the diagonal shaped (n,), all positive.
+        maxit (int, optional): Maximum number of Lanczos steps. Defaults to 20.
+
+    Returns:
+        float: The estimated spectral radius.
+    """
+    n = dinv.shape[0]
+    s = bm.sqrt(dinv)
+    v = 1.0 + 0.5 * bm.sin(bm.arange(n, **bm.context(dinv)))
+    v = v / bm.linalg.norm(v)
+    v_old = bm.zeros_like(v)
+    alpha, beta = [], [0.0]
+
+    for _ in range(min(maxit, n)):
+        w = s * (A @ (s * v)) - beta[-1] * v_old
+        a = float(bm.sum(w * v))
+        w = w - a * v
+        alpha.append(a)
+        b = float(bm.linalg.norm(w))
+        if b <= 1e-12 * abs(a):
+            break
+        beta.append(b)
+        v_old, v = v, w / b
+
+    k = len(alpha)
+    T = [[alpha[i] if j == i else (beta[max(i, j)] if abs(i - j) == 1 else 0.0)
+          for j in range(k)] for i in range(k)]
+    T = bm.tensor(T, **bm.context(dinv))
+    return float(bm.max(bm.linalg.eigvalsh(T)))
+
+
+class JacobiSmoother():
+    """Damped Jacobi smoother x <- x + omega D^{-1}(b - Ax)."""
+    def __init__(self, A: SupportsMatmul, omega: Optional[float]=None, *,
+                 dinv: Optional[TensorLike]=None, rho: Optional[float]=None):
+        """
+        Parameters:
+            A (SupportsMatmul): The matrix shaped (n, n).
+            omega (float | None, optional): Damping factor. Defaults to None,
+                meaning 4/(3 rho) where rho is the spectral radius of D^{-1}A.
+            dinv (Tensor | None, optional): Inverse of the diagonal. Computed from A if None.
+            rho (float | None, optional): Spectral radius of D^{-1}A. Estimated if None.
+        """
+        self.A = A
+        self.dinv = 1.0 / matrix_diagonal(A) if (dinv is None) else dinv
+        if omega is None:
+            rho = spectral_radius(A, self.dinv) if (rho is None) else rho
+            omega = 4.0 / (3.0 * rho)
+        self.omega = omega
+
+    def __call__(self, b: TensorLike, x: Optional[TensorLike]=None, nsweep: int=1) -> TensorLike:
+        """Apply `nsweep` sweeps to Ax = b and return the new x.
+        Starts from zero if x is None."""
+        A, omega = self.A, self.omega
+        for i in range(nsweep):
+            if (x is None) and (i == 0):
+                x = omega * _scale_rows(self.dinv, b)
+            else:
+                x = x + omega * _scale_rows(self.dinv, b - A @ x)
+        return x
+
+
+class ChebyshevSmoother():
+    """Chebyshev polynomial smoother of D^{-1}A.
+
+    The polynomial damps the eigenvalues of D^{-1}A in [lower*rho, upper*rho],
+    i.e. the high-frequency components, with `degree` products by A per sweep
+    and no inner products.
+    """
+    def __init__(self, A: SupportsMatmul, degree: int=2, *,
+                 lower: float=0.3, upper: float=1.1,
+                 dinv: Optional[TensorLike]=None, rho: Optional[float]=None):
+        """
+        Parameters:
+            A (SupportsMatmul): The matrix shaped (n, n).
+            degree (int, optional): Degree of the polynomial. Defaults to 2.
+            lower (float, optional): Lower end of the damped interval relative
+                to the spectral radius. Defaults to 0.3.
+            upper (float, optional): Upper end of the damped interval relative
+                to the spectral radius. Defaults to 1.1.
+            dinv (Tensor | None, optional): Inverse of the diagonal. Computed from A if None.
+            rho (float | None, optional): Spectral radius of D^{-1}A. Estimated if None.
+        """
+        self.A = A
+        self.degree = degree
+        self.dinv = 1.0 / matrix_diagonal(A) if (dinv is None) else dinv
+        rho = spectral_radius(A, self.dinv) if (rho is None) else rho
+        self.bounds = (lower * rho, upper * rho)
+
+    def __call__(self, b: TensorLike, x: Optional[TensorLike]=None, nsweep: int=1) -> TensorLike:
+        """Apply `nsweep` sweeps to Ax = b and return the new x.
+        Starts from zero if x is None."""
+        A, dinv = self.A, self.dinv
+        lo, hi = self.bounds
+        theta = (hi + lo) / 2
+        delta = (hi - lo) / 2
+        sigma = theta / delta
+
+        for _ in range(nsweep):
+            if x is None:
+                r = b
+                x = bm.zeros_like(b)
+            else:
+                r = b - A @ x
+            rho = 1.0 / sigma
+            d = _scale_rows(dinv, r) / theta
+            for k in range(self.degree):
+                x = x + d
+                if k == self.degree - 1:
+                    break
+                r = r - A @ d
+                rho_new = 1.0 / (2 * sigma - rho)
+                d = (rho_new * rho) * d + (2 * rho_new / delta) * _scale_rows(dinv, r)
+                rho = rho_new
+        return x
@@ -0,0 +1,49 @@
+from typing import Optional, List
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+class SolverInfo():
+    """Diagnostics of an iterative solve.
+
+    Attributes:
+        name (str): Name of the method.
+        niter (int): Number of iterations run.
+        iterations (Tensor): Number of iterations each right-hand side took to
+            converge, shaped () or (batch,).
+        converged (Tensor): Whether each right-hand side converged, shaped () or (batch,).
+        residual_history (Tensor): Residual norms of each right-hand side before
+            the first and after every iteration, shaped (niter+1,) or (niter+1, batch).
+            Converged columns keep their last value.
+        wall_time (float): Wall time of the solve in seconds.
+        stop_reason (str | None): Why the iteration stopped, e.g. 'tolerance' or 'maxiter'.
+        inner_niter (List[int | None] | None): Number of inner iterations of each
+            step, for the nested solves such as the mixed precision refinement.
+    """
+    def __init__(self, name: str, niter: int, iterations: TensorLike,
+                 converged: TensorLike, residual_history: TensorLike,
+                 wall_time: float, stop_reason: Optional[str]=None, *,
+                 inner_niter: Optional[List[Optional[int]]]=None):
+        self.name = name
+        self.niter = niter
+        self.iterations = iterations
+        self.converged = converged
+        self.residual_history = residual_history
+        self.wall_time = wall_time
+        self.stop_reason = stop_reason
+        self.inner_niter = inner_niter
+
+    @property
+    def success(self) -> bool:
+        """Whether all the right-hand sides converged."""
+        return bool(bm.all(self.converged))
+
+    @property
+    def residual(self) -> TensorLike:
+        """Final residual norms, shaped () or (batch,)."""
+        return self.residual_history[-1]
+
+    def __repr__(self) -> str:
+        return (f"SolverInfo(name={self.name}, niter={self.niter}, "
+                f"success={self.success}, wall_time={self.wall_time:.3e})")
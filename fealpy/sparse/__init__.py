@@ -6,6 +6,13 @@ from ..backend import Size
 from .sparse_tensor import SparseTensor
 from .coo_tensor import COOTensor
 from .csr_tensor import CSRTensor
+from .csr_pattern import CSRPattern
+from .coo_builder import COOBuilder
+from .csr_builder import CSRBuilder
+from ._coalesce import set_coalesce_method, get_coalesce_method
+from .ops import ptap
+from .triangular import TriangularSolver, spsolve_triangular
+from .incomplete import ic0, ilu0
 
 
 @overload
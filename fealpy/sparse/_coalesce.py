@@ -0,0 +1,173 @@
+from typing import Tuple, Optional, Dict, Callable
+from math import prod
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike as _DT
+from ..backend import promote_index_dtype
+
+_Size = Tuple[int, ...]
+_INT64_MAX = 2**63 - 1
+
+
+def _segment_sum(values: _DT, segment: _DT, num_segments: int) -> _DT:
+    """Sum values (..., n) into (..., num_segments) by the segment id of each entry."""
+    if values.ndim == 1 and values.dtype in (bm.float32, bm.float64):
+        out = bm.bincount(segment, weights=values, minlength=num_segments)
+        return bm.astype(out, values.dtype)
+    out = bm.zeros(values.shape[:-1] + (num_segments,), **bm.context(values))
+    return bm.index_add(out, segment, values, axis=-1)
+
+
+def flatten_key(indices: _DT, spshape: _Size) -> _DT:
+    """Pack multi-dimensional indices (D, nnz) into one int64 key per entry."""
+    key = bm.astype(indices[0], bm.int64)
+    for d in range(1, indices.shape[0]):
+        key = key * spshape[d] + bm.astype(indices[d], bm.int64)
+    return key
+
+
+def unflatten_key(key: _DT, spshape: _Size, dtype=None) -> _DT:
+    """Recover multi-dimensional indices (D, nnz) from the int64 keys."""
+    dtype = key.dtype if dtype is None else dtype
+    rows = []
+    for s in reversed(spshape[1:]):
+        rows.append(bm.astype(key % s, dtype))
+        key = key // s
+    rows.append(bm.astype(key, dtype))
+    return bm.stack(rows[::-1], axis=0)
+
+
+def coalesce_lexsort(indices: _DT, values: Optional[_DT], spshape: _Size,
+                     accumulate: bool=True) -> Tuple[_DT, Optional[_DT]]:
+    """Coalesce by a multi-key lexsort over all index rows (reference implementation)."""
+    order = bm.lexsort(tuple(reversed(indices)))
+    sorted_indices = indices[:, order]
+    unique_mask = bm.concat([
+        bm.ones((1, ), dtype=bm.bool, device=bm.get_device(sorted_indices)),
+        bm.any(sorted_indices[:, 1:] - sorted_indices[:, :-1], axis=0)
+    ], axis=0)
+    new_indices = bm.copy(sorted_indices[..., unique_mask])
+
+    if values is not None:
+        add_index = bm.cumsum(unique_mask, axis=0) - 1
+        sorted_values = values[..., order]
+        new_values = bm.zeros_like(sorted_values[..., unique_mask])
+        new_values = bm.index_add(new_values, add_index, sorted_values, axis=-1)
+
+    else:
+        if accumulate:
+            unique_location = bm.concat([
+                bm.nonzero(unique_mask)[0],
+                bm.tensor([len(unique_mask)], **bm.context(indices))
+            ], axis=0)
+            new_values = unique_location[1:] - unique_location[:-1]
+
+        else:
+            new_values = None
+
+    return new_indices, new_values
+
+
+def coalesce_key(indices: _DT, values: Optional[_DT], spshape: _Size,
+                 accumulate: bool=True) -> Tuple[_DT, Optional[_DT]]:
+    """Coalesce by packing indices into one int64 key and sorting it once.
+
+    Values are summed by a segmented reduction in their original order,
+    so they are never permuted.
+    Falls back to `coalesce_lexsort` if the keys can overflow int64.
+    """
+    if prod(spshape) > _INT64_MAX:
+        return coalesce_lexsort(indices, values, spshape, accumulate)
+
+    nnz = indices.shape[-1]
+    key = flatten_key(indices, spshape)
+    # Stability is not required: values are summed in their original order.
+    order = bm.argsort(key)
+    sorted_key = key[order]
+    unique_mask = bm.concat([
+        bm.ones((1, ), dtype=bm.bool, device=bm.get_device(key)),
+        sorted_key[1:] != sorted_key[:-1]
+    ], axis=0)
+    new_indices = unflatten_key(sorted_key[unique_mask], spshape, dtype=indices.dtype)
+    num_unique = new_indices.shape[-1]
+
+    if (values is None) and (not accumulate):
+        return new_indices, None
+
+    inverse = bm.empty((nnz, ), dtype=bm.int64, device=bm.get_device(key))
+    inverse = bm.set_at(inverse, order, bm.cumsum(bm.astype(unique_mask, bm.int64), axis=0) - 1)
+
+    if values is None:
+        new_values = bm.astype(bm.bincount(inverse, minlength=num_unique), indices.dtype)
+    else:
+        new_values = _segment_sum(values, inverse, num_unique)
+
+    return new_indices, new_values
+
+
+def coo_tocsr_counting(indices: _DT, values: Optional[_DT], spshape: _Size) -> Tuple[_DT, _DT, Optional[_DT]]:
+    """Convert 2-D COO to CSR with row pointers from a bincount of rows.
+
+    Entries are reordered by a stable sort over rows only when the rows are
+    not sorted yet (e.g. already coalesced tensors need no sorting at all).
+    Duplicated entries are kept. The indices are upcast to int64 if the number
+    of entries overflows their type.
+    """
+    row, col = indices[0], indices[1]
+    nrow = spshape[0]
+    itype = promote_index_dtype(row.dtype, row.shape[0])
+    counts = bm.bincount(row, minlength=nrow)
+    crow = bm.concat([bm.zeros((1, ), dtype=itype, device=bm.get_device(row)),
+                      bm.astype(bm.cumsum(counts, axis=0), itype)], axis=0)
+    col = bm.astype(col, itype) if col.dtype != itype else col
+
+    if row.shape[0] > 1 and not bm.all(row[1:] >= row[:-1]):
+        order = bm.argsort(row, stable=True)
+        col = col[order]
+        values = None if values is None else values[..., order]
+
+    return crow, col, values
+
+
+_COALESCE_METHODS: Dict[str, Callable] = {
+    'lexsort': coalesce_lexsort,
+    'key': coalesce_key,
+}
+_DEFAULT_METHOD = 'key'
+_BACKEND_METHOD: Dict[str, str] = {}
+
+
+def set_coalesce_method(method: str, backend: Optional[str]=None) -> None:
+    """Select the algorithm used by `COOTensor.coalesce`.
+
+    Parameters:
+        method (str): 'key' (single int64 key sort, default) or 'lexsort' (reference).
+        backend (str | None, optional): Name of the backend to apply the setting,
+            e.g. 'numpy' and 'pytorch'. Applies to all backends if None.
+    """
+    if method not in _COALESCE_METHODS:
+        raise ValueError(f"Unknown coalesce method '{method}', "
+                         f"available: {', '.join(_COALESCE_METHODS.keys())}.")
+    global _DEFAULT_METHOD
+    if backend is None:
+        _DEFAULT_METHOD = method
+        _BACKEND_METHOD.clear()
+    else:
+        _BACKEND_METHOD[backend] = method
+
+
+def get_coalesce_method(backend: Optional[str]=None) -> str:
+    """Get the name of the coalesce algorithm for the backend (current if None)."""
+    if backend is None:
+        backend = bm.backend_name
+    return _BACKEND_METHOD.get(backend, _DEFAULT_METHOD)
+
+
+def coalesce_coo(indices: _DT, values: Optional[_DT], spshape: _Size,
+                 accumulate: bool=True, method: Optional[str]=None):
+    if method is None:
+        method = get_coalesce_method()
+    if method not in _COALESCE_METHODS:
+        raise ValueError(f"Unknown coalesce method '{method}', "
+                         f"available: {', '.join(_COALESCE_METHODS.keys())}.")
+    return _COALESCE_METHODS[method](indices, values, spshape, accumulate)
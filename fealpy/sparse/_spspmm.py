@@ -1,8 +1,9 @@
-
 from typing import Tuple
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike as _DT
+from ..backend import promote_index_dtype
+from ._coalesce import flatten_key, unflatten_key, coo_tocsr_counting
 
 _Size = Tuple[int, ...]
 
@@ -17,97 +18,87 @@ def _shape_check(spshape1: _Size, spshape2: _Size):
                         f"got shape {spshape1} and {spshape2}.")
 
 
-def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
-               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
-    _shape_check(spshape1, spshape2)
-
+def _dense_shape_check(values1: _DT, values2: _DT):
     structure = values1.shape[:-1]
     if values2.shape[:-1] != structure:
         raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
                          f"must match that of matrix1 {structure}")
 
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
-
-    for i in range(size):
-        left_col_flag = (indices1[1, :] == i)
-
-        if not bm.any(left_col_flag, axis=0):
-            continue
 
-        right_row_flag = (indices2[0, :] == i)
+def spgemm_csr_symbolic(crow1: _DT, col1: _DT, spshape1: _Size,
+                        crow2: _DT, col2: _DT, spshape2: _Size):
+    """Symbolic phase of the sparse-sparse matrix product C = A @ B in CSR.
 
-        if not bm.any(right_row_flag, axis=0):
-            continue
+    All row-wise products of the Gustavson algorithm are expanded at once:
+    every non-zero A[i, k] is paired with all non-zeros in the k-th row of B.
+    The pairs are then compressed by their (i, j) position in C.
 
-        row = indices1[0, left_col_flag]
-        col = indices2[1, right_row_flag]
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.meshgrid(row, col, indexing='ij')
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., right_row_flag]
-
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
-        indices_list.append(idx)
-        values_list.append(val)
-
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-    return indices, values, (spshape1[0], spshape2[1])
+    Returns:
+        Tuple: crow and col of C, the positions of the left and right factors
+        in the values of A and B for every product, and the slot in C that
+        each product is summed into.
+    """
+    _shape_check(spshape1, spshape2)
+    M, N = spshape1[0], spshape2[1]
+    ikwargs = bm.context(col1)
+
+    row_nnz1 = crow1[1:] - crow1[:-1]
+    row_nnz2 = crow2[1:] - crow2[:-1]
+    row1 = bm.repeat(bm.arange(M, **ikwargs), row_nnz1)
+
+    # Number of products generated by each non-zero of A.
+    counts = bm.astype(row_nnz2[col1], bm.int64)
+    total = int(bm.sum(counts))
+    # The products are indexed in int64 if they overflow the index type.
+    pkwargs = {'dtype': promote_index_dtype(col1.dtype, total), 'device': bm.get_device(col1)}
+    counts = bm.astype(counts, pkwargs['dtype'])
+    nnz1 = col1.shape[0]
+    left = bm.repeat(bm.arange(nnz1, **pkwargs), counts)
+    first = bm.cumsum(counts, axis=0) - counts # exclusive prefix sum
+    right = bm.arange(total, **pkwargs) - first[left] + bm.astype(crow2[col1[left]], pkwargs['dtype'])
+
+    indices = bm.stack([row1[left], col2[right]], axis=0)
+    key = flatten_key(indices, (M, N))
+    unique_key, slot = bm.unique(key, return_inverse=True)
+    new_indices = unflatten_key(unique_key, (M, N), dtype=col1.dtype)
+    # Keys are sorted by unique, so the rows are sorted as well.
+    crow, col, _ = coo_tocsr_counting(new_indices, None, (M, N))
+
+    return crow, col, left, right, bm.reshape(slot, (-1,))
+
+
+def spgemm_csr_numeric(values1: _DT, values2: _DT, left: _DT, right: _DT,
+                       slot: _DT, nnz: int) -> _DT:
+    """Numeric phase of the sparse-sparse matrix product, see `spgemm_csr_symbolic`."""
+    _dense_shape_check(values1, values2)
+    products = values1[..., left] * values2[..., right]
+    new_values = bm.zeros(products.shape[:-1] + (nnz,), **bm.context(products))
+    return bm.index_add(new_values, slot, products, axis=-1)
 
 
 def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
-               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _DT, _Size]:
     _shape_check(spshape1, spshape2)
+    _dense_shape_check(values1, values2)
+    crow, col, left, right, slot = spgemm_csr_symbolic(
+        crow1, col1, spshape1, crow2, col2, spshape2
+    )
+    values = spgemm_csr_numeric(values1, values2, left, right, slot, col.shape[0])
 
-    structure = values1.shape[:-1]
-    if values2.shape[:-1] != structure:
-        raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
-                         f"must match that of matrix1 {structure}")
-
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
-    new_crow = bm.zeros(size+1,dtype=bm.int64)
-
-    for i in range(size):
-        row = bm.array([],dtype=bm.int64)
-        left_col_flag = (col1 == i)
-
-        for x in bm.where(left_col_flag == True)[0]+1:
-            flag = ~(x>crow1[:-1])^(x<=crow1[1:])
-            row = bm.concat((row,(bm.where(flag == True))[0]))
-
-        col = col2[crow2[i]:crow2[i+1]]
-
-        if not bm.any(row, axis=0):
-            continue
-
-        if not bm.any(col, axis=0):
-            continue
+    return crow, col, values, (spshape1[0], spshape2[1])
 
-        idx = bm.meshgrid(row, col, indexing='ij')
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., crow2[i]:crow2[i+1]]
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
 
-        indices_list.append(idx)
-        values_list.append(val)
-
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-
-    unique_indices, inverse_indices = bm.unique(indices, return_inverse=True, axis=1)
-    new_values = bm.zeros(unique_indices.shape[1])
-    new_values = bm.index_add(new_values, inverse_indices, values, axis=-1)
-
-    for x in unique_indices[0,:]:
-        new_crow[x+1]+=1
+def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
+               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+    _shape_check(spshape1, spshape2)
+    _dense_shape_check(values1, values2)
 
-    new_crow=bm.cumsum(new_crow, axis =-1)
+    crow1, col1, values1 = coo_tocsr_counting(indices1, values1, spshape1)
+    crow2, col2, values2 = coo_tocsr_counting(indices2, values2, spshape2)
+    crow, col, values, spshape = spspmm_csr(
+        crow1, col1, values1, spshape1,
+        crow2, col2, values2, spshape2
+    )
+    row = bm.repeat(bm.arange(spshape[0], **bm.context(col)), crow[1:] - crow[:-1])
 
-    return new_crow, unique_indices[1,:], new_values,(spshape1[0], spshape2[1])
+    return bm.stack([row, col], axis=0), values, spshape
@@ -0,0 +1,162 @@
+from typing import Optional
+
+from ..backend import TensorLike, Size, index_dtype
+from ..backend import backend_manager as bm
+from .coo_tensor import COOTensor
+
+
+class COOBuilder():
+    """An accumulator filling triplets of a COO tensor into preallocated buffers.
+
+    Calling `COOTensor.add` repeatedly concatenates all indices and values seen
+    so far, which copies the data once for every addition. The builder allocates
+    the buffers once with the expected number of triplets, writes each piece
+    in place, and outputs a single COOTensor at the end. The capacity is
+    enlarged automatically if more triplets than expected are added.
+
+    Example:
+    ```
+        builder = COOBuilder((gdof, gdof), nnz=NC*ldof*ldof, ftype=bm.float64)
+        builder.add_local(local_matrix, cell2dof, cell2dof)
+        M = builder.tocoo().coalesce()
+    ```
+    """
+    def __init__(self, spshape: Size, nnz: int=0, *,
+                 dense_shape: Size=(),
+                 itype=None, ftype=None, device=None):
+        """Initialize the builder.
+
+        Parameters:
+            spshape (Size): Shape of the sparse dimensions.
+            nnz (int, optional): Expected number of triplets. Defaults to 0.
+            dense_shape (Size, optional): Shape of the dense (batch) dimensions. Defaults to ().
+            itype (dtype | None, optional): Data type of indices. Defaults to the type
+                selected by the index policy for the sparse shape.
+            ftype (dtype | None, optional): Data type of values. Defaults to `bm.float64`.
+            device (device | None, optional): Device of the buffers. Defaults to None.
+        """
+        self._spshape = tuple(spshape)
+        self._dense_shape = tuple(dense_shape)
+        self._itype = index_dtype(max(self._spshape, default=0)) if itype is None else itype
+        self._ftype = bm.float64 if ftype is None else ftype
+        self._device = device
+        self._cursor = 0
+        self._indices = bm.empty((len(self._spshape), nnz), dtype=self._itype, device=device)
+        self._values = bm.empty(self._dense_shape + (nnz,), dtype=self._ftype, device=device)
+
+    @property
+    def nnz(self) -> int:
+        """Number of triplets added."""
+        return self._cursor
+
+    @property
+    def capacity(self) -> int:
+        """Number of triplets the buffers can hold."""
+        return self._indices.shape[-1]
+
+    @property
+    def sparse_shape(self) -> Size:
+        return self._spshape
+
+    def reserve(self, nnz: int, /) -> None:
+        """Enlarge the buffers to hold at least `nnz` triplets in total."""
+        if nnz <= self.capacity:
+            return
+        new_indices = bm.empty((len(self._spshape), nnz), dtype=self._itype, device=self._device)
+        new_values = bm.empty(self._dense_shape + (nnz,), dtype=self._ftype, device=self._device)
+        c = self._cursor
+        new_indices = bm.set_at(new_indices, (slice(None), slice(0, c)), self._indices[:, :c])
+        new_values = bm.set_at(new_values, (..., slice(0, c)), self._values[..., :c])
+        self._indices = new_indices
+        self._values = new_values
+
+    def _take(self, n: int) -> slice:
+        stop = self._cursor + n
+        if stop > self.capacity:
+            self.reserve(max(stop, 2 * self.capacity))
+        slicing = slice(self._cursor, stop)
+        self._cursor = stop
+        return slicing
+
+    def allocate(self, n: int, /) -> slice:
+        """Reserve the next `n` triplets to be filled later by `add` or
+        `add_local` with the `at` argument.
+
+        Disjoint allocated slices can be filled concurrently from several threads
+        (numpy backend only), as the buffers are not reallocated by filling.
+
+        Returns:
+            slice: Positions of the reserved triplets.
+        """
+        return self._take(n)
+
+    def _check_at(self, at: slice, n: int) -> slice:
+        if (at.stop - at.start != n) or (at.stop > self._cursor):
+            raise ValueError(f"Slice {at} is not allocated for {n} triplets.")
+        return at
+
+    def add(self, indices: TensorLike, values: TensorLike, /, *, at: Optional[slice]=None) -> None:
+        """Add triplets.
+
+        Parameters:
+            indices (Tensor): Indices shaped (sparse_ndim, n).
+            values (Tensor): Values shaped (..., n), broadcastable to (*dense_shape, n).
+            at (slice | None, optional): Positions allocated by `allocate` to fill.
+                Defaults to None, appending the triplets.
+        """
+        if indices.shape[0] != len(self._spshape):
+            raise ValueError(f"indices must have {len(self._spshape)} rows, "
+                             f"but got {indices.shape[0]}")
+        n = indices.shape[-1]
+        slicing = self._take(n) if (at is None) else self._check_at(at, n)
+        self._indices = bm.set_at(self._indices, (slice(None), slicing), indices)
+        self._values = bm.set_at(self._values, (..., slicing), values)
+
+    def add_local(self, local_tensor: TensorLike, /, *entity_to_global: TensorLike,
+                  at: Optional[slice]=None) -> None:
+        """Add local tensors of mesh entities.
+
+        Parameters:
+            local_tensor (Tensor): Local tensor shaped ([batch, ]NE, ldof_0, ..., ldof_{D-1})
+                where D is the number of sparse dimensions.
+            *entity_to_global (Tensor): Global indices of the local DoFs for
+                each sparse dimension, shaped (NE, ldof_d).
+            at (slice | None, optional): Positions allocated by `allocate` to fill.
+                Defaults to None, appending the triplets.
+        """
+        D = len(self._spshape)
+        if len(entity_to_global) != D:
+            raise ValueError(f"{D} entity-to-global tensors are required, "
+                             f"but got {len(entity_to_global)}")
+        local_shape = local_tensor.shape[-(D+1):]
+        n = 1
+        for s in local_shape:
+            n *= s
+        slicing = self._take(n) if (at is None) else self._check_at(at, n)
+
+        for d, e2g in enumerate(entity_to_global):
+            shape = [e2g.shape[0]] + [1] * D
+            shape[d+1] = e2g.shape[1]
+            idx = bm.broadcast_to(bm.reshape(e2g, shape), local_shape)
+            self._indices = bm.set_at(self._indices, (d, slicing), bm.reshape(idx, (-1,)))
+
+        values = bm.reshape(local_tensor, local_tensor.shape[:-(D+1)] + (n,))
+        self._values = bm.set_at(self._values, (..., slicing), values)
+
+    def tocoo(self, *, copy: bool=False) -> COOTensor:
+        """Output the added triplets as an un-coalesced COOTensor.
+
+        Parameters:
+            copy (bool, optional): Whether to copy the buffers. Defaults to False.
+                Without copying, the builder should not be used any more.
+        """
+        c = self._cursor
+        indices = self._indices[:, :c]
+        values = self._values[..., :c]
+        if copy:
+            indices, values = bm.copy(indices), bm.copy(values)
+        return COOTensor(indices, values, self._spshape)
+
+    def clear(self) -> None:
+        """Drop all added triplets but keep the buffers."""
+        self._cursor = 0
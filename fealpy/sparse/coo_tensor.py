@@ -10,6 +10,7 @@ from .utils import (
     check_shape_match, check_spshape_match
 )
 from ._spspmm import spspmm_coo
+from ._coalesce import coalesce_coo, coo_tocsr_counting
 from ._spmm import spmm_coo
 
 
@@ -128,23 +129,22 @@ class COOTensor(SparseTensor):
 
     def tocsr(self, *, copy=False):
         from .csr_tensor import CSRTensor
-        try:
-            crow, col, values = bm.coo_tocsr(self.indices(), self.values(), self.sparse_shape)
-            return CSRTensor(crow, col, values, spshape=self._spshape)
-        except (AttributeError, NotImplementedError):
-            pass
+        if self.sparse_ndim != 2:
+            raise ValueError("Only COOTensor with 2 sparse dimensions can be "
+                             f"converted to CSR format, but got {self.sparse_ndim}")
 
-        order = bm.argsort(self._indices[0], stable=True)
-        new_row = self._indices[0, order]
-        crow = bm.nonzero((bm.not_equal(new_row, bm.roll(new_row, 1))))[0]
-        crow = bm.concat([crow, bm.tensor([self.nnz], **bm.context(crow))])
-        new_col = bm.copy(self._indices[-1, order])
+        if (self._values is not None) and (self.dense_ndim == 0):
+            try:
+                crow, col, values = bm.coo_tocsr(self.indices(), self.values(), self.sparse_shape)
+                return CSRTensor(crow, col, values, spshape=self._spshape)
+            except (AttributeError, NotImplementedError):
+                pass
 
-        if self.values() is None:
-            new_values = None
-        else:
-            new_values = self.values()[..., order]
-            new_values = bm.copy(new_values) if copy else new_values
+        crow, new_col, new_values = coo_tocsr_counting(self._indices, self._values, self._spshape)
+
+        if copy:
+            new_col = bm.copy(new_col)
+            new_values = None if new_values is None else bm.copy(new_values)
 
         return CSRTensor(crow, new_col, new_values, spshape=self._spshape)
 
@@ -173,35 +173,25 @@ class COOTensor(SparseTensor):
             return COOTensor(bm.copy(self._indices), None, self._spshape)
         return COOTensor(bm.copy(self._indices), bm.copy(self._values), self._spshape)
 
-    def coalesce(self, accumulate: bool=True) -> 'COOTensor':
-        if self.is_coalesced or self.nnz == 0:
-            return self
-
-        order = bm.lexsort(tuple(reversed(self._indices)))
-        sorted_indices = self._indices[:, order]
-        unique_mask = bm.concat([
-            bm.ones((1, ), dtype=bm.bool, device=bm.get_device(sorted_indices)),
-            bm.any(sorted_indices[:, 1:] - sorted_indices[:, :-1], axis=0)
-        ], axis=0)
-        new_indices = bm.copy(sorted_indices[..., unique_mask])
+    def coalesce(self, accumulate: bool=True, *, method: Optional[str]=None) -> 'COOTensor':
+        """Sum the duplicated indices and return as a new sparse tensor.
+        Returns self if the indices are already coalesced.
 
-        if self._values is not None:
-            add_index = bm.cumsum(unique_mask, axis=0) - 1
-            sorted_values = self._values[..., order]
-            new_values = bm.zeros_like(sorted_values[..., unique_mask])
-            new_values = bm.index_add(new_values, add_index, sorted_values, axis=-1)
-
-        else:
-            if accumulate:
-                unique_location = bm.concat([
-                    bm.nonzero(unique_mask)[0],
-                    bm.tensor([len(unique_mask)], **bm.context(self._indices))
-                ], axis=0)
-                new_values = unique_location[1:] - unique_location[:-1]
+        Parameters:
+            accumulate (bool, optional): Whether to count the occurrences of indices\
+            as new values when `self.values` is None. Defaults to True.
+            method (str | None, optional): The algorithm, 'key' or 'lexsort'.\
+            Use the one chosen by `set_coalesce_method` for the current backend if None.
 
-            else:
-                new_values = None
+        Returns:
+            COOTensor: coalesced sparse tensor.
+        """
+        if self.is_coalesced or self.nnz == 0:
+            return self
 
+        new_indices, new_values = coalesce_coo(
+            self._indices, self._values, self.sparse_shape, accumulate, method
+        )
         return COOTensor(new_indices, new_values, self.sparse_shape, is_coalesced=True)
 
     @overload
@@ -448,7 +438,7 @@ class COOTensor(SparseTensor):
                 self.indices(), self.values(), self.sparse_shape,
                 other.indices(), other.values(), other.sparse_shape,
             )
-            return COOTensor(indices, values, spshape).coalesce()
+            return COOTensor(indices, values, spshape, is_coalesced=True)
 
         elif isinstance(other, TensorLike):
             if self.values() is None:
@@ -0,0 +1,309 @@
+from typing import Optional, List
+import os
+import tempfile
+
+from ..backend import TensorLike, Size, index_dtype, promote_index_dtype
+from ..backend import backend_manager as bm
+from ._coalesce import flatten_key
+from .csr_tensor import CSRTensor
+
+
+def _unique_key(key: TensorLike) -> TensorLike:
+    """Sorted unique values of 1-D keys by a plain sort, which is faster than
+    the hash-based `unique` of numpy for large integer arrays."""
+    key = bm.sort(key)
+    if key.shape[0] <= 1:
+        return key
+    mask = bm.concat([bm.ones((1,), dtype=bm.bool, device=bm.get_device(key)),
+                      key[1:] != key[:-1]], axis=0)
+    return key[mask]
+
+
+def _merge_key_files(a, b, path: str, block: int):
+    """Merge two sorted unique int64 arrays (numpy, possibly memory-mapped)
+    into a new file, holding only O(block) keys in memory at a time."""
+    import numpy as np
+    i = j = n = 0
+    with open(path, 'wb') as f:
+        while (i < a.shape[0]) or (j < b.shape[0]):
+            ab = np.asarray(a[i:i+block])
+            bb = np.asarray(b[j:j+block])
+            na, nb = ab.shape[0], bb.shape[0]
+            if na > 0 and nb > 0:
+                # Keys up to the smaller block end are complete in both blocks.
+                bound = min(ab[-1], bb[-1])
+                na = int(np.searchsorted(ab, bound, side='right'))
+                nb = int(np.searchsorted(bb, bound, side='right'))
+            piece = _unique_key(np.concatenate([ab[:na], bb[:nb]]))
+            piece.tofile(f)
+            i, j, n = i + na, j + nb, n + piece.shape[0]
+    return np.memmap(path, dtype=np.int64, mode='r', shape=(n,))
+
+
+class CSRBuilder():
+    """A two-pass accumulator summing triplets straight into CSR arrays.
+
+    In the symbolic pass, the (row, col) indices of all triplets are fed chunk
+    by chunk with `add_pattern` (or `add_local_pattern`), and the CSR structure
+    is fixed by `finalize`. In the numeric pass, the values are fed with the
+    same indices by `add` (or `add_local`) in any order, and are summed into
+    the final value array at once. Only the non-zeros of the result and one
+    chunk of triplets are held in memory, instead of all triplets.
+
+    The column indices and the values can optionally be memory-mapped into
+    .npy files (numpy backend only), so that the result can be larger than the
+    RAM. Each builder writes into its own new subdirectory of `mmap_dir`, so
+    matrices built earlier in the same directory are never overwritten. The
+    sorted keys of the symbolic pass are then also spilled to files there and
+    merged block by block, so the resident memory is about `crow` plus one
+    chunk of triplets in both passes, and the key files are removed by
+    `finalize`.
+
+    Example:
+    ```
+        builder = CSRBuilder((gdof, gdof))
+        for e2dof in chunks:
+            builder.add_local_pattern(e2dof, e2dof)
+        builder.finalize()
+        for local_matrix, e2dof in local_chunks:
+            builder.add_local(local_matrix, e2dof, e2dof)
+        M = builder.tocsr()
+    ```
+    """
+    _BLOCK = 2**22
+
+    def __init__(self, spshape: Size, *,
+                 dense_shape: Size=(),
+                 itype=None, ftype=None, device=None,
+                 mmap_dir: Optional[str]=None):
+        """Initialize the builder.
+
+        Parameters:
+            spshape (Size): Shape of the sparse matrix.
+            dense_shape (Size, optional): Shape of the dense (batch) dimensions. Defaults to ().
+            itype (dtype | None, optional): Data type of indices. Defaults to the type
+                selected by the index policy for the sparse shape. It is upcast to
+                int64 if the number of non-zeros overflows it.
+            ftype (dtype | None, optional): Data type of values. Defaults to `bm.float64`.
+            device (device | None, optional): Device of the arrays. Defaults to None.
+            mmap_dir (str | None, optional): Directory in which a new subdirectory
+                is created to store the memory-mapped 'col.npy' and 'values.npy'.
+                Defaults to None, keeping them in memory.
+        """
+        if len(spshape) != 2:
+            raise ValueError(f"spshape must be a 2-tuple for CSRBuilder, but got {spshape}")
+        if (mmap_dir is not None) and (bm.backend_name != 'numpy'):
+            raise ValueError("Memory-mapped CSR arrays are only supported by "
+                             f"the numpy backend, but the backend is {bm.backend_name}.")
+        self._spshape = tuple(spshape)
+        self._dense_shape = tuple(dense_shape)
+        self._itype = index_dtype(max(self._spshape)) if itype is None else itype
+        self._ftype = bm.float64 if ftype is None else ftype
+        self._device = device
+        self._mmap_dir = mmap_dir
+        self._mmap_path: Optional[str] = None
+
+        # Sorted unique keys of the symbolic pass, in decreasing sizes.
+        self._runs: List[TensorLike] = []
+        self._nfile = 0
+        self._depth = 0
+        self._crow = None
+        self._col = None
+        self._values = None
+
+    @property
+    def sparse_shape(self) -> Size:
+        return self._spshape
+
+    @property
+    def mmap_path(self) -> Optional[str]:
+        """Directory of the memory-mapped arrays of this builder, or None if
+        they are in memory or not allocated yet."""
+        return self._mmap_path
+
+    @property
+    def finalized(self) -> bool:
+        """Whether the CSR structure is fixed."""
+        return self._crow is not None
+
+    @property
+    def nnz(self) -> int:
+        """Number of non-zeros in the CSR structure."""
+        if not self.finalized:
+            raise RuntimeError("The CSR structure is not finalized yet.")
+        return self._col.shape[0]
+
+    def _file(self, name: str) -> str:
+        if self._mmap_path is None:
+            os.makedirs(self._mmap_dir, exist_ok=True)
+            self._mmap_path = tempfile.mkdtemp(prefix='csr_', dir=self._mmap_dir)
+        return os.path.join(self._mmap_path, name)
+
+    def _empty(self, name: str, shape: Size, dtype):
+        if self._mmap_dir is None:
+            return bm.zeros(shape, dtype=dtype, device=self._device)
+        from numpy.lib.format import open_memmap
+        return open_memmap(self._file(name + '.npy'), mode='w+', dtype=dtype, shape=shape)
+
+    ### Symbolic pass
+
+    def add_pattern(self, indices: TensorLike, /) -> None:
+        """Add (row, col) indices of triplets to the structure.
+
+        Parameters:
+            indices (Tensor): Row and column indices shaped (2, n).
+                Duplicated entries are allowed.
+        """
+        if self.finalized:
+            raise RuntimeError("Can not add pattern after finalize().")
+        if indices.ndim != 2 or indices.shape[0] != 2:
+            raise ValueError("indices must be shaped (2, n) for CSRBuilder, "
+                             f"but got {tuple(indices.shape)}")
+        key = _unique_key(flatten_key(indices, self._spshape))
+        if key.shape[0] == 0:
+            return
+        if self._mmap_dir is not None:
+            import numpy as np
+            path = self._file(f'key{self._nfile}.bin')
+            self._nfile += 1
+            key.tofile(path)
+            key = np.memmap(path, dtype=np.int64, mode='r', shape=key.shape)
+        self._runs.append(key)
+
+        # Merge the newest runs while they are of similar sizes, so that every
+        # key is merged O(log) times.
+        while (len(self._runs) > 1) and (self._runs[-2].shape[0] <= 2*self._runs[-1].shape[0]):
+            self._merge()
+
+    def add_local_pattern(self, *entity_to_global: TensorLike) -> None:
+        """Add the indices of local matrices of mesh entities to the structure.
+
+        Parameters:
+            *entity_to_global (Tensor): Global row and column indices of the
+                local DoFs, both shaped (NE, ldof).
+        """
+        self.add_pattern(self._local_indices(*entity_to_global))
+
+    def _merge(self) -> None:
+        """Merge the two newest runs of keys."""
+        b = self._runs.pop()
+        a = self._runs.pop()
+        if self._mmap_dir is None:
+            self._runs.append(_unique_key(bm.concat([a, b], axis=0)))
+            return
+        path = self._file(f'key{self._nfile}.bin')
+        self._nfile += 1
+        self._runs.append(_merge_key_files(a, b, path, self._BLOCK))
+        os.remove(a.filename)
+        os.remove(b.filename)
+
+    def finalize(self) -> None:
+        """Fix the CSR structure and allocate zero values."""
+        if self.finalized:
+            return
+        while len(self._runs) > 1:
+            self._merge()
+        if len(self._runs) == 0:
+            key = bm.zeros((0,), dtype=bm.int64, device=self._device)
+        else:
+            key = self._runs.pop()
+        nrow, ncol = self._spshape
+        nnz = key.shape[0]
+
+        # The keys are read by blocks, so that the memory-mapped ones are not
+        # loaded at once.
+        self._itype = promote_index_dtype(self._itype, nnz)
+        counts = bm.zeros((nrow,), dtype=bm.int64, device=self._device)
+        col = self._empty('col', (nnz,), self._itype)
+        for start in range(0, nnz, self._BLOCK):
+            block = key[start:start+self._BLOCK]
+            counts = counts + bm.bincount(block // ncol, minlength=nrow)
+            col = bm.set_at(col, slice(start, start+block.shape[0]), bm.astype(block % ncol, self._itype))
+        if self._mmap_dir is not None and nnz > 0:
+            os.remove(key.filename)
+        del key
+
+        crow = bm.concat([bm.zeros((1,), dtype=bm.int64, device=self._device),
+                          bm.cumsum(counts, axis=0)], axis=0)
+        self._depth = int(bm.max(counts)).bit_length() if nrow > 0 else 0
+        self._col = col
+        self._values = self._empty('values', self._dense_shape + (nnz,), self._ftype)
+        self._crow = bm.astype(crow, self._itype)
+
+    ### Numeric pass
+
+    def add(self, indices: TensorLike, values: TensorLike, /) -> None:
+        """Sum values of triplets into the CSR values.
+
+        Parameters:
+            indices (Tensor): Row and column indices shaped (2, n), which must
+                have been added in the symbolic pass.
+            values (Tensor): Values shaped (..., n), broadcastable to (*dense_shape, n).
+        """
+        if not self.finalized:
+            raise RuntimeError("Call finalize() before adding values.")
+        slot = self._find_slots(bm.astype(indices[0], bm.int64), bm.astype(indices[1], bm.int64))
+        values = bm.broadcast_to(values, self._dense_shape + (slot.shape[0],))
+        self._values = bm.index_add(self._values, slot, values, axis=-1)
+
+    def _find_slots(self, row: TensorLike, col: TensorLike) -> TensorLike:
+        """Positions of the (row, col) entries in the CSR arrays, by a binary
+        search over the sorted columns of each row, which reads `col` only at
+        O(log) positions per entry."""
+        n = row.shape[0]
+        if n == 0:
+            return row
+        if self.nnz == 0:
+            raise RuntimeError("Triplets not in the symbolic pass are added to the CSRBuilder.")
+        last = self.nnz - 1
+        lo = bm.astype(self._crow[row], bm.int64)
+        end = bm.astype(self._crow[row + 1], bm.int64)
+        hi = end
+
+        for _ in range(self._depth):
+            mid = (lo + hi) // 2
+            less = self._col[bm.clip(mid, 0, last)] < col
+            active = lo < hi
+            lo = bm.where(active & less, mid + 1, lo)
+            hi = bm.where(active & ~less, mid, hi)
+
+        found = (lo < end) & (self._col[bm.clip(lo, 0, last)] == col)
+        if not bm.all(found):
+            raise RuntimeError("Triplets not in the symbolic pass are added to the CSRBuilder.")
+        return lo
+
+    def add_local(self, local_tensor: TensorLike, /, *entity_to_global: TensorLike) -> None:
+        """Sum local matrices of mesh entities into the CSR values.
+
+        Parameters:
+            local_tensor (Tensor): Local matrices shaped ([batch, ]NE, ldof_0, ldof_1).
+            *entity_to_global (Tensor): Global row and column indices of the
+                local DoFs, shaped (NE, ldof_0) and (NE, ldof_1).
+        """
+        indices = self._local_indices(*entity_to_global)
+        values = bm.reshape(local_tensor, local_tensor.shape[:-3] + (-1,))
+        self.add(indices, values)
+
+    def _local_indices(self, *entity_to_global: TensorLike) -> TensorLike:
+        if len(entity_to_global) != 2:
+            raise ValueError("2 entity-to-global tensors are required, "
+                             f"but got {len(entity_to_global)}")
+        row, col = entity_to_global
+        local_shape = (row.shape[0], row.shape[1], col.shape[1])
+        row = bm.broadcast_to(row[:, :, None], local_shape)
+        col = bm.broadcast_to(col[:, None, :], local_shape)
+        return bm.stack([bm.reshape(row, (-1,)), bm.reshape(col, (-1,))], axis=0)
+
+    def clear(self) -> None:
+        """Reset the values to zero but keep the CSR structure."""
+        if self.finalized:
+            self._values = bm.set_at(self._values, (...,), 0)
+
+    def tocsr(self) -> CSRTensor:
+        """Output the summed matrix as a CSRTensor.
+
+        The tensor shares the arrays with the builder (memory-mapped if `mmap_dir`
+        is given), so later additions and `clear` also modify it."""
+        if not self.finalized:
+            raise RuntimeError("Call finalize() before outputting the matrix.")
+        return CSRTensor(self._crow, self._col, self._values, self._spshape)
@@ -0,0 +1,106 @@
+from typing import Optional
+
+from ..backend import TensorLike, Size, promote_index_dtype
+from ..backend import backend_manager as bm
+from .csr_tensor import CSRTensor
+
+
+class CSRPattern():
+    """A fixed CSR structure together with a scatter map from triplets to CSR slots.
+
+    The pattern is built once from the (row, col) indices of un-coalesced triplets.
+    After that, any values given in the same triplet order can be summed into
+    the CSR layout by a single scatter-add, without sorting or coalescing again.
+    This is useful when a sparse matrix is re-assembled many times with
+    unchanged indices, e.g. in time stepping or Newton iterations.
+    """
+    def __init__(self, indices: TensorLike, spshape: Size):
+        """Initialize the pattern from triplet indices.
+
+        Parameters:
+            indices (Tensor): Row and column indices of the triplets, shaped (2, nnz_in).
+                Duplicated entries are allowed.
+            spshape (Size): Shape of the sparse matrix.
+        """
+        if indices.ndim != 2 or indices.shape[0] != 2:
+            raise ValueError("indices must be shaped (2, nnz) for CSRPattern, "
+                             f"but got {tuple(indices.shape)}")
+        if len(spshape) != 2:
+            raise ValueError(f"spshape must be a 2-tuple for CSRPattern, but got {spshape}")
+
+        self._spshape = tuple(spshape)
+        nrow, ncol = self._spshape
+        key = bm.astype(indices[0], bm.int64) * ncol + bm.astype(indices[1], bm.int64)
+        unique_key, slot = bm.unique(key, return_inverse=True)
+        row = unique_key // ncol
+        itype = promote_index_dtype(indices.dtype, unique_key.shape[0])
+        kwargs = {'dtype': itype, 'device': bm.get_device(indices)}
+
+        self._crow = bm.astype(bm.searchsorted(row, bm.arange(nrow + 1, **kwargs)), itype)
+        self._col = bm.astype(unique_key % ncol, itype)
+        self._slot = slot.reshape(-1)
+
+    @property
+    def nnz(self) -> int:
+        """Number of non-zeros in the CSR structure."""
+        return self._col.shape[0]
+
+    @property
+    def ntriplets(self) -> int:
+        """Number of triplets accepted by `scatter`."""
+        return self._slot.shape[0]
+
+    @property
+    def sparse_shape(self) -> Size:
+        return self._spshape
+
+    def crow(self) -> TensorLike:
+        return self._crow
+
+    def col(self) -> TensorLike:
+        return self._col
+
+    def slot(self) -> TensorLike:
+        """Return the CSR position of every input triplet, shaped (nnz_in,)."""
+        return self._slot
+
+    def zeros(self, dense_shape: Size=(), *, dtype=None, device=None) -> TensorLike:
+        """Create a zero value array that fits the pattern, shaped (*dense_shape, nnz)."""
+        return bm.zeros(tuple(dense_shape) + (self.nnz,), dtype=dtype, device=device)
+
+    def scatter_add(self, out: TensorLike, values: TensorLike, /,
+                    start: int=0, stop: Optional[int]=None) -> TensorLike:
+        """Sum triplet values into a CSR value array in place.
+
+        Parameters:
+            out (Tensor): CSR values to accumulate into, shaped (..., nnz).
+            values (Tensor): Triplet values, shaped (..., stop - start).
+            start (int, optional): Position of the first triplet in the pattern. Defaults to 0.
+            stop (int | None, optional): Position after the last triplet. Defaults to None,
+                meaning `start + values.shape[-1]`.
+
+        Returns:
+            Tensor: The updated `out`.
+        """
+        if stop is None:
+            stop = start + values.shape[-1]
+        if stop - start != values.shape[-1]:
+            raise ValueError(f"Expected {stop - start} triplet values, "
+                             f"but got {values.shape[-1]}.")
+        return bm.index_add(out, self._slot[start:stop], values, axis=-1)
+
+    def scatter(self, values: TensorLike, /) -> CSRTensor:
+        """Build a CSR tensor from triplet values given in the pattern order.
+
+        Parameters:
+            values (Tensor): Triplet values, shaped (..., nnz_in).
+
+        Returns:
+            CSRTensor: The summed sparse matrix.
+        """
+        if values.shape[-1] != self.ntriplets:
+            raise ValueError(f"Expected {self.ntriplets} triplet values, "
+                             f"but got {values.shape[-1]}.")
+        out = self.zeros(values.shape[:-1], **bm.context(values))
+        out = self.scatter_add(out, values)
+        return CSRTensor(self._crow, self._col, out, self._spshape)
@@ -10,6 +10,7 @@ from .utils import (
     check_shape_match, check_spshape_match
 )
 from ._spspmm import spspmm_csr
+from ._coalesce import coalesce_coo, coo_tocsr_counting
 from ._spmm import spmm_csr
 
 
@@ -210,7 +211,18 @@ class CSRTensor(SparseTensor):
 
     @property
     def T(self):
-        raise NotImplementedError
+        if self.sparse_ndim != 2:
+            raise ValueError("sparse ndim must be 2 to transpose a CSRTensor, "
+                             f"but got {self.sparse_ndim}")
+        nrow, ncol = self._spshape
+        count = self._crow[1:] - self._crow[:-1]
+        row = bm.repeat(bm.arange(nrow, **bm.context(self._col)), count)
+        # Rows are sorted within each column after a stable sort on columns.
+        new_indices = bm.stack([self._col, row], axis=0)
+        new_crow, new_col, new_values = coo_tocsr_counting(
+            new_indices, self._values, (ncol, nrow)
+        )
+        return CSRTensor(new_crow, new_col, new_values, (ncol, nrow))
 
     def partial(self, index: Union[TensorLike, slice]):
         crow = self.crow()
@@ -274,28 +286,20 @@ class CSRTensor(SparseTensor):
             elif (not self._values is None) and (other._values is None):
                 raise ValueError("self has value while other does not")
 
-            new_crow = bm.array([0],dtype=bm.int64)
-            new_col = bm.array([],dtype=bm.int64)
-            new_values = bm.array([],dtype=bm.int64)
-
-            for i in range(0, self._crow.shape[0]-1): 
-                indices1 = self._col[self._crow[i]:self._crow[i+1]]
-                indices2 = other._col[other._crow[i]:other._crow[i+1]]
-                col, inverse_indices = bm.unique(bm.concat((indices1,indices2)), return_inverse=True)
-
-                if self._values is None:
-                    new_values = None
-                else:
-                    value1 = self._values[self._crow[i]:self._crow[i+1]]
-                    value2 = other._values[other._crow[i]:other._crow[i+1]]
-                    val =bm.concat((value1,alpha*value2))
-                    values = bm.zeros(col.shape[0],dtype=val.dtype)
-                    values = bm.index_add(values, inverse_indices, val, axis=-1)
-                    new_values = bm.concat((new_values,values))
-                new_crow = bm.concat((new_crow,bm.tensor([len(col)+new_crow[-1]])))
-                new_col = bm.concat((new_col,col))
-
-            return CSRTensor(new_crow, new_col,new_values ,self.sparse_shape)
+            # Concatenate the entries of the two tensors and sum the duplicates
+            # with one coalescing sort, instead of merging row by row.
+            indices = bm.stack([
+                bm.concat([self.row(), other.row()], axis=0),
+                bm.concat([self._col, other._col], axis=0)
+            ], axis=0)
+            if self._values is None:
+                values = None
+            else:
+                values = bm.concat([self._values, alpha * other._values], axis=-1)
+            indices, values = coalesce_coo(indices, values, self.sparse_shape, accumulate=False)
+            new_crow, new_col, new_values = coo_tocsr_counting(indices, values, self.sparse_shape)
+
+            return CSRTensor(new_crow, new_col, new_values, self.sparse_shape)
 
         elif isinstance(other, TensorLike):
             check_shape_match(self.shape, other.shape)
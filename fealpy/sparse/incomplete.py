@@ -0,0 +1,248 @@
+from typing import Tuple
+
+from ..backend import TensorLike
+from ..backend import backend_manager as bm
+from .. import logger
+from .csr_builder import _unique_key
+from .csr_tensor import CSRTensor
+from .triangular import level_schedule
+
+
+def _sorted_csr(A: CSRTensor) -> CSRTensor:
+    """The CSR tensor with sorted columns in every row."""
+    n = A.sparse_shape[1]
+    key = bm.astype(A.row(), bm.int64) * n + bm.astype(A.col(), bm.int64)
+    if key.shape[0] > 1 and not bm.all(key[1:] > key[:-1]):
+        order = bm.argsort(key)
+        return CSRTensor(A.crow(), A.col()[order], A.values()[order], A.sparse_shape)
+    return A
+
+
+def _group_entries(crow, col, row, pos, eij):
+    """Group the entries of a factor by (level of the row, position in the row),
+    so that every group only depends on the previous groups.
+
+    Returns:
+        Tuple[Tensor, ...]: Entries sorted by groups, start of each group,
+            order of the triples (given by their updated entries `eij`)
+            sorted by groups, and start of each group in the triples.
+    """
+    n = crow.shape[0] - 1
+    ikw = bm.context(crow)
+    order, ptr = level_schedule(crow, col, lower=True)
+    ptr_t = bm.tensor(ptr, **ikw)
+    level = bm.zeros((n,), **ikw)
+    level = bm.set_at(level, order, bm.repeat(bm.arange(len(ptr) - 1, **ikw), ptr_t[1:] - ptr_t[:-1]))
+    width = int(bm.max(crow[1:] - crow[:-1])) if n > 0 else 1
+    group = bm.astype(level[row], bm.int64) * width + bm.astype(pos, bm.int64)
+
+    entry_order = bm.argsort(group, stable=True)
+    groups = _unique_key(group)
+    gptr = bm.searchsorted(group[entry_order], groups)
+    triple_order = bm.argsort(group[eij], stable=True)
+    tptr = bm.searchsorted(group[eij][triple_order], groups)
+    return entry_order, gptr, triple_order, tptr
+
+
+def _local_positions(entry_order, gptr, nnz):
+    """Position of every entry inside its group."""
+    ikw = bm.context(entry_order)
+    gsize = bm.concat([gptr[1:], bm.tensor([nnz], **bm.context(gptr))], axis=0) - gptr
+    starts = bm.repeat(gptr, gsize)
+    local = bm.zeros((nnz,), **ikw)
+    return bm.set_at(local, entry_order, bm.arange(nnz, **ikw) - starts)
+
+
+def ic0_symbolic(L: CSRTensor) -> Tuple[TensorLike, ...]:
+    """Symbolic phase of IC(0) on the lower triangular pattern L with sorted
+    columns and the diagonal at the end of each row.
+
+    The entry (i, j) is updated by the products L_ik L_jk of all k < j with
+    both (i, k) and (j, k) in the pattern. These triples of entries are listed,
+    and the entries are grouped by the level of their row and their position in
+    the row, so that every group only depends on the previous groups.
+
+    Returns:
+        Tuple[Tensor, ...]: Entries sorted by groups, start of each group,
+            the three entries of the triples sorted by groups, start of each
+            group in the triples, and the diagonal entry of each row.
+    """
+    n = L.sparse_shape[0]
+    crow, col = L.crow(), L.col()
+    row = L.row()
+    nnz = col.shape[0]
+    ikw = bm.context(crow)
+    diag = crow[1:] - 1
+    if bm.any(col[diag] != bm.arange(n, **ikw)):
+        raise ValueError("IC(0) requires the full diagonal in the pattern.")
+
+    # Pairs of entries (i, j) and (i, k) of the same row with k < j.
+    pos = bm.arange(nnz, **ikw) - crow[row]
+    eij = bm.repeat(bm.arange(nnz, **ikw), pos)
+    offset = bm.cumsum(pos, axis=0) - pos
+    eik = crow[row[eij]] + (bm.arange(eij.shape[0], **ikw) - bm.repeat(offset, pos))
+
+    # Find the entry (j, k) by its key in the sorted pattern.
+    key = bm.astype(row, bm.int64) * n + bm.astype(col, bm.int64)
+    target = bm.astype(col[eij], bm.int64) * n + bm.astype(col[eik], bm.int64)
+    ejk = bm.searchsorted(key, target)
+    ejk = bm.clip(ejk, 0, max(nnz - 1, 0))
+    found = key[ejk] == target
+    eij, eik, ejk = eij[found], eik[found], ejk[found]
+
+    entry_order, gptr, triple_order, tptr = _group_entries(crow, col, row, pos, eij)
+
+    return (entry_order, gptr, eij[triple_order], eik[triple_order],
+            ejk[triple_order], tptr, diag)
+
+
+def ic0(A: CSRTensor, /) -> CSRTensor:
+    """Zero fill-in incomplete Cholesky factorization A ~ L L^T.
+
+    The factor has the pattern of the lower triangular part of A. The entries
+    are computed group by group (see `ic0_symbolic`), each group at once by
+    vectorized operations. Non-positive pivots, which may appear if A is not
+    an M-matrix, are replaced by the diagonal of A.
+
+    Parameters:
+        A (CSRTensor): Symmetric positive definite matrix.
+
+    Returns:
+        CSRTensor: The lower triangular factor L.
+    """
+    A = A.tocsr()
+    if A.sparse_shape[0] != A.sparse_shape[1]:
+        raise ValueError(f"IC(0) requires a square matrix, but got shape {A.sparse_shape}.")
+    L = _sorted_csr(A.tril())
+    entry_order, gptr, eij, eik, ejk, tptr, diag = ic0_symbolic(L)
+
+    col, row = L.col(), L.row()
+    a = L.values()
+    val = bm.copy(a)
+    nnz = col.shape[0]
+    ngroup = gptr.shape[0]
+
+    local = _local_positions(entry_order, gptr, nnz)
+    gptr = [int(g) for g in gptr] + [nnz]
+    tptr = [int(t) for t in tptr] + [eij.shape[0]]
+    breakdown = 0
+
+    for g in range(ngroup):
+        e = entry_order[gptr[g]:gptr[g+1]]
+        t0, t1 = tptr[g], tptr[g+1]
+        s = bm.zeros(e.shape, **bm.context(a))
+        if t1 > t0:
+            s = bm.index_add(s, local[eij[t0:t1]], val[eik[t0:t1]] * val[ejk[t0:t1]])
+        is_diag = col[e] == row[e]
+        pivot = a[e] - s
+        bad = is_diag & (pivot <= 0)
+        if bm.any(bad):
+            breakdown += int(bm.sum(bad))
+            pivot = bm.where(bad, a[e], pivot)
+        off = bm.where(is_diag, 1.0, val[diag[col[e]]])
+        val = bm.set_at(val, e, bm.where(is_diag, bm.sqrt(bm.abs(pivot)), pivot / off))
+
+    if breakdown > 0:
+        logger.warning(f"IC(0): {breakdown} non-positive pivots are replaced by the diagonal.")
+
+    return CSRTensor(L.crow(), col, val, L.sparse_shape)
+
+
+def ilu0_symbolic(A: CSRTensor) -> Tuple[TensorLike, ...]:
+    """Symbolic phase of ILU(0) on the pattern of A with sorted columns.
+
+    The entry (i, j) is updated by the products L_ik U_kj of all k < min(i, j)
+    with both (i, k) and (k, j) in the pattern. As in `ic0_symbolic`, these
+    triples are listed and the entries are grouped by the level of their row
+    and their position in the row.
+
+    Returns:
+        Tuple[Tensor, ...]: Entries sorted by groups, start of each group,
+            the three entries of the triples sorted by groups, start of each
+            group in the triples, and the diagonal entry of each row.
+    """
+    n = A.sparse_shape[0]
+    crow, col = A.crow(), A.col()
+    row = A.row()
+    nnz = col.shape[0]
+    ikw = bm.context(crow)
+
+    key = bm.astype(row, bm.int64) * n + bm.astype(col, bm.int64)
+    dkey = bm.astype(bm.arange(n, **ikw), bm.int64) * (n + 1)
+    diag = bm.clip(bm.searchsorted(key, dkey), 0, max(nnz - 1, 0))
+    if nnz == 0 or bm.any(key[diag] != dkey):
+        raise ValueError("ILU(0) requires the full diagonal in the pattern.")
+
+    # Pairs of entries (i, j) and (i, k) of the same row with k < j and k < i.
+    # The strictly lower entries come first in the sorted rows.
+    pos = bm.arange(nnz, **ikw) - crow[row]
+    nlower = diag - crow[:-1]
+    count = bm.minimum(pos, nlower[row])
+    eij = bm.repeat(bm.arange(nnz, **ikw), count)
+    offset = bm.cumsum(count, axis=0) - count
+    eik = crow[row[eij]] + (bm.arange(eij.shape[0], **ikw) - bm.repeat(offset, count))
+
+    # Find the entry (k, j) by its key in the sorted pattern.
+    target = bm.astype(col[eik], bm.int64) * n + bm.astype(col[eij], bm.int64)
+    ekj = bm.searchsorted(key, target)
+    ekj = bm.clip(ekj, 0, max(nnz - 1, 0))
+    found = key[ekj] == target
+    eij, eik, ekj = eij[found], eik[found], ekj[found]
+
+    entry_order, gptr, triple_order, tptr = _group_entries(crow, col, row, pos, eij)
+
+    return (entry_order, gptr, eij[triple_order], eik[triple_order],
+            ekj[triple_order], tptr, diag)
+
+
+def ilu0(A: CSRTensor, /) -> CSRTensor:
+    """Zero fill-in incomplete LU factorization A ~ L U.
+
+    Both factors are stored in one matrix with the pattern of A: the strictly
+    lower triangular part is L, whose diagonal is ones and not stored, and the
+    upper triangular part is U. The entries are computed group by group (see
+    `ilu0_symbolic`), each group at once by vectorized operations. Zero pivots
+    are replaced by the diagonal of A.
+
+    Parameters:
+        A (CSRTensor): Square matrix with the full diagonal in its pattern.
+
+    Returns:
+        CSRTensor: The factors L and U in one matrix.
+    """
+    A = A.tocsr()
+    if A.sparse_shape[0] != A.sparse_shape[1]:
+        raise ValueError(f"ILU(0) requires a square matrix, but got shape {A.sparse_shape}.")
+    A = _sorted_csr(A)
+    entry_order, gptr, eij, eik, ekj, tptr, diag = ilu0_symbolic(A)
+
+    col, row = A.col(), A.row()
+    a = A.values()
+    val = bm.copy(a)
+    nnz = col.shape[0]
+    ngroup = gptr.shape[0]
+
+    local = _local_positions(entry_order, gptr, nnz)
+    gptr = [int(g) for g in gptr] + [nnz]
+    tptr = [int(t) for t in tptr] + [eij.shape[0]]
+    breakdown = 0
+
+    for g in range(ngroup):
+        e = entry_order[gptr[g]:gptr[g+1]]
+        t0, t1 = tptr[g], tptr[g+1]
+        s = bm.zeros(e.shape, **bm.context(a))
+        if t1 > t0:
+            s = bm.index_add(s, local[eij[t0:t1]], val[eik[t0:t1]] * val[ekj[t0:t1]])
+        pivot = a[e] - s
+        bad = (col[e] == row[e]) & (pivot == 0)
+        if bm.any(bad):
+            breakdown += int(bm.sum(bad))
+            pivot = bm.where(bad, a[e], pivot)
+        is_lower = col[e] < row[e]
+        off = bm.where(is_lower, val[diag[col[e]]], 1.0)
+        val = bm.set_at(val, e, pivot / off)
+
+    if breakdown > 0:
+        logger.warning(f"ILU(0): {breakdown} zero pivots are replaced by the diagonal.")
+
+    return CSRTensor(A.crow(), col, val, A.sparse_shape)
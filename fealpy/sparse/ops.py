@@ -0,0 +1,38 @@
+from typing import Union
+
+from .coo_tensor import COOTensor
+from .csr_tensor import CSRTensor
+
+_ST = Union[COOTensor, CSRTensor]
+
+
+def ptap(P: _ST, A: _ST, /) -> _ST:
+    """Compute the Galerkin product P^T A P of two sparse matrices.
+
+    The two sparse-sparse products are done in CSR, e.g. for building
+    coarse-level operators of multigrid methods.
+
+    Parameters:
+        P (COOTensor | CSRTensor): The prolongation matrix, shaped (n, m).
+        A (COOTensor | CSRTensor): The matrix, shaped (n, n).
+
+    Returns:
+        COOTensor | CSRTensor: The coarse matrix shaped (m, m),
+            in the same format as `A`.
+    """
+    for name, M in (('P', P), ('A', A)):
+        if not isinstance(M, (COOTensor, CSRTensor)):
+            raise TypeError(f"{name} must be a COOTensor or CSRTensor, "
+                            f"but got {type(M).__name__}")
+    if A.sparse_shape[0] != A.sparse_shape[1]:
+        raise ValueError(f"A must be square, but got shape {A.sparse_shape}")
+
+    csr_P = P.tocsr()
+    csr_A = A.tocsr()
+    PtAP = csr_P.T.matmul(csr_A.matmul(csr_P))
+
+    if isinstance(A, COOTensor):
+        coo = PtAP.tocoo()
+        coo.is_coalesced = True
+        return coo
+    return PtAP
@@ -1,8 +1,9 @@
 
 from typing import Optional
+from math import prod
 
 from ..backend import backend_manager as bm
-from ..backend import TensorLike, Size
+from ..backend import TensorLike, Size, promote_index_dtype
 
 
 def check_shape_match(shape1: Size, shape2: Size):
@@ -41,11 +42,12 @@ def shape_to_strides(shape: Size, item_size: int):
 def flatten_indices(indices: TensorLike, shape: Size) -> TensorLike:
     nnz = indices.shape[-1]
     strides = shape_to_strides(shape, 1)
-    kwargs = bm.context(indices)
-    flatten = bm.zeros((nnz,), **kwargs)
+    # Upcast the indices if the flattened ones overflow, e.g. row*ncol in int32.
+    dtype = promote_index_dtype(indices.dtype, prod(shape))
+    flatten = bm.zeros((nnz,), dtype=dtype, device=bm.get_device(indices))
 
     for d, s in enumerate(strides):
-        flatten += indices[d, :] * s
+        flatten += bm.astype(indices[d, :], dtype) * s
 
     return flatten[None, ...]
 
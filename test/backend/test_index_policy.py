@@ -0,0 +1,86 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.backend import set_index_policy, get_index_policy, index_dtype, promote_index_dtype
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarMassIntegrator
+from fealpy.sparse import COOTensor
+
+ALL_BACKENDS = ['numpy', 'pytorch']
+
+
+@pytest.fixture(autouse=True)
+def reset_policy():
+    yield
+    set_index_policy('auto')
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_index_dtype(backend):
+    bm.set_backend(backend)
+    assert get_index_policy() == 'auto'
+    # torch scatter/gather kernels only take int64 indices.
+    assert index_dtype(10) == (bm.int64 if backend == 'pytorch' else bm.int32)
+    assert index_dtype(2**31) == bm.int64
+    assert promote_index_dtype(bm.int32, 2**31) == bm.int64
+    assert promote_index_dtype(bm.int64, 10) == bm.int64
+    set_index_policy('int64')
+    assert index_dtype(10) == bm.int64
+    set_index_policy('int32')
+    assert index_dtype(10) == bm.int32
+    with pytest.raises(OverflowError):
+        index_dtype(2**31)
+    with pytest.raises(ValueError):
+        set_index_policy('int16')
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+@pytest.mark.parametrize("policy", ['auto', 'int64'])
+def test_mesh_and_space(backend, policy):
+    bm.set_backend(backend)
+    set_index_policy(policy)
+    itype = bm.int32 if (policy == 'auto' and backend == 'numpy') else bm.int64
+    for mesh in [TriangleMesh.from_box(nx=2, ny=2), QuadrangleMesh.from_box(nx=2, ny=2),
+                 TetrahedronMesh.from_box(nx=1, ny=1, nz=1)]:
+        assert mesh.itype == itype
+        for name in ['cell', 'face', 'edge', 'face2cell', 'cell2edge']:
+            assert getattr(mesh, name).dtype == itype, name
+        space = LagrangeFESpace(mesh, p=2)
+        assert space.cell_to_dof().dtype == itype
+        assert LagrangeFESpace(mesh, p=1, ctype='D').cell_to_dof().dtype == itype
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarMassIntegrator())
+        M = bform.assembly()
+        assert M.crow().dtype == itype and M.col().dtype == itype
+        # The mass matrix sums to the measure of the domain.
+        np.testing.assert_allclose(float(bm.sum(M.values())), 1.0)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_upcast_flattened_indices(backend):
+    bm.set_backend(backend)
+    n = 2**20
+    indices = bm.tensor([[n - 1, 3, n - 1], [n - 2, 5, n - 2]], dtype=bm.int32)
+    values = bm.tensor([1.0, 2.0, 3.0], dtype=bm.float64)
+    coo = COOTensor(indices, values, (n, n))
+    flat = coo.ravel().indices()
+    assert flat.dtype == bm.int64
+    assert int(flat[0, 0]) == (n - 1) * n + n - 2
+    csr = coo.coalesce().tocsr()
+    assert csr.col().dtype == bm.int32
+    np.testing.assert_array_equal(bm.to_numpy(csr.col()), [5, n - 2])
+    np.testing.assert_allclose(bm.to_numpy(csr.values()), [2.0, 4.0])
+
+
+def test_scatter_int32_index():
+    # Indices stored by the 'int32' policy are cast for torch scatter kernels.
+    bm.set_backend('pytorch')
+    index = bm.tensor([0, 2, 0], dtype=bm.int32)
+    src = bm.tensor([1.0, 2.0, 3.0], dtype=bm.float64)
+    x = bm.scatter_add(bm.zeros((3,), dtype=bm.float64), index, src)
+    np.testing.assert_allclose(bm.to_numpy(x), [4.0, 0.0, 2.0])
+    x = bm.scatter(bm.zeros((3,), dtype=bm.float64), index[1:], src[1:])
+    np.testing.assert_allclose(bm.to_numpy(x), [3.0, 0.0, 2.0])
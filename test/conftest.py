@@ -0,0 +1,14 @@
+import pytest
+
+from fealpy.backend import backend_manager as bm
+
+
+@pytest.fixture
+def set_backend():
+    """Function switching the backend of a test. The pytorch backend is put
+    on CPU, since other tests may set the default device to cuda."""
+    def _set_backend(backend: str):
+        bm.set_backend(backend)
+        if backend == 'pytorch':
+            bm.set_default_device('cpu')
+    return _set_backend
@@ -0,0 +1,59 @@
+"""Benchmark of P1 and P2 assembly and SpMV with int32 and int64 indices.
+
+Usage:
+    python benchmark_index_dtype.py [backend] [max_exponent]
+
+Triangle meshes of the unit square with about 10^k cells are created under
+the 'int32' and 'int64' index policies. The mass matrix is assembled and
+multiplied by a vector 10 times. The memory counts the bytes of the index
+tensors: the cells, the cell-to-dof map and the CSR indices.
+"""
+import sys
+import time
+from math import prod
+
+from fealpy.backend import backend_manager as bm
+from fealpy.backend import set_index_policy
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarMassIntegrator
+
+
+def nbytes(*tensors):
+    return sum(prod(t.shape) * (4 if t.dtype == bm.int32 else 8) for t in tensors)
+
+
+def benchmark(backend: str, n: int, p: int, policy: str):
+    bm.set_backend(backend)
+    set_index_policy(policy)
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    mesh = TriangleMesh(mesh.node, mesh.cell)
+    space = LagrangeFESpace(mesh, p=p)
+
+    start = time.time()
+    cell2dof = space.cell_to_dof()
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarMassIntegrator(q=p+2))
+    M = bform.assembly()
+    mid = time.time()
+    x = bm.ones((M.shape[1], ), dtype=bm.float64)
+    for _ in range(10):
+        y = M @ x
+    end = time.time()
+    size = nbytes(mesh.cell, cell2dof, M.crow(), M.col()) / 2**20
+    return mid - start, end - mid, size
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'numpy'
+    max_exponent = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    for e in range(4, max_exponent + 1):
+        n = int((10**e / 2) ** 0.5)
+        for p in (1, 2):
+            results = {policy: benchmark(backend, n, p, policy) for policy in ('int64', 'int32')}
+            line = f"{backend} NC={2*n*n:.0e} P{p}:"
+            for policy, (t_asm, t_spmv, size) in results.items():
+                line += f" {policy} assembly {t_asm:.3f} s, 10 SpMV {t_spmv:.3f} s, index {size:.1f} MB;"
+            print(line)
+    set_index_policy('auto')
@@ -2,10 +2,10 @@ import numpy as np
 import pytest
 from fealpy.backend import backend_manager as bm
 
-from fealpy.mesh import TriangleMesh
+from fealpy.mesh import TriangleMesh, UniformMesh2d, UniformMesh3d
 from fealpy.functionspace import LagrangeFESpace
 from fealpy.fem import (
-        BilinearForm, ScalarDiffusionIntegrator
+        BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
     )
 
 from bilinear_form_data import *
@@ -43,6 +43,132 @@ class TestBilinearFormInterface:
         z = bm.to_numpy(bform @ x)
         assert np.linalg.norm(y-z) < 1e-12 
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("data", mesh_data)
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_keep_pattern(self, backend, data, p):
+        bm.set_backend(backend)
+
+        Mesh = mesh_map[data["class"]]
+        node = bm.from_numpy(data['node'])
+        cell = bm.from_numpy(data['cell'])
+        mesh = Mesh(node, cell)
+        space = LagrangeFESpace(mesh, p)
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        expected = bm.to_numpy(bform.assembly().to_dense())
+
+        bform = BilinearForm(space).keep_pattern()
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        first = bform.assembly()
+        pattern = bform._pattern
+        assert pattern is not None
+        second = bform.assembly()
+        assert bform._pattern is pattern
+        np.testing.assert_allclose(bm.to_numpy(first.to_dense()), expected, atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(second.to_dense()), expected, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("mesh", [
+        lambda: UniformMesh2d((0, 4, 0, 3), h=(0.5, 0.25)),
+        lambda: UniformMesh3d((0, 2, 0, 3, 0, 2), h=(0.5, 0.25, 0.2))
+    ])
+    def test_congruent_cells(self, backend, mesh):
+        bm.set_backend(backend)
+        mesh = mesh()
+        space = LagrangeFESpace(mesh, 1)
+        NC = mesh.number_of_cells()
+        coef = bm.arange(NC, dtype=bm.float64) + 1.0
+
+        for I in (ScalarDiffusionIntegrator(coef, q=3), ScalarMassIntegrator(2.0, q=3)):
+            assert I.is_congruent(space)
+            reference, scale = I.reference_assembly(space)
+            assert reference.shape == (8 if mesh.TD == 3 else 4,) * 2
+
+            expected = BilinearForm(space).add_integrator(I.const(space))
+            expected = bm.to_numpy(expected.assembly().to_dense())
+            bform = BilinearForm(space).add_integrator(I)
+            x = bm.from_numpy(np.random.default_rng(0).random(space.number_of_global_dofs()))
+            y = bm.to_numpy(bform @ x) # 矩阵无关的参考单元矩阵乘法
+            np.testing.assert_allclose(y, expected @ bm.to_numpy(x), atol=1e-12)
+            A = bm.to_numpy(bform.assembly().to_dense())
+            np.testing.assert_allclose(A, expected, atol=1e-12)
+
+        assert not ScalarDiffusionIntegrator(lambda p: p[..., 0], q=3).is_congruent(space)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_congruent_chunks(self, backend):
+        bm.set_backend(backend)
+        mesh = UniformMesh3d((0, 8, 0, 8, 0, 8), h=(0.125, 0.125, 0.125))
+        space = LagrangeFESpace(mesh, 1)
+        NC = mesh.number_of_cells()
+        coef = bm.arange(NC, dtype=bm.float64) + 1.0
+        I = ScalarMassIntegrator(coef, q=2)
+        expected = bm.to_numpy(BilinearForm(space).add_integrator(I).assembly().to_dense())
+
+        bform = BilinearForm(space)
+        bform.add_integrator(I, chunk_size=100)
+        shapes = [local.shape for local, _ in bform.assembly_local_iterative()]
+        assert shapes == [(100, 8, 8)] * 5 + [(12, 8, 8)]
+        A = bm.to_numpy(bform.streaming().assembly().to_dense())
+        np.testing.assert_allclose(A, expected, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("workers", [0, 4])
+    def test_chunk_workers(self, backend, workers):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=8, ny=8)
+        space = LagrangeFESpace(mesh, 2)
+        NC = mesh.number_of_cells()
+        coef = bm.arange(NC, dtype=bm.float64) + 1.0
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef, q=4))
+        expected = bform.assembly()
+
+        bform = BilinearForm(space, workers=workers)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef, q=4), chunk_size=23)
+        serial = BilinearForm(space)
+        serial.add_integrator(ScalarDiffusionIntegrator(coef, q=4), chunk_size=23)
+        A = bform.assembly()
+        B = serial.assembly()
+        np.testing.assert_array_equal(bm.to_numpy(A.col()), bm.to_numpy(expected.col()))
+        np.testing.assert_allclose(bm.to_numpy(A.values()), bm.to_numpy(expected.values()),
+                                   atol=1e-12)
+        # 并行分块与串行分块的结果逐位相同
+        np.testing.assert_array_equal(bm.to_numpy(A.values()), bm.to_numpy(B.values()))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_streaming(self, backend, tmp_path):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=6, ny=6)
+        space = LagrangeFESpace(mesh, 2)
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(q=4))
+        bform.add_integrator(ScalarMassIntegrator(q=4), chunk_size=17)
+        expected = bform.assembly()
+
+        mmap_dir = str(tmp_path) if backend == 'numpy' else None
+        A = bform.streaming(mmap_dir=mmap_dir).assembly()
+        np.testing.assert_array_equal(bm.to_numpy(A.crow()), bm.to_numpy(expected.crow()))
+        np.testing.assert_array_equal(bm.to_numpy(A.col()), bm.to_numpy(expected.col()))
+        np.testing.assert_allclose(bm.to_numpy(A.values()), bm.to_numpy(expected.values()),
+                                   atol=1e-12)
+        if mmap_dir is not None:
+            assert isinstance(A.values(), np.memmap)
+            # Assembling another form into the same directory keeps A intact.
+            values = np.array(A.values())
+            mform = BilinearForm(space)
+            mform.add_integrator(ScalarMassIntegrator(q=4))
+            mform.streaming(mmap_dir=mmap_dir).assembly()
+            np.testing.assert_array_equal(A.values(), values)
+
+        AT = bform.streaming().T.assembly()
+        np.testing.assert_allclose(bm.to_numpy(AT.to_dense()), bm.to_numpy(expected.to_dense()).T,
+                                   atol=1e-12)
+
 
 if __name__ == "__main__":
     pytest.main(['./test_bilinear_form.py', '-k', 'test_matmul'])
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from fealpy.backend import backend_manager as bm
+
+from fealpy.mesh import TriangleMesh, UniformMesh2d
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+        BilinearForm, MatrixFreeOperator, DirichletBC,
+        ScalarDiffusionIntegrator, ScalarMassIntegrator
+    )
+from fealpy.solver import cg
+
+
+def _form(case):
+    if case == 'triangle':
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 3)
+        NC = mesh.number_of_cells()
+        coef = bm.arange(NC, dtype=bm.float64) + 1.0
+    else:
+        mesh = UniformMesh2d((0, 5, 0, 4), h=(0.2, 0.25))
+        space = LagrangeFESpace(mesh, 1)
+        coef = 2.0
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(coef, q=5))
+    bform.add_integrator(ScalarMassIntegrator(q=5), chunk_size=7)
+    return space, bform
+
+
+class TestMatrixFreeOperator:
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("case", ['triangle', 'uniform'])
+    def test_matmul(self, backend, case):
+        bm.set_backend(backend)
+        space, bform = _form(case)
+        A = MatrixFreeOperator(bform)
+        M = bform.assembly()
+        gdof = space.number_of_global_dofs()
+        assert A.shape == (gdof, gdof)
+
+        x = bm.tensor(np.random.rand(gdof, 3), dtype=bm.float64)
+        expected = bm.to_numpy(M.to_dense()) @ bm.to_numpy(x)
+        np.testing.assert_allclose(bm.to_numpy(A @ x), expected, atol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(A @ x[:, 1]), expected[:, 1], atol=1e-10)
+        out = A.mult(x[:, 0])
+        assert A.mult(x[:, 2]) is out
+        np.testing.assert_allclose(bm.to_numpy(out), expected[:, 2], atol=1e-10)
+
+        np.testing.assert_allclose(bm.to_numpy(A.diagonal()),
+                                   np.diag(bm.to_numpy(M.to_dense())), atol=1e-10)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_cg_dirichlet(self, backend):
+        bm.set_backend(backend)
+        space, bform = _form('triangle')
+        gd = lambda p: p[..., 0] + p[..., 1]**2
+        F = bm.ones((space.number_of_global_dofs(),), dtype=bm.float64)
+        bc = DirichletBC(space, gd=gd)
+
+        M, F0 = bc.apply(bform.assembly(), F)
+        expected = bm.to_numpy(M.to_dense())
+
+        A = MatrixFreeOperator(bform)
+        F1 = bc.apply_vector(F, A, check=False)
+        A.set_dirichlet(bc.is_boundary_dof)
+        np.testing.assert_allclose(bm.to_numpy(F1), bm.to_numpy(F0), atol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(A.diagonal()), np.diag(expected), atol=1e-10)
+
+        uh = cg(A, F1, atol=1e-14, rtol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(uh), np.linalg.solve(expected, bm.to_numpy(F0)),
+                                   atol=1e-8)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from fealpy.backend import backend_manager as bm
+
+from fealpy.mesh import TriangleMesh, UniformMesh2d
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.material import LinearElasticMaterial
+from fealpy.fem import (
+        BilinearForm, ScaledBilinearForm, ConstIntegrator,
+        ScalarDiffusionIntegrator, LinearElasticIntegrator
+    )
+
+
+def _space_and_integrator(case):
+    if case == 'triangle':
+        mesh = TriangleMesh.from_box(nx=4, ny=3)
+        return LagrangeFESpace(mesh, 2), ScalarDiffusionIntegrator(q=4)
+    mesh = UniformMesh2d((0, 4, 0, 3), h=(0.5, 0.25))
+    material = LinearElasticMaterial('base', elastic_modulus=1, poisson_ratio=0.3,
+                                     hypo='plane_stress')
+    space = TensorFunctionSpace(LagrangeFESpace(mesh, 1), shape=(-1, 2))
+    return space, LinearElasticIntegrator(material, q=3, method='voigt')
+
+
+class TestScaledBilinearForm:
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("case", ['triangle', 'uniform'])
+    def test_assembly(self, backend, case):
+        bm.set_backend(backend)
+        space, integrator = _space_and_integrator(case)
+        NC = space.mesh.number_of_cells()
+        rng = np.random.default_rng(0)
+        KE = integrator(space)
+        cell2dof = space.cell_to_dof()
+
+        bform = ScaledBilinearForm(space).add_integrator(integrator)
+        for _ in range(2):
+            scale = bm.from_numpy(rng.random(NC) + 0.1)
+            K = bm.to_numpy(bform.assembly(scale).to_dense())
+            expected = BilinearForm(space)
+            expected.add_integrator(ConstIntegrator(scale[:, None, None] * KE, cell2dof))
+            expected = bm.to_numpy(expected.assembly().to_dense())
+            np.testing.assert_allclose(K, expected, atol=1e-12)
+
+        u = bm.from_numpy(rng.random(space.number_of_global_dofs()))
+        ce = bform.element_compliance(u)
+        ue = u[cell2dof]
+        expected = bm.einsum('ci, cij, cj -> c', ue, KE, ue)
+        np.testing.assert_allclose(bm.to_numpy(ce), bm.to_numpy(expected), rtol=1e-12)
+
+        with pytest.raises(ValueError):
+            bform.assembly(scale[:-1])
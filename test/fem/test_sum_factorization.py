@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from fealpy.backend import backend_manager as bm
+
+from fealpy.mesh import QuadrangleMesh, HexahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.decorator import cartesian
+from fealpy.fem import (
+        BilinearForm, MatrixFreeOperator,
+        ScalarDiffusionIntegrator, ScalarMassIntegrator
+    )
+
+
+@cartesian
+def coef(p):
+    return 1 + p[..., 0]**2
+
+
+def _space(mesh_type, p):
+    if mesh_type == 'quad':
+        mesh = QuadrangleMesh.from_box(nx=3, ny=2)
+    else:
+        mesh = HexahedronMesh.from_box(nx=2, ny=1, nz=2)
+    return LagrangeFESpace(mesh, p)
+
+
+class TestSumFactorization:
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("mesh_type", ['quad', 'hex'])
+    @pytest.mark.parametrize("p", [1, 4])
+    def test_assembly(self, backend, mesh_type, p):
+        bm.set_backend(backend)
+        space = _space(mesh_type, p)
+        NC = space.mesh.number_of_cells()
+        cellwise = bm.arange(NC, dtype=bm.float64) + 1.0
+
+        for Integrator, c in [(ScalarDiffusionIntegrator, coef), (ScalarMassIntegrator, cellwise)]:
+            expected = Integrator(c, q=p+2)(space)
+            val = Integrator(c, q=p+2, method='sumfact')(space)
+            np.testing.assert_allclose(bm.to_numpy(val), bm.to_numpy(expected), atol=1e-12)
+            # a chunk of cells
+            val = Integrator(c, q=p+2, method='sumfact')(space, indices=slice(1, 3))
+            np.testing.assert_allclose(bm.to_numpy(val), bm.to_numpy(expected[1:3]), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("mesh_type", ['quad', 'hex'])
+    def test_matrix_free(self, backend, mesh_type):
+        bm.set_backend(backend)
+        space = _space(mesh_type, 3)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef, q=5))
+        bform.add_integrator(ScalarMassIntegrator(2.0, q=5))
+        expected = bm.to_numpy(bform.assembly().to_dense())
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef, q=5, method='sumfact'))
+        bform.add_integrator(ScalarMassIntegrator(2.0, q=5, method='sumfact'))
+        A = MatrixFreeOperator(bform)
+        x = bm.tensor(np.random.rand(expected.shape[0], 2), dtype=bm.float64)
+        np.testing.assert_allclose(bm.to_numpy(A @ x), expected @ bm.to_numpy(x), atol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(A @ x[:, 0]), expected @ bm.to_numpy(x[:, 0]),
+                                   atol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(A.diagonal()), np.diag(expected), atol=1e-10)
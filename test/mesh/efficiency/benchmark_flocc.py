@@ -0,0 +1,42 @@
+"""Benchmark of the packed-key and lexsort paths of `flocc` in MeshDS.construct.
+
+Usage:
+    python benchmark_flocc.py [backend] [max_exponent]
+
+Tetrahedron meshes of the unit cube with 6*n^3 cells. For the faces and the
+edges, the sorted local entities are numbered by `flocc` with and without
+packing the rows into integer keys, and the outputs are checked to be equal.
+"""
+import sys
+import time
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TetrahedronMesh
+from fealpy.mesh.utils import flocc
+
+
+def timing(array, packed):
+    start = time.time()
+    out = flocc(array, packed=packed)
+    return time.time() - start, out
+
+
+def benchmark(backend: str, n: int):
+    bm.set_backend(backend)
+    mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=n, ny=n, nz=n)
+    line = f"{backend} NC={mesh.number_of_cells():.1e}:"
+    for name, total in [('face', mesh.total_face()), ('edge', mesh.total_edge())]:
+        array = bm.sort(total, axis=1)
+        t0, expected = timing(array, False)
+        t1, out = timing(array, True)
+        assert all(bm.all(a == b) for a, b in zip(out, expected))
+        line += f" {name} lexsort {t0:.4f} s, packed {t1:.4f} s ({t0/t1:.1f}x);"
+    print(line)
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'numpy'
+    max_exponent = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    for e in range(3, max_exponent + 1):
+        benchmark(backend, round((10**e / 6) ** (1/3)))
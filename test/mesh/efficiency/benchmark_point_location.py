@@ -0,0 +1,55 @@
+"""Benchmark of PointLocator against the brute force search over all cells.
+
+Usage:
+    python benchmark_point_location.py [backend] [max_exponent]
+
+Triangle meshes of the unit square with 2*n^2 cells locate 10^5 random
+points. The brute force tests every (point, cell) pair in chunks, only for
+the first 10^3 points. Times are reported per million points.
+"""
+import sys
+import time
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.mesh.point_locator import PointLocator
+
+
+def brute_force(mesh, points, chunk=200):
+    node, cell = mesh.entity('node'), mesh.entity('cell')
+    v0 = node[cell[:, 0]]
+    inv = bm.linalg.inv(bm.stack([node[cell[:, 1]] - v0, node[cell[:, 2]] - v0], axis=-1))
+    out = []
+    for start in range(0, points.shape[0], chunk):
+        p = points[start:start + chunk]
+        lam = bm.einsum('cij, pcj -> pci', inv, p[:, None, :] - v0[None, ...])
+        bc = bm.concat([1 - bm.sum(lam, axis=-1, keepdims=True), lam], axis=-1)
+        inside = bm.all(bc >= -1e-10, axis=-1)
+        out.append(bm.argmax(bm.astype(inside, bm.int8), axis=-1))
+    return bm.concat(out, axis=0)
+
+
+def benchmark(backend: str, n: int, npoints: int=10**5):
+    bm.set_backend(backend)
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    points = bm.random.rand(npoints, 2)
+
+    start = time.time()
+    locator = PointLocator(mesh)
+    mid = time.time()
+    cell = locator.locate(points)
+    end = time.time()
+    nbrute = 10**3
+    expected = brute_force(mesh, points[:nbrute])
+    brute = time.time() - end
+    assert bm.all(cell[:nbrute] == expected)
+    print(f"{backend} NC={mesh.number_of_cells():.0e}: build {mid-start:.4f} s, "
+          f"query {(end-mid) * 1e6 / npoints:.3f} s, brute force {brute * 1e6 / nbrute:.1f} s")
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'numpy'
+    max_exponent = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    for e in range(3, max_exponent + 1):
+        benchmark(backend, int((10**e / 2) ** 0.5))
@@ -0,0 +1,56 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh
+
+
+def box(cls, n=2):
+    if cls in (TetrahedronMesh, HexahedronMesh):
+        return cls.from_box([0, 1, 0, 1, 0, 1], nx=n, ny=n, nz=n)
+    return cls.from_box([0, 1, 0, 1], nx=n, ny=n)
+
+
+def topology(mesh):
+    names = ['face', 'edge', 'face2cell', 'cell2face', 'cell2edge']
+    if mesh.TD == 2:
+        names += ['edge2cell']
+    return {name: getattr(mesh, name) for name in names}
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("cls", [TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh])
+def test_lazy_construct(backend, cls, set_backend):
+    set_backend(backend)
+    mesh = box(cls)
+    mesh = cls(mesh.node, mesh.cell)
+    TD = mesh.TD
+    assert 'face2cell' not in mesh.__dict__
+    assert TD - 1 not in mesh.storage()
+
+    # Each entity is built on its first access, together with its relations.
+    NF = mesh.number_of_faces()
+    assert 'face2cell' in mesh.__dict__
+    assert mesh.face2cell.shape == (NF, 4)
+    if TD == 3:
+        assert 1 not in mesh.storage()
+        assert 'cell2edge' not in mesh.__dict__
+        assert mesh.cell_to_edge().shape == (mesh.number_of_cells(), mesh.number_of_edges_of_cells())
+    lazy = topology(mesh)
+
+    mesh.construct()
+    for name, value in topology(mesh).items():
+        assert bm.all(bm.equal(value, lazy[name])), name
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_invalidate(backend, set_backend):
+    set_backend(backend)
+    mesh = box(TetrahedronMesh, 1)
+    assert mesh.number_of_edges() == 19
+    mesh.cell = mesh.cell[:2]
+    mesh.invalidate()
+    assert 1 not in mesh.storage()
+    assert mesh.number_of_faces() == 7
+    assert mesh.number_of_edges() == 9
+    assert mesh.boundary_face_flag().sum() == 6
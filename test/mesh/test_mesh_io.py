@@ -0,0 +1,133 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.backend import set_index_policy, get_index_policy
+from fealpy.mesh import (
+    Mesh, IntervalMesh, TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh,
+    UniformMesh2d, UniformMesh3d
+)
+from fealpy.mesh.edge_mesh import EdgeMesh
+from fealpy.mesh.polygon_mesh import PolygonMesh
+from fealpy.mesh.lagrange_triangle_mesh import LagrangeTriangleMesh
+from fealpy.mesh.lagrange_quadrangle_mesh import LagrangeQuadrangleMesh
+from fealpy.mesh.mesh_io import read_header
+
+
+MESHES = {
+    'interval': lambda: IntervalMesh.from_interval_domain([0, 1], nx=5),
+    'triangle': lambda: TriangleMesh.from_box([0, 1, 0, 1], nx=3, ny=2),
+    'tetrahedron': lambda: TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=2, ny=1, nz=1),
+    'quadrangle': lambda: QuadrangleMesh.from_box([0, 1, 0, 1], nx=3, ny=2),
+    'hexahedron': lambda: HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=2, ny=1, nz=1),
+    'polygon': lambda: PolygonMesh.from_one_hexagon(),
+    'edge': lambda: EdgeMesh(bm.tensor([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]], dtype=bm.float64),
+                             bm.tensor([[0, 1], [1, 2], [2, 0]], dtype=bm.int32)),
+    'lagrange_triangle': lambda: LagrangeTriangleMesh.from_triangle_mesh(
+        TriangleMesh.from_box([0, 1, 0, 1], nx=2, ny=2), p=2),
+    'lagrange_quadrangle': lambda: LagrangeQuadrangleMesh.from_quadrangle_mesh(
+        QuadrangleMesh.from_box([0, 1, 0, 1], nx=2, ny=2), p=2),
+    'uniform2d': lambda: UniformMesh2d((0, 3, 0, 2), h=(0.5, 0.25), origin=(1.0, 0.0)),
+    'uniform3d': lambda: UniformMesh3d((0, 2, 0, 1, 0, 1), h=(0.5, 1.0, 1.0)),
+}
+
+
+def assert_same(a, b):
+    if isinstance(a, tuple):
+        for x, y in zip(a, b):
+            assert_same(x, y)
+        return
+    assert a.dtype == b.dtype
+    np.testing.assert_array_equal(bm.to_numpy(a), bm.to_numpy(b))
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("name", MESHES.keys())
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(backend, name, mmap, tmp_path, set_backend):
+    set_backend(backend)
+    mesh = MESHES[name]()
+    NN = mesh.number_of_nodes()
+    mesh.nodedata['u'] = bm.arange(NN, dtype=bm.float64)
+    mesh.celldata['name'] = name
+    filename = str(tmp_path / 'mesh.bin')
+    mesh.save(filename)
+
+    other = Mesh.load(filename, mmap=mmap)
+    assert type(other) is type(mesh)
+    assert other.itype == mesh.itype and other.ftype == mesh.ftype
+    for etype in range(mesh.TD + 1):
+        assert_same(mesh.entity(etype), other.entity(etype))
+    for relation in mesh._TOPOLOGY_ATTR:
+        if relation in mesh.__dict__:
+            assert_same(getattr(mesh, relation), other.__dict__[relation])
+    assert_same(mesh.nodedata['u'], other.nodedata['u'])
+    assert other.celldata['name'] == name
+
+
+def test_lazy_and_memory_mapped(tmp_path, set_backend):
+    set_backend('numpy')
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+    mesh = TriangleMesh(mesh.node, mesh.cell)
+    filename = str(tmp_path / 'mesh.bin')
+    mesh.save(filename)
+    header = read_header(filename)
+    assert header['itype'] == 'int32'
+    # The topology is not built yet, so it is neither saved nor loaded.
+    assert set(header['arrays']) == {'args/node', 'args/cell'}
+    for item in header['arrays'].values():
+        assert item['offset'] % 64 == 0
+
+    other = TriangleMesh.load(filename)
+    assert isinstance(other.cell, np.memmap)
+    assert 'face2cell' not in other.__dict__
+    assert other.number_of_edges() == mesh.number_of_edges()
+
+    # The arrays are copy-on-write, and the file is not modified.
+    other.node[0] = 100.0
+    assert_same(TriangleMesh.load(filename).node, mesh.node)
+
+    with pytest.raises(TypeError):
+        QuadrangleMesh.load(filename)
+
+
+def replace_class(filename, name):
+    """Rewrite the class name in the header of a mesh file."""
+    with open(filename, 'rb') as f:
+        data = f.read()
+    old = b'"fealpy.mesh.triangle_mesh:TriangleMesh"'
+    new = ('"' + name + '"').encode('utf-8')
+    assert len(new) <= len(old)
+    with open(filename, 'wb') as f:
+        f.write(data.replace(old, new + b' ' * (len(old) - len(new)), 1))
+
+
+@pytest.mark.parametrize("name", ['os:getcwd', 'fealpy.mesh.mesh_io:MAGIC',
+                                  'fealpy.mesh.point_locator:PointLocator',
+                                  'fealpy.mesh.mesh_io.os:getcwd', 'fealpy.mesh:TriangleMesh'])
+def test_untrusted_class(name, tmp_path, set_backend):
+    set_backend('numpy')
+    filename = str(tmp_path / 'mesh.bin')
+    TriangleMesh.from_box([0, 1, 0, 1], nx=2, ny=2).save(filename)
+    replace_class(filename, name)
+    for load in [Mesh.load, TriangleMesh.load]:
+        with pytest.raises(ValueError):
+            load(filename)
+
+
+def test_saved_index_type(tmp_path, set_backend):
+    set_backend('numpy')
+    filename = str(tmp_path / 'mesh.bin')
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=2, ny=2)
+    mesh.save(filename)
+    set_index_policy('int64')
+    try:
+        other = Mesh.load(filename)
+        # The index type of the file is kept, and the policy is untouched.
+        assert other.itype == bm.int32
+        assert isinstance(other.cell, np.memmap)
+        assert get_index_policy() == 'int64'
+        assert TriangleMesh.from_box([0, 1, 0, 1], nx=2, ny=2).itype == bm.int64
+    finally:
+        set_index_policy('auto')
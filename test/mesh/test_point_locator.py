@@ -0,0 +1,115 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh
+from fealpy.mesh.point_locator import PointLocator
+
+
+def perturbed_mesh(cls, n):
+    """Mesh of the unit square or cube with moved interior nodes."""
+    GD = 3 if cls in (TetrahedronMesh, HexahedronMesh) else 2
+    size = dict(nx=n, ny=n, nz=n) if GD == 3 else dict(nx=n, ny=n)
+    mesh = cls.from_box([0, 1] * GD, **size)
+    node = bm.to_numpy(mesh.entity('node')).copy()
+    rng = np.random.default_rng(0)
+    inner = np.all((node > 1e-12) & (node < 1 - 1e-12), axis=1)
+    node[inner] += (0.4 / n) * (rng.random((inner.sum(), GD)) - 0.5)
+    mesh.node = bm.tensor(node)
+    return mesh
+
+
+def to_point(mesh, cell, bc):
+    """Map the reference coordinates back, pairwise with the cells."""
+    X = mesh.entity('node')[mesh.entity('cell')[cell]]
+    if not isinstance(bc, tuple):
+        return bm.einsum('pv, pvg -> pg', bc, X)
+    if len(bc) == 2:
+        w = bm.reshape(bm.einsum('pi, pj -> pij', *bc), (-1, 4))
+        order = [0, 3, 1, 2]
+    else:
+        w = bm.reshape(bm.einsum('pi, pj, pk -> pijk', *bc), (-1, 8))
+        order = [0, 4, 3, 7, 1, 5, 2, 6]
+    return bm.einsum('pv, pvg -> pg', w, X[:, order])
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("cls, n", [(TriangleMesh, 8), (QuadrangleMesh, 8),
+                                    (TetrahedronMesh, 4), (HexahedronMesh, 4)])
+def test_point_to_bc(backend, cls, n, set_backend):
+    set_backend(backend)
+    mesh = perturbed_mesh(cls, n)
+    GD = mesh.geo_dimension()
+    rng = np.random.default_rng(1)
+    points = bm.tensor(rng.random((2000, GD)) * 1.2 - 0.1)
+    locator = PointLocator(mesh, chunk_size=700)
+    cell, bc = locator.point_to_bc(points)
+
+    inside = bm.all((points >= 0) & (points <= 1), axis=-1)
+    assert bm.all((cell >= 0) == inside)
+    index = bm.nonzero(inside)[0]
+    bc = tuple(b[index] for b in bc) if isinstance(bc, tuple) else bc[index]
+    q = to_point(mesh, cell[index], bc)
+    assert bm.max(bm.abs(q - points[index])) < 1e-12
+    assert bm.all(cell == mesh.location(points))
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_batch_shape(backend, set_backend):
+    set_backend(backend)
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+    # The nodes are on the boundaries of the cells.
+    points = bm.reshape(mesh.entity('node'), (5, 5, 2))
+    cell, bc = mesh.point_to_bc(points)
+    assert cell.shape == (5, 5)
+    assert bc.shape == (5, 5, 3)
+    assert bm.all(cell >= 0)
+    assert bm.allclose(bm.max(bc, axis=-1), bm.ones((5, 5), dtype=bm.float64))
+    cell, bc = mesh.point_to_bc(bm.zeros((0, 2), dtype=bm.float64))
+    assert cell.shape == (0, )
+
+
+def test_surface_mesh(set_backend):
+    set_backend('numpy')
+    with pytest.raises(ValueError):
+        PointLocator(TriangleMesh.from_unit_sphere_surface())
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_locator_cache(backend, set_backend):
+    set_backend(backend)
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+    points = bm.tensor([[0.3, 0.6], [1.5, 0.5]], dtype=bm.float64)
+    cell = mesh.location(points)
+    locator = mesh.point_locator()
+    assert mesh.point_locator() is locator
+    mesh.point_to_bc(points)
+    assert mesh.point_locator() is locator
+    # Moving the nodes drops the locator.
+    mesh.node = mesh.entity('node') + 1.0
+    assert mesh.point_locator() is not locator
+    assert bm.all(mesh.location(points + 1.0) == cell)
+    locator = mesh.point_locator()
+    mesh.uniform_refine()
+    assert mesh.point_locator() is not locator
+    assert mesh.point_locator().cell.shape[0] == 128
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_is_crossed_cell(backend, set_backend):
+    set_backend(backend)
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=8, ny=8)
+    point = bm.tensor([[0.13, 0.31], [0.71, 0.58], [0.0, 0.0], [1.0, 1.0]], dtype=bm.float64)
+    # Every cell containing a point of the segment is marked.
+    flag = mesh.is_crossed_cell(point, bm.tensor([[0, 1]]))
+    t = bm.linspace(0, 1, 1001)[:, None]
+    cell = mesh.location(point[0] * (1 - t) + point[1] * t)
+    assert bm.all(flag[cell])
+    assert int(bm.sum(flag)) == 10
+    # A segment through the nodes marks all the cells around these nodes.
+    flag = mesh.is_crossed_cell(point, bm.tensor([[2, 3]]))
+    cell = mesh.entity('cell')
+    node = mesh.entity('node')
+    onDiagonal = bm.abs(node[:, 0] - node[:, 1]) < 1e-12
+    assert bm.all(flag == bm.any(onDiagonal[cell], axis=-1))
@@ -3,7 +3,7 @@ import pytest
 
 import numpy as np
 from fealpy.backend import backend_manager as bm
-from fealpy.mesh.utils import inverse_relation
+from fealpy.mesh.utils import inverse_relation, flocc
 
 inverse_relation_with_index_data = [
     {
@@ -62,3 +62,25 @@ def test_inverse_relation_with_flag(data, backend):
     assert bm.all(bm.equal(row, bm.from_numpy(data['row'])))
     assert bm.all(bm.equal(col, bm.from_numpy(data['col'])))
     assert spshape == data['spshape']
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+@pytest.mark.parametrize('base', [7, 2**40])
+def test_flocc_packed(backend, base):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(0)
+    # Base 2**40 needs one key per column, and the rows are ordered by lexsort.
+    array = bm.from_numpy(rng.integers(0, 7, (500, 3)) * (base // 7))
+    expected = flocc(array, packed=False)
+    for out, ref in zip(flocc(array), expected):
+        assert bm.all(bm.equal(out, ref))
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+def test_flocc_negative(backend):
+    bm.set_backend(backend)
+    array = bm.from_numpy(np.array([[0, -1], [2, 1], [0, -1]]))
+    i0, i1, j = flocc(array)
+    assert bm.all(bm.equal(i0, bm.from_numpy(np.array([0, 1]))))
+    assert bm.all(bm.equal(i1, bm.from_numpy(np.array([2, 1]))))
+    assert bm.all(bm.equal(j, bm.from_numpy(np.array([0, 1, 0]))))
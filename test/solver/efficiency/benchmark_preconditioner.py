@@ -0,0 +1,75 @@
+"""Benchmark of the incomplete factorization preconditioners against
+unpreconditioned Krylov solves.
+
+Usage:
+    python benchmark_preconditioner.py [backend] [max_exponent]
+
+P1 matrices are assembled on triangle meshes of the unit square with about
+10^k cells. cg solves the diffusion+mass problem with no preconditioner,
+Jacobi, SSOR and IC(0). The backend GMRES(200) solves a convection-diffusion
+problem with no preconditioner, Jacobi and ILU(0), for at most 30 restart
+cycles, since shorter restarts stagnate on this problem at 10^5 cells, even
+with ILU(0). Both stop at rtol 1e-10.
+The setup time builds the preconditioner, and the solve time runs the
+iterations only.
+"""
+import sys
+import time
+
+from fealpy.backend import backend_manager as bm
+from fealpy.decorator import cartesian
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarConvectionIntegrator
+)
+from fealpy.solver import cg, gmres, get_preconditioner
+
+
+@cartesian
+def velocity(p):
+    return bm.stack([bm.ones_like(p[..., 0]), 0.5 * bm.ones_like(p[..., 1])], axis=-1)
+
+
+def assemble(n: int, convection: bool):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    bform = BilinearForm(LagrangeFESpace(mesh, p=1))
+    if convection:
+        bform.add_integrator(ScalarDiffusionIntegrator(5e-2))
+        bform.add_integrator(ScalarConvectionIntegrator(velocity))
+    else:
+        bform.add_integrator(ScalarDiffusionIntegrator())
+    bform.add_integrator(ScalarMassIntegrator())
+    return bform.assembly().tocsr()
+
+
+def benchmark(A, F, method: str, M):
+    start = time.time()
+    P = get_preconditioner(M, A)
+    mid = time.time()
+    if method == 'cg':
+        _, info = cg(A, F, M=P, rtol=1e-10, maxiter=100000, return_info=True)
+    else:
+        _, info = gmres(A, F, 'fealpy', tol=1e-10, maxiter=30, M=P, restart=200,
+                        return_info=True)
+    end = time.time()
+    return info.niter, info.success, mid - start, end - mid
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'numpy'
+    max_exponent = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    bm.set_backend(backend)
+
+    cases = [('cg', False, [None, 'jacobi', 'ssor', 'ic0']),
+             ('gmres', True, [None, 'jacobi', 'ilu0'])]
+    for e in range(4, max_exponent + 1):
+        n = int((10**e / 2) ** 0.5)
+        for method, convection, preconditioners in cases:
+            A = assemble(n, convection)
+            F = bm.sin(bm.arange(A.shape[0], dtype=bm.float64))
+            for M in preconditioners:
+                niter, success, t_setup, t_solve = benchmark(A, F, method, M)
+                status = '' if success else ' (not converged)'
+                print(f"{backend} NC={2*n*n:.0e} {method} M={M}: {niter} iterations{status}, "
+                      f"setup {t_setup:.3f} s, solve {t_solve:.3f} s")
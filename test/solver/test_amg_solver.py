@@ -0,0 +1,84 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator,
+    LinearForm, ScalarSourceIntegrator, DirichletBC
+)
+from fealpy.sparse import COOTensor
+from fealpy.solver import cg, AMGSolver, rigid_body_modes
+
+
+class CountedMatrix():
+    def __init__(self, A):
+        self.A = A
+        self.count = 0
+
+    def __matmul__(self, x):
+        self.count += 1
+        return self.A @ x
+
+
+def poisson_system(n: int):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=1)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    lform = LinearForm(space)
+    lform.add_integrator(ScalarSourceIntegrator(1.0))
+    A, F = DirichletBC(space, gd=0.0).apply(bform.assembly(), lform.assembly())
+    return mesh, A, F
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_preconditioned_cg(backend):
+    bm.set_backend(backend)
+    _, A, F = poisson_system(32)
+    amg = AMGSolver(A, coarse_size=50)
+    assert amg.nlevels >= 2
+    assert amg.operator_complexity() < 2.0
+
+    plain = CountedMatrix(A)
+    cg(plain, F, rtol=1e-8)
+    precond = CountedMatrix(A)
+    x = cg(precond, F, M=amg, rtol=1e-8)
+
+    assert bm.linalg.norm(F - A @ x) < 1e-8 * bm.linalg.norm(F)
+    assert precond.count * 3 < plain.count
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("smoother", ['jacobi', 'chebyshev'])
+@pytest.mark.parametrize("cycle", ['V', 'W'])
+def test_standalone(backend, smoother, cycle):
+    bm.set_backend(backend)
+    _, A, F = poisson_system(16)
+    amg = AMGSolver(A, coarse_size=20, smoother=smoother, cycle=cycle)
+    x = amg.solve(F, rtol=1e-8, maxiter=100)
+    assert bm.linalg.norm(F - A @ x) < 1e-8 * bm.linalg.norm(F)
+
+    # batched right-hand sides
+    FF = bm.stack([F, 2*F], axis=1)
+    xx = amg.solve(FF, rtol=1e-8, maxiter=100)
+    assert bm.allclose(xx[:, 1], 2*xx[:, 0])
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_block_size(backend):
+    bm.set_backend(backend)
+    mesh, A, F = poisson_system(16)
+    # Vector Laplacian with the two components interleaved by nodes.
+    row, col, val = A.row(), A.col(), A.values()
+    indices = bm.concat([bm.stack([2*row, 2*col], axis=0),
+                         bm.stack([2*row+1, 2*col+1], axis=0)], axis=1)
+    AA = COOTensor(indices, bm.concat([val, val], axis=0), (2*A.shape[0],)*2).tocsr()
+    FF = bm.stack([F, -F], axis=1).reshape(-1)
+
+    B = rigid_body_modes(mesh.entity('node'))
+    assert B.shape == (AA.shape[0], 3)
+    amg = AMGSolver(AA, block_size=2, B=B, coarse_size=20)
+    x = cg(AA, FF, M=amg, rtol=1e-8)
+    assert bm.linalg.norm(FF - AA @ x) < 1e-8 * bm.linalg.norm(FF)
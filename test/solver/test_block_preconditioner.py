@@ -0,0 +1,79 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.fem import (
+    BilinearForm, BlockForm, ScalarDiffusionIntegrator, ScalarMassIntegrator, PressWorkIntegrator
+)
+from fealpy.solver import (
+    minres, gmres, AMGSolver, BlockOperator, BlockDiagonalPreconditioner,
+    BlockTriangularPreconditioner, MassSchurPreconditioner
+)
+
+
+def stokes(n=8, mu=1.0):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    pspace = LagrangeFESpace(mesh, p=1)
+    uspace = TensorFunctionSpace(LagrangeFESpace(mesh, p=2), (2, -1))
+    U = BilinearForm(uspace)
+    U.add_integrator(ScalarDiffusionIntegrator(mu))
+    P = BilinearForm((pspace, uspace))
+    P.add_integrator(PressWorkIntegrator(-1))
+    form = BlockForm([[U, P], [P.T, None]])
+    mass = BilinearForm(pspace)
+    mass.add_integrator(ScalarMassIntegrator())
+    return form, uspace.is_boundary_dof(), mass.assembly()
+
+
+def rhs(A, is_bd_dof):
+    nu, np_ = A.row_sizes
+    fu = bm.sin(bm.arange(nu, dtype=bm.float64))
+    fu = bm.where(is_bd_dof, 0.0, fu)
+    return bm.concat([fu, bm.zeros((np_,), dtype=bm.float64)], axis=0)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_block_operator(backend, set_backend):
+    set_backend(backend)
+    form, _, _ = stokes(n=4)
+    A = BlockOperator.from_form(form)
+    assert A.shape == tuple(int(s) for s in form.shape)
+    assert A.block(1, 1) is None
+    u = bm.sin(bm.arange(A.shape[1], dtype=bm.float64))
+    M = form.assembly()
+    assert bm.allclose(A @ u, M @ u)
+    U = bm.stack([u, 2 * u], axis=1)
+    assert bm.allclose(A @ U, M @ U)
+    B = BlockOperator.from_matrix(M, A.row_sizes)
+    assert B.block(1, 1) is None
+    assert bm.allclose(B @ u, M @ u)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_block_diagonal_minres(backend, set_backend):
+    set_backend(backend)
+    form, is_bd_dof, Mp = stokes()
+    A = BlockOperator.from_form(form).dirichlet([is_bd_dof, None])
+    F = rhs(A, is_bd_dof)
+    _, plain = minres(A, F, rtol=1e-8, return_info=True)
+    M = BlockDiagonalPreconditioner(A, [AMGSolver(A.block(0, 0)), MassSchurPreconditioner(Mp)])
+    x, info = minres(A, F, M=M, rtol=1e-8, return_info=True)
+    assert info.success
+    assert info.niter < plain.niter
+    assert bm.linalg.norm(F - A @ x) < 1e-6 * bm.linalg.norm(F)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_block_triangular_gmres(backend, set_backend):
+    set_backend(backend)
+    form, is_bd_dof, Mp = stokes()
+    A = BlockOperator.from_form(form).dirichlet([is_bd_dof, None])
+    F = rhs(A, is_bd_dof)
+    _, plain = gmres(A, F, 'fealpy', tol=1e-8, restart=50, maxiter=10, return_info=True)
+    M = BlockTriangularPreconditioner(A, ['ic0', MassSchurPreconditioner(Mp, scale=-1.0)])
+    x, info = gmres(A, F, 'fealpy', tol=1e-8, restart=50, M=M, return_info=True)
+    assert info.success
+    assert info.niter < plain.niter
+    assert bm.linalg.norm(F - A @ x) < 1e-6 * bm.linalg.norm(F)
@@ -4,7 +4,8 @@ import pytest
 import scipy.sparse as sp
 
 from fealpy.backend import backend_manager as bm
-from fealpy.solver import spsolve
+from fealpy.solver import spsolve, DirectSolver, clear_factor_cache
+from fealpy.solver.direct_solver import value_key
 from fealpy.sparse import COOTensor, CSRTensor
 
 class TestDirectSolver:
@@ -50,6 +51,88 @@ class TestDirectSolver:
         assert self._check_solution(x0, x), "Pytorch GPU test failed!!!!!!!!!!!!!!!!!!!!!!!!"
         print("Pytorch GPU test passed!")
 
+
+class TestFactorization:
+
+    def _get_data(self, backend, scale=1.0):
+        bm.set_backend(backend)
+        if backend == 'pytorch': # test_gpu may switch to cuda
+            bm.set_default_device('cpu')
+        rng = np.random.default_rng(0)
+        A = sp.random(30, 30, density=0.2, random_state=1) + 4 * sp.eye(30)
+        A = A.tocsr()
+        A.data = A.data * scale
+        X = rng.random((30, 3))
+        return CSRTensor.from_scipy(A), bm.tensor(X), bm.tensor(A @ X)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_multi_rhs(self, backend):
+        A, X, B = self._get_data(backend)
+        solver = DirectSolver(A, solver='scipy')
+        assert bm.allclose(solver.solve(B), X)
+        assert bm.allclose(solver @ B[:, 0], X[:, 0])
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_refactor(self, backend):
+        A, X, B = self._get_data(backend)
+        solver = DirectSolver(A, solver='scipy')
+        A2, X2, B2 = self._get_data(backend, scale=2.0)
+        solver.refactor(A2)
+        assert solver.value_key == value_key(A2)
+        assert bm.allclose(solver.solve(B2), X2)
+
+        indices = bm.tensor([[0, 1], [1, 0]])
+        C = COOTensor(indices, bm.tensor([1.0, 1.0], dtype=bm.float64), (30, 30))
+        with pytest.raises(ValueError):
+            solver.refactor(A2.add(C.tocsr()))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_spsolve_reuse(self, backend):
+        clear_factor_cache()
+        A, X, B = self._get_data(backend)
+        for _ in range(2):
+            assert bm.allclose(spsolve(A, B, 'scipy', reuse=True), X)
+        A2, X2, B2 = self._get_data(backend, scale=0.5)
+        assert bm.allclose(spsolve(A2, B2, 'scipy', reuse=True), X2)
+        clear_factor_cache()
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_spsolve_reuse_same_pattern(self, backend, monkeypatch):
+        clear_factor_cache()
+        A, X, B = self._get_data(backend)
+        A2, X2, B2 = self._get_data(backend, scale=0.5)
+        calls = []
+        factorize, refactor = DirectSolver.factorize, DirectSolver._refactor_scipy
+        monkeypatch.setattr(DirectSolver, 'factorize',
+                            lambda self, A: calls.append('full') or factorize(self, A))
+        monkeypatch.setattr(DirectSolver, '_refactor_scipy',
+                            lambda self, A: calls.append('numeric') or refactor(self, A))
+        # Matrices with one pattern do not evict each other.
+        for _ in range(10):
+            assert bm.allclose(spsolve(A, B, 'scipy', reuse=True), X)
+            assert bm.allclose(spsolve(A2, B2, 'scipy', reuse=True), X2)
+        assert calls == ['full', 'numeric']
+        clear_factor_cache()
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_mixed_precision(self, backend):
+        A, X, B = self._get_data(backend)
+        solver = DirectSolver(A, solver='scipy', mixed_precision=True)
+        assert solver._lu.L.dtype == np.float32
+        x, info = solver.solve(B, rtol=1e-13, return_info=True)
+        assert info.success
+        assert 1 < info.niter < 10
+        assert x.dtype == bm.float64
+        assert bm.max(bm.abs(x - X)) < 1e-11
+        A2, X2, B2 = self._get_data(backend, scale=2.0)
+        solver.refactor(A2)
+        assert bm.max(bm.abs(solver @ B2[:, 0] - X2[:, 0])) < 1e-10
+        assert bm.allclose(spsolve(A2, B2, 'scipy', reuse=True, mixed_precision=True), X2)
+        clear_factor_cache()
+        with pytest.raises(ValueError):
+            DirectSolver(A, solver='mumps', mixed_precision=True)
+
+
 if __name__ == '__main__':
     test = TestDirectSolver()
     #test.test_cpu('numpy', 'scipy')
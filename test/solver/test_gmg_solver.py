@@ -0,0 +1,72 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator,
+    LinearForm, ScalarSourceIntegrator, DirichletBC
+)
+from fealpy.solver import cg, GeometricMultigrid, nodal_prolongation
+
+
+def assemble(mesh):
+    space = LagrangeFESpace(mesh, p=1)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=3))
+    return DirichletBC(space, gd=0.0).apply_matrix(bform.assembly())
+
+
+def source(mesh, A):
+    space = LagrangeFESpace(mesh, p=1)
+    lform = LinearForm(space)
+    lform.add_integrator(ScalarSourceIntegrator(1.0))
+    return DirichletBC(space, gd=0.0).apply_vector(lform.assembly(), A)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("mesh_type", [TriangleMesh, QuadrangleMesh, TetrahedronMesh])
+def test_nodal_prolongation(backend, mesh_type, set_backend):
+    set_backend(backend)
+    box = [0, 1] * (3 if mesh_type is TetrahedronMesh else 2)
+    mesh = mesh_type.from_box(box, nx=2, ny=2)
+    P = nodal_prolongation(mesh)
+    coarse = mesh.entity('node')
+    mesh.uniform_refine()
+    fine = mesh.entity('node')
+
+    assert P.shape == (fine.shape[0], coarse.shape[0])
+    # Linear functions are interpolated exactly.
+    assert bm.allclose(P @ coarse[:, 0], fine[:, 0])
+    assert bm.allclose(P @ (coarse[:, 1] - 2*coarse[:, 0]), fine[:, 1] - 2*fine[:, 0])
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("mesh_type", [TriangleMesh, QuadrangleMesh])
+@pytest.mark.parametrize("galerkin", [False, True])
+def test_solve(backend, mesh_type, galerkin, set_backend):
+    set_backend(backend)
+    mesh = mesh_type.from_box([0, 1, 0, 1], nx=2, ny=2)
+    mg = GeometricMultigrid.from_mesh(mesh, 4, assemble, galerkin=galerkin)
+    assert mg.nlevels == 5
+    A = mg.A[0]
+    assert A.shape[0] == mesh.number_of_nodes()
+    F = source(mesh, A)
+
+    x = mg.solve(F, rtol=1e-8, maxiter=50)
+    assert bm.linalg.norm(F - A @ x) < 1e-8 * bm.linalg.norm(F)
+
+    y = cg(A, F, M=mg, rtol=1e-10)
+    assert bm.linalg.norm(F - A @ y) < 1e-10 * bm.linalg.norm(F)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_chebyshev(backend, set_backend):
+    set_backend(backend)
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=2, ny=2)
+    mg = GeometricMultigrid.from_mesh(mesh, 4, assemble, smoother='chebyshev')
+    A = mg.A[0]
+    F = source(mesh, A)
+    x = mg.solve(F, rtol=1e-8, maxiter=20)
+    assert bm.linalg.norm(F - A @ x) < 1e-8 * bm.linalg.norm(F)
@@ -0,0 +1,116 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.decorator import cartesian
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarConvectionIntegrator
+)
+from fealpy.sparse import COOTensor
+from fealpy.solver import bicgstab, minres, gmres, get_preconditioner, SolverInfo
+from fealpy.solver.smoother import matrix_diagonal
+
+
+def assemble(n=8, convection=False):
+    @cartesian
+    def velocity(p):
+        return bm.stack([bm.ones_like(p[..., 0]), 0.5 * bm.ones_like(p[..., 1])], axis=-1)
+
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=1)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(5e-2 if convection else 1.0))
+    if convection:
+        bform.add_integrator(ScalarConvectionIntegrator(velocity))
+    bform.add_integrator(ScalarMassIntegrator())
+    return bform.assembly().tocsr()
+
+
+def saddle_point(K):
+    """[[K, B^T], [B, 0]] with B averaging pairs of neighbouring DoFs."""
+    n = K.shape[0]
+    m = n // 2
+    row = bm.concat([bm.arange(m), bm.arange(m)], axis=0)
+    col = bm.concat([2 * bm.arange(m), 2 * bm.arange(m) + 1], axis=0)
+    kr, kc, kv = K.row(), K.col(), K.values()
+    indices = bm.stack([
+        bm.concat([kr, n + row, col], axis=0),
+        bm.concat([kc, col, n + row], axis=0)
+    ], axis=0)
+    values = bm.concat([kv, bm.ones(4 * m, dtype=bm.float64)], axis=0)
+    return COOTensor(indices, values, (n + m, n + m)).tocsr()
+
+
+def rhs(n, k):
+    return bm.stack([bm.sin(bm.arange(n, dtype=bm.float64) * (i + 1)) for i in range(k)], axis=1)
+
+
+def relative_residual(A, x, F):
+    return bm.linalg.norm(F - A @ x, axis=0) / bm.linalg.norm(F, axis=0)
+
+
+class MatrixFree():
+    def __init__(self, A):
+        self.A = A
+
+    def __matmul__(self, x):
+        return self.A @ x
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("M", [None, 'ilu0'])
+def test_bicgstab(backend, M, set_backend):
+    set_backend(backend)
+    A = assemble(convection=True)
+    F = rhs(A.shape[0], 3)
+    M = get_preconditioner(M, A) # also used with the matrix-free operator
+    x, info = bicgstab(A, F, M=M, rtol=1e-10, return_info=True)
+    assert isinstance(info, SolverInfo)
+    assert info.success
+    assert bm.all(relative_residual(A, x, F) < 1e-8)
+    y = bicgstab(MatrixFree(A), F.T, M=M, rtol=1e-10, batch_first=True)
+    assert bm.allclose(y.T, x)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("M", [None, 'ilu0'])
+def test_gmres(backend, M, set_backend):
+    set_backend(backend)
+    A = assemble(convection=True)
+    F = rhs(A.shape[0], 3)
+    M = get_preconditioner(M, A)
+    x, info = gmres(A, F, 'fealpy', tol=1e-10, M=M, restart=30, return_info=True)
+    assert info.success
+    assert info.residual_history.shape == (info.niter + 1, 3)
+    assert bm.all(relative_residual(A, x, F) < 1e-8)
+    y = gmres(MatrixFree(A), F[:, 1], 'fealpy', tol=1e-10, M=M, restart=30)
+    assert bm.allclose(y, x[:, 1])
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_gmres_restart(backend, set_backend):
+    set_backend(backend)
+    A = assemble(convection=True)
+    F = rhs(A.shape[0], 1)[:, 0]
+    _, info = gmres(A, F, 'fealpy', tol=1e-10, restart=5, maxiter=2, return_info=True)
+    assert info.niter == 10
+    assert not info.success
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("M", [None, 'jacobi'])
+def test_minres_saddle_point(backend, M, set_backend):
+    set_backend(backend)
+    K = assemble()
+    A = saddle_point(K)
+    F = rhs(A.shape[0], 2)
+    if M == 'jacobi':
+        # An SPD block diagonal preconditioner: Jacobi of K and identity.
+        n = K.shape[0]
+        d = bm.concat([1.0 / matrix_diagonal(K), bm.ones(A.shape[0] - n, dtype=bm.float64)], axis=0)
+        M = lambda r: d[:, None] * r
+    x, info = minres(A, F, M=M, rtol=1e-10, return_info=True)
+    assert info.success
+    assert bm.all(relative_residual(A, x, F) < 1e-7)
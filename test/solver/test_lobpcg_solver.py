@@ -0,0 +1,106 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, HexahedronMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.material import LinearElasticMaterial
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator, LinearElasticIntegrator
+)
+from fealpy.sparse import CSRTensor
+from fealpy.solver import lobpcg, AMGSolver, SolverInfo
+
+
+def interior(A, free):
+    index = np.nonzero(free)[0]
+    return CSRTensor.from_scipy(A.to_scipy().tocsr()[index][:, index])
+
+
+def elasticity(n=2):
+    """Stiffness and mass of a cantilever beam clamped at x = 0."""
+    mesh = HexahedronMesh.from_box([0, 4, 0, 1, 0, 1], nx=4*n, ny=n, nz=n)
+    material = LinearElasticMaterial('base', elastic_modulus=1, poisson_ratio=0.3)
+    space = TensorFunctionSpace(LagrangeFESpace(mesh, p=1), shape=(-1, 3))
+    K = BilinearForm(space)
+    K.add_integrator(LinearElasticIntegrator(material, q=2, method='voigt'))
+    M = BilinearForm(space)
+    M.add_integrator(ScalarMassIntegrator(q=3))
+    free = np.repeat(bm.to_numpy(mesh.entity('node'))[:, 0] > 1e-12, 3)
+    return interior(K.assembly(), free), interior(M.assembly(), free)
+
+
+def initial_guess(n, k):
+    return bm.tensor(np.random.default_rng(0).random((n, k)), dtype=bm.float64)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("precond", [False, True])
+def test_generalized(backend, precond, set_backend):
+    set_backend(backend)
+    K, M = elasticity()
+    k = 6
+    expected = np.linalg.eigvalsh(
+        np.linalg.solve(np.linalg.cholesky(M.to_scipy().toarray()), K.to_scipy().toarray())
+        @ np.linalg.inv(np.linalg.cholesky(M.to_scipy().toarray())).T
+    )[:k]
+    P = AMGSolver(K, block_size=3, coarse_size=50) if precond else None
+    X = initial_guess(K.shape[0], k)
+    # No absolute floor, to check the relative residuals of the small eigenvalues.
+    theta, V, info = lobpcg(K, X, M, M=P, atol=0.0, rtol=1e-8, return_info=True)
+    assert isinstance(info, SolverInfo)
+    assert info.success
+    assert info.residual_history.shape == (info.niter + 1, k)
+    np.testing.assert_allclose(bm.to_numpy(theta), expected, rtol=1e-8)
+    np.testing.assert_allclose(bm.to_numpy(V.T @ (M @ V)), np.eye(k), atol=1e-10)
+    R = K @ V - (M @ V) * theta[None, :]
+    assert bm.all(bm.linalg.norm(R, axis=0) < 1e-6 * theta * bm.linalg.norm(M @ V, axis=0))
+
+
+def test_preconditioner_iterations(set_backend):
+    set_backend('numpy')
+    K, M = elasticity()
+    X = initial_guess(K.shape[0], 4)
+    _, _, plain = lobpcg(K, X, M, rtol=1e-8, return_info=True)
+    amg = AMGSolver(K, block_size=3, coarse_size=50)
+    _, _, info = lobpcg(K, X, M, M=amg, rtol=1e-8, return_info=True)
+    assert info.niter * 2 < plain.niter
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_largest(backend, set_backend):
+    set_backend(backend)
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=6, ny=6)
+    bform = BilinearForm(LagrangeFESpace(mesh, p=1))
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    A = bform.assembly().tocsr()
+    expected = np.linalg.eigvalsh(A.to_scipy().toarray())[::-1][:3]
+    theta, V = lobpcg(A, initial_guess(A.shape[0], 3), largest=True, rtol=1e-8, maxiter=1000)
+    np.testing.assert_allclose(bm.to_numpy(theta), expected, rtol=1e-8)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_zero_eigenvalue(backend, set_backend):
+    set_backend(backend)
+    # The Neumann problem has the constants as eigenvectors with lambda = 0.
+    space = LagrangeFESpace(TriangleMesh.from_box([0, 1, 0, 1], nx=8, ny=8), p=1)
+    K = BilinearForm(space)
+    K.add_integrator(ScalarDiffusionIntegrator())
+    M = BilinearForm(space)
+    M.add_integrator(ScalarMassIntegrator())
+    K, M = K.assembly().tocsr(), M.assembly().tocsr()
+    Ms = M.to_scipy().toarray()
+    L = np.linalg.cholesky(Ms)
+    expected = np.linalg.eigvalsh(np.linalg.solve(L, np.linalg.solve(L, K.to_scipy().toarray()).T))[:3]
+    theta, V, info = lobpcg(K, initial_guess(K.shape[0], 3), M, rtol=1e-8, return_info=True)
+    assert info.success
+    assert abs(float(theta[0])) < 1e-8
+    np.testing.assert_allclose(bm.to_numpy(theta)[1:], expected[1:], rtol=1e-6)
+
+
+def test_too_many_eigenpairs(set_backend):
+    set_backend('numpy')
+    A = bm.eye(10, dtype=bm.float64)
+    with pytest.raises(ValueError):
+        lobpcg(A, initial_guess(10, 4))
@@ -0,0 +1,174 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.decorator import cartesian
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarConvectionIntegrator
+)
+from fealpy.solver import (
+    cg, gmres, get_preconditioner, BlockJacobiPreconditioner, SolverInfo, AMGSolver
+)
+from fealpy.solver.mixed_precision import iterative_refinement
+from fealpy.sparse import CSRTensor, ic0, ilu0
+
+
+def assemble(n=8):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=1)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    bform.add_integrator(ScalarMassIntegrator())
+    return bform.assembly()
+
+
+def assemble_convection(n=16, eps=5e-2):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=1)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(eps))
+    @cartesian
+    def velocity(p):
+        return bm.stack([bm.ones_like(p[..., 0]), 0.5 * bm.ones_like(p[..., 1])], axis=-1)
+
+    bform.add_integrator(ScalarConvectionIntegrator(velocity))
+    bform.add_integrator(ScalarMassIntegrator())
+    return bform.assembly().tocsr()
+
+
+def rhs(n, k):
+    return bm.stack([bm.sin(bm.arange(n, dtype=bm.float64) * (i + 1)) for i in range(k)], axis=1)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("M", [None, 'jacobi', 'ssor', 'ic0', 'ilu0', 'block_jacobi', 'callable'])
+def test_cg_preconditioner(backend, M, set_backend):
+    set_backend(backend)
+    A = assemble(n=9) # 100 nodes
+    F = rhs(A.shape[0], 3)
+    if M == 'block_jacobi':
+        M = BlockJacobiPreconditioner(A, 2)
+    elif M == 'callable':
+        M = lambda r: 0.5 * r
+
+    x, info = cg(A, F, M=M, atol=0.0, rtol=1e-10, return_info=True)
+    res = bm.linalg.norm(F - A @ x, axis=0) / bm.linalg.norm(F, axis=0)
+    assert bm.all(res < 1e-8)
+    assert isinstance(info, SolverInfo)
+    assert info.success
+    assert info.residual_history.shape == (info.niter + 1, 3)
+    assert info.wall_time > 0
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_column_convergence(backend, set_backend):
+    set_backend(backend)
+    A = assemble()
+    F = rhs(A.shape[0], 4)
+    F = bm.set_at(F, (slice(None), 1), 0.0)
+    x0 = bm.zeros_like(F)
+    x0 = bm.set_at(x0, (slice(None), 2), cg(A, F[:, 2], rtol=1e-12))
+
+    x, info = cg(A, F, x0, M='ic0', rtol=1e-10, return_info=True)
+    # Zero and solved columns stop at once, the others on their own.
+    assert int(info.iterations[1]) == 0
+    assert int(info.iterations[2]) == 0
+    assert bm.all(x[:, 1] == 0)
+    assert int(bm.max(info.iterations)) == info.niter
+    for i in (0, 3):
+        y = cg(A, F[:, i], M='ic0', rtol=1e-10)
+        assert bm.allclose(x[:, i], y)
+
+    y, info = cg(A, F.T, M='jacobi', batch_first=True, return_info=True)
+    assert y.shape == F.T.shape
+    assert info.iterations.shape == (4,)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_incomplete_factorization_iterations(backend, set_backend):
+    set_backend(backend)
+    A = assemble(n=16)
+    F = rhs(A.shape[0], 1)[:, 0]
+    _, plain = cg(A, F, rtol=1e-10, return_info=True)
+    _, ic = cg(A, F, M='ic0', rtol=1e-10, return_info=True)
+    assert ic.success
+    assert ic.niter < plain.niter
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_gmres_ilu0(backend, set_backend):
+    set_backend(backend)
+    A = assemble_convection()
+    F = rhs(A.shape[0], 1)[:, 0]
+    # One restart cycle: ILU(0) converges, the plain iteration does not.
+    x = gmres(A, F, tol=1e-10, maxiter=1, M='ilu0')
+    y = gmres(A, F, tol=1e-10, maxiter=1)
+    res_x = bm.linalg.norm(F - A @ x) / bm.linalg.norm(F)
+    res_y = bm.linalg.norm(F - A @ y) / bm.linalg.norm(F)
+    assert res_x < 1e-6
+    assert res_x < 1e-3 * res_y
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_incomplete_int32_keys(backend, set_backend):
+    set_backend(backend)
+    # row * n + col does not fit in int32 for this size.
+    n = 50000
+    crow = bm.arange(n + 1, dtype=bm.int32)
+    col = bm.arange(n, dtype=bm.int32)
+    A = CSRTensor(crow, col, 4.0 * bm.ones((n,), dtype=bm.float64), (n, n))
+    assert bm.allclose(ilu0(A).values(), 4.0)
+    assert bm.allclose(ic0(A).values(), 2.0)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_maxiter_info(backend, set_backend):
+    set_backend(backend)
+    A = assemble()
+    F = rhs(A.shape[0], 1)[:, 0]
+    x, info = cg(A, F, maxiter=3, return_info=True)
+    assert x.shape == F.shape
+    assert info.niter == 3
+    assert not info.success
+    assert info.residual_history.shape == (4,)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("M", [None, 'ic0', 'amg'])
+def test_cg_mixed_precision(backend, M, set_backend):
+    set_backend(backend)
+    A = assemble(n=16).tocsr()
+    F = rhs(A.shape[0], 2)
+    if M == 'amg':
+        M = AMGSolver(A.astype(bm.float32), coarse_size=20)
+    x, info = cg(A, F, M=M, atol=0.0, rtol=1e-12, mixed_precision=True, return_info=True)
+    assert x.dtype == bm.float64
+    assert info.success
+    assert info.stop_reason == 'tolerance'
+    assert 1 < info.niter < 10
+    assert len(info.inner_niter) == info.niter
+    res = bm.linalg.norm(F - A @ x, axis=0) / bm.linalg.norm(F, axis=0)
+    assert bm.all(res < 1e-12)
+
+
+def test_refinement_stagnation():
+    bm.set_backend('numpy')
+    A = assemble(n=4).tocsr()
+    F = rhs(A.shape[0], 1)[:, 0]
+    # The residual is not reduced by a useless inner solve.
+    x, info = iterative_refinement(A, F, lambda r: 0.0 * r, rtol=1e-10, return_info=True)
+    assert info.stop_reason == 'stagnation'
+    assert info.niter == 1
+    assert not info.success
+
+
+def test_get_preconditioner():
+    bm.set_backend('numpy')
+    A = assemble(n=2)
+    assert get_preconditioner(None, A) is None
+    with pytest.raises(ValueError):
+        get_preconditioner('unknown', A)
+    with pytest.raises(TypeError):
+        get_preconditioner(1.0, A)
@@ -0,0 +1,80 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
+from fealpy.solver import cg, AdditiveSchwarzPreconditioner, partition_cells
+
+
+def assemble(n=16):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=1)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    bform.add_integrator(ScalarMassIntegrator(1e-3))
+    A = bform.assembly().tocsr()
+    F = bm.sin(bm.arange(A.shape[0], dtype=bm.float64))
+    return space, A, F
+
+
+def test_partition_cells(set_backend):
+    set_backend('numpy')
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=8, ny=8)
+    parts = partition_cells(mesh, 6, method='rcb')
+    assert parts.shape == (mesh.number_of_cells(), )
+    counts = bm.bincount(bm.tensor(parts))
+    assert counts.shape == (6, )
+    assert counts.max() - counts.min() <= 1
+
+
+def test_partition_cells_metis(set_backend):
+    set_backend('numpy')
+    # Falls back to 'rcb' if the METIS library is not found.
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=8, ny=8)
+    parts = partition_cells(mesh, 4)
+    assert set(parts.tolist()) == {0, 1, 2, 3}
+    space, A, _ = assemble(8)
+    M = AdditiveSchwarzPreconditioner(A, space, 4)
+    assert M.nparts == 4
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("coarse", [False, True])
+def test_schwarz_cg(backend, coarse, set_backend):
+    set_backend(backend)
+    space, A, F = assemble()
+    _, plain = cg(A, F, rtol=1e-8, return_info=True)
+    M = AdditiveSchwarzPreconditioner(A, space, 4, method='rcb', coarse=coarse)
+    x, info = cg(A, F, M=M, rtol=1e-8, return_info=True)
+    assert info.success
+    assert info.niter < plain.niter / 3
+    assert bm.linalg.norm(F - A @ x) < 1e-6 * bm.linalg.norm(F)
+
+
+def test_schwarz_coarse_space(set_backend):
+    set_backend('numpy')
+    space, A, F = assemble()
+    niter = []
+    for coarse in [False, True]:
+        M = AdditiveSchwarzPreconditioner(A, space, 16, method='rcb', coarse=coarse)
+        _, info = cg(A, F, M=M, rtol=1e-8, return_info=True)
+        niter.append(info.niter)
+    assert niter[1] < niter[0]
+
+
+def test_schwarz_workers(set_backend):
+    set_backend('numpy')
+    space, A, F = assemble(n=8)
+    parts = partition_cells(space.mesh, 4, method='rcb')
+    serial = AdditiveSchwarzPreconditioner(A, space, parts=parts, coarse=True)
+    M = AdditiveSchwarzPreconditioner(A, space, parts=parts, coarse=True, workers=2)
+    try:
+        R = bm.stack([F, 2 * F], axis=1)
+        assert bm.allclose(M @ F, serial @ F)
+        assert bm.allclose(M @ R, serial @ R)
+        x = cg(A, F, M=M, rtol=1e-8)
+        assert bm.allclose(x, cg(A, F, M=serial, rtol=1e-8))
+    finally:
+        M.close()
@@ -0,0 +1,46 @@
+"""Benchmark of COOTensor.coalesce and tocsr over the number of triplets.
+
+Usage:
+    python benchmark_coalesce.py [backend] [max_exponent]
+
+The default runs numpy for 10^5 to 10^8 triplets. 10^8 triplets need about
+10 GB of memory.
+"""
+import sys
+import time
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor
+
+
+def random_fem_triplets(nnz: int, n: int):
+    """Triplets with FE-like duplication: about 10 duplicates per entry."""
+    nunique = max(nnz // 10, 1)
+    row = bm.random.randint(0, n, (nunique,))
+    col = bm.random.randint(0, n, (nunique,))
+    pick = bm.random.randint(0, nunique, (nnz,))
+    indices = bm.stack([row[pick], col[pick]], axis=0)
+    values = bm.random.rand(nnz)
+    return COOTensor(indices, values, (n, n))
+
+
+def benchmark(backend: str, nnz: int):
+    bm.set_backend(backend)
+    coo = random_fem_triplets(nnz, max(nnz // 50, 10))
+
+    for method in ['lexsort', 'key']:
+        start = time.time()
+        M = coo.coalesce(method=method)
+        mid = time.time()
+        M.tocsr()
+        end = time.time()
+        print(f"{backend} nnz={nnz:.0e} {method:>8}: coalesce {mid-start:.4f} s, "
+              f"tocsr {end-mid:.4f} s")
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'numpy'
+    max_exponent = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    for e in range(5, max_exponent + 1):
+        benchmark(backend, 10**e)
@@ -0,0 +1,66 @@
+# test_coo_builder.py
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor, COOBuilder
+
+ALL_BACKENDS = ['numpy', 'pytorch']
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_add_local(backend):
+    bm.set_backend(backend)
+    cell2dof = bm.tensor([[0, 1, 2], [2, 1, 3]])
+    local = bm.reshape(bm.arange(18, dtype=bm.float64), (2, 3, 3))
+    builder = COOBuilder((4, 4), 18, itype=cell2dof.dtype, ftype=bm.float64)
+    builder.add_local(local, cell2dof, cell2dof)
+    assert builder.nnz == 18
+    assert builder.capacity == 18
+
+    I = bm.broadcast_to(cell2dof[:, :, None], (2, 3, 3)).reshape(-1)
+    J = bm.broadcast_to(cell2dof[:, None, :], (2, 3, 3)).reshape(-1)
+    expected = COOTensor(bm.stack([I, J], axis=0), local.reshape(-1), (4, 4))
+    coo = builder.tocoo()
+    np.testing.assert_array_equal(bm.to_numpy(coo.indices()), bm.to_numpy(expected.indices()))
+    np.testing.assert_allclose(bm.to_numpy(coo.coalesce().to_dense()),
+                               bm.to_numpy(expected.to_dense()))
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_grow_and_batch(backend):
+    bm.set_backend(backend)
+    builder = COOBuilder((3,), 2, dense_shape=(2,), ftype=bm.float64)
+    builder.add(bm.tensor([[0, 1]], dtype=bm.int64), bm.tensor([1., 2.], dtype=bm.float64))
+    builder.add_local(bm.tensor([[3., 4.]], dtype=bm.float64), bm.tensor([[1, 2]], dtype=bm.int64))
+    assert builder.nnz == 4
+    assert builder.capacity >= 4
+
+    coo = builder.tocoo().coalesce()
+    expected = np.array([[1., 5., 4.], [1., 5., 4.]])
+    np.testing.assert_allclose(bm.to_numpy(coo.to_dense()), expected)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_allocate(backend):
+    bm.set_backend(backend)
+    cell2dof = bm.tensor([[0, 1], [1, 2], [2, 3]], dtype=bm.int64)
+    local = bm.reshape(bm.arange(12, dtype=bm.float64), (3, 2, 2))
+    builder = COOBuilder((4, 4), ftype=bm.float64)
+    builder.add(bm.tensor([[0], [0]], dtype=bm.int64), bm.tensor([1.], dtype=bm.float64))
+    slicing = builder.allocate(12)
+    assert slicing == slice(1, 13)
+    # Fill in the reversed order of cells.
+    builder.add_local(local[2:], cell2dof[2:], cell2dof[2:], at=slice(9, 13))
+    builder.add_local(local[:2], cell2dof[:2], cell2dof[:2], at=slice(1, 9))
+
+    expected = COOBuilder((4, 4), ftype=bm.float64)
+    expected.add(bm.tensor([[0], [0]], dtype=bm.int64), bm.tensor([1.], dtype=bm.float64))
+    expected.add_local(local, cell2dof, cell2dof)
+    np.testing.assert_array_equal(bm.to_numpy(builder.tocoo().indices()),
+                                  bm.to_numpy(expected.tocoo().indices()))
+    np.testing.assert_array_equal(bm.to_numpy(builder.tocoo().values()),
+                                  bm.to_numpy(expected.tocoo().values()))
+
+    with pytest.raises(ValueError):
+        builder.add_local(local[:1], cell2dof[:1], cell2dof[:1], at=slice(13, 17))
@@ -1,4 +1,5 @@
 # test_coo_tensor.py
+import numpy as np
 import pytest
 
 from fealpy.sparse.coo_tensor import COOTensor
@@ -87,6 +88,43 @@ def test_coalesce_without_values_not_accumulate(backend):
     assert coalesced_coo._values is None
 
 
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+@pytest.mark.parametrize("method", ['key', 'lexsort'])
+def test_coalesce_methods(backend, method):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(0)
+    indices = bm.from_numpy(rng.integers(0, 7, (3, 200)))
+    values = bm.from_numpy(rng.random((2, 200)))
+    coo = COOTensor(indices, values, (7, 7, 7))
+
+    coalesced_coo = coo.coalesce(method=method)
+    reference = coo.coalesce(method='lexsort')
+    assert coalesced_coo.is_coalesced
+    assert bm.allclose(coalesced_coo.indices(), reference.indices())
+    assert bm.allclose(coalesced_coo.values(), reference.values())
+    assert bm.allclose(coalesced_coo.to_dense(), coo.to_dense())
+
+    counted = COOTensor(indices, None, (7, 7, 7)).coalesce(method=method)
+    assert bm.tolist(counted.values()) == bm.tolist(
+        COOTensor(indices, None, (7, 7, 7)).coalesce(method='lexsort').values())
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_tocsr(backend):
+    bm.set_backend(backend)
+    indices = bm.tensor([[3, 0, 3, 0, 1], [1, 2, 0, 2, 3]])
+    values = bm.tensor([[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]], dtype=bm.float64)
+    coo = COOTensor(indices, values, (5, 4))
+
+    csr = coo.tocsr()
+    assert bm.tolist(csr.crow()) == [0, 2, 3, 3, 5, 5]
+    assert bm.allclose(csr.to_dense(), coo.to_dense())
+
+    csr = coo.coalesce().tocsr()
+    assert bm.tolist(csr.crow()) == [0, 1, 2, 2, 4, 4]
+    assert bm.allclose(csr.to_dense(), coo.to_dense())
+
+
 @pytest.mark.parametrize("backend", ALL_BACKENDS)
 def test_to_dense(backend):
     bm.set_backend(backend)
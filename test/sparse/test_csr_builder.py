@@ -0,0 +1,123 @@
+# test_csr_builder.py
+import os
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor, CSRBuilder
+
+ALL_BACKENDS = ['numpy', 'pytorch']
+
+
+def _random_triplets(n, shape, seed):
+    rng = np.random.default_rng(seed)
+    indices = np.stack([rng.integers(0, shape[0], n), rng.integers(0, shape[1], n)])
+    return bm.tensor(indices, dtype=bm.int64), bm.tensor(rng.random(n), dtype=bm.float64)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_two_pass(backend):
+    bm.set_backend(backend)
+    shape = (13, 7)
+    chunks = [_random_triplets(n, shape, seed) for seed, n in enumerate([30, 5, 60, 1])]
+    builder = CSRBuilder(shape)
+    for indices, _ in chunks:
+        builder.add_pattern(indices)
+    builder.finalize()
+    # Values may come in another order than the pattern.
+    for indices, values in reversed(chunks):
+        builder.add(indices, values)
+    csr = builder.tocsr()
+
+    indices = bm.concat([c[0] for c in chunks], axis=1)
+    values = bm.concat([c[1] for c in chunks], axis=0)
+    expected = COOTensor(indices, values, shape).coalesce().tocsr()
+    assert builder.nnz == expected.nnz
+    np.testing.assert_array_equal(bm.to_numpy(csr.crow()), bm.to_numpy(expected.crow()))
+    np.testing.assert_array_equal(bm.to_numpy(csr.col()), bm.to_numpy(expected.col()))
+    np.testing.assert_allclose(bm.to_numpy(csr.values()), bm.to_numpy(expected.values()))
+
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_unknown_triplets(backend):
+    bm.set_backend(backend)
+    builder = CSRBuilder((3, 3))
+    builder.add_pattern(bm.tensor([[0, 2], [1, 2]], dtype=bm.int64))
+    with pytest.raises(RuntimeError):
+        builder.add(bm.tensor([[0], [1]], dtype=bm.int64), bm.tensor([1.], dtype=bm.float64))
+    builder.finalize()
+    with pytest.raises(RuntimeError):
+        builder.add(bm.tensor([[1], [1]], dtype=bm.int64), bm.tensor([1.], dtype=bm.float64))
+    with pytest.raises(RuntimeError):
+        builder.add_pattern(bm.tensor([[1], [1]], dtype=bm.int64))
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_local_batch(backend):
+    bm.set_backend(backend)
+    cell2dof = bm.tensor([[0, 1, 2], [2, 1, 3]], dtype=bm.int64)
+    local = bm.reshape(bm.arange(18, dtype=bm.float64), (2, 3, 3))
+    builder = CSRBuilder((4, 4), dense_shape=(2,))
+    builder.add_local_pattern(cell2dof, cell2dof)
+    builder.finalize()
+    builder.add_local(bm.stack([local, -local], axis=0), cell2dof, cell2dof)
+    dense = bm.to_numpy(builder.tocsr().to_dense())
+
+    expected = np.zeros((4, 4))
+    for c in range(2):
+        idx = bm.to_numpy(cell2dof[c])
+        expected[np.ix_(idx, idx)] += bm.to_numpy(local[c])
+    np.testing.assert_allclose(dense[0], expected)
+    np.testing.assert_allclose(dense[1], -expected)
+
+
+def test_memmap(tmp_path):
+    bm.set_backend('numpy')
+    indices, values = _random_triplets(50, (9, 9), 0)
+    builder = CSRBuilder((9, 9), mmap_dir=str(tmp_path))
+    builder.add_pattern(indices)
+    builder.finalize()
+    builder.add(indices, values)
+    csr = builder.tocsr()
+    assert isinstance(csr.values(), np.memmap)
+
+    expected = COOTensor(indices, values, (9, 9)).to_dense()
+    np.testing.assert_allclose(csr.to_dense(), expected)
+    path = builder.mmap_path
+    assert os.path.dirname(path) == str(tmp_path)
+    np.testing.assert_allclose(np.load(os.path.join(path, 'values.npy')), csr.values())
+    np.testing.assert_array_equal(np.load(os.path.join(path, 'col.npy')), csr.col())
+
+    # Another builder in the same directory does not touch the first matrix.
+    values = np.array(csr.values())
+    other = CSRBuilder((9, 9), mmap_dir=str(tmp_path))
+    other.add_pattern(indices[:, :10])
+    other.finalize()
+    other.add(indices[:, :10], -values[:10])
+    assert other.mmap_path != path
+    np.testing.assert_array_equal(csr.values(), values)
+
+
+def test_memmap_blocks(tmp_path, monkeypatch):
+    bm.set_backend('numpy')
+    # Small blocks and many chunks to merge the spilled keys by blocks.
+    monkeypatch.setattr(CSRBuilder, '_BLOCK', 4)
+    shape = (11, 8)
+    chunks = [_random_triplets(n, shape, seed) for seed, n in enumerate([7, 20, 3, 15, 9, 1, 30])]
+    builder = CSRBuilder(shape, mmap_dir=str(tmp_path))
+    for indices, _ in chunks:
+        builder.add_pattern(indices)
+    builder.finalize()
+    assert sorted(os.listdir(builder.mmap_path)) == ['col.npy', 'values.npy']
+    for indices, values in chunks:
+        builder.add(indices, values)
+
+    indices = bm.concat([c[0] for c in chunks], axis=1)
+    values = bm.concat([c[1] for c in chunks], axis=0)
+    expected = COOTensor(indices, values, shape).coalesce().tocsr()
+    csr = builder.tocsr()
+    np.testing.assert_array_equal(csr.crow(), expected.crow())
+    np.testing.assert_array_equal(csr.col(), expected.col())
+    np.testing.assert_allclose(csr.values(), expected.values())
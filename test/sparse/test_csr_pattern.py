@@ -0,0 +1,43 @@
+# test_csr_pattern.py
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor, CSRPattern
+
+ALL_BACKENDS = ['numpy', 'pytorch']
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_scatter(backend):
+    bm.set_backend(backend)
+    indices = bm.tensor([[0, 2, 1, 0, 2, 0], [1, 0, 2, 1, 0, 0]])
+    values = bm.tensor([1, 2, 3, 4, 5, 6], dtype=bm.float64)
+    pattern = CSRPattern(indices, (3, 3))
+
+    assert pattern.nnz == 4
+    assert pattern.ntriplets == 6
+    np.testing.assert_array_equal(bm.to_numpy(pattern.crow()), [0, 2, 3, 4])
+    np.testing.assert_array_equal(bm.to_numpy(pattern.col()), [0, 1, 2, 0])
+
+    csr = pattern.scatter(values)
+    expected = COOTensor(indices, values, (3, 3)).to_dense()
+    np.testing.assert_allclose(bm.to_numpy(csr.to_dense()), bm.to_numpy(expected))
+
+    # values with a batch dimension
+    csr = pattern.scatter(bm.stack([values, 2*values], axis=0))
+    np.testing.assert_allclose(bm.to_numpy(csr.to_dense()[1]), 2*bm.to_numpy(expected))
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_scatter_add_partial(backend):
+    bm.set_backend(backend)
+    indices = bm.tensor([[0, 1, 1, 0], [0, 1, 1, 0]])
+    pattern = CSRPattern(indices, (2, 2))
+    out = pattern.zeros(dtype=bm.float64)
+    out = pattern.scatter_add(out, bm.tensor([1., 2.], dtype=bm.float64), 0)
+    out = pattern.scatter_add(out, bm.tensor([3., 4.], dtype=bm.float64), 2)
+    np.testing.assert_allclose(bm.to_numpy(out), [5., 5.])
+
+    with pytest.raises(ValueError):
+        pattern.scatter(bm.tensor([1., 2.], dtype=bm.float64))
@@ -1,9 +1,10 @@
 
+import numpy as np
 import pytest
 
 from fealpy.backend import backend_manager as bm
 from fealpy.sparse._spspmm import spspmm_coo
-from fealpy.sparse import COOTensor
+from fealpy.sparse import COOTensor, CSRTensor, ptap
 
 ALL_BACKENDS = ['numpy', 'pytorch']
 
@@ -47,5 +48,66 @@ def test_spspmm_coo_valid_input(backend):
 
     assert bm.allclose(result, expected)
 
+
+def _random_coo(rng, shape, nnz, dense_shape=()):
+    indices = np.stack([rng.integers(0, shape[0], nnz),
+                        rng.integers(0, shape[1], nnz)], axis=0)
+    values = rng.random(dense_shape + (nnz,))
+    return COOTensor(bm.from_numpy(indices), bm.from_numpy(values), shape)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+@pytest.mark.parametrize("dense_shape", [(), (2,)])
+def test_spspmm_random(backend, dense_shape):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(0)
+    A = _random_coo(rng, (30, 20), 80, dense_shape)
+    B = _random_coo(rng, (20, 25), 60, dense_shape)
+    expected = bm.to_numpy(A.to_dense()) @ bm.to_numpy(B.to_dense())
+
+    C = A.matmul(B)
+    assert C.is_coalesced
+    np.testing.assert_allclose(bm.to_numpy(C.to_dense()), expected)
+
+    C = A.tocsr().matmul(B.tocsr())
+    assert isinstance(C, CSRTensor)
+    np.testing.assert_allclose(bm.to_numpy(C.to_dense()), expected)
+    col = bm.to_numpy(C.col())
+    crow = bm.to_numpy(C.crow())
+    for i in range(C.shape[-2]):
+        assert np.all(np.diff(col[crow[i]:crow[i+1]]) > 0)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_csr_transpose(backend):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(1)
+    A = _random_coo(rng, (7, 5), 20).coalesce().tocsr()
+    AT = A.T
+    assert AT.sparse_shape == (5, 7)
+    np.testing.assert_allclose(bm.to_numpy(AT.to_dense()),
+                               bm.to_numpy(A.to_dense()).T)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_ptap(backend):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(2)
+    A = _random_coo(rng, (12, 12), 50)
+    P = _random_coo(rng, (12, 4), 16)
+    Pd = bm.to_numpy(P.to_dense())
+    expected = Pd.T @ bm.to_numpy(A.to_dense()) @ Pd
+
+    coarse = ptap(P, A)
+    assert isinstance(coarse, COOTensor)
+    np.testing.assert_allclose(bm.to_numpy(coarse.to_dense()), expected)
+
+    coarse = ptap(P.tocsr(), A.tocsr())
+    assert isinstance(coarse, CSRTensor)
+    np.testing.assert_allclose(bm.to_numpy(coarse.to_dense()), expected)
+
+    with pytest.raises(ValueError):
+        ptap(P, P)
+
 # Additional tests can be added here to cover more edge cases, different shapes,
 # or to ensure consistency with other matrix multiplication methods under various conditions.
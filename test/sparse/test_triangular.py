@@ -0,0 +1,101 @@
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
+from fealpy.sparse import COOTensor, TriangularSolver, spsolve_triangular, ic0, ilu0
+
+
+def assemble(p=1, n=4):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=p)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    bform.add_integrator(ScalarMassIntegrator())
+    return bform.assembly()
+
+
+def reference_ic0(D):
+    n = len(D)
+    L = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1):
+            if D[i][j] == 0:
+                continue
+            s = sum(L[i][k] * L[j][k] for k in range(j))
+            if i == j:
+                L[i][i] = (D[i][i] - s) ** 0.5
+            else:
+                L[i][j] = (D[i][j] - s) / L[j][j]
+    return L
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+@pytest.mark.parametrize("lower", [True, False])
+def test_triangular_solve(backend, lower, set_backend):
+    set_backend(backend)
+    A = assemble(p=2)
+    T = A.tril() if lower else A.triu()
+    Td = T.to_dense()
+    b = bm.stack([bm.sin(bm.arange(A.shape[0], dtype=bm.float64) * k) for k in (1, 2, 3)], axis=1)
+
+    solver = TriangularSolver(A, lower=lower)
+    assert solver.nlevels < A.shape[0]
+    x = solver.solve(b)
+    assert bm.allclose(Td @ x, b)
+    x = spsolve_triangular(A, b[:, 0], lower=lower)
+    assert bm.allclose(Td @ x, b[:, 0])
+    if backend == 'numpy':
+        # The level-scheduled sweeps, used on the other backends.
+        solver._lu = None
+        assert bm.allclose(Td @ solver.solve(b), b)
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_triangular_unit_diagonal(backend, set_backend):
+    set_backend(backend)
+    indices = bm.tensor([[0, 1, 2, 2], [0, 0, 1, 2]])
+    values = bm.tensor([5.0, 2.0, 3.0, 5.0], dtype=bm.float64)
+    A = COOTensor(indices, values, (3, 3)).tocsr()
+    x = spsolve_triangular(A, bm.tensor([1.0, 4.0, 9.0], dtype=bm.float64), unit_diagonal=True)
+    assert bm.allclose(x, bm.tensor([1.0, 2.0, 3.0], dtype=bm.float64))
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_ic0(backend, set_backend):
+    set_backend(backend)
+    A = assemble(p=1, n=3)
+    L = ic0(A)
+    expected = bm.tensor(reference_ic0(bm.to_numpy(A.to_dense()).tolist()), dtype=bm.float64)
+    assert L.nnz == A.tril().nnz
+    assert bm.allclose(L.to_dense(), expected)
+
+
+def reference_ilu0(D):
+    n = len(D)
+    W = [list(r) for r in D]
+    for i in range(1, n):
+        for k in range(i):
+            if D[i][k] == 0:
+                continue
+            W[i][k] /= W[k][k]
+            for j in range(k + 1, n):
+                if D[i][j] != 0:
+                    W[i][j] -= W[i][k] * W[k][j]
+    return [[W[i][j] if D[i][j] != 0 else 0.0 for j in range(n)] for i in range(n)]
+
+
+@pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+def test_ilu0(backend, set_backend):
+    set_backend(backend)
+    A = assemble(p=2, n=2)
+    # A non-symmetric matrix with the pattern of A.
+    row, col = A.row(), A.col()
+    val = A.values() * (1.0 + 0.3 * bm.astype(col > row, bm.float64))
+    A = COOTensor(bm.stack([row, col], axis=0), val, A.sparse_shape).tocsr()
+    LU = ilu0(A)
+    expected = bm.tensor(reference_ilu0(bm.to_numpy(A.to_dense()).tolist()), dtype=bm.float64)
+    assert LU.nnz == A.nnz
+    assert bm.allclose(LU.to_dense(), expected)